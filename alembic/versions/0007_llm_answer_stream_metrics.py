@@ -0,0 +1,41 @@
+"""add streaming metrics to llm answers
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def _column_names(table_name: str) -> set[str]:
+    from sqlalchemy import inspect
+
+    inspector = inspect(op.get_bind())
+    if table_name not in inspector.get_table_names():
+        return set()
+    return {column["name"] for column in inspector.get_columns(table_name)}
+
+
+def upgrade() -> None:
+    existing = _column_names("llm_answers")
+    with op.batch_alter_table("llm_answers") as batch_op:
+        if "time_to_first_token" not in existing:
+            batch_op.add_column(sa.Column("time_to_first_token", sa.Float(), nullable=True))
+        if "tokens_per_second" not in existing:
+            batch_op.add_column(sa.Column("tokens_per_second", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("llm_answers") as batch_op:
+        batch_op.drop_column("tokens_per_second")
+        batch_op.drop_column("time_to_first_token")
@@ -0,0 +1,26 @@
+"""add knowledge translation memory table
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    from models.knowledge_domain import KnowledgeTranslationMemory
+
+    KnowledgeTranslationMemory.__table__.create(bind=op.get_bind(), checkfirst=True)
+
+
+def downgrade() -> None:
+    op.drop_table("knowledge_translation_memory")
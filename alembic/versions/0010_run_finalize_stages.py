@@ -0,0 +1,26 @@
+"""add run finalize stage checkpoints
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    from models.domain import RunFinalizeStage
+
+    RunFinalizeStage.__table__.create(bind=op.get_bind(), checkfirst=True)
+
+
+def downgrade() -> None:
+    op.drop_table("run_finalize_stages")
@@ -0,0 +1,58 @@
+"""add indexed prompt text hashes for answer reuse
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = ("text_zh_hash", "text_en_hash")
+
+
+def _column_names(table_name: str) -> set[str]:
+    from sqlalchemy import inspect
+
+    inspector = inspect(op.get_bind())
+    if table_name not in inspector.get_table_names():
+        return set()
+    return {column["name"] for column in inspector.get_columns(table_name)}
+
+
+def _backfill() -> None:
+    from models.domain import prompt_text_hash
+
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT id, text_zh, text_en FROM prompts")).fetchall()
+    for prompt_id, text_zh, text_en in rows:
+        bind.execute(
+            sa.text("UPDATE prompts SET text_zh_hash = :zh, text_en_hash = :en WHERE id = :id"),
+            {"zh": prompt_text_hash(text_zh), "en": prompt_text_hash(text_en), "id": prompt_id},
+        )
+
+
+def upgrade() -> None:
+    existing = _column_names("prompts")
+    missing = [column for column in _COLUMNS if column not in existing]
+    if missing:
+        with op.batch_alter_table("prompts") as batch_op:
+            for column in missing:
+                batch_op.add_column(sa.Column(column, sa.String(length=64), nullable=True))
+                batch_op.create_index(f"ix_prompts_{column}", [column])
+    _backfill()
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("prompts") as batch_op:
+        for column in _COLUMNS:
+            batch_op.drop_index(f"ix_prompts_{column}")
+            batch_op.drop_column(column)
@@ -0,0 +1,36 @@
+"""add secondary indexes for hot query paths
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+# Created by revision 0002 and left in place on downgrade.
+_FROM_0002 = {
+    "ix_prompts_run_id",
+    "ix_brand_mentions_llm_answer_id",
+    "ix_product_mentions_llm_answer_id",
+}
+
+
+def upgrade() -> None:
+    from models.indexes import ensure_hot_path_indexes
+
+    ensure_hot_path_indexes(op.get_bind())
+
+
+def downgrade() -> None:
+    from models.indexes import HOT_PATH_INDEXES, drop_hot_path_indexes
+
+    names = [spec.name for spec in HOT_PATH_INDEXES if spec.name not in _FROM_0002]
+    drop_hot_path_indexes(op.get_bind(), names)
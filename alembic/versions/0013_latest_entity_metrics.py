@@ -0,0 +1,26 @@
+"""add materialized latest entity metrics
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    from models.domain import LatestEntityMetrics
+
+    LatestEntityMetrics.__table__.create(bind=op.get_bind(), checkfirst=True)
+
+
+def downgrade() -> None:
+    op.drop_table("latest_entity_metrics")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Benchmark dashboard API latency under parallel load, with and without DB offloading.
+
+Seeds a synthetic SQLite database (same shape as
+``benchmark_db_indexes.py``), then fires concurrent dashboard requests
+(``/metrics/latest``, ``/tracking/runs``, ``/verticals``,
+``/verticals/{id}/models``) at the ASGI app twice: once with
+``DB_OFFLOAD_ENABLED=false`` (queries block the event loop) and once with
+the bounded DB thread pool. Reports p50/p99 per endpoint group.
+
+Usage:
+    python scripts/benchmark_api_concurrency.py --clients 16 --requests 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+
+_DB_DIR = tempfile.mkdtemp(prefix="dragonlens-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_DB_DIR}/bench.db")
+os.environ.setdefault("KNOWLEDGE_DATABASE_URL", f"sqlite:///{_DB_DIR}/knowledge.db")
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+os.environ.setdefault("TRANSLATION_MEMORY_ENABLED", "false")
+
+import httpx  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from api.app import create_app  # noqa: E402
+from api.db_offload import reset_db_executor  # noqa: E402
+from config import settings  # noqa: E402
+from models import Base  # noqa: E402
+from models.database import engine  # noqa: E402
+from models.indexes import ensure_hot_path_indexes  # noqa: E402
+from scripts.benchmark_db_indexes import MODELS, seed  # noqa: E402
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _requests(vertical_id: int) -> list[tuple[str, str, dict]]:
+    return [
+        ("heavy", "/api/v1/metrics/latest", {"vertical_id": vertical_id, "model_name": MODELS[0]}),
+        ("light", "/api/v1/tracking/runs", {"vertical_id": vertical_id, "limit": 20}),
+        ("light", "/api/v1/verticals", {}),
+        ("light", f"/api/v1/verticals/{vertical_id}/models", {}),
+    ]
+
+
+async def _load(app, vertical_id: int, clients: int, per_client: int) -> dict[str, list[float]]:
+    latencies: dict[str, list[float]] = {"heavy": [], "light": []}
+    plan = _requests(vertical_id)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker(offset: int) -> None:
+            for i in range(per_client):
+                group, path, params = plan[(offset + i) % len(plan)]
+                start = time.perf_counter()
+                response = await client.get(path, params=params)
+                latencies[group].append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        await asyncio.gather(*(worker(offset) for offset in range(clients)))
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--verticals", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=30, help="runs per vertical")
+    parser.add_argument("--prompts", type=int, default=20, help="prompts per run")
+    parser.add_argument("--brands", type=int, default=40, help="brands/products per vertical")
+    parser.add_argument("--mentions", type=int, default=8, help="brand and product mentions per answer")
+    parser.add_argument("--clients", type=int, default=16, help="concurrent dashboard clients")
+    parser.add_argument("--requests", type=int, default=20, help="requests per client")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        ensure_hot_path_indexes(connection)
+    with Session(engine) as session:
+        seed(session, args.verticals, args.runs, args.prompts, args.brands, args.mentions)
+
+    app = create_app()
+    vertical_id = args.verticals // 2 + 1
+    results = {}
+    for label, enabled in (("blocking", False), ("offloaded", True)):
+        settings.db_offload_enabled = enabled
+        reset_db_executor()
+        asyncio.run(_load(app, vertical_id, 2, 4))
+        started = time.perf_counter()
+        results[label] = _load_result = asyncio.run(_load(app, vertical_id, args.clients, args.requests))
+        elapsed = time.perf_counter() - started
+        total = sum(len(samples) for samples in _load_result.values())
+        print(f"{label:10s} {total} requests in {elapsed:.2f}s ({total / elapsed:.0f} req/s)")
+    reset_db_executor()
+
+    print(f"\n{'mode':10s} {'group':6s} {'p50':>9s} {'p99':>9s} {'mean':>9s}")
+    for label, latencies in results.items():
+        for group, samples in latencies.items():
+            print(
+                f"{label:10s} {group:6s} {_percentile(samples, 50) * 1000:7.1f}ms "
+                f"{_percentile(samples, 99) * 1000:7.1f}ms {statistics.mean(samples) * 1000:7.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
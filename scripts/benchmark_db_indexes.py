@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Benchmark hot query paths before and after the hot-path indexes.
+
+Seeds a synthetic SQLite database, times ``/metrics/latest``,
+``/tracking/runs`` and ``_prompt_work_items`` without the secondary
+indexes, then creates them (``models.indexes.ensure_hot_path_indexes``)
+and times the same calls again.
+
+Usage:
+    python scripts/benchmark_db_indexes.py --verticals 10 --runs 60
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+
+_DB_DIR = tempfile.mkdtemp(prefix="dragonlens-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_DB_DIR}/bench.db")
+os.environ.setdefault("KNOWLEDGE_DATABASE_URL", f"sqlite:///{_DB_DIR}/knowledge.db")
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+os.environ.setdefault("TRANSLATION_MEMORY_ENABLED", "false")
+
+from sqlalchemy import create_engine, insert, text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from models import (  # noqa: E402
+    Base,
+    Brand,
+    BrandMention,
+    LLMAnswer,
+    Product,
+    ProductMention,
+    Prompt,
+    Run,
+    RunStatus,
+    Vertical,
+)
+from models.domain import PromptLanguage, Sentiment, prompt_text_hash  # noqa: E402
+from models.indexes import HOT_PATH_INDEXES, ensure_hot_path_indexes  # noqa: E402
+
+MODELS = ("deepseek-chat", "qwen-plus", "kimi-k2")
+
+
+def _chunks(rows: list[dict], size: int = 5000):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _bulk(session: Session, model, rows: list[dict]) -> None:
+    for chunk in _chunks(rows):
+        session.execute(insert(model), chunk)
+
+
+def seed(session: Session, verticals: int, runs: int, prompts: int, brands: int, mentions: int) -> None:
+    now = datetime.utcnow()
+    _bulk(session, Vertical, [{"id": v + 1, "name": f"vertical-{v}"} for v in range(verticals)])
+    brand_rows, product_rows = [], []
+    for v in range(1, verticals + 1):
+        for b in range(brands):
+            brand_id = (v - 1) * brands + b + 1
+            brand_rows.append({
+                "id": brand_id, "vertical_id": v, "display_name": f"Brand {v}-{b}",
+                "original_name": f"Brand {v}-{b}", "aliases": {}, "is_user_input": b < 3,
+            })
+            product_rows.append({
+                "id": brand_id, "vertical_id": v, "brand_id": brand_id,
+                "display_name": f"Product {v}-{b}", "original_name": f"Product {v}-{b}",
+                "is_user_input": False,
+            })
+    _bulk(session, Brand, brand_rows)
+    _bulk(session, Product, product_rows)
+
+    run_rows, prompt_rows, answer_rows, brand_mentions, product_mentions = [], [], [], [], []
+    run_id = prompt_id = 0
+    for v in range(1, verticals + 1):
+        for r in range(runs):
+            run_id += 1
+            run_rows.append({
+                "id": run_id, "vertical_id": v, "provider": "deepseek",
+                "model_name": MODELS[r % len(MODELS)], "status": RunStatus.COMPLETED,
+                "reuse_answers": False, "web_search_enabled": False, "priority": 1,
+                "run_time": now - timedelta(hours=runs - r), "completed_at": now - timedelta(hours=runs - r),
+            })
+            for p in range(prompts):
+                prompt_id += 1
+                text_zh = f"推荐第{p}款{v}类产品"
+                prompt_rows.append({
+                    "id": prompt_id, "vertical_id": v, "run_id": run_id, "text_zh": text_zh,
+                    "text_zh_hash": prompt_text_hash(text_zh), "language_original": PromptLanguage.ZH,
+                })
+                answer_rows.append({
+                    "id": prompt_id, "run_id": run_id, "prompt_id": prompt_id, "provider": "deepseek",
+                    "model_name": MODELS[r % len(MODELS)], "raw_answer_zh": "回答",
+                })
+                for m in range(mentions):
+                    entity_id = (v - 1) * brands + (p + m) % brands + 1
+                    common = {
+                        "llm_answer_id": prompt_id, "mentioned": True, "rank": m + 1,
+                        "sentiment": Sentiment.NEUTRAL, "evidence_snippets": {},
+                    }
+                    brand_mentions.append({**common, "brand_id": entity_id})
+                    product_mentions.append({**common, "product_id": entity_id})
+    _bulk(session, Run, run_rows)
+    _bulk(session, Prompt, prompt_rows)
+    _bulk(session, LLMAnswer, answer_rows)
+    _bulk(session, BrandMention, brand_mentions)
+    _bulk(session, ProductMention, product_mentions)
+    session.commit()
+
+
+def _timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def measure(engine, vertical_id: int, repeat: int) -> dict[str, float]:
+    from api.routers.metrics import get_latest_metrics
+    from api.routers.tracking import list_runs
+    from workers.tasks import _prompt_work_items
+
+    with Session(engine) as session:
+        new_run = Run(
+            vertical_id=vertical_id, provider="deepseek", model_name=MODELS[0],
+            status=RunStatus.PENDING, reuse_answers=True,
+        )
+        session.add(new_run)
+        session.flush()
+        prompts = session.query(Prompt).filter(Prompt.vertical_id == vertical_id).limit(200).all()
+
+        def metrics_latest():
+            asyncio.run(get_latest_metrics(vertical_id=vertical_id, model_name=MODELS[0], db=session))
+            session.expire_all()
+
+        def tracking_runs():
+            asyncio.run(list_runs(
+                vertical_id=vertical_id, provider=None, model_name=MODELS[1], skip=0, limit=100, db=session,
+            ))
+            session.expire_all()
+
+        def prompt_work_items():
+            _prompt_work_items(session, new_run, prompts, translator=None)
+            session.expire_all()
+
+        timings = {
+            "/metrics/latest": _timed(metrics_latest, repeat),
+            "/tracking/runs": _timed(tracking_runs, repeat),
+            "_prompt_work_items": _timed(prompt_work_items, repeat),
+        }
+        session.rollback()
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--verticals", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=60, help="runs per vertical")
+    parser.add_argument("--prompts", type=int, default=20, help="prompts per run")
+    parser.add_argument("--brands", type=int, default=40, help="brands/products per vertical")
+    parser.add_argument("--mentions", type=int, default=8, help="brand and product mentions per answer")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    Base.metadata.create_all(engine)
+    started = time.perf_counter()
+    with Session(engine) as session:
+        seed(session, args.verticals, args.runs, args.prompts, args.brands, args.mentions)
+    print(f"Seeded {os.environ['DATABASE_URL']} in {time.perf_counter() - started:.1f}s")
+
+    vertical_id = args.verticals // 2 + 1
+    before = measure(engine, vertical_id, args.repeat)
+    with engine.begin() as connection:
+        created = ensure_hot_path_indexes(connection)
+        connection.execute(text("ANALYZE"))
+    print(f"Created {len(created)}/{len(HOT_PATH_INDEXES)} indexes: {', '.join(created)}")
+    after = measure(engine, vertical_id, args.repeat)
+
+    print(f"\n{'path':22s} {'before':>10s} {'after':>10s} {'speedup':>8s}")
+    for name in before:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(f"{name:22s} {before[name] * 1000:8.1f}ms {after[name] * 1000:8.1f}ms {speedup:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
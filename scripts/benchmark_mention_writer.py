@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Benchmark per-object mention saves against the bulk ``MentionWriter``.
+
+Seeds a synthetic SQLite run (500 answers by default), then replaces the
+mentions of every answer twice: once the old way (per-answer ``DELETE``s
+and one ORM object per mention) and once with ``delete_mentions`` plus
+``MentionWriter.write``, committing through ``commit_with_retry`` in both.
+
+Usage:
+    python scripts/benchmark_mention_writer.py --answers 500 --mentions 10
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+
+_DB_DIR = tempfile.mkdtemp(prefix="dragonlens-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_DB_DIR}/bench.db")
+os.environ.setdefault("KNOWLEDGE_DATABASE_URL", f"sqlite:///{_DB_DIR}/knowledge.db")
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+os.environ.setdefault("TRANSLATION_MEMORY_ENABLED", "false")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from models import (  # noqa: E402
+    Base,
+    Brand,
+    BrandMention,
+    ExtractionDebug,
+    LLMAnswer,
+    Product,
+    ProductMention,
+    Prompt,
+    Run,
+    RunStatus,
+    Vertical,
+)
+from models.db_retry import commit_with_retry  # noqa: E402
+from models.domain import PromptLanguage, Sentiment  # noqa: E402
+from services.mention_writer import MentionWriter, delete_mentions  # noqa: E402
+
+SNIPPETS = {"zh": ["比亚迪宋PLUS续航表现很好"], "en": ["BYD Song PLUS has good range"]}
+
+
+def seed(session: Session, answers: int, brands: int) -> list[int]:
+    session.execute(insert(Vertical), [{"id": 1, "name": "SUV"}])
+    session.execute(insert(Brand), [
+        {"id": b + 1, "vertical_id": 1, "display_name": f"Brand {b}", "original_name": f"Brand {b}",
+         "aliases": {}, "is_user_input": False}
+        for b in range(brands)
+    ])
+    session.execute(insert(Product), [
+        {"id": b + 1, "vertical_id": 1, "brand_id": b + 1, "display_name": f"Product {b}",
+         "original_name": f"Product {b}", "is_user_input": False}
+        for b in range(brands)
+    ])
+    session.execute(insert(Run), [{
+        "id": 1, "vertical_id": 1, "provider": "deepseek", "model_name": "deepseek-chat",
+        "status": RunStatus.IN_PROGRESS, "reuse_answers": False, "web_search_enabled": False, "priority": 1,
+    }])
+    session.execute(insert(Prompt), [
+        {"id": a + 1, "vertical_id": 1, "run_id": 1, "text_zh": f"问题{a}", "language_original": PromptLanguage.ZH}
+        for a in range(answers)
+    ])
+    session.execute(insert(LLMAnswer), [
+        {"id": a + 1, "run_id": 1, "prompt_id": a + 1, "provider": "deepseek",
+         "model_name": "deepseek-chat", "raw_answer_zh": "回答"}
+        for a in range(answers)
+    ])
+    session.commit()
+    return list(range(1, answers + 1))
+
+
+def _entities(answer_id: int, mentions: int, brands: int) -> list[tuple[int, int]]:
+    return [(rank, (answer_id + rank) % brands + 1) for rank in range(1, mentions + 1)]
+
+
+def save_per_object(session: Session, answer_ids: list[int], mentions: int, brands: int) -> None:
+    for answer_id in answer_ids:
+        session.query(BrandMention).filter(BrandMention.llm_answer_id == answer_id).delete()
+        session.query(ProductMention).filter(ProductMention.llm_answer_id == answer_id).delete()
+        session.query(ExtractionDebug).filter(ExtractionDebug.llm_answer_id == answer_id).delete()
+    for answer_id in answer_ids:
+        session.add(ExtractionDebug(llm_answer_id=answer_id, raw_brands="[]", extraction_method="qwen"))
+        for rank, entity_id in _entities(answer_id, mentions, brands):
+            session.add(BrandMention(
+                llm_answer_id=answer_id, brand_id=entity_id, mentioned=True, rank=rank,
+                sentiment=Sentiment.NEUTRAL, evidence_snippets=SNIPPETS,
+            ))
+            session.add(ProductMention(
+                llm_answer_id=answer_id, product_id=entity_id, mentioned=True, rank=rank,
+                sentiment=Sentiment.NEUTRAL, evidence_snippets=SNIPPETS,
+            ))
+    commit_with_retry(session)
+
+
+def save_bulk(session: Session, answer_ids: list[int], mentions: int, brands: int) -> None:
+    delete_mentions(session, answer_ids, include_debug=True)
+    writer = MentionWriter()
+    for answer_id in answer_ids:
+        writer.add_debug(answer_id)
+        for rank, entity_id in _entities(answer_id, mentions, brands):
+            writer.add_brand(answer_id, entity_id, rank, Sentiment.NEUTRAL, SNIPPETS["zh"], SNIPPETS["en"])
+            writer.add_product(answer_id, entity_id, rank, Sentiment.NEUTRAL, SNIPPETS["zh"], SNIPPETS["en"])
+    writer.write(session)
+    commit_with_retry(session)
+
+
+def _timed(engine, fn, answer_ids: list[int], mentions: int, brands: int, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        with Session(engine) as session:
+            start = time.perf_counter()
+            fn(session, answer_ids, mentions, brands)
+            samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--answers", type=int, default=500)
+    parser.add_argument("--mentions", type=int, default=10, help="brand and product mentions per answer")
+    parser.add_argument("--brands", type=int, default=60, help="brands/products in the vertical")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        answer_ids = seed(session, args.answers, args.brands)
+
+    rows = args.answers * (2 * args.mentions + 1)
+    per_object = _timed(engine, save_per_object, answer_ids, args.mentions, args.brands, args.repeat)
+    bulk = _timed(engine, save_bulk, answer_ids, args.mentions, args.brands, args.repeat)
+    with Session(engine) as session:
+        assert session.query(BrandMention).count() == args.answers * args.mentions
+
+    print(f"{args.answers} answers, {rows} rows replaced per pass (median of {args.repeat})")
+    print(f"{'per-object ORM':16s} {per_object * 1000:9.1f}ms")
+    print(f"{'bulk writer':16s} {bulk * 1000:9.1f}ms  ({per_object / bulk:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
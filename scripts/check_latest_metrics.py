@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Diff the materialized latest metrics against a from-scratch recomputation.
+
+Recomputes every stored (vertical, model) scope of ``latest_entity_metrics``
+and prints each row or field that disagrees. With ``--repair`` the
+affected verticals are rebuilt. Exits non-zero when differences remain.
+
+Usage:
+    python scripts/check_latest_metrics.py [--vertical-id 3] [--repair]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from models import Vertical  # noqa: E402
+from models.database import SessionLocal  # noqa: E402
+from services.latest_metrics import check_latest_metrics, refresh_latest_metrics  # noqa: E402
+
+
+def main() -> int:
+    args = parse_args()
+    inconsistent = 0
+    with SessionLocal() as db:
+        vertical_ids = args.vertical_ids or [v.id for v in db.query(Vertical).order_by(Vertical.id)]
+        for vertical_id in vertical_ids:
+            diffs = check_latest_metrics(db, vertical_id, tolerance=args.tolerance)
+            for diff in diffs:
+                print(
+                    f"vertical={vertical_id} model={diff.model_name} {diff.entity_type}="
+                    f"{diff.entity_key!r} {diff.field}: stored={diff.stored!r} expected={diff.expected!r}"
+                )
+            if not diffs:
+                continue
+            if args.repair:
+                refresh_latest_metrics(db, vertical_id)
+                print(f"vertical={vertical_id} rebuilt")
+            else:
+                inconsistent += 1
+    print(f"Checked {len(vertical_ids)} verticals, {inconsistent} inconsistent")
+    return 1 if inconsistent else 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--vertical-id",
+        dest="vertical_ids",
+        action="append",
+        type=int,
+        help="Check a vertical by ID. Repeat to include multiple verticals; all by default.",
+    )
+    parser.add_argument("--tolerance", type=float, default=1e-9, help="allowed metric difference")
+    parser.add_argument("--repair", action="store_true", help="rebuild verticals that differ")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
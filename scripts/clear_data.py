@@ -41,6 +41,7 @@ def _clear_all_tables_sqlite(session, engine) -> None:
     tables = _tables_in_order(
         _table_names(engine),
         [
+            "latest_entity_metrics",
             "daily_metrics",
             "run_metrics",
             "brand_mentions",
@@ -76,6 +77,7 @@ def _clear_extracted_tables(session, engine) -> None:
     tables = _tables_in_order(
         _table_names(engine),
         [
+            "latest_entity_metrics",
             "daily_metrics",
             "run_metrics",
             "brand_mentions",
@@ -7,14 +7,14 @@ sys.path.insert(0, str(ROOT))
 sys.path.insert(0, str(ROOT / "src"))
 
 from config import settings  # noqa: E402
-from models.database import SessionLocal, init_db  # noqa: E402
+from models.database import ReadSessionLocal, init_db  # noqa: E402
 from services.demo_dashboard_snapshot import build_dashboard_snapshot  # noqa: E402
 
 
 def main() -> None:
     args = parse_args()
     init_db()
-    with SessionLocal() as db:
+    with ReadSessionLocal() as db:
         snapshot = build_dashboard_snapshot(
             db,
             vertical_ids=args.vertical_ids,
@@ -15,8 +15,10 @@ from api.routers import (
     tracking,
     verticals,
 )
+from api.db_offload import reset_db_executor
 from config import settings
-from models.knowledge_database import init_knowledge_db
+from models.database import database_pool_stats
+from models.knowledge_database import init_knowledge_db, knowledge_pool_stats
 from models.migrations import upgrade_db
 
 MUTATING_METHODS = {"DELETE", "PATCH", "POST", "PUT"}
@@ -27,6 +29,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     upgrade_db()
     init_knowledge_db()
     yield
+    reset_db_executor()
 
 
 def create_app(app_lifespan=lifespan) -> FastAPI:
@@ -96,4 +99,8 @@ def _include_health_routes(app: FastAPI) -> None:
     async def health():
         return {"status": "healthy"}
 
+    @app.get("/health/db")
+    async def database_health():
+        return {"main": database_pool_stats(), "knowledge": knowledge_pool_stats()}
+
 app = create_app()
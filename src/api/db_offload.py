@@ -0,0 +1,62 @@
+"""Run blocking database work off the API event loop.
+
+Routers are ``async def`` but query through the synchronous ``Session``
+from ``get_db``, so a slow query would stall every other request on the
+uvicorn loop. Read endpoints decorated with :func:`offload_db` run their
+body in a dedicated, bounded thread pool (``db_threadpool_workers``,
+sized to stay within the SQLAlchemy connection pool) and await the
+result. The decorated endpoint keeps its signature, so FastAPI resolves
+dependencies exactly as before.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from config import settings
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.db_threadpool_workers),
+                thread_name_prefix="db-offload",
+            )
+        return _executor
+
+
+def reset_db_executor(executor: Optional[ThreadPoolExecutor] = None) -> None:
+    global _executor
+    with _executor_lock:
+        previous, _executor = _executor, executor
+    if previous is not None and previous is not executor:
+        previous.shutdown(wait=False)
+
+
+async def run_db(fn: Callable[..., T], *args, **kwargs) -> T:
+    """Call ``fn`` in the database thread pool, or inline when offloading is disabled."""
+    if not settings.db_offload_enabled:
+        return fn(*args, **kwargs)
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, fn, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(get_db_executor(), call)
+
+
+def offload_db(fn: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+    """Turn a synchronous endpoint body into an ``async`` endpoint backed by :func:`run_db`."""
+
+    @functools.wraps(fn)
+    async def endpoint(*args, **kwargs) -> T:
+        return await run_db(fn, *args, **kwargs)
+
+    return endpoint
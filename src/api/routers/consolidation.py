@@ -18,6 +18,7 @@ from services.entity_consolidation import (
     get_pending_candidates,
     validate_candidate,
 )
+from services.latest_metrics import schedule_latest_metrics_refresh
 
 router = APIRouter()
 
@@ -32,6 +33,7 @@ async def consolidate_entities(
         raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
 
     result = consolidate_run(db, run_id)
+    schedule_latest_metrics_refresh(db, [run.vertical_id])
 
     return ConsolidationResultResponse(
         brands_merged=result.brands_merged,
@@ -167,6 +169,7 @@ async def validate_entity_candidate(
         )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    schedule_latest_metrics_refresh(db, [candidate.vertical_id])
 
     return ValidationCandidateResponse(
         id=candidate.id,
@@ -4,12 +4,13 @@ import asyncio
 import logging
 import os
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import func
-from sqlalchemy.orm import Session, joinedload, sessionmaker
+from sqlalchemy.orm import Session, defer, joinedload, selectinload, sessionmaker
 
+from api.db_offload import offload_db
 from models import (
     Brand,
     BrandMention,
@@ -22,6 +23,7 @@ from models import (
     RunComparisonConfig,
     Vertical,
     get_db,
+    get_read_db,
 )
 from models.db_retry import commit_with_retry, flush_with_retry
 from models.domain import PromptLanguage, RunStatus, Sentiment
@@ -35,13 +37,22 @@ from models.schemas import (
     RunEntityProduct,
     RunDetailedResponse,
     RunInspectorPromptExport,
+    RunProgressResponse,
     RunResponse,
+    RunStageResponse,
     TrackingJobCreate,
     TrackingJobResponse,
 )
 from services.translater import format_entity_label
+from services.latest_metrics import invalidate_latest_metrics
 from services.metrics_service import calculate_and_save_metrics
 from services.run_inspector_export import build_run_inspector_export
+from services.run_checkpoints import (
+    can_resume_finalize,
+    finalize_stage_rows,
+    first_incomplete_stage,
+)
+from services.run_state import get_run_state_store
 
 logger = logging.getLogger(__name__)
 
@@ -129,6 +140,7 @@ async def create_tracking_job(
         status=RunStatus.PENDING,
         reuse_answers=job.reuse_answers,
         web_search_enabled=job.web_search_enabled,
+        priority=job.priority,
     )
     db.add(run)
     flush_with_retry(db)
@@ -294,6 +306,7 @@ async def delete_tracking_jobs(
 
     for run in runs_to_delete:
         db.delete(run)
+    invalidate_latest_metrics(db, vertical_ids)
 
     commit_with_retry(db)
 
@@ -304,7 +317,8 @@ async def delete_tracking_jobs(
 
 
 @router.get("/runs", response_model=List[RunResponse])
-async def list_runs(
+@offload_db
+def list_runs(
     vertical_id: int | None = None,
     provider: str | None = None,
     model_name: str | None = None,
@@ -340,7 +354,8 @@ async def list_runs(
 
 
 @router.get("/runs/{run_id}", response_model=RunResponse)
-async def get_run(
+@offload_db
+def get_run(
     run_id: int,
     db: Session = Depends(get_db),
 ) -> Run:
@@ -364,6 +379,61 @@ async def get_run(
     return run
 
 
+@router.get("/runs/{run_id}/progress", response_model=RunProgressResponse)
+async def get_run_progress(run_id: int) -> RunProgressResponse:
+    """
+    Get live progress counters for a run from Redis.
+
+    Args:
+        run_id: Run ID
+
+    Returns:
+        Prompt totals and answered/extracted/failed counters
+
+    Raises:
+        HTTPException: If no progress is tracked for the run or Redis is unavailable
+    """
+    try:
+        progress = await asyncio.to_thread(get_run_state_store().progress, run_id)
+    except Exception as exc:
+        logger.warning("Run progress unavailable for run %s: %s", run_id, exc)
+        raise HTTPException(status_code=503, detail="Run progress store unavailable")
+    if progress is None:
+        raise HTTPException(status_code=404, detail=f"No progress tracked for run {run_id}")
+    return RunProgressResponse(**progress.as_dict())
+
+
+@router.get("/runs/{run_id}/stages", response_model=List[RunStageResponse])
+@offload_db
+def get_run_stages(
+    run_id: int,
+    db: Session = Depends(get_db),
+) -> List[RunStageResponse]:
+    """
+    Get completed finalize stages of a run with their durations.
+
+    Args:
+        run_id: Run ID
+        db: Database session
+
+    Returns:
+        Checkpointed stages in pipeline order
+
+    Raises:
+        HTTPException: If run not found
+    """
+    if not db.query(Run.id).filter(Run.id == run_id).first():
+        raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
+    return [
+        RunStageResponse(
+            stage=row.stage,
+            duration_seconds=row.duration_seconds,
+            completed_at=row.completed_at,
+        )
+        for row in finalize_stage_rows(db, run_id)
+    ]
+
+
 @router.post("/runs/{run_id}/reprocess")
 async def reprocess_run(
     run_id: int,
@@ -377,6 +447,9 @@ async def reprocess_run(
     2. Enqueue a Celery task to reprocess the run
     3. The task will reuse existing LLM answers and re-run extraction
 
+    A failed run whose finalization stopped part-way resumes from the first
+    incomplete finalize stage instead.
+
     Args:
         run_id: Run ID to reprocess
         db: Database session
@@ -417,9 +490,20 @@ async def reprocess_run(
             commit_with_retry(db)
         return {"message": f"Run {run_id} queued for inline reprocessing", "run_id": run_id}
 
-    from workers.tasks import start_run
+    from workers.tasks import finalize_run, start_run
 
     try:
+        if run.status == RunStatus.FAILED and can_resume_finalize(db, run.id):
+            finalize_run.delay(run.id)
+            run.status = RunStatus.IN_PROGRESS
+            run.error_message = None
+            run.completed_at = None
+            commit_with_retry(db)
+            return {
+                "message": f"Run {run_id} queued to resume finalization",
+                "run_id": run_id,
+                "resume_stage": first_incomplete_stage(db, run.id),
+            }
         start_run.delay(run.id, True)
         if run.status in {RunStatus.COMPLETED, RunStatus.FAILED}:
             run.status = RunStatus.PENDING
@@ -435,20 +519,87 @@ async def reprocess_run(
         )
 
 
+def _answer_load_options(include_answer_text: bool, include_mentions: bool) -> list:
+    options = [selectinload(LLMAnswer.prompt).load_only(Prompt.text_zh, Prompt.text_en)]
+    if not include_answer_text:
+        options.append(defer(LLMAnswer.raw_answer_zh))
+        options.append(defer(LLMAnswer.raw_answer_en))
+    if include_mentions:
+        options.append(
+            selectinload(LLMAnswer.mentions)
+            .selectinload(BrandMention.brand)
+            .load_only(Brand.original_name, Brand.translated_name)
+        )
+    return options
+
+
+def _mention_response(mention: BrandMention) -> BrandMentionResponse:
+    brand = mention.brand
+    return BrandMentionResponse(
+        brand_id=mention.brand_id,
+        brand_name=(
+            format_entity_label(brand.original_name, brand.translated_name)
+            if brand
+            else "Unknown"
+        ),
+        mentioned=mention.mentioned,
+        rank=mention.rank,
+        sentiment=mention.sentiment.value,
+        evidence_snippets=mention.evidence_snippets,
+    )
+
+
+def _answer_response(
+    llm_answer: LLMAnswer, include_answer_text: bool, include_mentions: bool
+) -> LLMAnswerResponse:
+    prompt = llm_answer.prompt
+    return LLMAnswerResponse(
+        id=llm_answer.id,
+        prompt_text_zh=prompt.text_zh if prompt else None,
+        prompt_text_en=prompt.text_en if prompt else None,
+        provider=llm_answer.provider,
+        model_name=llm_answer.model_name,
+        route=llm_answer.route.value if llm_answer.route else None,
+        raw_answer_zh=llm_answer.raw_answer_zh if include_answer_text else None,
+        raw_answer_en=llm_answer.raw_answer_en if include_answer_text else None,
+        tokens_in=llm_answer.tokens_in,
+        tokens_out=llm_answer.tokens_out,
+        latency=llm_answer.latency,
+        cost_estimate=llm_answer.cost_estimate,
+        mentions=(
+            [_mention_response(m) for m in llm_answer.mentions] if include_mentions else []
+        ),
+        created_at=llm_answer.created_at,
+    )
+
+
 @router.get("/runs/{run_id}/details", response_model=RunDetailedResponse)
-async def get_run_details(
+@offload_db
+def get_run_details(
     run_id: int,
+    cursor: Optional[int] = Query(None, ge=0, description="Return answers with id greater than this"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; all answers when omitted"),
+    include_answer_text: bool = Query(True, description="Include raw_answer_zh/raw_answer_en"),
+    include_mentions: bool = Query(True, description="Include brand mentions per answer"),
     db: Session = Depends(get_db),
 ) -> RunDetailedResponse:
     """
     Get detailed information about a run including answers and mentions.
 
+    Answers are ordered by id; pass ``limit`` to page through them and feed
+    ``next_cursor`` back as ``cursor``. Prompts, mentions and brands are
+    loaded with one query per table regardless of page size.
+
     Args:
         run_id: Run ID
+        cursor: Answer id to continue after
+        limit: Maximum number of answers to return
+        include_answer_text: Whether to include the raw answer bodies
+        include_mentions: Whether to include brand mentions
         db: Database session
 
     Returns:
-        Detailed run information with all answers and brand mentions
+        Detailed run information with a page of answers and brand mentions
 
     Raises:
         HTTPException: If run not found
@@ -458,48 +609,25 @@ async def get_run_details(
         raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
 
     vertical = db.query(Vertical).filter(Vertical.id == run.vertical_id).first()
-    answers_data = []
-
-    for llm_answer in run.answers:
-        prompt = db.query(Prompt).filter(Prompt.id == llm_answer.prompt_id).first()
-        mentions_data = []
-
-        for mention in llm_answer.mentions:
-            brand = db.query(Brand).filter(Brand.id == mention.brand_id).first()
-            brand_label = (
-                format_entity_label(brand.original_name, brand.translated_name)
-                if brand
-                else "Unknown"
-            )
-            mentions_data.append(
-                BrandMentionResponse(
-                    brand_id=mention.brand_id,
-                    brand_name=brand_label,
-                    mentioned=mention.mentioned,
-                    rank=mention.rank,
-                    sentiment=mention.sentiment.value,
-                    evidence_snippets=mention.evidence_snippets,
-                )
-            )
+    total_answers = (
+        db.query(func.count(LLMAnswer.id)).filter(LLMAnswer.run_id == run_id).scalar() or 0
+    )
+    answers_query = (
+        db.query(LLMAnswer)
+        .filter(LLMAnswer.run_id == run_id)
+        .options(*_answer_load_options(include_answer_text, include_mentions))
+        .order_by(LLMAnswer.id)
+    )
+    if cursor is not None:
+        answers_query = answers_query.filter(LLMAnswer.id > cursor)
+    if limit is not None:
+        answers_query = answers_query.limit(limit + 1)
+    answers = answers_query.all()
 
-        answers_data.append(
-            LLMAnswerResponse(
-                id=llm_answer.id,
-                prompt_text_zh=prompt.text_zh if prompt else None,
-                prompt_text_en=prompt.text_en if prompt else None,
-                provider=llm_answer.provider,
-                model_name=llm_answer.model_name,
-                route=llm_answer.route.value if llm_answer.route else None,
-                raw_answer_zh=llm_answer.raw_answer_zh,
-                raw_answer_en=llm_answer.raw_answer_en,
-                tokens_in=llm_answer.tokens_in,
-                tokens_out=llm_answer.tokens_out,
-                latency=llm_answer.latency,
-                cost_estimate=llm_answer.cost_estimate,
-                mentions=mentions_data,
-                created_at=llm_answer.created_at,
-            )
-        )
+    next_cursor = None
+    if limit is not None and len(answers) > limit:
+        answers = answers[:limit]
+        next_cursor = answers[-1].id
 
     return RunDetailedResponse(
         id=run.id,
@@ -512,14 +640,41 @@ async def get_run_details(
         run_time=run.run_time,
         completed_at=run.completed_at,
         error_message=run.error_message,
-        answers=answers_data,
+        total_answers=total_answers,
+        next_cursor=next_cursor,
+        answers=[
+            _answer_response(answer, include_answer_text, include_mentions)
+            for answer in answers
+        ],
     )
 
 
-@router.get("/runs/{run_id}/inspector-export", response_model=List[RunInspectorPromptExport])
-async def export_run_inspector_data(
+@router.get("/runs/{run_id}/answers/{answer_id}", response_model=LLMAnswerResponse)
+@offload_db
+def get_run_answer(
     run_id: int,
+    answer_id: int,
     db: Session = Depends(get_db),
+) -> LLMAnswerResponse:
+    """Get one answer of a run with its full text and brand mentions."""
+    llm_answer = (
+        db.query(LLMAnswer)
+        .filter(LLMAnswer.run_id == run_id, LLMAnswer.id == answer_id)
+        .options(*_answer_load_options(True, True))
+        .first()
+    )
+    if not llm_answer:
+        raise HTTPException(
+            status_code=404, detail=f"Answer {answer_id} not found in run {run_id}"
+        )
+    return _answer_response(llm_answer, True, True)
+
+
+@router.get("/runs/{run_id}/inspector-export", response_model=List[RunInspectorPromptExport])
+@offload_db
+def export_run_inspector_data(
+    run_id: int,
+    db: Session = Depends(get_read_db),
 ) -> list[dict]:
     """
     Export prompt answers and extracted entities for a run.
@@ -533,7 +688,8 @@ async def export_run_inspector_data(
 
 
 @router.get("/runs/{run_id}/entities", response_model=RunEntitiesResponse)
-async def get_run_entities(
+@offload_db
+def get_run_entities(
     run_id: int,
     db: Session = Depends(get_db),
 ) -> RunEntitiesResponse:
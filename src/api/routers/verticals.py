@@ -5,7 +5,8 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from models import Brand, DailyMetrics, Run, RunMetrics, RunStatus, Vertical, get_db
+from api.db_offload import offload_db
+from models import Brand, DailyMetrics, Run, RunMetrics, RunStatus, Vertical, get_db, get_read_db
 from models.schemas import (
     BrandResponse,
     DeleteVerticalResponse,
@@ -13,6 +14,7 @@ from models.schemas import (
     VerticalCreate,
     VerticalResponse,
 )
+from services.latest_metrics import invalidate_latest_metrics
 from services.run_inspector_export import build_vertical_inspector_export
 
 router = APIRouter()
@@ -52,10 +54,11 @@ async def create_vertical(
 
 
 @router.get("", response_model=List[VerticalResponse])
-async def list_verticals(
+@offload_db
+def list_verticals(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> List[Vertical]:
     """
     List all verticals.
@@ -73,9 +76,10 @@ async def list_verticals(
 
 
 @router.get("/{vertical_id}", response_model=VerticalResponse)
-async def get_vertical(
+@offload_db
+def get_vertical(
     vertical_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> Vertical:
     """
     Get a specific vertical by ID.
@@ -98,9 +102,10 @@ async def get_vertical(
 
 
 @router.get("/{vertical_id}/models", response_model=List[str])
-async def get_vertical_models(
+@offload_db
+def get_vertical_models(
     vertical_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> List[str]:
     vertical = db.query(Vertical).filter(Vertical.id == vertical_id).first()
     if not vertical:
@@ -117,9 +122,10 @@ async def get_vertical_models(
 
 
 @router.get("/{vertical_id}/inspector-export", response_model=List[RunInspectorPromptExport])
-async def export_vertical_inspector_data(
+@offload_db
+def export_vertical_inspector_data(
     vertical_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> list[dict]:
     """
     Export run inspector prompt/answer data for all completed runs in this vertical.
@@ -131,10 +137,11 @@ async def export_vertical_inspector_data(
 
 
 @router.get("/{vertical_id}/brands", response_model=List[BrandResponse])
-async def list_vertical_brands(
+@offload_db
+def list_vertical_brands(
     vertical_id: int,
     user_input_only: bool = False,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> List[Brand]:
     """
     List brands for a specific vertical.
@@ -216,6 +223,7 @@ async def delete_vertical(
     vertical_name = vertical.name
 
     db.query(DailyMetrics).filter(DailyMetrics.vertical_id == vertical_id).delete()
+    invalidate_latest_metrics(db, [vertical_id])
     db.query(RunMetrics).filter(
         RunMetrics.run_id.in_(
             db.query(Run.id).filter(Run.vertical_id == vertical_id)
@@ -93,3 +93,32 @@ def visibility_metrics(
     top_value = top_spot_share(prompt_ids, brand_mentions, brand)
     sentiment_value = sentiment_index(brand_mentions, brand)
     return build_metric_summary(mention_value, sov_value, top_value, sentiment_value)
+
+
+def visibility_metrics_by_brand(
+    prompt_ids: Sequence[int],
+    mentions: Iterable[AnswerMetrics],
+    brands: Sequence[str],
+) -> Dict[str, Dict[str, float]]:
+    """``visibility_metrics`` for every brand, competing against all others, in one pass."""
+    mention_list = list(mentions)
+    pool = set(brands)
+    grouped: Dict[str, List[AnswerMetrics]] = {}
+    for m in mention_list:
+        grouped.setdefault(m.brand, []).append(m)
+    total_weight = sum(dcg_weight(m.rank) for m in mention_list if m.brand in pool)
+    results: Dict[str, Dict[str, float]] = {}
+    for brand in brands:
+        brand_mentions = grouped.get(brand, [])
+        if not brand_mentions:
+            results[brand] = zero_metrics()
+            continue
+        brand_weight = sum(dcg_weight(m.rank) for m in brand_mentions)
+        sov_value = 0.0 if brand_weight == 0.0 or total_weight == 0.0 else brand_weight / total_weight
+        results[brand] = build_metric_summary(
+            mention_rate(prompt_ids, brand_mentions, brand),
+            sov_value,
+            top_spot_share(prompt_ids, brand_mentions, brand),
+            sentiment_index(brand_mentions, brand),
+        )
+    return results
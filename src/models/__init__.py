@@ -1,4 +1,4 @@
-from .database import Base, get_db, init_db
+from .database import Base, get_db, get_read_db, init_db
 from .domain import (
     APIKey,
     Brand,
@@ -18,6 +18,7 @@ from .domain import (
     DailyMetrics,
     EntityType,
     ExtractionDebug,
+    LatestEntityMetrics,
     LLMAnswer,
     LLMProvider,
     LLMRoute,
@@ -30,6 +31,7 @@ from .domain import (
     RejectedEntity,
     Run,
     RunComparisonConfig,
+    RunFinalizeStage,
     RunMetrics,
     RunProductMetrics,
     RunStatus,
@@ -60,7 +62,9 @@ __all__ = [
     "EntityType",
     "ExtractionDebug",
     "get_db",
+    "get_read_db",
     "init_db",
+    "LatestEntityMetrics",
     "LLMAnswer",
     "LLMProvider",
     "LLMRoute",
@@ -73,6 +77,7 @@ __all__ = [
     "RejectedEntity",
     "Run",
     "RunComparisonConfig",
+    "RunFinalizeStage",
     "RunMetrics",
     "RunProductMetrics",
     "RunStatus",
@@ -1,10 +1,12 @@
 from typing import Generator
 
-from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy import inspect, text
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from config import settings
-from models.sqlite_config import apply_sqlite_pragmas, is_sqlite_url, sqlite_connect_args
+from models.engines import create_db_engine, pool_stats
+from models.indexes import ensure_hot_path_indexes
+from models.sqlite_config import is_sqlite_url
 
 PRODUCT_BRAND_MAPPING_TABLE_SQL = """
 CREATE TABLE product_brand_mappings (
@@ -27,21 +29,20 @@ class Base(DeclarativeBase):
     pass
 
 
-engine = create_engine(
+engine = create_db_engine(
     settings.database_url,
-    connect_args=sqlite_connect_args(settings.database_url),
-    echo=settings.debug,
+    statement_timeout_ms=settings.db_statement_timeout_ms,
 )
+read_engine = engine
+if settings.resolved_database_read_url != settings.database_url:
+    read_engine = create_db_engine(
+        settings.resolved_database_read_url,
+        read_only=True,
+        statement_timeout_ms=settings.db_read_statement_timeout_ms,
+    )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
-def _apply_sqlite_pragmas(dbapi_connection, _):
-    apply_sqlite_pragmas(dbapi_connection)
-
-
-if is_sqlite_url(settings.database_url):
-    event.listen(engine, "connect", _apply_sqlite_pragmas)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -52,6 +53,18 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def get_read_db() -> Generator[Session, None, None]:
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def database_pool_stats() -> dict:
+    return {"write": pool_stats(engine), "read": pool_stats(read_engine)}
+
+
 def _migrate_brands_table(connection, inspector):
     if "brands" in inspector.get_table_names():
         brand_columns = {column["name"] for column in inspector.get_columns("brands")}
@@ -84,6 +97,12 @@ def _migrate_runs_table(connection, inspector):
                     "ALTER TABLE runs ADD COLUMN provider VARCHAR(50) NOT NULL DEFAULT 'qwen'"
                 )
             )
+        if "priority" not in run_columns:
+            connection.execute(
+                text(
+                    "ALTER TABLE runs ADD COLUMN priority INTEGER NOT NULL DEFAULT 1"
+                )
+            )
 
 
 def _migrate_llm_answers_table(connection, inspector):
@@ -107,6 +126,18 @@ def _migrate_llm_answers_table(connection, inspector):
                     "ALTER TABLE llm_answers ADD COLUMN latency FLOAT"
                 )
             )
+        if "time_to_first_token" not in answer_columns:
+            connection.execute(
+                text(
+                    "ALTER TABLE llm_answers ADD COLUMN time_to_first_token FLOAT"
+                )
+            )
+        if "tokens_per_second" not in answer_columns:
+            connection.execute(
+                text(
+                    "ALTER TABLE llm_answers ADD COLUMN tokens_per_second FLOAT"
+                )
+            )
 
 
 def _migrate_daily_metrics_table(connection, inspector):
@@ -127,6 +158,30 @@ def _migrate_prompts_table(connection, inspector):
             connection.execute(
                 text("ALTER TABLE prompts ADD COLUMN run_id INTEGER REFERENCES runs(id)")
             )
+        for column in ("text_zh_hash", "text_en_hash"):
+            if column not in prompt_columns:
+                connection.execute(text(f"ALTER TABLE prompts ADD COLUMN {column} VARCHAR(64)"))
+                connection.execute(
+                    text(f"CREATE INDEX IF NOT EXISTS ix_prompts_{column} ON prompts ({column})")
+                )
+        _backfill_prompt_text_hashes(connection)
+
+
+def _backfill_prompt_text_hashes(connection):
+    from models.domain import prompt_text_hash
+
+    rows = connection.execute(
+        text(
+            "SELECT id, text_zh, text_en FROM prompts "
+            "WHERE (text_zh IS NOT NULL AND text_zh_hash IS NULL) "
+            "OR (text_en IS NOT NULL AND text_en_hash IS NULL)"
+        )
+    ).fetchall()
+    for prompt_id, text_zh, text_en in rows:
+        connection.execute(
+            text("UPDATE prompts SET text_zh_hash = :zh, text_en_hash = :en WHERE id = :id"),
+            {"zh": prompt_text_hash(text_zh), "en": prompt_text_hash(text_en), "id": prompt_id},
+        )
 
 
 def _migrate_consolidation_debug_table(connection, inspector):
@@ -196,3 +251,5 @@ def init_db() -> None:
         _migrate_product_brand_mapping_table(connection, inspector)
 
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        ensure_hot_path_indexes(connection)
@@ -41,3 +41,19 @@ def flush_with_retry(session, retries: int = 3, delay: float = 0.1, attempt: int
             raise
         _sleep_for_retry(delay, attempt)
         flush_with_retry(session, retries=retries, delay=delay, attempt=attempt + 1)
+
+
+def execute_with_retry(
+    session, statement, params=None, retries: int = 3, delay: float = 0.1, attempt: int = 0
+):
+    # No rollback here: it would discard the statements already run in this
+    # transaction and the retry would then apply this one on its own.
+    try:
+        return session.execute(statement, params)
+    except OperationalError as exc:
+        if not _should_retry(exc, attempt, retries):
+            raise
+        _sleep_for_retry(delay, attempt)
+        return execute_with_retry(
+            session, statement, params, retries=retries, delay=delay, attempt=attempt + 1
+        )
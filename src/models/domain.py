@@ -1,8 +1,9 @@
 import enum
+import hashlib
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import Boolean, JSON, DateTime, Enum, Float, ForeignKey, Integer, String, Text, func
+from sqlalchemy import Boolean, JSON, DateTime, Enum, Float, ForeignKey, Integer, String, Text, UniqueConstraint, event, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .database import Base
@@ -94,6 +95,8 @@ class Prompt(Base):
     run_id: Mapped[Optional[int]] = mapped_column(ForeignKey("runs.id"), nullable=True)
     text_en: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     text_zh: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    text_en_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)
+    text_zh_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)
     language_original: Mapped[PromptLanguage] = mapped_column(
         Enum(PromptLanguage), nullable=False, default=PromptLanguage.ZH
     )
@@ -125,6 +128,7 @@ class Run(Base):
     status: Mapped[RunStatus] = mapped_column(Enum(RunStatus), nullable=False, default=RunStatus.PENDING)
     reuse_answers: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     web_search_enabled: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    priority: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
     run_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -132,6 +136,9 @@ class Run(Base):
     vertical: Mapped["Vertical"] = relationship(Vertical, back_populates="runs")
     prompts: Mapped[List["Prompt"]] = relationship("Prompt", back_populates="run", foreign_keys="[Prompt.run_id]")
     answers: Mapped[List["LLMAnswer"]] = relationship("LLMAnswer", back_populates="run", cascade="all, delete-orphan")
+    finalize_stages: Mapped[List["RunFinalizeStage"]] = relationship(
+        "RunFinalizeStage", back_populates="run", cascade="all, delete-orphan"
+    )
 
 
 class LLMAnswer(Base):
@@ -149,6 +156,12 @@ class LLMAnswer(Base):
     tokens_in: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     tokens_out: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     latency: Mapped[Optional[float]] = mapped_column(Float, nullable=True, comment="Response latency in seconds")
+    time_to_first_token: Mapped[Optional[float]] = mapped_column(
+        Float, nullable=True, comment="Seconds until the first streamed token"
+    )
+    tokens_per_second: Mapped[Optional[float]] = mapped_column(
+        Float, nullable=True, comment="Output tokens per second after the first token"
+    )
     cost_estimate: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -602,6 +615,27 @@ class ComparisonRunEvent(Base):
     run: Mapped["Run"] = relationship(Run)
 
 
+class RunFinalizeStage(Base):
+    """Completion marker and output of one finalize_run stage."""
+
+    __tablename__ = "run_finalize_stages"
+    __table_args__ = (
+        UniqueConstraint("run_id", "stage", name="uq_run_finalize_stage"),
+        {'extend_existing': True},
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    run_id: Mapped[int] = mapped_column(ForeignKey("runs.id"), nullable=False, index=True)
+    stage: Mapped[str] = mapped_column(String(50), nullable=False)
+    output: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    duration_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    completed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    run: Mapped["Run"] = relationship(Run, back_populates="finalize_stages")
+
+
 class RunProductMetrics(Base):
     __tablename__ = "run_product_metrics"
     __table_args__ = {'extend_existing': True}
@@ -619,3 +653,56 @@ class RunProductMetrics(Base):
     )
 
     product: Mapped["Product"] = relationship(Product)
+
+
+class LatestEntityMetrics(Base):
+    """Materialized ``/metrics/latest`` row for one entity in a (vertical, model) scope.
+
+    ``model_name`` is ``"all"`` for the cross-model aggregate. Rows are
+    rebuilt per scope by ``services.latest_metrics`` and kept in the order
+    the endpoint returns them (``position``).
+    """
+
+    __tablename__ = "latest_entity_metrics"
+    __table_args__ = (
+        UniqueConstraint(
+            "vertical_id", "model_name", "entity_type", "entity_key",
+            name="uq_latest_entity_metrics_scope_key",
+        ),
+        {'extend_existing': True},
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    vertical_id: Mapped[int] = mapped_column(ForeignKey("verticals.id"), nullable=False)
+    model_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    entity_type: Mapped[EntityType] = mapped_column(Enum(EntityType), nullable=False)
+    entity_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    entity_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    brand_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    brand_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    mention_rate: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    share_of_voice: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    top_spot_share: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    sentiment_index: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    dragon_lens_visibility: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    latest_run_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+def prompt_text_hash(text: Optional[str]) -> Optional[str]:
+    """Hash of whitespace-normalized prompt text, used for answer reuse lookups."""
+    normalized = " ".join((text or "").split())
+    if not normalized:
+        return None
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+@event.listens_for(Prompt, "before_insert")
+@event.listens_for(Prompt, "before_update")
+def _prompt_before_save(_, __, target: Prompt) -> None:
+    target.text_zh_hash = prompt_text_hash(target.text_zh)
+    target.text_en_hash = prompt_text_hash(target.text_en)
@@ -0,0 +1,90 @@
+"""Engine construction shared by the main and knowledge databases.
+
+Both databases can have a separate read URL (e.g. a streaming replica or,
+locally, a second SQLite file). Read engines are opened read-only so a
+misrouted write fails loudly instead of landing on a replica.
+"""
+
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from config import settings
+from models.sqlite_config import apply_sqlite_pragmas, is_sqlite_url, sqlite_connect_args
+
+
+def _pool_kwargs(url: str) -> dict:
+    if is_sqlite_url(url):
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_pre_ping": True,
+    }
+
+
+def _postgres_options(statement_timeout_ms: Optional[int], read_only: bool) -> list[str]:
+    options = []
+    if statement_timeout_ms:
+        options.append(f"-c statement_timeout={int(statement_timeout_ms)}")
+    if read_only:
+        options.append("-c default_transaction_read_only=on")
+    return options
+
+
+def _connect_args(url: str, statement_timeout_ms: Optional[int], read_only: bool) -> dict:
+    if is_sqlite_url(url):
+        return sqlite_connect_args(url)
+    if not url.startswith("postgresql"):
+        return {}
+    options = _postgres_options(statement_timeout_ms, read_only)
+    return {"options": " ".join(options)} if options else {}
+
+
+def _listen_sqlite_pragmas(engine: Engine, read_only: bool) -> None:
+    def _apply(dbapi_connection, _):
+        apply_sqlite_pragmas(dbapi_connection)
+        if read_only:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA query_only=ON")
+            cursor.close()
+
+    event.listen(engine, "connect", _apply)
+
+
+def create_db_engine(
+    url: str,
+    *,
+    read_only: bool = False,
+    statement_timeout_ms: Optional[int] = None,
+    **engine_kwargs,
+) -> Engine:
+    """Create an engine with the configured pool and per-statement timeout."""
+    kwargs = {**_pool_kwargs(url), **engine_kwargs}
+    engine = create_engine(
+        url,
+        connect_args=_connect_args(url, statement_timeout_ms, read_only),
+        echo=settings.debug,
+        **kwargs,
+    )
+    if is_sqlite_url(url):
+        _listen_sqlite_pragmas(engine, read_only)
+    return engine
+
+
+def pool_stats(engine: Engine) -> dict:
+    """Return connection pool usage for ``engine`` without opening a connection."""
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__, "url": engine.url.render_as_string(hide_password=True)}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    return stats
@@ -0,0 +1,84 @@
+"""Secondary indexes for the hot query paths.
+
+Kept out of the ORM models because ``alembic/versions/0001`` builds the
+schema with ``create_all`` and later revisions create some of these
+indexes by name. ``init_db`` (SQLite bootstrap) and alembic revision 0012
+both call :func:`ensure_hot_path_indexes`, which skips any index whose
+columns are already the leading columns of an existing index or unique
+constraint.
+"""
+
+from dataclasses import dataclass
+
+from sqlalchemy import inspect, text
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    name: str
+    table: str
+    columns: tuple[str, ...]
+
+
+HOT_PATH_INDEXES: tuple[IndexSpec, ...] = (
+    IndexSpec("ix_llm_answers_run_prompt", "llm_answers", ("run_id", "prompt_id")),
+    IndexSpec("ix_brand_mentions_brand_id", "brand_mentions", ("brand_id",)),
+    IndexSpec("ix_brand_mentions_llm_answer_id", "brand_mentions", ("llm_answer_id",)),
+    IndexSpec("ix_product_mentions_product_id", "product_mentions", ("product_id",)),
+    IndexSpec("ix_product_mentions_llm_answer_id", "product_mentions", ("llm_answer_id",)),
+    IndexSpec(
+        "ix_runs_vertical_status_model_time",
+        "runs",
+        ("vertical_id", "status", "model_name", "run_time"),
+    ),
+    IndexSpec("ix_runs_vertical_model_time", "runs", ("vertical_id", "model_name", "run_time")),
+    IndexSpec("ix_prompts_vertical_id", "prompts", ("vertical_id",)),
+    IndexSpec("ix_prompts_run_id", "prompts", ("run_id",)),
+    IndexSpec("ix_brands_vertical_id", "brands", ("vertical_id",)),
+    IndexSpec("ix_products_vertical_id", "products", ("vertical_id",)),
+    IndexSpec("ix_run_metrics_run_id", "run_metrics", ("run_id",)),
+    IndexSpec("ix_run_product_metrics_run_id", "run_product_metrics", ("run_id",)),
+)
+
+
+def _covered(spec: IndexSpec, inspector) -> bool:
+    existing = list(inspector.get_indexes(spec.table))
+    existing += list(inspector.get_unique_constraints(spec.table))
+    width = len(spec.columns)
+    for index in existing:
+        if index.get("name") == spec.name:
+            return True
+        if tuple(index.get("column_names") or ())[:width] == spec.columns:
+            return True
+    return False
+
+
+def missing_hot_path_indexes(connection) -> list[IndexSpec]:
+    inspector = inspect(connection)
+    tables = set(inspector.get_table_names())
+    return [
+        spec
+        for spec in HOT_PATH_INDEXES
+        if spec.table in tables and not _covered(spec, inspector)
+    ]
+
+
+def ensure_hot_path_indexes(connection) -> list[str]:
+    """Create missing hot-path indexes; return the names that were created."""
+    created = []
+    for spec in missing_hot_path_indexes(connection):
+        columns = ", ".join(spec.columns)
+        connection.execute(text(f"CREATE INDEX {spec.name} ON {spec.table} ({columns})"))
+        created.append(spec.name)
+    return created
+
+
+def drop_hot_path_indexes(connection, names=None) -> None:
+    inspector = inspect(connection)
+    tables = set(inspector.get_table_names())
+    wanted = set(names) if names is not None else {spec.name for spec in HOT_PATH_INDEXES}
+    for spec in HOT_PATH_INDEXES:
+        if spec.name not in wanted or spec.table not in tables:
+            continue
+        if any(index["name"] == spec.name for index in inspector.get_indexes(spec.table)):
+            connection.execute(text(f"DROP INDEX {spec.name}"))
@@ -1,48 +1,49 @@
 from typing import Generator
 
-from sqlalchemy import create_engine, event
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from config import settings
-from models.sqlite_config import apply_sqlite_pragmas, is_sqlite_url, sqlite_connect_args
+from models.engines import create_db_engine, pool_stats
 
 
 class KnowledgeBase(DeclarativeBase):
     pass
 
 
+def _memory_pool_kwargs(url: str) -> dict:
+    return {"poolclass": StaticPool} if url == "sqlite:///:memory:" else {}
+
+
 _knowledge_url = settings.resolved_knowledge_database_url
-_knowledge_pool_kwargs: dict = {}
-if not is_sqlite_url(_knowledge_url):
-    _knowledge_pool_kwargs = {"pool_size": 5, "max_overflow": 10, "pool_pre_ping": True}
-elif _knowledge_url == "sqlite:///:memory:":
-    _knowledge_pool_kwargs = {"poolclass": StaticPool}
+_knowledge_read_url = settings.resolved_knowledge_database_read_url
 
-knowledge_engine = create_engine(
+knowledge_engine = create_db_engine(
     _knowledge_url,
-    connect_args=sqlite_connect_args(_knowledge_url),
-    echo=settings.debug,
-    **_knowledge_pool_kwargs,
+    statement_timeout_ms=settings.db_statement_timeout_ms,
+    **_memory_pool_kwargs(_knowledge_url),
 )
-knowledge_read_engine = knowledge_engine
 knowledge_write_engine = knowledge_engine
+knowledge_read_engine = knowledge_engine
+if _knowledge_read_url != _knowledge_url:
+    knowledge_read_engine = create_db_engine(
+        _knowledge_read_url,
+        read_only=True,
+        statement_timeout_ms=settings.db_read_statement_timeout_ms,
+        **_memory_pool_kwargs(_knowledge_read_url),
+    )
 
 KnowledgeSessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=knowledge_engine,
 )
-KnowledgeReadSessionLocal = KnowledgeSessionLocal
 KnowledgeWriteSessionLocal = KnowledgeSessionLocal
-
-
-def _apply_knowledge_sqlite_pragmas(dbapi_connection, _) -> None:
-    apply_sqlite_pragmas(dbapi_connection)
-
-
-if is_sqlite_url(settings.resolved_knowledge_database_url):
-    event.listen(knowledge_engine, "connect", _apply_knowledge_sqlite_pragmas)
+KnowledgeReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=knowledge_read_engine,
+)
 
 
 def get_knowledge_db() -> Generator[Session, None, None]:
@@ -61,5 +62,9 @@ def get_knowledge_db_write() -> Generator[Session, None, None]:
         db.close()
 
 
+def knowledge_pool_stats() -> dict:
+    return {"write": pool_stats(knowledge_write_engine), "read": pool_stats(knowledge_read_engine)}
+
+
 def init_knowledge_db() -> None:
     KnowledgeBase.metadata.create_all(bind=knowledge_engine)
@@ -3,7 +3,7 @@ import re
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, JSON, String, Text, event, func
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, JSON, String, Text, UniqueConstraint, event, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from models.domain import EntityType
@@ -191,6 +191,31 @@ class KnowledgeTranslationOverride(KnowledgeBase):
     vertical: Mapped["KnowledgeVertical"] = relationship(KnowledgeVertical)
 
 
+class KnowledgeTranslationMemory(KnowledgeBase):
+    __tablename__ = "knowledge_translation_memory"
+    __table_args__ = (
+        UniqueConstraint(
+            "source_hash", "source_lang", "target_lang", "model",
+            name="uq_knowledge_translation_memory_key",
+        ),
+        {"extend_existing": True},
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    source_hash: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    source_lang: Mapped[str] = mapped_column(String(20), nullable=False)
+    target_lang: Mapped[str] = mapped_column(String(20), nullable=False)
+    model: Mapped[str] = mapped_column(String(255), nullable=False)
+    kind: Mapped[str] = mapped_column(String(50), nullable=False, default="text")
+    source_text: Mapped[str] = mapped_column(Text, nullable=False)
+    translated_text: Mapped[str] = mapped_column(Text, nullable=False)
+    hit_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    last_used_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
 class FeedbackStatus(str, enum.Enum):
     RECEIVED = "received"
 
@@ -85,6 +85,12 @@ class TrackingJobCreate(BaseModel):
     web_search_enabled: bool = Field(
         default=False, description="Whether web search is enabled for this run"
     )
+    priority: int = Field(
+        default=1,
+        ge=1,
+        le=10,
+        description="Relative share of worker capacity while other runs are active (higher gets more)",
+    )
     comparison_enabled: bool = Field(
         default=True, description="Deprecated: comparison prompts run automatically after the main run completes"
     )
@@ -166,6 +172,7 @@ class RunResponse(BaseModel):
     model_name: str
     route: Optional[str] = None
     status: str
+    priority: int = 1
     run_time: datetime
     completed_at: Optional[datetime]
     error_message: Optional[str]
@@ -173,6 +180,23 @@ class RunResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class RunProgressResponse(BaseModel):
+    run_id: int
+    total: int
+    answered: int
+    extracted: int
+    failed: int
+    batches_completed: int
+    started_at: Optional[float] = None
+    updated_at: Optional[float] = None
+
+
+class RunStageResponse(BaseModel):
+    stage: str
+    duration_seconds: float
+    completed_at: datetime
+
+
 class BrandMentionResponse(BaseModel):
     brand_id: int
     brand_name: str
@@ -191,13 +215,13 @@ class LLMAnswerResponse(BaseModel):
     provider: str
     model_name: str
     route: Optional[str] = None
-    raw_answer_zh: str
-    raw_answer_en: Optional[str]
+    raw_answer_zh: Optional[str] = None
+    raw_answer_en: Optional[str] = None
     tokens_in: Optional[int]
     tokens_out: Optional[int]
     latency: Optional[float]
     cost_estimate: Optional[float]
-    mentions: List[BrandMentionResponse]
+    mentions: List[BrandMentionResponse] = Field(default_factory=list)
     created_at: datetime
 
     model_config = {"from_attributes": True}
@@ -214,6 +238,8 @@ class RunDetailedResponse(BaseModel):
     run_time: datetime
     completed_at: Optional[datetime]
     error_message: Optional[str]
+    total_answers: int = 0
+    next_cursor: Optional[int] = None
     answers: List[LLMAnswerResponse]
 
     model_config = {"from_attributes": True}
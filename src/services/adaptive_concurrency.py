@@ -0,0 +1,284 @@
+"""Adaptive (AIMD) concurrency limits for LLM fan-out.
+
+Each (provider, model) pair gets its own limiter. The limit grows by one
+slot after a full window of healthy calls and is cut multiplicatively when
+the provider signals overload (429/503/timeouts).
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+OVERLOAD_STATUS_CODES = {429, 503}
+_LATENCY_WINDOW = 50
+_EWMA_ALPHA = 0.2
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    """Return True for errors that mean "slow down" rather than "broken request"."""
+    from openai import APIStatusError, APITimeoutError, RateLimitError
+
+    if isinstance(exc, (RateLimitError, APITimeoutError, httpx.TimeoutException, asyncio.TimeoutError)):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in OVERLOAD_STATUS_CODES
+    if isinstance(exc, APIStatusError):
+        return exc.status_code in OVERLOAD_STATUS_CODES
+    return False
+
+
+@dataclass(frozen=True)
+class LimiterSnapshot:
+    name: str
+    limit: int
+    min_limit: int
+    max_limit: int
+    in_flight: int
+    waiting: int
+    successes: int
+    overloads: int
+    errors: int
+    ewma_latency: Optional[float]
+    p50_latency: Optional[float]
+    p95_latency: Optional[float]
+
+    def as_dict(self) -> dict:
+        return dict(self.__dict__)
+
+
+def _percentile(values: list[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class AdaptiveLimiter:
+    """Concurrency gate whose limit follows additive-increase/multiplicative-decrease."""
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        backoff_factor: float = 0.5,
+        latency_target: Optional[float] = None,
+        error_rate_threshold: float = 0.1,
+    ) -> None:
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit if max_limit is not None else initial_limit)
+        self.limit = min(self.max_limit, max(self.min_limit, initial_limit))
+        self.backoff_factor = backoff_factor
+        self.latency_target = latency_target
+        self.error_rate_threshold = error_rate_threshold
+        self.in_flight = 0
+        self.successes = 0
+        self.overloads = 0
+        self.errors = 0
+        self.ewma_latency: Optional[float] = None
+        self._latencies: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._outcomes: deque[bool] = deque(maxlen=_LATENCY_WINDOW)
+        self._healthy_streak = 0
+        self._last_backoff = 0.0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @classmethod
+    def fixed(cls, name: str, limit: int) -> "AdaptiveLimiter":
+        limit = max(1, limit)
+        return cls(name, limit, min_limit=limit, max_limit=limit)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        await self._wait_for_slot()
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException as exc:
+            self._release()
+            self.record_failure(exc)
+            raise
+        self._release()
+        self.record_success(time.monotonic() - start)
+
+    async def _wait_for_slot(self) -> None:
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._wake_waiters()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            else:
+                self._discard_waiter(waiter)
+            raise
+
+    def _discard_waiter(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _release(self) -> None:
+        self.in_flight = max(0, self.in_flight - 1)
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    def record_success(self, latency: float) -> None:
+        self.successes += 1
+        self._outcomes.append(True)
+        self._latencies.append(latency)
+        self.ewma_latency = latency if self.ewma_latency is None else (
+            _EWMA_ALPHA * latency + (1 - _EWMA_ALPHA) * self.ewma_latency
+        )
+        if not self._is_healthy():
+            self._healthy_streak = 0
+            return
+        self._healthy_streak += 1
+        if self._healthy_streak >= self.limit and self.limit < self.max_limit:
+            self._healthy_streak = 0
+            self.limit += 1
+            logger.debug("[%s] concurrency increased to %d", self.name, self.limit)
+            self._wake_waiters()
+
+    def record_failure(self, exc: BaseException) -> None:
+        self._outcomes.append(False)
+        self._healthy_streak = 0
+        if isinstance(exc, asyncio.CancelledError):
+            return
+        if not is_overload_error(exc):
+            self.errors += 1
+            return
+        self.overloads += 1
+        self._back_off(type(exc).__name__)
+
+    def _back_off(self, reason: str) -> None:
+        now = time.monotonic()
+        cooldown = self.ewma_latency or 0.0
+        if now - self._last_backoff < cooldown:
+            return
+        self._last_backoff = now
+        new_limit = max(self.min_limit, int(self.limit * self.backoff_factor))
+        if new_limit < self.limit:
+            logger.warning(
+                "[%s] %s: concurrency reduced %d -> %d", self.name, reason, self.limit, new_limit
+            )
+        self.limit = new_limit
+
+    def _is_healthy(self) -> bool:
+        if self.latency_target and self.ewma_latency and self.ewma_latency > self.latency_target:
+            return False
+        if not self._outcomes:
+            return True
+        failures = sum(1 for ok in self._outcomes if not ok)
+        return failures / len(self._outcomes) <= self.error_rate_threshold
+
+    def snapshot(self) -> LimiterSnapshot:
+        latencies = list(self._latencies)
+        return LimiterSnapshot(
+            name=self.name,
+            limit=self.limit,
+            min_limit=self.min_limit,
+            max_limit=self.max_limit,
+            in_flight=self.in_flight,
+            waiting=sum(1 for w in self._waiters if not w.done()),
+            successes=self.successes,
+            overloads=self.overloads,
+            errors=self.errors,
+            ewma_latency=self.ewma_latency,
+            p50_latency=_percentile(latencies, 0.5),
+            p95_latency=_percentile(latencies, 0.95),
+        )
+
+
+_limiters: dict[tuple[str, str], AdaptiveLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _build_limiter(name: str, initial: int, maximum: int) -> AdaptiveLimiter:
+    if not settings.adaptive_concurrency_enabled:
+        return AdaptiveLimiter.fixed(name, initial)
+    return AdaptiveLimiter(
+        name,
+        initial,
+        min_limit=settings.adaptive_concurrency_min,
+        max_limit=max(initial, maximum),
+        backoff_factor=settings.adaptive_concurrency_backoff_factor,
+        latency_target=settings.adaptive_concurrency_latency_target_seconds,
+        error_rate_threshold=settings.adaptive_concurrency_error_rate_threshold,
+    )
+
+
+def get_limiter(provider: str, model_name: str, local: bool = False) -> AdaptiveLimiter:
+    """Return the shared limiter for a (provider, model) pair."""
+    key = (str(provider).lower(), model_name or "")
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            if local:
+                initial, maximum = settings.local_llm_concurrency, settings.local_llm_max_concurrency
+            else:
+                initial, maximum = settings.remote_llm_concurrency, settings.remote_llm_max_concurrency
+            limiter = _build_limiter(f"{key[0]}/{key[1]}", initial, maximum)
+            _limiters[key] = limiter
+        return limiter
+
+
+def get_ollama_limiter() -> AdaptiveLimiter:
+    """Limiter for local Ollama extraction, sentiment and translation calls."""
+    key = ("ollama", "*")
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _build_limiter("ollama/*", settings.ollama_concurrency, settings.ollama_max_concurrency)
+            _limiters[key] = limiter
+        return limiter
+
+
+def limiter_snapshots() -> list[dict]:
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return [limiter.snapshot().as_dict() for limiter in limiters]
+
+
+def log_limiter_snapshots() -> None:
+    for snap in limiter_snapshots():
+        logger.info(
+            "[concurrency] %s limit=%d in_flight=%d ok=%d overloads=%d errors=%d ewma=%s p95=%s",
+            snap["name"], snap["limit"], snap["in_flight"], snap["successes"],
+            snap["overloads"], snap["errors"],
+            _fmt_seconds(snap["ewma_latency"]), _fmt_seconds(snap["p95_latency"]),
+        )
+
+
+def _fmt_seconds(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.2f}s"
+
+
+def reset_limiters() -> None:
+    with _limiters_lock:
+        _limiters.clear()
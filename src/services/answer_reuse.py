@@ -1,12 +1,17 @@
 """Service for finding and reusing LLM answers from previous runs."""
 
-from typing import Optional
+from datetime import datetime
+from typing import Optional, Sequence
 
-from sqlalchemy import or_
+from sqlalchemy import func, literal, select, union_all
 from sqlalchemy.orm import Session
 
 from models import LLMAnswer, Prompt, Run
-from models.domain import RunStatus
+from models.domain import RunStatus, prompt_text_hash
+
+_HASH_CHUNK_SIZE = 500
+
+PromptTexts = tuple[Optional[str], Optional[str]]
 
 
 def find_reusable_answer(
@@ -15,55 +20,89 @@ def find_reusable_answer(
     prompt_text_zh: Optional[str] = None,
     prompt_text_en: Optional[str] = None,
 ) -> Optional[LLMAnswer]:
-    if not run.reuse_answers:
-        return None
+    return find_reusable_answers(db, run, [(prompt_text_zh, prompt_text_en)])[0]
 
-    if not prompt_text_zh and not prompt_text_en:
-        return None
 
-    completed_runs = (
-        db.query(Run)
-        .filter(
-            Run.vertical_id == run.vertical_id,
-            Run.id != run.id,
-            Run.status == RunStatus.COMPLETED,
-            Run.provider == run.provider,
-            Run.model_name == run.model_name,
-            Run.web_search_enabled == run.web_search_enabled,
-        )
-        .all()
-    )
+def find_reusable_answers(
+    db: Session, run: Run, prompt_texts: Sequence[PromptTexts]
+) -> list[Optional[LLMAnswer]]:
+    """Resolve reusable answers for many ``(text_zh, text_en)`` pairs at once.
 
-    if not completed_runs:
-        return None
+    Matches on the indexed prompt text hashes against completed runs of the
+    same vertical, provider, model and web-search setting, preferring the
+    most recently completed run. Results are aligned with ``prompt_texts``.
+    """
+    hashes = [(prompt_text_hash(zh), prompt_text_hash(en)) for zh, en in prompt_texts]
+    if not run.reuse_answers:
+        return [None] * len(hashes)
+    resolved: list[Optional[LLMAnswer]] = []
+    for start in range(0, len(hashes), _HASH_CHUNK_SIZE):
+        resolved.extend(_resolve_chunk(db, run, hashes[start:start + _HASH_CHUNK_SIZE]))
+    return resolved
 
-    completed_run_ids = [r.id for r in completed_runs]
 
-    match_conditions = []
-    if prompt_text_zh:
-        match_conditions.append(Prompt.text_zh == prompt_text_zh)
-    if prompt_text_en:
-        match_conditions.append(Prompt.text_en == prompt_text_en)
+def _resolve_chunk(
+    db: Session, run: Run, hashes: list[tuple[Optional[str], Optional[str]]]
+) -> list[Optional[LLMAnswer]]:
+    zh_hashes = {zh for zh, _ in hashes if zh}
+    en_hashes = {en for _, en in hashes if en}
+    ranked = []
+    if zh_hashes:
+        ranked.append(_ranked_answers(run, "zh", Prompt.text_zh_hash, zh_hashes))
+    if en_hashes:
+        ranked.append(_ranked_answers(run, "en", Prompt.text_en_hash, en_hashes))
+    if not ranked:
+        return [None] * len(hashes)
 
-    matching_prompt = (
-        db.query(Prompt)
-        .filter(
-            Prompt.run_id.in_(completed_run_ids),
-            or_(*match_conditions),
-        )
-        .first()
+    newest = union_all(*ranked).subquery()
+    rows = (
+        db.query(LLMAnswer, newest.c.kind, newest.c.hash, newest.c.completed_at, newest.c.run_id)
+        .join(newest, newest.c.answer_id == LLMAnswer.id)
+        .filter(newest.c.position == 1)
+        .all()
     )
+    best: dict[tuple[str, str], tuple[tuple, LLMAnswer]] = {}
+    for answer, kind, text_hash, completed_at, run_id in rows:
+        recency = (completed_at is not None, completed_at or datetime.min, run_id, answer.id)
+        best[(kind, text_hash)] = (recency, answer)
+
+    resolved: list[Optional[LLMAnswer]] = []
+    for zh, en in hashes:
+        matches = [m for m in (best.get(("zh", zh)), best.get(("en", en))) if m]
+        resolved.append(max(matches, key=lambda m: m[0])[1] if matches else None)
+    return resolved
 
-    if not matching_prompt:
-        return None
 
-    answer = (
-        db.query(LLMAnswer)
-        .filter(
-            LLMAnswer.prompt_id == matching_prompt.id,
-            LLMAnswer.run_id.in_(completed_run_ids),
+def _ranked_answers(run: Run, kind: str, hash_column, hashes: set[str]):
+    """Number the matching answers per prompt hash, newest completed run first."""
+    position = func.row_number().over(
+        partition_by=hash_column,
+        order_by=(
+            Run.completed_at.is_(None),
+            Run.completed_at.desc(),
+            Run.id.desc(),
+            LLMAnswer.id.desc(),
+        ),
+    )
+    return (
+        select(
+            literal(kind).label("kind"),
+            hash_column.label("hash"),
+            LLMAnswer.id.label("answer_id"),
+            Run.completed_at.label("completed_at"),
+            Run.id.label("run_id"),
+            position.label("position"),
+        )
+        .select_from(LLMAnswer)
+        .join(Prompt, Prompt.id == LLMAnswer.prompt_id)
+        .join(Run, Run.id == LLMAnswer.run_id)
+        .where(
+            Run.vertical_id == run.vertical_id,
+            Run.id != run.id,
+            Run.status == RunStatus.COMPLETED,
+            Run.provider == run.provider,
+            Run.model_name == run.model_name,
+            Run.web_search_enabled == run.web_search_enabled,
+            hash_column.in_(hashes),
         )
-        .first()
     )
-
-    return answer
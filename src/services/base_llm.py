@@ -11,6 +11,8 @@ from config import settings
 from models import APIKey
 from models.domain import LLMProvider
 from services.encryption import EncryptionService
+from services.llm_client_pool import LLMClientPool
+from services.llm_streaming import StreamCollector, chunk_usage, usage_value
 
 logger = logging.getLogger(__name__)
 
@@ -80,6 +82,9 @@ class BaseLLMService(ABC):
     def _build_messages(self, prompt_zh: str) -> list[dict]:
         return [{"role": "user", "content": prompt_zh}]
 
+    def _get_http_client(self, api_key: str) -> httpx.AsyncClient:
+        return LLMClientPool.get_http_client(self.provider.value, self.api_base, api_key)
+
     def validate_model(self, model: str) -> None:
         return None
 
@@ -102,17 +107,17 @@ class BaseLLMService(ABC):
         payload = self._build_payload(messages, model)
         headers = self._build_headers(api_key)
 
+        client = self._get_http_client(api_key)
         start_time = time.time()
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            try:
-                response = await client.post(url, json=payload, headers=headers)
-                response.raise_for_status()
-                result = response.json()
-                latency = time.time() - start_time
-                return self._parse_response(result, latency)
-            except httpx.HTTPError as e:
-                logger.error(f"{self.provider.value} API error: {e}")
-                raise
+        try:
+            response = await client.post(url, json=payload, headers=headers)
+            response.raise_for_status()
+            result = response.json()
+            latency = time.time() - start_time
+            return self._parse_response(result, latency)
+        except httpx.HTTPError as e:
+            logger.error(f"{self.provider.value} API error: {e}")
+            raise
 
     def _parse_response(self, result: dict, latency: float) -> tuple[str, int, int, float]:
         answer = result["choices"][0]["message"]["content"]
@@ -140,22 +145,29 @@ class OpenAICompatibleService(BaseLLMService):
         messages.append({"role": "user", "content": prompt_zh})
         return messages
 
+    def _get_openai_client(self, api_key: str) -> AsyncOpenAI:
+        return LLMClientPool.get_sdk_client(
+            self.provider.value,
+            self.api_base,
+            api_key,
+            lambda http_client: AsyncOpenAI(
+                api_key=api_key,
+                base_url=self.api_base,
+                http_client=http_client,
+            ),
+        )
+
     async def query(
         self,
         prompt_zh: str,
         model_name: Optional[str] = None,
+        stream: Optional[StreamCollector] = None,
         **kwargs,
     ) -> tuple[str, int, int, float]:
         api_key = self._get_api_key()
         model = model_name or self.default_model
         self.validate_model(model)
-
-        http_client = httpx.AsyncClient(timeout=httpx.Timeout(120.0, connect=30.0))
-        client = AsyncOpenAI(
-            api_key=api_key,
-            base_url=self.api_base,
-            http_client=http_client,
-        )
+        client = self._get_openai_client(api_key)
 
         messages = self._build_messages(prompt_zh)
         request_kwargs = {"model": model, "messages": messages}
@@ -165,6 +177,13 @@ class OpenAICompatibleService(BaseLLMService):
         if self.max_tokens is not None:
             request_kwargs["max_tokens"] = self.max_tokens
 
+        if stream is not None:
+            try:
+                return await self._query_streaming(client, request_kwargs, stream)
+            except Exception as e:
+                logger.error(f"{self.provider.value} API error: {e}")
+                raise
+
         start_time = time.time()
         try:
             logger.info(f"[BASE_LLM] About to call client.chat.completions.create()")
@@ -178,13 +197,48 @@ class OpenAICompatibleService(BaseLLMService):
         except Exception as e:
             logger.error(f"{self.provider.value} API error: {e}")
             raise
-        finally:
-            logger.info(f"[BASE_LLM] In finally block, about to close http_client")
-            await http_client.aclose()
-            logger.info(f"[BASE_LLM] http_client closed")
 
     def _parse_openai_response(self, response, latency: float) -> tuple[str, int, int, float]:
         answer = response.choices[0].message.content
         tokens_in = response.usage.prompt_tokens if response.usage else 0
         tokens_out = response.usage.completion_tokens if response.usage else 0
         return answer, tokens_in, tokens_out, latency
+
+    def _stream_request_kwargs(self, request_kwargs: dict) -> dict:
+        return {**request_kwargs, "stream": True, "stream_options": {"include_usage": True}}
+
+    async def _query_streaming(
+        self,
+        client: AsyncOpenAI,
+        request_kwargs: dict,
+        stream: StreamCollector,
+    ) -> tuple[str, int, int, float]:
+        stream.start()
+        usage = None
+        response = await client.chat.completions.create(**self._stream_request_kwargs(request_kwargs))
+        async for chunk in response:
+            usage = chunk_usage(chunk) or usage
+            for choice in chunk.choices or []:
+                delta = choice.delta
+                if delta is None:
+                    continue
+                stream.feed(getattr(delta, "reasoning_content", None), reasoning=True)
+                stream.feed(delta.content)
+        answer = stream.text
+        tokens_in = usage_value(usage, "prompt_tokens") or 0
+        tokens_out = usage_value(usage, "completion_tokens")
+        if tokens_out is None:
+            tokens_out = len(answer) // 2
+        stream.finish(tokens_out)
+        logger.info(
+            "%s stream finished: ttft=%s tokens/s=%s latency=%.2fs",
+            self.provider.value,
+            _fmt_metric(stream.time_to_first_token),
+            _fmt_metric(stream.tokens_per_second),
+            stream.latency,
+        )
+        return answer, tokens_in, tokens_out, stream.latency
+
+
+def _fmt_metric(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.2f}"
@@ -1,30 +1,13 @@
 """
 Async utilities for brand recognition.
 
-This module contains async helper functions and event loop management
-for running async code from synchronous contexts.
+Sync entry points run their coroutines on the worker-wide event loop
+bridge so that loop-bound clients are shared with the rest of the worker.
 """
 
-import asyncio
-
-
-_persistent_event_loop = None
-
-
-def _get_or_create_event_loop():
-    """Get or create a persistent event loop."""
-    global _persistent_event_loop
-    if _persistent_event_loop is None or _persistent_event_loop.is_closed():
-        _persistent_event_loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(_persistent_event_loop)
-    return _persistent_event_loop
+from services.event_loop_bridge import run_sync
 
 
 def _run_async(coro):
     """Run an async coroutine from a synchronous context."""
-    try:
-        asyncio.get_running_loop()
-        raise RuntimeError("Cannot run async code from within async context. Use await instead.")
-    except RuntimeError:
-        loop = _get_or_create_event_loop()
-        return loop.run_until_complete(coro)
+    return run_sync(coro)
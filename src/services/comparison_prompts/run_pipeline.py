@@ -17,6 +17,7 @@ from models import (
     ComparisonRunStatus,
     ComparisonSentimentObservation,
     EntityType,
+    LLMRoute,
     Product,
     PromptLanguage,
     Run,
@@ -25,6 +26,7 @@ from models import (
     RunProductMetrics,
     Sentiment,
 )
+from services.adaptive_concurrency import AdaptiveLimiter, get_limiter
 from services.comparison_prompts.generation import build_product_comparison_prompt_generation_prompt
 from services.comparison_prompts.pair_planner import build_competitor_brand_schedule
 from services.comparison_prompts.text_parser import parse_text_zh_list_from_text
@@ -244,25 +246,25 @@ def _prompt_row(run: Run, item: dict, pair: dict, text_zh: str) -> ComparisonPro
 
 async def _ensure_answers(db: Session, run: Run) -> list[ComparisonAnswer]:
     prompts = db.query(ComparisonPrompt).filter(ComparisonPrompt.run_id == run.id).all()
-    llm_router = LLMRouter(db)
+    llm_router = LLMRouter(db, run_id=run.id)
     resolution = llm_router.resolve(run.provider, run.model_name)
     return await _fetch_answers(db, run, prompts, llm_router, resolution)
 
 
 async def _fetch_answers(db: Session, run: Run, prompts: list[ComparisonPrompt], llm_router, resolution) -> list[ComparisonAnswer]:
-    sem = asyncio.Semaphore(3)
-    tasks = [_fetch_one(db, run, p, llm_router, resolution, sem) for p in prompts]
+    limiter = get_limiter(run.provider, run.model_name, local=resolution.route == LLMRoute.LOCAL)
+    tasks = [_fetch_one(db, run, p, llm_router, resolution, limiter) for p in prompts]
     results = await asyncio.gather(*tasks)
     return [r for r in results if r]
 
 
-async def _fetch_one(db: Session, run: Run, prompt: ComparisonPrompt, llm_router, resolution, sem: asyncio.Semaphore) -> ComparisonAnswer | None:
+async def _fetch_one(db: Session, run: Run, prompt: ComparisonPrompt, llm_router, resolution, limiter: AdaptiveLimiter) -> ComparisonAnswer | None:
     existing = db.query(ComparisonAnswer).filter(ComparisonAnswer.run_id == run.id, ComparisonAnswer.comparison_prompt_id == prompt.id).first()
     if existing:
         return existing
     if not prompt.text_zh:
         return None
-    async with sem:
+    async with limiter.acquire():
         answer_zh, tokens_in, tokens_out, latency = await llm_router.query_with_resolution(resolution, prompt.text_zh)
     ans = ComparisonAnswer(
         run_id=run.id,
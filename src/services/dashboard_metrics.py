@@ -1,11 +1,14 @@
+from dataclasses import dataclass
 from datetime import datetime
 
 from sqlalchemy.orm import Session
 
-from metrics.metrics import AnswerMetrics, visibility_metrics
+from metrics.metrics import AnswerMetrics, visibility_metrics_by_brand
 from models import (
     Brand,
     BrandMention,
+    EntityType,
+    LatestEntityMetrics,
     LLMAnswer,
     Product,
     ProductMention,
@@ -13,6 +16,7 @@ from models import (
     Run,
     RunMetrics,
     RunProductMetrics,
+    Sentiment,
     Vertical,
 )
 from models.schemas import (
@@ -38,71 +42,179 @@ from services.canonicalization_metrics import (
 from services.translater import format_entity_label
 
 
+@dataclass
+class LatestEntityEntries:
+    """Latest metrics for one scope, keyed by the canonical entity key in response order."""
+
+    vertical: Vertical
+    model_name: str
+    date: datetime
+    entries: list[tuple[str, BrandMetrics | ProductMetrics]]
+
+
 def get_latest_brand_metrics(
     db: Session,
     vertical_id: int,
     model_name: str,
 ) -> MetricsResponse:
     vertical = _vertical_or_raise(db, vertical_id)
-    brand_id_to_key, brand_groups = _brand_groups(db, vertical_id)
+    rows = load_latest_entity_rows(db, vertical_id, model_name, EntityType.BRAND)
+    if not rows:
+        return compute_latest_brand_metrics(db, vertical_id, model_name)
+    return MetricsResponse(
+        vertical_id=vertical_id,
+        vertical_name=vertical.name,
+        model_name=_display_model(model_name),
+        date=rows[0].latest_run_time,
+        brands=[brand_metric_from_row(row) for row in rows],
+    )
+
+
+def get_latest_product_metrics(
+    db: Session,
+    vertical_id: int,
+    model_name: str,
+) -> ProductMetricsResponse:
+    vertical = _vertical_or_raise(db, vertical_id)
+    rows = load_latest_entity_rows(db, vertical_id, model_name, EntityType.PRODUCT)
+    if not rows:
+        return compute_latest_product_metrics(db, vertical_id, model_name)
+    return ProductMetricsResponse(
+        vertical_id=vertical_id,
+        vertical_name=vertical.name,
+        model_name=_display_model(model_name),
+        date=rows[0].latest_run_time,
+        products=[product_metric_from_row(row) for row in rows],
+    )
+
+
+def compute_latest_brand_metrics(
+    db: Session,
+    vertical_id: int,
+    model_name: str,
+) -> MetricsResponse:
+    latest = compute_latest_brand_entries(db, vertical_id, model_name)
+    return MetricsResponse(
+        vertical_id=vertical_id,
+        vertical_name=latest.vertical.name,
+        model_name=latest.model_name,
+        date=latest.date,
+        brands=[metric for _, metric in latest.entries],
+    )
+
+
+def compute_latest_product_metrics(
+    db: Session,
+    vertical_id: int,
+    model_name: str,
+) -> ProductMetricsResponse:
+    latest = compute_latest_product_entries(db, vertical_id, model_name)
+    return ProductMetricsResponse(
+        vertical_id=vertical_id,
+        vertical_name=latest.vertical.name,
+        model_name=latest.model_name,
+        date=latest.date,
+        products=[metric for _, metric in latest.entries],
+    )
+
+
+def compute_latest_brand_entries(
+    db: Session,
+    vertical_id: int,
+    model_name: str,
+    groups: tuple[dict[int, str], dict[str, list[Brand]]] | None = None,
+) -> LatestEntityEntries:
+    """Recompute brand metrics for a scope from mentions; ``groups`` reuses canonical maps."""
+    vertical = _vertical_or_raise(db, vertical_id)
+    brand_id_to_key, brand_groups = groups or build_brand_groups(db, vertical_id)
     runs, display_model = _runs_for_model(db, vertical_id, model_name)
-    run_ids = [run.id for run in runs]
-    latest_run_time = max(run.run_time for run in runs)
     prompt_ids = _prompt_ids(db, vertical_id)
     mentions = (
-        db.query(BrandMention)
+        db.query(BrandMention.brand_id, LLMAnswer.prompt_id, BrandMention.rank, BrandMention.sentiment)
         .join(LLMAnswer, LLMAnswer.id == BrandMention.llm_answer_id)
-        .filter(LLMAnswer.run_id.in_(run_ids))
+        .filter(LLMAnswer.run_id.in_([run.id for run in runs]), BrandMention.mentioned)
         .all()
     )
-    answer_metrics = _collapse_answer_metrics(
-        _brand_answer_metrics(mentions, brand_id_to_key)
-    )
+    answer_metrics = _collapse_answer_metrics(_answer_metrics(mentions, brand_id_to_key))
     keys = _brand_keys(answer_metrics, brand_groups)
-    brand_metrics = [
-        _brand_metric(prompt_ids, answer_metrics, key, keys, brand_groups)
-        for key in keys
-    ]
-    return MetricsResponse(
-        vertical_id=vertical_id,
-        vertical_name=vertical.name,
+    by_key = visibility_metrics_by_brand(prompt_ids, answer_metrics, keys)
+    return LatestEntityEntries(
+        vertical=vertical,
         model_name=display_model,
-        date=latest_run_time,
-        brands=brand_metrics,
+        date=max(run.run_time for run in runs),
+        entries=[(key, _brand_metric(by_key[key], brand_groups[key])) for key in keys],
     )
 
 
-def get_latest_product_metrics(
+def compute_latest_product_entries(
     db: Session,
     vertical_id: int,
     model_name: str,
-) -> ProductMetricsResponse:
+    groups: tuple[dict[int, str], dict[str, list[Product]]] | None = None,
+) -> LatestEntityEntries:
+    """Recompute product metrics for a scope from mentions; ``groups`` reuses canonical maps."""
     vertical = _vertical_or_raise(db, vertical_id)
-    product_id_to_key, product_groups = _product_groups(db, vertical_id)
+    product_id_to_key, product_groups = groups or build_product_groups(db, vertical_id)
     runs, display_model = _runs_for_model(db, vertical_id, model_name)
-    run_ids = [run.id for run in runs]
-    latest_run_time = max(run.run_time for run in runs)
     prompt_ids = _prompt_ids(db, vertical_id)
     mentions = (
-        db.query(ProductMention)
+        db.query(ProductMention.product_id, LLMAnswer.prompt_id, ProductMention.rank, ProductMention.sentiment)
         .join(LLMAnswer, LLMAnswer.id == ProductMention.llm_answer_id)
-        .filter(LLMAnswer.run_id.in_(run_ids))
+        .filter(LLMAnswer.run_id.in_([run.id for run in runs]), ProductMention.mentioned)
         .all()
     )
-    answer_metrics = _collapse_answer_metrics(
-        _product_answer_metrics(mentions, product_id_to_key)
-    )
+    answer_metrics = _collapse_answer_metrics(_answer_metrics(mentions, product_id_to_key))
     keys = _product_keys(answer_metrics, product_groups)
-    product_metrics = [
-        _product_metric(prompt_ids, answer_metrics, key, keys, product_groups)
-        for key in keys
-    ]
-    return ProductMetricsResponse(
-        vertical_id=vertical_id,
-        vertical_name=vertical.name,
+    by_key = visibility_metrics_by_brand(prompt_ids, answer_metrics, keys)
+    return LatestEntityEntries(
+        vertical=vertical,
         model_name=display_model,
-        date=latest_run_time,
-        products=product_metrics,
+        date=max(run.run_time for run in runs),
+        entries=[(key, _product_metric(by_key[key], product_groups[key])) for key in keys],
+    )
+
+
+def load_latest_entity_rows(
+    db: Session,
+    vertical_id: int,
+    model_name: str,
+    entity_type: EntityType,
+) -> list[LatestEntityMetrics]:
+    return (
+        db.query(LatestEntityMetrics)
+        .filter(
+            LatestEntityMetrics.vertical_id == vertical_id,
+            LatestEntityMetrics.model_name == model_name,
+            LatestEntityMetrics.entity_type == entity_type,
+        )
+        .order_by(LatestEntityMetrics.position)
+        .all()
+    )
+
+
+def brand_metric_from_row(row: LatestEntityMetrics) -> BrandMetrics:
+    return BrandMetrics(
+        brand_id=row.entity_id,
+        brand_name=row.entity_name,
+        mention_rate=row.mention_rate,
+        share_of_voice=row.share_of_voice,
+        top_spot_share=row.top_spot_share,
+        sentiment_index=row.sentiment_index,
+        dragon_lens_visibility=row.dragon_lens_visibility,
+    )
+
+
+def product_metric_from_row(row: LatestEntityMetrics) -> ProductMetrics:
+    return ProductMetrics(
+        product_id=row.entity_id,
+        product_name=row.entity_name,
+        brand_id=row.brand_id,
+        brand_name=row.brand_name or "",
+        mention_rate=row.mention_rate,
+        share_of_voice=row.share_of_voice,
+        top_spot_share=row.top_spot_share,
+        sentiment_index=row.sentiment_index,
+        dragon_lens_visibility=row.dragon_lens_visibility,
     )
 
 
@@ -198,7 +310,11 @@ def _runs_for_model(
         if model_name != "all":
             detail += f" and model {model_name}"
         raise ValueError(detail)
-    return runs, "All Models" if model_name == "all" else model_name
+    return runs, _display_model(model_name)
+
+
+def _display_model(model_name: str) -> str:
+    return "All Models" if model_name == "all" else model_name
 
 
 def _all_model_runs(db: Session, vertical_id: int) -> list[Run]:
@@ -244,37 +360,37 @@ def _prompt_ids(db: Session, vertical_id: int) -> list[int]:
     return [prompt.id for prompt in prompts]
 
 
-def _brand_groups(
+def build_brand_groups(
     db: Session,
     vertical_id: int,
 ) -> tuple[dict[int, str], dict[str, list[Brand]]]:
     brands = db.query(Brand).filter(Brand.vertical_id == vertical_id).all()
     user_exact, user_norm = build_user_brand_variant_maps(db, vertical_id)
     canon, alias, norm = build_brand_canonical_maps(db, vertical_id)
-    id_to_key = {
-        brand.id: _brand_key(brand, user_exact, user_norm, canon, alias, norm)
-        for brand in brands
-    }
-    return _fill_unresolved_brand_keys(brands, id_to_key), _group_by_key(
+    id_to_key = _fill_unresolved_brand_keys(
         brands,
-        _fill_unresolved_brand_keys(brands, id_to_key),
+        {
+            brand.id: _brand_key(brand, user_exact, user_norm, canon, alias, norm)
+            for brand in brands
+        },
     )
+    return id_to_key, _group_by_key(brands, id_to_key)
 
 
-def _product_groups(
+def build_product_groups(
     db: Session,
     vertical_id: int,
 ) -> tuple[dict[int, str], dict[str, list[Product]]]:
     products = db.query(Product).filter(Product.vertical_id == vertical_id).all()
     canon, alias, norm = build_product_canonical_maps(db, vertical_id)
-    id_to_key = {
-        product.id: _product_key(product, canon, alias, norm)
-        for product in products
-    }
-    return _fill_unresolved_product_keys(products, id_to_key), _group_by_key(
+    id_to_key = _fill_unresolved_product_keys(
         products,
-        _fill_unresolved_product_keys(products, id_to_key),
+        {
+            product.id: _product_key(product, canon, alias, norm)
+            for product in products
+        },
     )
+    return id_to_key, _group_by_key(products, id_to_key)
 
 
 def _brand_key(
@@ -346,27 +462,19 @@ def _group_by_key(items: list, id_to_key: dict[int, str]) -> dict[str, list]:
     return grouped
 
 
-def _brand_answer_metrics(
-    mentions: list[BrandMention],
+def _answer_metrics(
+    mentions: list[tuple[int, int, int | None, Sentiment]],
     id_to_key: dict[int, str],
 ) -> list[AnswerMetrics]:
-    return [_to_answer_metric(mention, id_to_key.get(mention.brand_id)) for mention in mentions if mention.mentioned]
-
-
-def _product_answer_metrics(
-    mentions: list[ProductMention],
-    id_to_key: dict[int, str],
-) -> list[AnswerMetrics]:
-    return [_to_answer_metric(mention, id_to_key.get(mention.product_id)) for mention in mentions if mention.mentioned]
-
-
-def _to_answer_metric(mention, key: str | None) -> AnswerMetrics:
-    return AnswerMetrics(
-        prompt_id=mention.llm_answer.prompt_id,
-        brand=key or "",
-        rank=mention.rank,
-        sentiment=mention.sentiment.value,
-    )
+    return [
+        AnswerMetrics(
+            prompt_id=prompt_id,
+            brand=id_to_key.get(entity_id) or "",
+            rank=rank,
+            sentiment=sentiment.value,
+        )
+        for entity_id, prompt_id, rank, sentiment in mentions
+    ]
 
 
 def _collapse_answer_metrics(metrics: list[AnswerMetrics]) -> list[AnswerMetrics]:
@@ -432,21 +540,8 @@ def _product_keys(
     return sorted(mentioned | user)
 
 
-def _brand_metric(
-    prompt_ids: list[int],
-    answer_metrics: list[AnswerMetrics],
-    key: str,
-    all_keys: list[str],
-    brand_groups: dict[str, list[Brand]],
-) -> BrandMetrics:
-    representative = choose_brand_rep(brand_groups[key])
-    competitors = [competitor for competitor in all_keys if competitor != key]
-    metrics = visibility_metrics(
-        prompt_ids=prompt_ids,
-        mentions=answer_metrics,
-        brand=key,
-        competitor_brands=competitors,
-    )
+def _brand_metric(metrics: dict[str, float], brands: list[Brand]) -> BrandMetrics:
+    representative = choose_brand_rep(brands)
     return BrandMetrics(
         brand_id=representative.id,
         brand_name=format_entity_label(
@@ -461,21 +556,8 @@ def _brand_metric(
     )
 
 
-def _product_metric(
-    prompt_ids: list[int],
-    answer_metrics: list[AnswerMetrics],
-    key: str,
-    all_keys: list[str],
-    product_groups: dict[str, list[Product]],
-) -> ProductMetrics:
-    representative = choose_product_rep(product_groups[key])
-    competitors = [competitor for competitor in all_keys if competitor != key]
-    metrics = visibility_metrics(
-        prompt_ids=prompt_ids,
-        mentions=answer_metrics,
-        brand=key,
-        competitor_brands=competitors,
-    )
+def _product_metric(metrics: dict[str, float], products: list[Product]) -> ProductMetrics:
+    representative = choose_product_rep(products)
     brand_name = ""
     if representative.brand:
         brand_name = format_entity_label(
@@ -21,6 +21,7 @@ from models import (
     PromptLanguage,
     Run,
     RunComparisonConfig,
+    RunFinalizeStage,
     RunMetrics,
     RunProductMetrics,
     RunStatus,
@@ -41,6 +42,7 @@ from models.admin_schemas import (
     DemoRunProductMetricPayload,
     DemoVerticalPayload,
 )
+from services.latest_metrics import invalidate_latest_metrics
 
 
 def build_demo_publish_request(
@@ -417,10 +419,14 @@ def _delete_run_rows(db: Session, run_ids: list[int]) -> None:
     db.query(RunProductMetrics).filter(
         RunProductMetrics.run_id.in_(run_ids)
     ).delete(synchronize_session=False)
+    db.query(RunFinalizeStage).filter(
+        RunFinalizeStage.run_id.in_(run_ids)
+    ).delete(synchronize_session=False)
     db.query(Run).filter(Run.id.in_(run_ids)).delete(synchronize_session=False)
 
 
 def _delete_vertical_rows(db: Session, vertical_id: int) -> None:
+    invalidate_latest_metrics(db, [vertical_id])
     db.query(ProductBrandMapping).filter(
         ProductBrandMapping.vertical_id == vertical_id
     ).delete(synchronize_session=False)
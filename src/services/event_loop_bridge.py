@@ -0,0 +1,170 @@
+"""Process-wide background event loop for running coroutines from sync code.
+
+Celery tasks and the ``*_sync`` service helpers submit coroutines here
+instead of creating a loop per call, so loop-bound resources (the shared
+Ollama ``httpx.AsyncClient``, pooled LLM clients, semaphores and limiters)
+live for as long as the worker process does.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import contextvars
+import logging
+import os
+import threading
+from typing import Any, Awaitable, Coroutine, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class EventLoopBridge:
+    """A single event loop running forever in a daemon thread."""
+
+    def __init__(self, name: str = "dragonlens-event-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        self.start()
+        return self._loop
+
+    def is_running(self) -> bool:
+        return (
+            self._pid == os.getpid()
+            and self._thread is not None
+            and self._thread.is_alive()
+            and self._loop is not None
+            and not self._loop.is_closed()
+        )
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def start(self) -> None:
+        if self.is_running():
+            return
+        with self._lock:
+            if self.is_running():
+                return
+            # A forked child inherits the attributes but not the thread.
+            self._ready.clear()
+            self._loop = asyncio.new_event_loop()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run_forever, name=self.name, daemon=True)
+            self._thread.start()
+            self._ready.wait()
+
+    def _run_forever(self) -> None:
+        loop = self._loop
+        asyncio.set_event_loop(loop)
+        loop.call_soon(self._ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            _cancel_pending(loop)
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+        """Schedule ``coro`` on the bridge loop from any thread.
+
+        The coroutine runs in a copy of the caller's context, so context
+        variables (e.g. the LLM cache run scope) carry over.
+        """
+        if not asyncio.iscoroutine(coro):
+            raise TypeError(f"Expected a coroutine, got {type(coro).__name__}")
+        loop = self.loop
+        context = contextvars.copy_context()
+        future: concurrent.futures.Future = concurrent.futures.Future()
+
+        def _start() -> None:
+            if not future.set_running_or_notify_cancel():
+                coro.close()
+                return
+            task = loop.create_task(coro, context=context)
+            task.add_done_callback(lambda done: _copy_result(done, future))
+
+            def _cancel_task(done: concurrent.futures.Future) -> None:
+                if done.cancelled() and not loop.is_closed():
+                    loop.call_soon_threadsafe(task.cancel)
+
+            future.add_done_callback(_cancel_task)
+
+        loop.call_soon_threadsafe(_start)
+        return future
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """Run ``coro`` on the bridge loop and block until it finishes."""
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError(
+                "Cannot block on the event loop bridge from its own thread; await the coroutine instead."
+            )
+        return self.submit(coro).result(timeout)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or thread is None or self._pid != os.getpid():
+                return
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(loop.stop)
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+            self._loop = None
+            self._thread = None
+
+
+def _copy_result(task: asyncio.Task, future: concurrent.futures.Future) -> None:
+    if future.done():
+        return
+    if task.cancelled():
+        future.cancel()
+    elif task.exception() is not None:
+        future.set_exception(task.exception())
+    else:
+        future.set_result(task.result())
+
+
+def _cancel_pending(loop: asyncio.AbstractEventLoop) -> None:
+    pending = [task for task in asyncio.all_tasks(loop) if not task.done()]
+    for task in pending:
+        task.cancel()
+    if pending:
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+
+
+_bridge: Optional[EventLoopBridge] = None
+_bridge_lock = threading.Lock()
+
+
+def get_event_loop_bridge() -> EventLoopBridge:
+    global _bridge
+    with _bridge_lock:
+        if _bridge is None:
+            _bridge = EventLoopBridge()
+        return _bridge
+
+
+def run_sync(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """Run a coroutine to completion on the worker's background loop."""
+    return get_event_loop_bridge().run(coro, timeout)
+
+
+def shutdown_event_loop_bridge(timeout: float = 5.0) -> None:
+    global _bridge
+    with _bridge_lock:
+        bridge, _bridge = _bridge, None
+    if bridge is not None:
+        bridge.stop(timeout)
+
+
+atexit.register(shutdown_event_loop_bridge)
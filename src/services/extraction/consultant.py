@@ -34,6 +34,7 @@ from services.extraction.product_consolidation import (
     strip_brand_prefixes,
 )
 from services.knowledge_verticals import normalize_entity_key
+from services.llm_cache import cached_llm_call
 
 logger = logging.getLogger(__name__)
 
@@ -385,20 +386,33 @@ class ExtractionConsultant:
 
     async def _call_llm(self, prompt: str, retries: int = 2, temperature: float | None = None) -> str:
         from services.remote_llms import OpenRouterService
+        service = OpenRouterService(db=None)
+        if temperature is not None:
+            service.temperature = temperature
         last_error = None
         for model in [OPENROUTER_PRIMARY_MODEL, OPENROUTER_BACKUP_MODEL]:
-            for attempt in range(retries):
-                try:
-                    service = OpenRouterService(db=None)
-                    if temperature is not None:
-                        service.temperature = temperature
-                    answer, _, _, _ = await service.query(prompt, model_name=model)
-                    return answer
-                except Exception as e:
-                    logger.warning("OpenRouter %s failed (attempt %d): %s", model, attempt + 1, e)
-                    last_error = e
+            try:
+                return await cached_llm_call(
+                    f"openrouter/{model}",
+                    prompt,
+                    lambda model=model: self._query_model(service, prompt, model, retries),
+                    temperature=service.temperature,
+                )
+            except Exception as e:
+                last_error = e
         raise RuntimeError(f"All LLM attempts failed: {last_error}")
 
+    async def _query_model(self, service, prompt: str, model: str, retries: int) -> str:
+        last_error: Exception | None = None
+        for attempt in range(retries):
+            try:
+                answer, _, _, _ = await service.query(prompt, model_name=model)
+                return answer
+            except Exception as e:
+                logger.warning("OpenRouter %s failed (attempt %d): %s", model, attempt + 1, e)
+                last_error = e
+        raise last_error or RuntimeError(f"No attempts made for {model}")
+
 
 def _merge_remote_aliases(
     parsed: dict,
@@ -9,7 +9,12 @@ from typing import Iterable
 from sqlalchemy.orm import Session
 
 from models.domain import EntityType
-from models.knowledge_database import KnowledgeWriteSessionLocal
+from models.knowledge_database import (
+    KnowledgeReadSessionLocal,
+    KnowledgeWriteSessionLocal,
+    knowledge_read_engine,
+    knowledge_write_engine,
+)
 from models.knowledge_domain import (
     KnowledgeBrand,
     KnowledgeBrandAlias,
@@ -65,9 +70,16 @@ class ExtractionPipeline:
 
     def _get_matcher(self) -> KnowledgeBaseMatcher:
         if self._matcher is None:
-            self._matcher = KnowledgeBaseMatcher(self.knowledge_vertical_id, self.knowledge_db)
+            self._matcher = self._load_matcher()
         return self._matcher
 
+    def _load_matcher(self) -> KnowledgeBaseMatcher:
+        if not self._owns_knowledge_db or knowledge_read_engine is knowledge_write_engine:
+            return KnowledgeBaseMatcher(self.knowledge_vertical_id, self.knowledge_db)
+        self.knowledge_db.commit()
+        with KnowledgeReadSessionLocal() as read_db:
+            return KnowledgeBaseMatcher(self.knowledge_vertical_id, read_db)
+
     async def process_response(
         self,
         text: str,
@@ -81,7 +93,7 @@ class ExtractionPipeline:
             logger.info(f"[PIPELINE] Ensuring seeded...")
             await self._ensure_seeded(user_brands or [])
             self._seed_checked = True
-            self._matcher = KnowledgeBaseMatcher(self.knowledge_vertical_id, self.knowledge_db)
+            self._matcher = self._load_matcher()
             logger.info(f"[PIPELINE] Seeding completed")
 
         logger.info(f"[PIPELINE] Parsing items...")
@@ -32,6 +32,8 @@ from models.schemas import (
     FeedbackVerticalAliasResponse,
 )
 from services.canonicalization_metrics import normalize_entity_key
+from services.knowledge_verticals import resolve_knowledge_vertical_id
+from services.latest_metrics import schedule_latest_metrics_refresh
 
 
 def submit_feedback(
@@ -47,6 +49,7 @@ def submit_feedback(
     applied = _apply_feedback(knowledge_db, canonical.id, payload)
     _store_feedback_event(knowledge_db, canonical.id, payload)
     knowledge_db.commit()
+    schedule_latest_metrics_refresh(db, _local_vertical_ids(db, knowledge_db, canonical.id))
     return _response(payload.run_id, canonical.id, applied)
 
 
@@ -69,6 +72,8 @@ def save_vertical_alias(
     resolved = _resolve_canonical_vertical(knowledge_db, canonical)
     created = _ensure_vertical_alias_created(knowledge_db, resolved.id, vertical.name)
     knowledge_db.commit()
+    if created:
+        schedule_latest_metrics_refresh(db, [vertical.id])
     return FeedbackVerticalAliasResponse(
         status="ok",
         vertical_id=vertical.id,
@@ -79,6 +84,27 @@ def save_vertical_alias(
     )
 
 
+def _local_vertical_ids(db: Session, knowledge_db: Session, canonical_id: int) -> list[int]:
+    names = [
+        alias
+        for (alias,) in knowledge_db.query(KnowledgeVerticalAlias.alias).filter(
+            KnowledgeVerticalAlias.vertical_id == canonical_id
+        )
+    ]
+    canonical = knowledge_db.query(KnowledgeVertical).filter(KnowledgeVertical.id == canonical_id).first()
+    if canonical:
+        names.append(canonical.name)
+    keys = {name.casefold() for name in names if name}
+    if not keys:
+        return []
+    candidates = db.query(Vertical).filter(func.lower(Vertical.name).in_(keys)).all()
+    return [
+        vertical.id
+        for vertical in candidates
+        if resolve_knowledge_vertical_id(knowledge_db, vertical.name) == canonical_id
+    ]
+
+
 def _validate_payload(payload: FeedbackSubmitRequest) -> None:
     _validate_canonical_vertical(payload.canonical_vertical)
     _validate_brand_items(payload.brand_feedback)
@@ -0,0 +1,253 @@
+"""Materialized ``/metrics/latest`` aggregates.
+
+``latest_entity_metrics`` holds the response of ``/metrics/latest`` and
+``/metrics/latest/products`` per (vertical, model) scope, one row per
+canonical entity, so the endpoints read a single indexed range instead of
+rebuilding canonical maps and scanning every mention of every run. A scope
+is rebuilt from scratch (canonical maps are computed once per vertical)
+when ``finalize_run`` completes for one of its runs. When feedback or
+consolidation changes canonical mappings the vertical's rows are dropped
+in the request and rebuilt by a worker task. Deleting runs drops the rows
+of their verticals; scopes without rows fall back to the live computation
+in ``services.dashboard_metrics``. :func:`check_latest_metrics` recomputes
+a vertical from scratch and diffs it against the stored rows.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from models import EntityType, LatestEntityMetrics, Run
+from models.db_retry import commit_with_retry
+from services.dashboard_metrics import (
+    LatestEntityEntries,
+    build_brand_groups,
+    build_product_groups,
+    compute_latest_brand_entries,
+    compute_latest_product_entries,
+    load_latest_entity_rows,
+)
+
+logger = logging.getLogger(__name__)
+
+ALL_MODELS = "all"
+
+_METRIC_FIELDS = (
+    "mention_rate",
+    "share_of_voice",
+    "top_spot_share",
+    "sentiment_index",
+    "dragon_lens_visibility",
+)
+
+
+@dataclass(frozen=True)
+class LatestMetricsDiff:
+    model_name: str
+    entity_type: str
+    entity_key: str
+    field: str
+    stored: Any
+    expected: Any
+
+
+def refresh_latest_metrics(
+    db: Session,
+    vertical_id: int,
+    model_names: Optional[Iterable[str]] = None,
+) -> dict:
+    """Rebuild the stored scopes of ``vertical_id`` (all of its models by default) and commit."""
+    scopes = _scopes(db, vertical_id, model_names)
+    expected = _expected_entries(db, vertical_id, scopes)
+    rows = 0
+    for (model_name, entity_type), entries in expected.items():
+        rows += _replace_scope(db, vertical_id, model_name, entity_type, entries)
+    commit_with_retry(db)
+    logger.info("[LATEST_METRICS] vertical=%d scopes=%s rows=%d", vertical_id, scopes, rows)
+    return {"scopes": scopes, "rows": rows}
+
+
+def refresh_latest_metrics_safely(
+    db: Session,
+    vertical_id: int,
+    model_names: Optional[Iterable[str]] = None,
+) -> Optional[dict]:
+    """Refresh, or drop the vertical's rows (so reads fall back to live metrics) on failure."""
+    try:
+        return refresh_latest_metrics(db, vertical_id, model_names)
+    except Exception as exc:
+        logger.warning("[LATEST_METRICS] refresh failed for vertical %s: %s", vertical_id, exc)
+        db.rollback()
+        invalidate_latest_metrics(db, [vertical_id])
+        commit_with_retry(db)
+        return None
+
+
+def schedule_latest_metrics_refresh(db: Session, vertical_ids: Iterable[int]) -> None:
+    """Drop the stored rows of ``vertical_ids`` now and queue their rebuild on a worker."""
+    ids = sorted(set(vertical_ids))
+    if not ids:
+        return
+    invalidate_latest_metrics(db, ids)
+    commit_with_retry(db)
+    try:
+        from workers.tasks import refresh_vertical_latest_metrics
+
+        for vertical_id in ids:
+            refresh_vertical_latest_metrics.delay(vertical_id)
+    except Exception as exc:
+        logger.warning("[LATEST_METRICS] could not queue refresh for verticals %s: %s", ids, exc)
+
+
+def invalidate_latest_metrics(db: Session, vertical_ids: Iterable[int]) -> None:
+    """Delete the stored rows of ``vertical_ids``; the caller commits."""
+    ids = list(vertical_ids)
+    if ids:
+        db.execute(delete(LatestEntityMetrics).where(LatestEntityMetrics.vertical_id.in_(ids)))
+
+
+def check_latest_metrics(
+    db: Session,
+    vertical_id: int,
+    tolerance: float = 1e-9,
+) -> list[LatestMetricsDiff]:
+    """Recompute every stored scope of ``vertical_id`` and return where the rows disagree."""
+    stored_scopes = _stored_scopes(db, vertical_id)
+    expected = _expected_entries(db, vertical_id, sorted({model for model, _ in stored_scopes}))
+    diffs: list[LatestMetricsDiff] = []
+    for model_name, entity_type in sorted(stored_scopes):
+        rows = load_latest_entity_rows(db, vertical_id, model_name, entity_type)
+        entries = expected.get((model_name, entity_type), [])
+        diffs.extend(_diff_scope(model_name, entity_type, rows, entries, tolerance))
+    return diffs
+
+
+def _scopes(db: Session, vertical_id: int, model_names: Optional[Iterable[str]]) -> list[str]:
+    if model_names is None:
+        rows = db.query(Run.model_name).filter(Run.vertical_id == vertical_id).distinct().all()
+        model_names = [model_name for model_name, in rows]
+    return [ALL_MODELS, *sorted(set(model_names) - {ALL_MODELS})]
+
+
+def _stored_scopes(db: Session, vertical_id: int) -> set[tuple[str, EntityType]]:
+    rows = (
+        db.query(LatestEntityMetrics.model_name, LatestEntityMetrics.entity_type)
+        .filter(LatestEntityMetrics.vertical_id == vertical_id)
+        .distinct()
+        .all()
+    )
+    return {(model_name, entity_type) for model_name, entity_type in rows}
+
+
+def _expected_entries(
+    db: Session,
+    vertical_id: int,
+    scopes: list[str],
+) -> dict[tuple[str, EntityType], list[dict]]:
+    brand_groups = build_brand_groups(db, vertical_id)
+    product_groups = build_product_groups(db, vertical_id)
+    expected: dict[tuple[str, EntityType], list[dict]] = {}
+    for model_name in scopes:
+        brands = _scope_entries(compute_latest_brand_entries, db, vertical_id, model_name, brand_groups)
+        products = _scope_entries(compute_latest_product_entries, db, vertical_id, model_name, product_groups)
+        expected[(model_name, EntityType.BRAND)] = _row_values(brands, EntityType.BRAND)
+        expected[(model_name, EntityType.PRODUCT)] = _row_values(products, EntityType.PRODUCT)
+    return expected
+
+
+def _scope_entries(
+    compute: Callable[..., LatestEntityEntries],
+    db: Session,
+    vertical_id: int,
+    model_name: str,
+    groups: tuple,
+) -> Optional[LatestEntityEntries]:
+    try:
+        return compute(db, vertical_id, model_name, groups)
+    except ValueError:
+        return None
+
+
+def _row_values(latest: Optional[LatestEntityEntries], entity_type: EntityType) -> list[dict]:
+    if latest is None:
+        return []
+    return [
+        _row_value(position, key, metric, entity_type, latest)
+        for position, (key, metric) in enumerate(latest.entries)
+    ]
+
+
+def _row_value(position: int, key: str, metric, entity_type: EntityType, latest: LatestEntityEntries) -> dict:
+    values = {field: getattr(metric, field) for field in _METRIC_FIELDS}
+    values.update(entity_key=key, position=position, latest_run_time=latest.date)
+    if entity_type == EntityType.BRAND:
+        values.update(
+            entity_id=metric.brand_id, entity_name=metric.brand_name, brand_id=None, brand_name=None
+        )
+    else:
+        values.update(
+            entity_id=metric.product_id,
+            entity_name=metric.product_name,
+            brand_id=metric.brand_id,
+            brand_name=metric.brand_name,
+        )
+    return values
+
+
+def _replace_scope(
+    db: Session,
+    vertical_id: int,
+    model_name: str,
+    entity_type: EntityType,
+    entries: list[dict],
+) -> int:
+    db.execute(
+        delete(LatestEntityMetrics).where(
+            LatestEntityMetrics.vertical_id == vertical_id,
+            LatestEntityMetrics.model_name == model_name,
+            LatestEntityMetrics.entity_type == entity_type,
+        )
+    )
+    db.add_all(
+        LatestEntityMetrics(
+            vertical_id=vertical_id, model_name=model_name, entity_type=entity_type, **values
+        )
+        for values in entries
+    )
+    db.flush()
+    return len(entries)
+
+
+def _diff_scope(
+    model_name: str,
+    entity_type: EntityType,
+    rows: list[LatestEntityMetrics],
+    entries: list[dict],
+    tolerance: float,
+) -> list[LatestMetricsDiff]:
+    stored = {row.entity_key: row for row in rows}
+    expected = {values["entity_key"]: values for values in entries}
+    diffs = []
+
+    def diff(key: str, field: str, stored_value, expected_value) -> None:
+        diffs.append(
+            LatestMetricsDiff(model_name, entity_type.value, key, field, stored_value, expected_value)
+        )
+
+    for key in sorted(stored.keys() - expected.keys()):
+        diff(key, "row", "present", "missing")
+    for key in sorted(expected.keys() - stored.keys()):
+        diff(key, "row", "missing", "present")
+    for key in sorted(stored.keys() & expected.keys()):
+        row, values = stored[key], expected[key]
+        for field, expected_value in values.items():
+            stored_value = getattr(row, field)
+            if field in _METRIC_FIELDS:
+                if abs(stored_value - expected_value) > tolerance:
+                    diff(key, field, stored_value, expected_value)
+            elif stored_value != expected_value:
+                diff(key, field, stored_value, expected_value)
+    return diffs
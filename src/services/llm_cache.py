@@ -0,0 +1,391 @@
+"""Content-addressed cache for deterministic LLM calls.
+
+Responses are keyed on a hash of (model, system prompt, prompt, temperature,
+format). Calls above ``llm_cache_max_temperature`` bypass the cache unless
+``llm_cache_nondeterministic`` is enabled. Hit/miss counters are tracked per
+run and persisted next to the cached responses so every worker contributes
+to the same totals.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterator, Optional, Protocol
+
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, Text, create_engine, delete, event, func, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
+
+from config import settings
+from models.sqlite_config import apply_sqlite_pragmas, is_sqlite_url, sqlite_connect_args
+
+logger = logging.getLogger(__name__)
+
+_current_run_id: ContextVar[Optional[int]] = ContextVar("llm_cache_run_id", default=None)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def add(self, other: "CacheStats") -> None:
+        self.hits += other.hits
+        self.misses += other.misses
+        self.bypassed += other.bypassed
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+def cache_key(
+    model: str,
+    system_prompt: Optional[str],
+    prompt: str,
+    temperature: Optional[float],
+    format: Optional[str] = None,
+) -> str:
+    payload = json.dumps(
+        [model, system_prompt or "", prompt, temperature, format or ""],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Optional[str]: ...
+
+    def set(self, key: str, model: str, value: str) -> None: ...
+
+    def add_run_stats(self, run_id: int, stats: CacheStats) -> None: ...
+
+    def run_stats(self, run_id: int) -> CacheStats: ...
+
+
+class MemoryCacheBackend:
+    """Process-local LRU backend; used in tests and when no cache URL is set."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._run_stats: dict[int, CacheStats] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created_at, value = entry
+            if self.ttl_seconds and time.time() - created_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, model: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def add_run_stats(self, run_id: int, stats: CacheStats) -> None:
+        with self._lock:
+            self._run_stats.setdefault(run_id, CacheStats()).add(stats)
+
+    def run_stats(self, run_id: int) -> CacheStats:
+        with self._lock:
+            stored = self._run_stats.get(run_id, CacheStats())
+            return CacheStats(stored.hits, stored.misses, stored.bypassed)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_metadata = MetaData()
+
+llm_response_cache_table = Table(
+    "llm_response_cache",
+    _metadata,
+    Column("key", String(64), primary_key=True),
+    Column("model", String(255), nullable=False),
+    Column("response", Text, nullable=False),
+    Column("created_at", Float, nullable=False),
+    Column("accessed_at", Float, nullable=False, index=True),
+)
+
+llm_cache_run_stats_table = Table(
+    "llm_cache_run_stats",
+    _metadata,
+    Column("run_id", Integer, primary_key=True),
+    Column("hits", Integer, nullable=False, default=0),
+    Column("misses", Integer, nullable=False, default=0),
+    Column("bypassed", Integer, nullable=False, default=0),
+)
+
+
+class SQLCacheBackend:
+    """SQLite/Postgres backend with TTL expiry and LRU eviction by access time."""
+
+    EVICTION_INTERVAL = 100
+
+    def __init__(self, url: str, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.engine = create_cache_engine(url)
+        _metadata.create_all(self.engine)
+        self._writes_since_eviction = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        table = llm_response_cache_table
+        now = time.time()
+        with self.engine.begin() as conn:
+            row = conn.execute(
+                select(table.c.response, table.c.created_at).where(table.c.key == key)
+            ).first()
+            if row is None:
+                return None
+            if self.ttl_seconds and now - row.created_at > self.ttl_seconds:
+                conn.execute(delete(table).where(table.c.key == key))
+                return None
+            conn.execute(update(table).where(table.c.key == key).values(accessed_at=now))
+            return row.response
+
+    def set(self, key: str, model: str, value: str) -> None:
+        table = llm_response_cache_table
+        now = time.time()
+        with self.engine.begin() as conn:
+            conn.execute(delete(table).where(table.c.key == key))
+            conn.execute(
+                table.insert().values(
+                    key=key, model=model, response=value, created_at=now, accessed_at=now
+                )
+            )
+        self._maybe_evict()
+
+    def _maybe_evict(self) -> None:
+        with self._lock:
+            self._writes_since_eviction += 1
+            if self._writes_since_eviction < self.EVICTION_INTERVAL:
+                return
+            self._writes_since_eviction = 0
+        self.evict()
+
+    def evict(self) -> int:
+        """Drop expired rows, then least-recently-used rows above max_entries."""
+        table = llm_response_cache_table
+        removed = 0
+        with self.engine.begin() as conn:
+            if self.ttl_seconds:
+                cutoff = time.time() - self.ttl_seconds
+                removed += conn.execute(delete(table).where(table.c.created_at < cutoff)).rowcount or 0
+            total = conn.execute(select(func.count()).select_from(table)).scalar_one()
+            overflow = total - self.max_entries
+            if overflow > 0:
+                oldest = select(table.c.key).order_by(table.c.accessed_at).limit(overflow)
+                keys = [row[0] for row in conn.execute(oldest)]
+                removed += conn.execute(delete(table).where(table.c.key.in_(keys))).rowcount or 0
+        return removed
+
+    def add_run_stats(self, run_id: int, stats: CacheStats) -> None:
+        table = llm_cache_run_stats_table
+        with self.engine.begin() as conn:
+            updated = conn.execute(
+                update(table)
+                .where(table.c.run_id == run_id)
+                .values(
+                    hits=table.c.hits + stats.hits,
+                    misses=table.c.misses + stats.misses,
+                    bypassed=table.c.bypassed + stats.bypassed,
+                )
+            ).rowcount
+            if not updated:
+                conn.execute(
+                    table.insert().values(
+                        run_id=run_id, hits=stats.hits, misses=stats.misses, bypassed=stats.bypassed
+                    )
+                )
+
+    def run_stats(self, run_id: int) -> CacheStats:
+        table = llm_cache_run_stats_table
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(table.c.hits, table.c.misses, table.c.bypassed).where(table.c.run_id == run_id)
+            ).first()
+        if row is None:
+            return CacheStats()
+        return CacheStats(row.hits, row.misses, row.bypassed)
+
+
+def create_cache_engine(url: str) -> Engine:
+    kwargs: dict = {"connect_args": sqlite_connect_args(url)}
+    if url == "sqlite:///:memory:":
+        kwargs["poolclass"] = StaticPool
+    elif not is_sqlite_url(url):
+        kwargs["pool_pre_ping"] = True
+    engine = create_engine(url, **kwargs)
+    if is_sqlite_url(url):
+        event.listen(engine, "connect", lambda dbapi_connection, _: apply_sqlite_pragmas(dbapi_connection))
+    return engine
+
+
+class LLMResponseCache:
+    """Front-end that decides cacheability and counts hits/misses per run."""
+
+    def __init__(self, backend: CacheBackend, max_temperature: float = 0.0, allow_nondeterministic: bool = False):
+        self.backend = backend
+        self.max_temperature = max_temperature
+        self.allow_nondeterministic = allow_nondeterministic
+        self._pending: dict[Optional[int], CacheStats] = {}
+        self._lock = threading.Lock()
+
+    def is_cacheable(self, temperature: Optional[float]) -> bool:
+        if self.allow_nondeterministic:
+            return True
+        return isinstance(temperature, (int, float)) and temperature <= self.max_temperature
+
+    def lookup(self, key: str) -> Optional[str]:
+        try:
+            value = self.backend.get(key)
+        except Exception as exc:
+            logger.warning("LLM cache read failed: %s", exc)
+            value = None
+        self._count("hits" if value is not None else "misses")
+        return value
+
+    def store(self, key: str, model: str, value: str) -> None:
+        if not value:
+            return
+        try:
+            self.backend.set(key, model, value)
+        except Exception as exc:
+            logger.warning("LLM cache write failed: %s", exc)
+
+    async def alookup(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self.lookup, key)
+
+    async def astore(self, key: str, model: str, value: str) -> None:
+        await asyncio.to_thread(self.store, key, model, value)
+
+    def record_bypass(self) -> None:
+        self._count("bypassed")
+
+    def _count(self, field: str) -> None:
+        run_id = _current_run_id.get()
+        with self._lock:
+            stats = self._pending.setdefault(run_id, CacheStats())
+            setattr(stats, field, getattr(stats, field) + 1)
+
+    def flush_run_stats(self, run_id: Optional[int]) -> None:
+        with self._lock:
+            stats = self._pending.pop(run_id, None)
+        if run_id is None or stats is None:
+            return
+        try:
+            self.backend.add_run_stats(run_id, stats)
+        except Exception as exc:
+            logger.warning("Failed to persist LLM cache stats for run %s: %s", run_id, exc)
+
+    def run_stats(self, run_id: int) -> CacheStats:
+        try:
+            stats = self.backend.run_stats(run_id)
+        except Exception as exc:
+            logger.warning("Failed to read LLM cache stats for run %s: %s", run_id, exc)
+            stats = CacheStats()
+        with self._lock:
+            pending = self._pending.get(run_id)
+            if pending is not None:
+                stats.add(pending)
+        return stats
+
+
+_cache_instance: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def _build_backend() -> CacheBackend:
+    url = settings.llm_cache_url.strip()
+    ttl = settings.llm_cache_ttl_seconds
+    if not url or url == "memory://":
+        return MemoryCacheBackend(ttl, settings.llm_cache_max_entries)
+    return SQLCacheBackend(url, ttl, settings.llm_cache_max_entries)
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Return the process-wide cache, or None when caching is disabled."""
+    global _cache_instance
+    if not settings.llm_cache_enabled:
+        return None
+    with _cache_lock:
+        if _cache_instance is None:
+            _cache_instance = LLMResponseCache(
+                _build_backend(),
+                max_temperature=settings.llm_cache_max_temperature,
+                allow_nondeterministic=settings.llm_cache_nondeterministic,
+            )
+        return _cache_instance
+
+
+def reset_llm_cache(cache: Optional[LLMResponseCache] = None) -> None:
+    global _cache_instance
+    with _cache_lock:
+        _cache_instance = cache
+
+
+@contextmanager
+def llm_cache_run_scope(run_id: Optional[int]) -> Iterator[None]:
+    """Attribute cache hits/misses inside the block to ``run_id``."""
+    token = _current_run_id.set(run_id)
+    try:
+        yield
+    finally:
+        _current_run_id.reset(token)
+        cache = get_llm_cache()
+        if cache is not None:
+            cache.flush_run_stats(run_id)
+
+
+async def cached_llm_call(
+    model: str,
+    prompt: str,
+    fetch: Callable[[], Awaitable[str]],
+    system_prompt: Optional[str] = None,
+    temperature: Optional[float] = None,
+    format: Optional[str] = None,
+) -> str:
+    """Return a cached response for the call, or run ``fetch`` and cache its result."""
+    cache = get_llm_cache()
+    if cache is None:
+        return await fetch()
+    if not cache.is_cacheable(temperature):
+        cache.record_bypass()
+        return await fetch()
+    key = cache_key(model, system_prompt, prompt, temperature, format)
+    cached = await cache.alookup(key)
+    if cached is not None:
+        return cached
+    result = await fetch()
+    await cache.astore(key, model, result)
+    return result
@@ -0,0 +1,141 @@
+"""Long-lived, per-event-loop HTTP clients for remote LLM providers."""
+
+import asyncio
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+import httpx
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PoolEntry:
+    loop: Optional[asyncio.AbstractEventLoop]
+    http_client: httpx.AsyncClient
+    sdk_client: Any = None
+
+
+def api_key_fingerprint(api_key: str) -> str:
+    return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+
+
+def _http2_enabled() -> bool:
+    if not settings.llm_http2_enabled:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("LLM_HTTP2_ENABLED is set but the 'h2' package is missing; using HTTP/1.1")
+        return False
+    return True
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=settings.llm_http_max_connections,
+        max_keepalive_connections=settings.llm_http_max_keepalive_connections,
+        keepalive_expiry=settings.llm_http_keepalive_expiry,
+    )
+    timeout = httpx.Timeout(
+        settings.llm_http_read_timeout,
+        connect=settings.llm_http_connect_timeout,
+    )
+    return httpx.AsyncClient(limits=limits, timeout=timeout, http2=_http2_enabled())
+
+
+def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class LLMClientPool:
+    """Share keep-alive clients per (event loop, provider, base URL, API key).
+
+    httpx connections are bound to the loop that opened them, so each loop
+    gets its own client; entries whose loop has been closed are dropped.
+    """
+
+    _entries: dict[tuple, _PoolEntry] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def _entry_key(cls, loop, provider: str, base_url: str, api_key: str) -> tuple:
+        return (id(loop), provider, base_url.rstrip("/"), api_key_fingerprint(api_key))
+
+    @classmethod
+    def _prune_closed_loops(cls) -> None:
+        stale = [key for key, entry in cls._entries.items() if entry.loop is not None and entry.loop.is_closed()]
+        for key in stale:
+            cls._entries.pop(key, None)
+
+    @classmethod
+    def _get_entry(cls, provider: str, base_url: str, api_key: str) -> _PoolEntry:
+        loop = _current_loop()
+        key = cls._entry_key(loop, provider, base_url, api_key)
+        with cls._lock:
+            cls._prune_closed_loops()
+            entry = cls._entries.get(key)
+            if entry is None or entry.http_client.is_closed:
+                entry = _PoolEntry(loop=loop, http_client=_build_http_client())
+                cls._entries[key] = entry
+                logger.debug("Opened pooled HTTP client for %s (%s)", provider, base_url)
+            return entry
+
+    @classmethod
+    def get_http_client(cls, provider: str, base_url: str, api_key: str) -> httpx.AsyncClient:
+        return cls._get_entry(provider, base_url, api_key).http_client
+
+    @classmethod
+    def get_sdk_client(
+        cls,
+        provider: str,
+        base_url: str,
+        api_key: str,
+        factory: Callable[[httpx.AsyncClient], Any],
+    ) -> Any:
+        entry = cls._get_entry(provider, base_url, api_key)
+        if entry.sdk_client is None:
+            entry.sdk_client = factory(entry.http_client)
+        return entry.sdk_client
+
+    @classmethod
+    def size(cls) -> int:
+        return len(cls._entries)
+
+    @classmethod
+    def _take_entries(cls, loop=None) -> list[_PoolEntry]:
+        with cls._lock:
+            keys = [key for key, entry in cls._entries.items() if loop is None or entry.loop is loop]
+            return [cls._entries.pop(key) for key in keys]
+
+    @classmethod
+    async def aclose_current_loop(cls) -> None:
+        for entry in cls._take_entries(_current_loop()):
+            if not entry.http_client.is_closed:
+                await entry.http_client.aclose()
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Close every pooled client from synchronous code (e.g. worker shutdown)."""
+        for entry in cls._take_entries():
+            _close_entry_sync(entry)
+
+
+def _close_entry_sync(entry: _PoolEntry) -> None:
+    if entry.http_client.is_closed:
+        return
+    loop = entry.loop
+    if loop is None or loop.is_closed() or loop.is_running():
+        return
+    try:
+        loop.run_until_complete(entry.http_client.aclose())
+    except Exception as exc:
+        logger.warning("Failed to close pooled LLM client: %s", exc)
@@ -0,0 +1,148 @@
+"""Cross-worker coalescing of identical in-flight LLM prompts.
+
+Concurrent runs often ask the same provider/model the same prompt. The
+first ``ensure_llm_answer`` to claim a prompt's Redis lock calls the
+provider and publishes the stored answer id under a result key; the
+others retry their task until that key appears and copy the answer
+instead of calling the provider again. A leader that fails releases its
+lock, and one that dies lets it expire, so a waiter takes over.
+
+The result key only outlives the lock by as long as the lock had left,
+so it serves runs that were waiting on the flight, not later runs; those
+go through the completed-run answer reuse instead.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def singleflight_key(
+    provider: str, model_name: str, web_search_enabled: bool, prompt_text_zh: str
+) -> str:
+    payload = json.dumps(
+        [provider, model_name, bool(web_search_enabled), prompt_text_zh],
+        ensure_ascii=False,
+    )
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"dragonlens:singleflight:{digest}"
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+@dataclass
+class Flight:
+    """Outcome of joining a flight: lead it, reuse its result, or wait for it."""
+
+    key: str
+    token: Optional[str] = None
+    result: Optional[str] = None
+
+    @property
+    def leader(self) -> bool:
+        return self.token is not None
+
+    @property
+    def pending(self) -> bool:
+        """Another caller leads the flight and has not published yet."""
+        return self.token is None and self.result is None
+
+
+class Singleflight:
+    """Redis lock + result key per flight, shared by all workers."""
+
+    def __init__(self, redis_client, lock_ttl_seconds: int = 300):
+        self.redis = redis_client
+        self.lock_ttl_seconds = lock_ttl_seconds
+
+    @staticmethod
+    def _lock_key(key: str) -> str:
+        return f"{key}:lock"
+
+    @staticmethod
+    def _result_key(key: str) -> str:
+        return f"{key}:result"
+
+    def join(self, key: str) -> Flight:
+        """Return a published result, take the lead, or report the flight as pending.
+
+        Never blocks: callers wait for a pending flight by rescheduling
+        themselves, so no worker slot is held while the leader runs.
+        """
+        result = self.redis.get(self._result_key(key))
+        if result is not None:
+            return Flight(key, result=_decode(result))
+        token = uuid.uuid4().hex
+        if self.redis.set(self._lock_key(key), token, nx=True, ex=self.lock_ttl_seconds):
+            return Flight(key, token=token)
+        return Flight(key)
+
+    def publish(self, flight: Flight, result) -> None:
+        """Hand ``result`` to the waiters for the rest of the lock's lifetime."""
+        if not flight.leader:
+            return
+        remaining_ms = self.redis.pttl(self._lock_key(flight.key))
+        if remaining_ms is None or remaining_ms <= 0:
+            remaining_ms = self.lock_ttl_seconds * 1000
+        self.redis.set(self._result_key(flight.key), str(result), px=remaining_ms)
+        self._release(flight)
+
+    def abandon(self, flight: Flight) -> None:
+        if flight.leader:
+            self._release(flight)
+
+    def forget(self, key: str) -> None:
+        """Drop a published result that turned out to be unusable."""
+        self.redis.delete(self._result_key(key))
+
+    def _release(self, flight: Flight) -> None:
+        import redis
+
+        lock_key = self._lock_key(flight.key)
+        with self.redis.pipeline() as pipe:
+            try:
+                pipe.watch(lock_key)
+                owner = pipe.get(lock_key)
+                if owner is None or _decode(owner) != flight.token:
+                    return
+                pipe.multi()
+                pipe.delete(lock_key)
+                pipe.execute()
+            except redis.WatchError:
+                pass
+
+
+_singleflight: Optional[Singleflight] = None
+_singleflight_lock = threading.Lock()
+
+
+def get_llm_singleflight() -> Optional[Singleflight]:
+    """Return the process-wide singleflight, or None when it is disabled."""
+    global _singleflight
+    if not settings.llm_singleflight_enabled:
+        return None
+    with _singleflight_lock:
+        if _singleflight is None:
+            from services.run_state import get_run_state_store
+
+            _singleflight = Singleflight(
+                get_run_state_store().redis,
+                lock_ttl_seconds=settings.llm_singleflight_lock_ttl_seconds,
+            )
+        return _singleflight
+
+
+def reset_llm_singleflight(singleflight: Optional[Singleflight] = None) -> None:
+    global _singleflight
+    with _singleflight_lock:
+        _singleflight = singleflight
@@ -0,0 +1,127 @@
+"""Streaming helpers that capture time-to-first-token and generation speed."""
+
+import logging
+import time
+from typing import Callable, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class StreamCollector:
+    """Accumulates streamed answer text and timing for a single LLM call.
+
+    ``on_text`` is called with every content delta as it arrives, so callers
+    can observe the answer before it is complete.
+    Reasoning deltas count towards time-to-first-token but are not part of
+    the answer text.
+    """
+
+    def __init__(
+        self,
+        on_text: Optional[Callable[[str], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.on_text = on_text
+        self.clock = clock
+        self.reset()
+
+    def reset(self) -> None:
+        self._chunks: list[str] = []
+        self.started_at: Optional[float] = None
+        self.first_token_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.reasoning_chars = 0
+        self.tokens_out: Optional[int] = None
+
+    def start(self) -> None:
+        self.reset()
+        self.started_at = self.clock()
+
+    def feed(self, delta: Optional[str], reasoning: bool = False) -> None:
+        if not delta:
+            return
+        if self.first_token_at is None:
+            self.first_token_at = self.clock()
+        if reasoning:
+            self.reasoning_chars += len(delta)
+            return
+        self._chunks.append(delta)
+        if self.on_text is None:
+            return
+        try:
+            self.on_text(delta)
+        except Exception as exc:
+            logger.warning("Stream text hook failed: %s", exc)
+
+    def finish(self, tokens_out: Optional[int] = None) -> None:
+        self.finished_at = self.clock()
+        self.tokens_out = tokens_out
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    @property
+    def latency(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or self.clock()) - self.started_at
+
+    @property
+    def time_to_first_token(self) -> Optional[float]:
+        if self.started_at is None or self.first_token_at is None:
+            return None
+        return self.first_token_at - self.started_at
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        if self.first_token_at is None or self.finished_at is None:
+            return None
+        duration = self.finished_at - self.first_token_at
+        tokens = self.tokens_out if self.tokens_out is not None else len(self.text) // 2
+        if duration <= 0 or not tokens:
+            return None
+        return tokens / duration
+
+    def metrics(self) -> dict:
+        return {
+            "time_to_first_token": self.time_to_first_token,
+            "tokens_per_second": self.tokens_per_second,
+        }
+
+
+def new_stream_collector(
+    on_text: Optional[Callable[[str], None]] = None,
+) -> Optional[StreamCollector]:
+    """Return a collector when streaming is enabled, else None (blocking calls)."""
+    if not settings.llm_streaming_enabled:
+        return None
+    return StreamCollector(on_text=on_text)
+
+
+def stream_metrics(stream: Optional[StreamCollector]) -> dict:
+    if stream is None:
+        return {"time_to_first_token": None, "tokens_per_second": None}
+    return stream.metrics()
+
+
+def usage_value(usage, field: str) -> Optional[int]:
+    """Read a token count from an SDK usage object or a plain dict."""
+    if usage is None:
+        return None
+    value = usage.get(field) if isinstance(usage, dict) else getattr(usage, field, None)
+    return int(value) if isinstance(value, (int, float)) else None
+
+
+def chunk_usage(chunk):
+    """Usage block of a streamed chunk: top-level (OpenAI) or per-choice (Moonshot)."""
+    usage = getattr(chunk, "usage", None)
+    if usage:
+        return usage
+    for choice in getattr(chunk, "choices", None) or []:
+        usage = getattr(choice, "usage", None)
+        if usage:
+            return usage
+    return None
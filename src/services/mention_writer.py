@@ -0,0 +1,156 @@
+"""Bulk persistence of extracted brand/product mentions.
+
+Mentions and extraction debug rows are collected as plain dicts and
+written with one multi-row ``INSERT`` per table (SQLAlchemy batches the
+parameter sets into ``INSERT ... VALUES (...), (...)`` on both SQLite and
+Postgres) instead of one ORM object per mention. Previous rows for a set
+of answers are removed with a single ``DELETE ... WHERE llm_answer_id IN``
+per table. Statements go through ``execute_with_retry`` so SQLite lock
+contention is retried like ``commit_with_retry``/``flush_with_retry``.
+"""
+
+import json
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from models import BrandMention, ExtractionDebug, ProductMention
+from models.db_retry import execute_with_retry, flush_with_retry
+from models.domain import Sentiment
+
+_INSERT_CHUNK_SIZE = 1000
+_DELETE_CHUNK_SIZE = 500
+
+
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _json_list(values: Optional[Iterable]) -> str:
+    return json.dumps(list(values or []), ensure_ascii=False)
+
+
+class MentionWriter:
+    """Collects mention and debug rows for a batch of answers and writes them in bulk."""
+
+    def __init__(self):
+        self.brand_rows: list[dict] = []
+        self.product_rows: list[dict] = []
+        self.debug_rows: list[dict] = []
+
+    def __len__(self) -> int:
+        return len(self.brand_rows) + len(self.product_rows) + len(self.debug_rows)
+
+    @staticmethod
+    def _mention_row(
+        llm_answer_id: int,
+        rank: Optional[int],
+        sentiment: Sentiment,
+        zh_snippets: list[str],
+        en_snippets: list[str],
+    ) -> dict:
+        return {
+            "llm_answer_id": llm_answer_id,
+            "mentioned": True,
+            "rank": rank,
+            "sentiment": sentiment,
+            "evidence_snippets": {"zh": zh_snippets, "en": en_snippets},
+        }
+
+    def add_brand(
+        self,
+        llm_answer_id: int,
+        brand_id: int,
+        rank: Optional[int],
+        sentiment: Sentiment,
+        zh_snippets: list[str],
+        en_snippets: list[str],
+    ) -> None:
+        row = self._mention_row(llm_answer_id, rank, sentiment, zh_snippets, en_snippets)
+        row["brand_id"] = brand_id
+        self.brand_rows.append(row)
+
+    def add_product(
+        self,
+        llm_answer_id: int,
+        product_id: int,
+        rank: Optional[int],
+        sentiment: Sentiment,
+        zh_snippets: list[str],
+        en_snippets: list[str],
+    ) -> None:
+        row = self._mention_row(llm_answer_id, rank, sentiment, zh_snippets, en_snippets)
+        row["product_id"] = product_id
+        self.product_rows.append(row)
+
+    def add_debug(
+        self,
+        llm_answer_id: int,
+        raw_brands=None,
+        raw_products=None,
+        rejected_at_light_filter=None,
+        final_brands=None,
+        final_products=None,
+        extraction_method: str = "qwen",
+    ) -> None:
+        self.debug_rows.append({
+            "llm_answer_id": llm_answer_id,
+            "raw_brands": _json_list(raw_brands),
+            "raw_products": _json_list(raw_products),
+            "rejected_at_light_filter": _json_list(rejected_at_light_filter),
+            "final_brands": _json_list(final_brands),
+            "final_products": _json_list(final_products),
+            "extraction_method": extraction_method,
+        })
+
+    def write(self, db: Session, replace_answer_ids: Iterable[int] = ()) -> int:
+        """Insert the collected rows (without committing); return the row count.
+
+        Pending ORM objects (new answers, discovered brands/products) are
+        flushed first so the foreign keys the rows point at exist. Mentions
+        and debug rows of ``replace_answer_ids`` are deleted after that flush,
+        in the same transaction as the inserts.
+        """
+        written = len(self)
+        replace_answer_ids = list(replace_answer_ids)
+        if not written and not replace_answer_ids:
+            return 0
+        flush_with_retry(db)
+        delete_mentions(db, replace_answer_ids, include_debug=True)
+        for model, rows in (
+            (ExtractionDebug, self.debug_rows),
+            (BrandMention, self.brand_rows),
+            (ProductMention, self.product_rows),
+        ):
+            for chunk in _chunks(rows, _INSERT_CHUNK_SIZE):
+                execute_with_retry(db, insert(model), chunk)
+        self.brand_rows, self.product_rows, self.debug_rows = [], [], []
+        return written
+
+
+def delete_extraction_debug(db: Session, llm_answer_ids: Iterable[int]) -> None:
+    _delete_for_answers(db, (ExtractionDebug,), llm_answer_ids)
+
+
+def delete_mentions(
+    db: Session, llm_answer_ids: Iterable[int], include_debug: bool = False
+) -> None:
+    """Delete brand/product mentions (and optionally debug rows) for many answers."""
+    models = (BrandMention, ProductMention) + ((ExtractionDebug,) if include_debug else ())
+    _delete_for_answers(db, models, llm_answer_ids)
+
+
+def _delete_for_answers(db: Session, models: tuple, llm_answer_ids: Iterable[int]) -> None:
+    ids = sorted({int(answer_id) for answer_id in llm_answer_ids if answer_id is not None})
+    if not ids:
+        return
+    for model in models:
+        for chunk in _chunks(ids, _DELETE_CHUNK_SIZE):
+            execute_with_retry(
+                db,
+                delete(model)
+                .where(model.llm_answer_id.in_(chunk))
+                .execution_options(synchronize_session=False),
+            )
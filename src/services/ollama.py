@@ -1,18 +1,24 @@
 import asyncio
+import json
 import logging
 import re
 import time
-from typing import Optional
+from typing import Awaitable, Callable, Optional, TypeVar
 
 import httpx
 
 from config import settings
 from services.brand_recognition import extract_snippet_with_list_awareness
+from services.llm_cache import cached_llm_call
+from services.llm_streaming import StreamCollector
 from services.mention_ranking import rank_entities
-from services.sentiment_analysis import get_sentiment_service
+from services.sentiment_analysis import get_async_sentiment_client
+from services.sentiment_cache import get_sentiment_cache
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class OllamaOverloadedError(httpx.HTTPStatusError):
     """Raised when Ollama returns 503 (overloaded/busy)."""
@@ -70,7 +76,7 @@ class OllamaService:
 
     def _get_sentiment_service(self):
         if self._sentiment_service is None:
-            self._sentiment_service = get_sentiment_service()
+            self._sentiment_service = get_async_sentiment_client()
         return self._sentiment_service
 
     async def _call_ollama(
@@ -81,8 +87,24 @@ class OllamaService:
         temperature: float = 0.7,
         format: Optional[str] = None,
     ) -> str:
-        url = f"{self.base_url}/api/chat"
+        return await cached_llm_call(
+            f"ollama/{model}",
+            prompt,
+            lambda: self._request_ollama(model, prompt, system_prompt, temperature, format),
+            system_prompt=system_prompt,
+            temperature=temperature,
+            format=format,
+        )
 
+    def _chat_payload(
+        self,
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        format: Optional[str],
+        stream: bool = False,
+    ) -> dict:
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
@@ -91,7 +113,7 @@ class OllamaService:
         payload: dict = {
             "model": model,
             "messages": messages,
-            "stream": False,
+            "stream": stream,
             "think": False,
             "keep_alive": settings.ollama_keep_alive,
             "options": {
@@ -100,21 +122,65 @@ class OllamaService:
         }
         if format:
             payload["format"] = format
+        return payload
+
+    async def _request_ollama(
+        self,
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        format: Optional[str],
+    ) -> str:
+        url = f"{self.base_url}/api/chat"
+        payload = self._chat_payload(model, prompt, system_prompt, temperature, format)
+        client = self._get_client()
+
+        async def _post() -> str:
+            response = await client.post(url, json=payload)
+            _raise_for_ollama_status(response)
+            result = response.json()
+            return result.get("message", {}).get("content", "")
 
+        return await self._with_retries(model, _post)
+
+    async def _stream_ollama(
+        self,
+        model: str,
+        prompt: str,
+        temperature: float,
+        stream: StreamCollector,
+    ) -> tuple[str, int, int, float]:
+        url = f"{self.base_url}/api/chat"
+        payload = self._chat_payload(model, prompt, None, temperature, None, stream=True)
         client = self._get_client()
+
+        async def _consume() -> dict:
+            stream.start()
+            final: dict = {}
+            async with client.stream("POST", url, json=payload) as response:
+                _raise_for_ollama_status(response)
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    chunk = json.loads(line)
+                    stream.feed(chunk.get("message", {}).get("content", ""))
+                    if chunk.get("done"):
+                        final = chunk
+            return final
+
+        final = await self._with_retries(model, _consume)
+        answer = stream.text
+        tokens_in = final.get("prompt_eval_count") or len(prompt) // 2
+        tokens_out = final.get("eval_count") or len(answer) // 2
+        stream.finish(tokens_out)
+        return answer, tokens_in, tokens_out, stream.latency
+
+    async def _with_retries(self, model: str, attempt_fn: Callable[[], Awaitable[T]]) -> T:
         last_exc: Exception | None = None
         for attempt in range(settings.ollama_retry_attempts):
             try:
-                response = await client.post(url, json=payload)
-                if response.status_code == 503:
-                    raise OllamaOverloadedError(
-                        "Ollama overloaded (503)",
-                        request=response.request,
-                        response=response,
-                    )
-                response.raise_for_status()
-                result = response.json()
-                return result.get("message", {}).get("content", "")
+                return await attempt_fn()
             except _RETRYABLE_EXCEPTIONS as exc:
                 last_exc = exc
                 if attempt < settings.ollama_retry_attempts - 1:
@@ -135,17 +201,63 @@ class OllamaService:
         raise last_exc  # type: ignore[misc]
 
     async def classify_sentiment(self, text_zh: str) -> str:
-        if settings.use_erlangshen_sentiment:
-            try:
-                sentiment = self._get_sentiment_service().classify_sentiment(text_zh)
-                logger.debug(f"Erlangshen sentiment analysis: {text_zh[:50]}... -> {sentiment}")
-                return sentiment
-            except Exception as e:
-                logger.error(f"Erlangshen sentiment analysis failed, falling back to Qwen: {e}")
-                return await self._classify_sentiment_with_qwen(text_zh)
-        else:
+        cache = get_sentiment_cache()
+        if cache is not None:
+            cached = await cache.aget(text_zh)
+            if cached is not None:
+                return cached
+        sentiment, reliable = await self._classify_sentiment_uncached(text_zh)
+        if cache is not None and reliable:
+            await cache.aset(text_zh, sentiment)
+        return sentiment
+
+    async def classify_sentiment_batch(self, texts_zh: list[str]) -> list[str]:
+        """Classify many snippets with one model call, reusing cached labels.
+
+        Duplicate texts are classified once. Returns labels in input order.
+        """
+        cache = get_sentiment_cache()
+        labels: dict[str, str] = {}
+        unique = list(dict.fromkeys(t for t in texts_zh if t and t.strip()))
+        if cache is not None:
+            for text in unique:
+                cached = await cache.aget(text)
+                if cached is not None:
+                    labels[text] = cached
+        missing = [t for t in unique if t not in labels]
+        if missing:
+            sentiments, reliable = await self._classify_sentiment_batch_uncached(missing)
+            labels.update(zip(missing, sentiments))
+            if cache is not None and reliable:
+                for text, sentiment in zip(missing, sentiments):
+                    await cache.aset(text, sentiment)
+        return [labels.get(t, "neutral") for t in texts_zh]
+
+    async def _classify_sentiment_batch_uncached(self, texts_zh: list[str]) -> tuple[list[str], bool]:
+        if not settings.use_erlangshen_sentiment:
+            return list(await asyncio.gather(*(self._classify_sentiment_with_qwen(t) for t in texts_zh))), True
+        try:
+            return await self._get_sentiment_service().classify_batch(texts_zh, raise_errors=True), True
+        except httpx.HTTPError:
+            return ["neutral"] * len(texts_zh), False
+        except Exception as e:
+            logger.error(f"Erlangshen batch sentiment failed, falling back to Qwen: {e}")
+            return list(await asyncio.gather(*(self._classify_sentiment_with_qwen(t) for t in texts_zh))), True
+
+    async def _classify_sentiment_uncached(self, text_zh: str) -> tuple[str, bool]:
+        """Return (sentiment, reliable); unreliable results are service-outage defaults."""
+        if not settings.use_erlangshen_sentiment:
             logger.debug("Erlangshen sentiment analysis disabled, using Qwen")
-            return await self._classify_sentiment_with_qwen(text_zh)
+            return await self._classify_sentiment_with_qwen(text_zh), True
+        try:
+            sentiment = await self._get_sentiment_service().classify_sentiment(text_zh, raise_errors=True)
+            logger.debug(f"Erlangshen sentiment analysis: {text_zh[:50]}... -> {sentiment}")
+            return sentiment, True
+        except httpx.HTTPError:
+            return "neutral", False
+        except Exception as e:
+            logger.error(f"Erlangshen sentiment analysis failed, falling back to Qwen: {e}")
+            return await self._classify_sentiment_with_qwen(text_zh), True
 
     async def _classify_sentiment_with_qwen(self, text_zh: str) -> str:
         system_prompt = (
@@ -169,8 +281,15 @@ class OllamaService:
         else:
             return "neutral"
 
-    async def query_main_model(self, prompt_zh: str, model_name: Optional[str] = None) -> tuple[str, int, int, float]:
+    async def query_main_model(
+        self,
+        prompt_zh: str,
+        model_name: Optional[str] = None,
+        stream: Optional[StreamCollector] = None,
+    ) -> tuple[str, int, int, float]:
         model_to_use = model_name or self.main_model
+        if stream is not None:
+            return await self._stream_ollama(model_to_use, prompt_zh, 0.7, stream)
         start_time = time.time()
         
         response = await self._call_ollama(
@@ -219,6 +338,16 @@ class OllamaService:
         )
 
 
+def _raise_for_ollama_status(response: httpx.Response) -> None:
+    if response.status_code == 503:
+        raise OllamaOverloadedError(
+            "Ollama overloaded (503)",
+            request=response.request,
+            response=response,
+        )
+    response.raise_for_status()
+
+
 def _flatten_variants(names: list[str], aliases: list[list[str]]) -> list[str]:
     seen: set[str] = set()
     result: list[str] = []
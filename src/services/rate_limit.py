@@ -0,0 +1,245 @@
+"""Cluster-wide request and token budgets for remote LLM providers.
+
+Budgets live in Redis so every Celery worker draws from the same
+requests-per-minute / tokens-per-minute buckets for a provider + API key.
+When several runs compete for a bucket, a run that has already used its
+fair share of the current minute yields to runs that are waiting.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from config import settings
+from models.domain import LLMProvider
+from services.llm_client_pool import api_key_fingerprint
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "dragonlens:ratelimit"
+WAITING_TTL_SECONDS = 5.0
+FAIR_SHARE_RETRY_SECONDS = 0.25
+MIN_WAIT_SECONDS = 0.05
+STATE_TTL_SECONDS = 3600
+
+
+class RateBudgetTimeout(RuntimeError):
+    """Raised when a provider budget could not be acquired within the max wait."""
+
+
+@dataclass(frozen=True)
+class RateBudget:
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+
+    @property
+    def is_unlimited(self) -> bool:
+        return not self.requests_per_minute and not self.tokens_per_minute
+
+
+@dataclass(frozen=True)
+class RatePermit:
+    bucket: str
+    run_key: str
+    estimated_tokens: int
+
+
+_PROVIDER_BUDGETS = {
+    LLMProvider.DEEPSEEK: lambda: RateBudget(
+        settings.deepseek_requests_per_minute, settings.deepseek_tokens_per_minute
+    ),
+    LLMProvider.KIMI: lambda: RateBudget(
+        settings.kimi_requests_per_minute, settings.kimi_tokens_per_minute
+    ),
+    LLMProvider.OPENROUTER: lambda: RateBudget(
+        settings.openrouter_requests_per_minute, settings.openrouter_tokens_per_minute
+    ),
+}
+
+
+def budget_for(provider: LLMProvider) -> RateBudget:
+    getter = _PROVIDER_BUDGETS.get(provider)
+    return getter() if getter else RateBudget()
+
+
+def estimate_tokens(prompt: str, max_output_tokens: Optional[int] = None) -> int:
+    output = max_output_tokens or settings.llm_rate_limit_default_output_tokens
+    return max(1, len(prompt or "") // 2) + output
+
+
+def bucket_name(provider: LLMProvider, api_key: str) -> str:
+    return f"{provider.value}:{api_key_fingerprint(api_key)}"
+
+
+def _to_float(value, default: float) -> float:
+    if value is None:
+        return default
+    if isinstance(value, bytes):
+        value = value.decode()
+    return float(value)
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+class RedisTokenBucket:
+    """Two refilling buckets (requests, tokens) per provider key, stored in one Redis hash."""
+
+    def __init__(self, redis_client, clock: Callable[[], float] = time.time):
+        self.redis = redis_client
+        self.clock = clock
+
+    def _keys(self, bucket: str) -> tuple[str, str, str]:
+        window = int(self.clock() // 60)
+        base = f"{KEY_PREFIX}:{bucket}"
+        return f"{base}:state", f"{base}:waiting", f"{base}:usage:{window}"
+
+    def try_acquire(self, bucket: str, budget: RateBudget, tokens: int, run_key: str) -> float:
+        """Take one request and `tokens` tokens. Returns 0.0 on success, else seconds to wait."""
+        import redis
+
+        state_key, waiting_key, usage_key = self._keys(bucket)
+        with self.redis.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(state_key, waiting_key, usage_key)
+                    now = self.clock()
+                    levels = self._refilled_levels(pipe.hgetall(state_key), budget, now)
+                    wait = self._fair_share_wait(pipe, waiting_key, usage_key, budget, run_key, now)
+                    if not wait:
+                        wait = self._deficit_wait(levels, budget, tokens)
+                    pipe.multi()
+                    if wait:
+                        # Score is the expected retry time so long waits stay registered.
+                        pipe.zadd(waiting_key, {run_key: now + wait})
+                        pipe.expire(waiting_key, STATE_TTL_SECONDS)
+                    else:
+                        self._store_levels(pipe, state_key, levels, tokens, now)
+                        pipe.zrem(waiting_key, run_key)
+                        pipe.hincrby(usage_key, run_key, 1)
+                        pipe.expire(usage_key, 120)
+                    pipe.execute()
+                    return wait
+                except redis.WatchError:
+                    continue
+
+    def refund(self, bucket: str, budget: RateBudget, tokens: int) -> None:
+        """Return over-estimated tokens (negative values charge extra usage)."""
+        if not budget.tokens_per_minute or not tokens:
+            return
+        state_key = self._keys(bucket)[0]
+        if self.redis.hexists(state_key, "tokens"):
+            self.redis.hincrbyfloat(state_key, "tokens", tokens)
+
+    def _refilled_levels(self, state: dict, budget: RateBudget, now: float) -> dict[str, float]:
+        state = {_decode(k): v for k, v in (state or {}).items()}
+        last = _to_float(state.get("ts"), now)
+        elapsed = max(0.0, now - last)
+        levels: dict[str, float] = {}
+        for field, per_minute in (("requests", budget.requests_per_minute), ("tokens", budget.tokens_per_minute)):
+            if not per_minute:
+                continue
+            capacity = float(per_minute)
+            current = _to_float(state.get(field), capacity)
+            levels[field] = min(capacity, current + elapsed * capacity / 60.0)
+        return levels
+
+    def _deficit_wait(self, levels: dict[str, float], budget: RateBudget, tokens: int) -> float:
+        wait = 0.0
+        needs = (("requests", 1, budget.requests_per_minute), ("tokens", tokens, budget.tokens_per_minute))
+        for field, need, per_minute in needs:
+            if not per_minute:
+                continue
+            need = min(need, per_minute)
+            missing = need - levels[field]
+            if missing > 0:
+                wait = max(wait, missing * 60.0 / per_minute)
+        return max(wait, MIN_WAIT_SECONDS) if wait else 0.0
+
+    def _fair_share_wait(self, pipe, waiting_key: str, usage_key: str, budget: RateBudget, run_key: str, now: float) -> float:
+        if not budget.requests_per_minute:
+            return 0.0
+        waiting = {_decode(m) for m in pipe.zrangebyscore(waiting_key, now - WAITING_TTL_SECONDS, "+inf")}
+        others = waiting - {run_key}
+        if not others:
+            return 0.0
+        usage = {_decode(k): int(v) for k, v in pipe.hgetall(usage_key).items()}
+        active = len(others | {run_key} | set(usage))
+        fair_share = max(1.0, budget.requests_per_minute / active)
+        if usage.get(run_key, 0) < fair_share:
+            return 0.0
+        return FAIR_SHARE_RETRY_SECONDS
+
+    def _store_levels(self, pipe, state_key: str, levels: dict[str, float], tokens: int, now: float) -> None:
+        mapping: dict[str, float] = {"ts": now}
+        if "requests" in levels:
+            mapping["requests"] = levels["requests"] - 1
+        if "tokens" in levels:
+            mapping["tokens"] = levels["tokens"] - tokens
+        pipe.hset(state_key, mapping=mapping)
+        pipe.expire(state_key, STATE_TTL_SECONDS)
+
+
+class ProviderRateLimiter:
+    """Async front-end that waits on a RedisTokenBucket without blocking the event loop."""
+
+    def __init__(self, bucket: RedisTokenBucket, max_wait: Optional[float] = None):
+        self.bucket = bucket
+        self.max_wait = settings.llm_rate_limit_max_wait_seconds if max_wait is None else max_wait
+
+    async def acquire(
+        self,
+        provider: LLMProvider,
+        api_key: str,
+        estimated_tokens: int,
+        run_id: Optional[int] = None,
+    ) -> Optional[RatePermit]:
+        budget = budget_for(provider)
+        if budget.is_unlimited:
+            return None
+        bucket = bucket_name(provider, api_key)
+        run_key = str(run_id) if run_id is not None else "adhoc"
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            try:
+                wait = await asyncio.to_thread(self.bucket.try_acquire, bucket, budget, estimated_tokens, run_key)
+            except Exception as exc:
+                logger.warning("Rate limiter unavailable for %s, sending unthrottled: %s", provider.value, exc)
+                return None
+            if not wait:
+                return RatePermit(bucket, run_key, estimated_tokens)
+            if time.monotonic() + wait > deadline:
+                raise RateBudgetTimeout(
+                    f"{provider.value} rate budget not available within {self.max_wait:.0f}s"
+                )
+            logger.debug("Rate budget for %s exhausted, run=%s waiting %.2fs", bucket, run_key, wait)
+            await asyncio.sleep(wait)
+
+    async def settle(self, provider: LLMProvider, permit: Optional[RatePermit], actual_tokens: int) -> None:
+        if permit is None:
+            return
+        try:
+            await asyncio.to_thread(
+                self.bucket.refund, permit.bucket, budget_for(provider), permit.estimated_tokens - actual_tokens
+            )
+        except Exception as exc:
+            logger.warning("Failed to settle rate budget for %s: %s", permit.bucket, exc)
+
+
+_rate_limiter: Optional[ProviderRateLimiter] = None
+
+
+def get_provider_rate_limiter() -> Optional[ProviderRateLimiter]:
+    """Return the process-wide limiter, or None when rate limiting is disabled."""
+    global _rate_limiter
+    if not settings.llm_rate_limit_enabled:
+        return None
+    if _rate_limiter is None:
+        import redis
+
+        client = redis.from_url(settings.redis_url)
+        _rate_limiter = ProviderRateLimiter(RedisTokenBucket(client))
+    return _rate_limiter
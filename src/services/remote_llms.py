@@ -4,13 +4,14 @@ import time
 from dataclasses import dataclass
 from typing import Optional
 
-import httpx
-from openai import APIConnectionError, APIStatusError, APITimeoutError, AsyncOpenAI, RateLimitError
+from openai import APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
 from sqlalchemy.orm import Session
 
 from config import settings
 from models.domain import LLMProvider, LLMRoute
 from services.base_llm import BaseLLMService, OpenAICompatibleService
+from services.llm_streaming import StreamCollector
+from services.rate_limit import ProviderRateLimiter, estimate_tokens, get_provider_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -102,10 +103,23 @@ class KimiService(OpenAICompatibleService):
             )
         return self._parse_openai_response(response, latency)
 
+    def _stream_request_kwargs(self, request_kwargs: dict) -> dict:
+        # Moonshot reports usage on the final choice instead of via stream_options.
+        return {**request_kwargs, "stream": True}
+
+    async def _query_streaming(self, client, request_kwargs: dict, stream: StreamCollector) -> tuple[str, int, int, float]:
+        answer = await super()._query_streaming(client, request_kwargs, stream)
+        if not answer[0] and stream.reasoning_chars:
+            raise KimiReasoningOnlyError(
+                "Kimi returned reasoning_content without final content"
+            )
+        return answer
+
     async def query(
         self,
         prompt_zh: str,
         model_name: Optional[str] = None,
+        stream: Optional[StreamCollector] = None,
         **kwargs,
     ) -> tuple[str, int, int, float]:
         api_key = self._get_api_key()
@@ -135,15 +149,12 @@ class KimiService(OpenAICompatibleService):
         )
 
         attempts = max(1, settings.kimi_retry_attempts)
+        client = self._get_openai_client(api_key)
         start_time = time.time()
         for attempt in range(attempts):
-            http_client = httpx.AsyncClient(timeout=httpx.Timeout(120.0, connect=30.0))
-            client = AsyncOpenAI(
-                api_key=api_key,
-                base_url=self.api_base,
-                http_client=http_client,
-            )
             try:
+                if stream is not None:
+                    return await self._query_streaming(client, request_kwargs, stream)
                 response = await client.chat.completions.create(**request_kwargs)
                 latency = time.time() - start_time
                 return self._parse_kimi_response(response, latency)
@@ -162,8 +173,6 @@ class KimiService(OpenAICompatibleService):
                     delay,
                 )
                 await asyncio.sleep(delay)
-            finally:
-                await http_client.aclose()
 
         raise RuntimeError("Kimi request retry loop exited without returning a response")
 
@@ -183,11 +192,13 @@ class LLMResolution:
     service: Optional[BaseLLMService]
     model_name: str
     route: LLMRoute
+    api_key: Optional[str] = None
 
 
 class LLMRouter:
-    def __init__(self, db: Optional[Session] = None):
+    def __init__(self, db: Optional[Session] = None, run_id: Optional[int] = None):
         self.db = db
+        self.run_id = run_id
         self._services: dict[LLMProvider, BaseLLMService] = {}
 
     def _get_service(self, provider: LLMProvider) -> BaseLLMService:
@@ -214,31 +225,75 @@ class LLMRouter:
 
     def _resolve_vendor(self, provider: LLMProvider, model_name: str) -> LLMResolution:
         vendor_service = self._get_service(provider)
-        if vendor_service.has_api_key():
-            return LLMResolution(vendor_service, model_name, LLMRoute.VENDOR)
+        api_key = vendor_service._find_api_key()
+        if api_key:
+            return LLMResolution(vendor_service, model_name, LLMRoute.VENDOR, api_key)
         return self._resolve_openrouter(model_name)
 
     def _resolve_openrouter(self, model_name: str) -> LLMResolution:
         service = self._get_service(LLMProvider.OPENROUTER)
-        if not service.has_api_key():
+        api_key = service._find_api_key()
+        if not api_key:
             raise ValueError("No active openrouter API key found")
-        return LLMResolution(service, _normalize_openrouter_model(model_name), LLMRoute.OPENROUTER)
+        return LLMResolution(
+            service, _normalize_openrouter_model(model_name), LLMRoute.OPENROUTER, api_key
+        )
 
-    async def _query_local(self, prompt_zh: str, model_name: str) -> tuple[str, int, int, float]:
+    async def _query_local(
+        self,
+        prompt_zh: str,
+        model_name: str,
+        stream: Optional[StreamCollector] = None,
+    ) -> tuple[str, int, int, float]:
         from services.ollama import OllamaService
         ollama = OllamaService()
-        return await ollama.query_main_model(prompt_zh, model_name)
+        if stream is None:
+            return await ollama.query_main_model(prompt_zh, model_name)
+        return await ollama.query_main_model(prompt_zh, model_name, stream=stream)
 
     async def query_with_resolution(
         self,
         resolution: LLMResolution,
         prompt_zh: str,
+        stream: Optional[StreamCollector] = None,
     ) -> tuple[str, int, int, float]:
         if resolution.route == LLMRoute.LOCAL:
-            return await self._query_local(prompt_zh, resolution.model_name)
+            return await self._query_local(prompt_zh, resolution.model_name, stream)
         if not resolution.service:
             raise ValueError("No service available for route")
-        return await resolution.service.query(prompt_zh, resolution.model_name)
+        rate_limiter = get_provider_rate_limiter()
+        if rate_limiter is None:
+            return await self._query_service(resolution, prompt_zh, stream)
+        return await self._query_with_budget(rate_limiter, resolution, prompt_zh, stream)
+
+    async def _query_service(
+        self,
+        resolution: LLMResolution,
+        prompt_zh: str,
+        stream: Optional[StreamCollector],
+    ) -> tuple[str, int, int, float]:
+        if stream is None:
+            return await resolution.service.query(prompt_zh, resolution.model_name)
+        return await resolution.service.query(prompt_zh, resolution.model_name, stream=stream)
+
+    async def _query_with_budget(
+        self,
+        rate_limiter: ProviderRateLimiter,
+        resolution: LLMResolution,
+        prompt_zh: str,
+        stream: Optional[StreamCollector] = None,
+    ) -> tuple[str, int, int, float]:
+        service = resolution.service
+        api_key = resolution.api_key or service._get_api_key()
+        estimated = estimate_tokens(prompt_zh, getattr(service, "max_tokens", None))
+        permit = await rate_limiter.acquire(service.provider, api_key, estimated, self.run_id)
+        used = estimated
+        try:
+            answer = await self._query_service(resolution, prompt_zh, stream)
+            used = answer[1] + answer[2] or estimated
+            return answer
+        finally:
+            await rate_limiter.settle(service.provider, permit, used)
 
     async def query(
         self,
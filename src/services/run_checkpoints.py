@@ -0,0 +1,111 @@
+"""Per-stage checkpoints for ``finalize_run``.
+
+Each finalize stage commits its own work; once it returns, a
+``RunFinalizeStage`` row records the stage as done together with its
+(JSON) output and duration. A retried or reprocessed finalize skips the
+stages that already have a row and resumes from the first one that does
+not, reusing stored outputs (e.g. the normalized brand map) instead of
+recomputing them with the LLM.
+"""
+
+import logging
+import time
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from models import RunFinalizeStage
+from models.db_retry import commit_with_retry
+
+logger = logging.getLogger(__name__)
+
+FINALIZE_STAGES = (
+    "results",
+    "english_backfill",
+    "enhanced_consolidation",
+    "vertical_gate",
+    "entity_consolidation",
+    "product_brand_mapping",
+    "run_metrics",
+    "product_metrics",
+    "comparison",
+    "vertical_auto_match",
+    "latest_metrics",
+)
+
+
+class FinalizeCheckpoints:
+    """Run finalize stages at most once per run, recording outputs and timings."""
+
+    def __init__(self, db: Session, run_id: int, clock: Callable[[], float] = time.monotonic):
+        self.db = db
+        self.run_id = run_id
+        self.clock = clock
+        self.current_stage: Optional[str] = None
+        self._done = {
+            row.stage: row
+            for row in db.query(RunFinalizeStage).filter(RunFinalizeStage.run_id == run_id).all()
+        }
+
+    def completed(self, stage: str) -> bool:
+        return stage in self._done
+
+    def output(self, stage: str) -> Optional[dict]:
+        row = self._done.get(stage)
+        return row.output if row else None
+
+    def run(self, stage: str, fn: Callable[[], Optional[dict]]) -> Optional[dict]:
+        """Run ``fn`` unless ``stage`` is already checkpointed; return its output."""
+        if stage not in FINALIZE_STAGES:
+            raise ValueError(f"Unknown finalize stage: {stage}")
+        if stage in self._done:
+            logger.info("[FINALIZE] run=%d stage=%s already done, skipping", self.run_id, stage)
+            return self._done[stage].output
+        self.current_stage = stage
+        started = self.clock()
+        output = fn()
+        row = RunFinalizeStage(
+            run_id=self.run_id,
+            stage=stage,
+            output=output,
+            duration_seconds=round(self.clock() - started, 3),
+        )
+        self.db.add(row)
+        commit_with_retry(self.db)
+        self._done[stage] = row
+        self.current_stage = None
+        logger.info(
+            "[FINALIZE] run=%d stage=%s done in %.2fs", self.run_id, stage, row.duration_seconds
+        )
+        return output
+
+    def durations(self) -> dict[str, float]:
+        return {
+            stage: self._done[stage].duration_seconds
+            for stage in FINALIZE_STAGES
+            if stage in self._done
+        }
+
+
+def finalize_stage_rows(db: Session, run_id: int) -> list[RunFinalizeStage]:
+    rows = db.query(RunFinalizeStage).filter(RunFinalizeStage.run_id == run_id).all()
+    order = {stage: index for index, stage in enumerate(FINALIZE_STAGES)}
+    return sorted(rows, key=lambda row: order.get(row.stage, len(order)))
+
+
+def first_incomplete_stage(db: Session, run_id: int) -> Optional[str]:
+    done = {row.stage for row in finalize_stage_rows(db, run_id)}
+    return next((stage for stage in FINALIZE_STAGES if stage not in done), None)
+
+
+def can_resume_finalize(db: Session, run_id: int) -> bool:
+    """True when finalize got past loading results but did not finish."""
+    done = {row.stage for row in finalize_stage_rows(db, run_id)}
+    return "results" in done and not set(FINALIZE_STAGES) <= done
+
+
+def clear_finalize_checkpoints(db: Session, run_id: int) -> None:
+    db.query(RunFinalizeStage).filter(RunFinalizeStage.run_id == run_id).delete(
+        synchronize_session=False
+    )
+    commit_with_retry(db)
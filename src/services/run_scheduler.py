@@ -0,0 +1,166 @@
+"""Fair-share dispatch priorities for concurrent runs.
+
+Every active run has a virtual time in a Redis sorted set. Dispatching a
+prompt chain advances it by ``1 / weight``, so a run with weight 2 may
+dispatch twice as many chains as a run with weight 1 for the same virtual
+time. A chain's Celery priority is how far its run is ahead of the
+slowest active run, in quanta: a run that just joined (or has fallen
+behind) gets priority 0, so its chains are consumed before chains that
+runs far ahead of it dispatch afterwards. With the Redis broker's
+priority queues this yields weighted round-robin across runs instead of
+FIFO per queue.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_LEVELS = 10
+
+ACTIVE_KEY = "dragonlens:scheduler:active"
+WEIGHTS_KEY = "dragonlens:scheduler:weights"
+SEEN_KEY = "dragonlens:scheduler:seen"
+
+
+def priority_level(
+    virtual_time: float,
+    min_virtual_time: float,
+    quantum: float,
+    levels: int = PRIORITY_LEVELS,
+) -> int:
+    """Map a run's lead over the slowest active run to a priority (0 = first)."""
+    lead = max(0.0, virtual_time - min_virtual_time)
+    return min(levels - 1, int(lead // max(quantum, 1e-9)))
+
+
+@dataclass
+class RunShare:
+    run_id: int
+    virtual_time: float
+    weight: float
+
+
+class FairShareScheduler:
+    """Weighted virtual-time accounting for active runs, shared through Redis."""
+
+    def __init__(
+        self,
+        redis_client,
+        quantum: float = 5.0,
+        idle_seconds: float = 3600.0,
+        levels: int = PRIORITY_LEVELS,
+        clock=time.time,
+    ):
+        self.redis = redis_client
+        self.quantum = quantum
+        self.idle_seconds = idle_seconds
+        self.levels = levels
+        self.clock = clock
+
+    def _min_virtual_time(self) -> float:
+        lowest = self.redis.zrange(ACTIVE_KEY, 0, 0, withscores=True)
+        return float(lowest[0][1]) if lowest else 0.0
+
+    def _join_virtual_time(self, run_id: int) -> float:
+        others = [
+            float(score)
+            for member, score in self.redis.zrange(ACTIVE_KEY, 0, -1, withscores=True)
+            if int(member) != run_id
+        ]
+        if not others:
+            return 0.0
+        return max(0.0, max(others) - self.quantum * (self.levels - 1))
+
+    def prune_idle(self) -> list[int]:
+        """Forget runs that have not dispatched anything for ``idle_seconds``."""
+        cutoff = self.clock() - self.idle_seconds
+        stale = [int(m) for m in self.redis.zrangebyscore(SEEN_KEY, "-inf", cutoff)]
+        for run_id in stale:
+            self.finish_run(run_id)
+        if stale:
+            logger.info("[scheduler] dropped idle runs %s", stale)
+        return stale
+
+    def register_run(self, run_id: int, weight: float = 1.0) -> None:
+        """Join (or re-join) the active set.
+
+        A new run starts up to ``levels - 1`` quanta behind the leading run,
+        so it gets precedence long enough to finish a small run but cannot
+        starve a long one indefinitely.
+        """
+        self.prune_idle()
+        start = self._join_virtual_time(run_id)
+        with self.redis.pipeline() as pipe:
+            pipe.zadd(ACTIVE_KEY, {run_id: start})
+            pipe.hset(WEIGHTS_KEY, run_id, max(float(weight), 0.1))
+            pipe.zadd(SEEN_KEY, {run_id: self.clock()})
+            pipe.execute()
+
+    def next_priority(self, run_id: int) -> int:
+        """Account one dispatched chain for ``run_id`` and return its priority."""
+        import redis
+
+        while True:
+            with self.redis.pipeline() as pipe:
+                try:
+                    pipe.watch(ACTIVE_KEY)
+                    virtual_time = pipe.zscore(ACTIVE_KEY, run_id)
+                    weight = float(pipe.hget(WEIGHTS_KEY, run_id) or 1.0)
+                    min_virtual_time = self._min_virtual_time()
+                    if virtual_time is None:
+                        virtual_time = min_virtual_time
+                    pipe.multi()
+                    pipe.zadd(ACTIVE_KEY, {run_id: float(virtual_time) + 1.0 / weight})
+                    pipe.zadd(SEEN_KEY, {run_id: self.clock()})
+                    pipe.execute()
+                    break
+                except redis.WatchError:
+                    continue
+        return priority_level(float(virtual_time), min_virtual_time, self.quantum, self.levels)
+
+    def finish_run(self, run_id: int) -> None:
+        with self.redis.pipeline() as pipe:
+            pipe.zrem(ACTIVE_KEY, run_id)
+            pipe.hdel(WEIGHTS_KEY, run_id)
+            pipe.zrem(SEEN_KEY, run_id)
+            pipe.execute()
+
+    def shares(self) -> list[RunShare]:
+        weights = {int(k): float(v) for k, v in self.redis.hgetall(WEIGHTS_KEY).items()}
+        return [
+            RunShare(int(member), float(score), weights.get(int(member), 1.0))
+            for member, score in self.redis.zrange(ACTIVE_KEY, 0, -1, withscores=True)
+        ]
+
+
+_scheduler: Optional[FairShareScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_run_scheduler() -> Optional[FairShareScheduler]:
+    """Return the process-wide scheduler, or None when fair scheduling is disabled."""
+    global _scheduler
+    if not settings.fair_scheduling_enabled:
+        return None
+    with _scheduler_lock:
+        if _scheduler is None:
+            from services.run_state import get_run_state_store
+
+            _scheduler = FairShareScheduler(
+                get_run_state_store().redis,
+                quantum=settings.fair_scheduling_quantum,
+                idle_seconds=settings.fair_scheduling_idle_seconds,
+            )
+        return _scheduler
+
+
+def reset_run_scheduler(scheduler: Optional[FairShareScheduler] = None) -> None:
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = scheduler
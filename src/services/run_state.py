@@ -0,0 +1,184 @@
+"""Redis-backed run state: chord batch results and per-run progress counters.
+
+All workers share one connection pool per process. Batch results are
+appended with a single multi-value ``RPUSH`` inside a pipeline, and
+progress lives in a per-run hash updated with ``HINCRBY`` so the API can
+report progress without querying the database.
+"""
+
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+RUN_STATE_TTL_SECONDS = 86400
+
+PROGRESS_FIELDS = ("total", "answered", "extracted", "failed", "batches_completed")
+
+
+def results_key(run_id: int) -> str:
+    return f"dragonlens:run:{run_id}:batch_results"
+
+
+def progress_key(run_id: int) -> str:
+    return f"dragonlens:run:{run_id}:progress"
+
+
+@dataclass
+class RunProgress:
+    run_id: int
+    total: int = 0
+    answered: int = 0
+    extracted: int = 0
+    failed: int = 0
+    batches_completed: int = 0
+    started_at: Optional[float] = None
+    updated_at: Optional[float] = None
+
+    @property
+    def done(self) -> int:
+        return self.extracted + self.failed
+
+    def as_dict(self) -> dict:
+        return {
+            "run_id": self.run_id,
+            "total": self.total,
+            "answered": self.answered,
+            "extracted": self.extracted,
+            "failed": self.failed,
+            "batches_completed": self.batches_completed,
+            "started_at": self.started_at,
+            "updated_at": self.updated_at,
+        }
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+class RunStateStore:
+    """Run results and progress counters on top of one Redis client."""
+
+    def __init__(self, redis_client, ttl_seconds: int = RUN_STATE_TTL_SECONDS, clock=time.time):
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+
+    def begin_run(self, run_id: int, total_prompts: int) -> None:
+        """Reset results and counters for a (re)started run."""
+        key = progress_key(run_id)
+        now = self.clock()
+        with self.redis.pipeline() as pipe:
+            pipe.delete(results_key(run_id), key)
+            pipe.hset(
+                key,
+                mapping={"total": total_prompts, "kb_version": 0, "started_at": now, "updated_at": now},
+            )
+            pipe.expire(key, self.ttl_seconds)
+            pipe.execute()
+
+    def store_results(self, key: str, results: list[dict]) -> None:
+        if not results:
+            return
+        with self.redis.pipeline() as pipe:
+            pipe.rpush(key, *(json.dumps(result) for result in results))
+            pipe.expire(key, self.ttl_seconds)
+            pipe.execute()
+
+    def load_results(self, key: str) -> list[dict]:
+        return [json.loads(item) for item in self.redis.lrange(key, 0, -1)]
+
+    def clear_results(self, key: str) -> None:
+        self.redis.delete(key)
+
+    def increment(self, run_id: int, **counters: int) -> None:
+        """Atomically add to progress counters; failures are logged, not raised."""
+        counters = {name: amount for name, amount in counters.items() if amount}
+        if not counters:
+            return
+        unknown = set(counters) - set(PROGRESS_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown run progress counters: {sorted(unknown)}")
+        key = progress_key(run_id)
+        try:
+            with self.redis.pipeline() as pipe:
+                for name, amount in counters.items():
+                    pipe.hincrby(key, name, amount)
+                pipe.hset(key, "updated_at", self.clock())
+                pipe.expire(key, self.ttl_seconds)
+                pipe.execute()
+        except Exception as exc:
+            logger.warning("Failed to update progress for run %s: %s", run_id, exc)
+
+    def add_stats(self, run_id: int, group: str, counts: dict[str, int]) -> None:
+        """Add to a named group of per-run counters stored in the progress hash."""
+        counts = {name: amount for name, amount in counts.items() if amount}
+        if not counts:
+            return
+        key = progress_key(run_id)
+        with self.redis.pipeline() as pipe:
+            for name, amount in counts.items():
+                pipe.hincrby(key, f"{group}:{name}", amount)
+            pipe.expire(key, self.ttl_seconds)
+            pipe.execute()
+
+    def stats(self, run_id: int, group: str) -> dict[str, int]:
+        prefix = f"{group}:"
+        raw = self.redis.hgetall(progress_key(run_id))
+        fields = {_decode(k): _decode(v) for k, v in raw.items()}
+        return {name[len(prefix):]: int(value) for name, value in fields.items() if name.startswith(prefix)}
+
+    def bump_kb_version(self, run_id: int) -> int:
+        """Mark one more consolidation pass as written to the knowledge DB."""
+        key = progress_key(run_id)
+        with self.redis.pipeline() as pipe:
+            pipe.hincrby(key, "kb_version", 1)
+            pipe.expire(key, self.ttl_seconds)
+            version, _ = pipe.execute()
+        return int(version)
+
+    def kb_version(self, run_id: int) -> int:
+        return int(self.redis.hget(progress_key(run_id), "kb_version") or 0)
+
+    def progress(self, run_id: int) -> Optional[RunProgress]:
+        raw = self.redis.hgetall(progress_key(run_id))
+        if not raw:
+            return None
+        values = {_decode(k): _decode(v) for k, v in raw.items()}
+        progress = RunProgress(run_id=run_id)
+        for name in PROGRESS_FIELDS:
+            setattr(progress, name, int(values.get(name, 0)))
+        for name in ("started_at", "updated_at"):
+            if name in values:
+                setattr(progress, name, float(values[name]))
+        return progress
+
+
+_store: Optional[RunStateStore] = None
+_store_lock = threading.Lock()
+
+
+def get_run_state_store() -> RunStateStore:
+    """Return the process-wide store backed by a shared connection pool."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            import redis
+
+            pool = redis.ConnectionPool.from_url(
+                settings.redis_url, max_connections=settings.run_state_redis_max_connections
+            )
+            _store = RunStateStore(redis.Redis(connection_pool=pool))
+        return _store
+
+
+def reset_run_state_store(store: Optional[RunStateStore] = None) -> None:
+    global _store
+    with _store_lock:
+        _store = store
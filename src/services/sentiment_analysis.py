@@ -1,4 +1,7 @@
+import asyncio
 import logging
+import threading
+from dataclasses import dataclass
 from typing import Optional, Dict, Any
 
 import httpx
@@ -8,6 +11,7 @@ from config import settings
 logger = logging.getLogger(__name__)
 
 _sentiment_client_instance: Optional["SentimentClient"] = None
+_async_sentiment_client_instance: Optional["AsyncSentimentClient"] = None
 
 
 def get_sentiment_service() -> "SentimentClient":
@@ -17,6 +21,17 @@ def get_sentiment_service() -> "SentimentClient":
     return _sentiment_client_instance
 
 
+def get_async_sentiment_client() -> "AsyncSentimentClient":
+    global _async_sentiment_client_instance
+    if _async_sentiment_client_instance is None:
+        _async_sentiment_client_instance = AsyncSentimentClient()
+    return _async_sentiment_client_instance
+
+
+def _sentiment_timeout() -> httpx.Timeout:
+    return httpx.Timeout(settings.sentiment_read_timeout, connect=settings.sentiment_connect_timeout)
+
+
 class SentimentClient:
     def __init__(self, base_url: Optional[str] = None):
         self.base_url = base_url or settings.sentiment_service_url
@@ -24,7 +39,7 @@ class SentimentClient:
 
     def _get_client(self) -> httpx.Client:
         if self._http_client is None:
-            self._http_client = httpx.Client(timeout=30.0)
+            self._http_client = httpx.Client(timeout=_sentiment_timeout())
         return self._http_client
 
     def classify_sentiment(self, text: str) -> str:
@@ -50,6 +65,32 @@ class SentimentClient:
             logger.error(f"Sentiment analysis failed: {e}")
             return "neutral"
 
+    def classify_batch(self, texts: list[str]) -> list[str]:
+        """Classify many texts via /sentiment/batch; failures yield "neutral"."""
+        results = ["neutral"] * len(texts)
+        pending = [i for i, text in enumerate(texts) if text and text.strip()]
+        chunk_size = max(1, settings.sentiment_client_batch_size)
+        for start in range(0, len(pending), chunk_size):
+            indices = pending[start:start + chunk_size]
+            for index, sentiment in zip(indices, self._post_batch([texts[i] for i in indices])):
+                results[index] = sentiment
+        return results
+
+    def _post_batch(self, texts: list[str]) -> list[str]:
+        try:
+            response = self._get_client().post(
+                f"{self.base_url}/sentiment/batch",
+                json={"texts": texts},
+            )
+            response.raise_for_status()
+            items = response.json().get("results", [])
+            return [item.get("sentiment", "neutral") for item in items]
+        except httpx.ConnectError:
+            logger.error(f"Sentiment service unavailable at {self.base_url}")
+        except Exception as e:
+            logger.error(f"Batch sentiment analysis failed: {e}")
+        return ["neutral"] * len(texts)
+
     def health_check(self) -> bool:
         try:
             response = self._get_client().get(f"{self.base_url}/health")
@@ -65,3 +106,119 @@ class SentimentClient:
             return {"status": "unavailable"}
         except Exception:
             return {"status": "unavailable"}
+
+
+@dataclass
+class _LoopClient:
+    http_client: httpx.AsyncClient
+    semaphore: asyncio.Semaphore
+
+
+class AsyncSentimentClient:
+    """Non-blocking client for the sentiment service, for use inside event loops.
+
+    Keeps one pooled ``httpx.AsyncClient`` per event loop, like
+    ``LLMClientPool``, so loops sharing this client (the worker bridge, the
+    API server) never drop each other's connections; clients of closed loops
+    are discarded. In-flight requests are capped per loop with a semaphore
+    so a burst of mentions cannot flood the service.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, max_concurrency: Optional[int] = None):
+        self.base_url = base_url or settings.sentiment_service_url
+        self.max_concurrency = max(1, max_concurrency or settings.sentiment_max_concurrency)
+        self._clients: dict[asyncio.AbstractEventLoop, _LoopClient] = {}
+        self._lock = threading.Lock()
+
+    def _loop_client(self) -> _LoopClient:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for stale in [other for other in self._clients if other.is_closed()]:
+                self._clients.pop(stale)
+            entry = self._clients.get(loop)
+            if entry is None or entry.http_client.is_closed:
+                limits = httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                )
+                entry = _LoopClient(
+                    httpx.AsyncClient(timeout=_sentiment_timeout(), limits=limits),
+                    asyncio.Semaphore(self.max_concurrency),
+                )
+                self._clients[loop] = entry
+            return entry
+
+    def _get_client(self) -> httpx.AsyncClient:
+        return self._loop_client().http_client
+
+    async def _post(self, path: str, payload: dict) -> dict:
+        entry = self._loop_client()
+        async with entry.semaphore:
+            response = await entry.http_client.post(f"{self.base_url}{path}", json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    async def classify_sentiment(self, text: str, raise_errors: bool = False) -> str:
+        """Classify one text; on failure return "neutral" unless ``raise_errors``."""
+        if not text or not text.strip():
+            logger.warning("Empty text provided for sentiment analysis")
+            return "neutral"
+
+        try:
+            result = await self._post("/sentiment", {"text": text})
+            sentiment = result.get("sentiment", "neutral")
+            confidence = result.get("confidence", 0.0)
+            logger.debug(f"Sentiment: {text[:50]}... -> {sentiment} ({confidence:.3f})")
+            return sentiment
+        except httpx.ConnectError:
+            logger.error(f"Sentiment service unavailable at {self.base_url}")
+            if raise_errors:
+                raise
+            return "neutral"
+        except Exception as e:
+            logger.error(f"Sentiment analysis failed: {e}")
+            if raise_errors:
+                raise
+            return "neutral"
+
+    async def classify_batch(self, texts: list[str], raise_errors: bool = False) -> list[str]:
+        """Classify texts in chunked batch calls; failed chunks are "neutral" unless ``raise_errors``."""
+        results = ["neutral"] * len(texts)
+        pending = [i for i, text in enumerate(texts) if text and text.strip()]
+        chunk_size = max(1, settings.sentiment_client_batch_size)
+        chunks = [pending[start:start + chunk_size] for start in range(0, len(pending), chunk_size)]
+        outputs = await asyncio.gather(
+            *(self._post_batch([texts[i] for i in chunk], raise_errors) for chunk in chunks)
+        )
+        for chunk, sentiments in zip(chunks, outputs):
+            for index, sentiment in zip(chunk, sentiments):
+                results[index] = sentiment
+        return results
+
+    async def _post_batch(self, texts: list[str], raise_errors: bool = False) -> list[str]:
+        try:
+            result = await self._post("/sentiment/batch", {"texts": texts})
+            return [item.get("sentiment", "neutral") for item in result.get("results", [])]
+        except httpx.ConnectError:
+            logger.error(f"Sentiment service unavailable at {self.base_url}")
+            if raise_errors:
+                raise
+        except Exception as e:
+            logger.error(f"Batch sentiment analysis failed: {e}")
+            if raise_errors:
+                raise
+        return ["neutral"] * len(texts)
+
+    async def health_check(self) -> bool:
+        try:
+            response = await self._get_client().get(f"{self.base_url}/health")
+            return response.status_code == 200
+        except Exception:
+            return False
+
+    async def aclose(self) -> None:
+        """Close the current loop's client."""
+        with self._lock:
+            entry = self._clients.pop(asyncio.get_running_loop(), None)
+        if entry is not None and not entry.http_client.is_closed:
+            await entry.http_client.aclose()
@@ -0,0 +1,193 @@
+"""Memo layer for snippet sentiment, keyed by normalized text and model identity.
+
+Lookups hit a process-local LRU first and then a persistent table in the
+cache database. The model identity covers the primary classifier and its
+fallback, so changing either one invalidates every cached label.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import Column, Float, MetaData, String, Table, delete, select
+from sqlalchemy.engine import Engine
+
+from config import settings
+from services.llm_cache import create_cache_engine
+
+logger = logging.getLogger(__name__)
+
+# Bump when the Qwen sentiment prompt or label parsing changes.
+QWEN_SENTIMENT_PROMPT_VERSION = "v1"
+
+_WHITESPACE = re.compile(r"\s+")
+
+_metadata = MetaData()
+
+sentiment_cache_table = Table(
+    "sentiment_cache",
+    _metadata,
+    Column("key", String(64), primary_key=True),
+    Column("model_identity", String(512), nullable=False, index=True),
+    Column("sentiment", String(16), nullable=False),
+    Column("created_at", Float, nullable=False),
+)
+
+
+def sentiment_model_identity() -> str:
+    qwen = f"qwen:{settings.ollama_model_sentiment}:{QWEN_SENTIMENT_PROMPT_VERSION}"
+    if not settings.use_erlangshen_sentiment:
+        return qwen
+    return f"erlangshen:{settings.erlangshen_sentiment_model}|fallback={qwen}"
+
+
+def normalize_snippet(text: str) -> str:
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text or "")).strip()
+
+
+def sentiment_cache_key(text: str, model_identity: str) -> str:
+    payload = f"{model_identity}\x00{normalize_snippet(text)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    """Two-tier (LRU + SQL) sentiment memo for one model identity."""
+
+    def __init__(self, model_identity: str, engine: Optional[Engine] = None, memory_entries: int = 10000):
+        self.model_identity = model_identity
+        self.engine = engine
+        self.memory_entries = max(1, memory_entries)
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        if engine is not None:
+            _metadata.create_all(engine)
+            self.purge_stale()
+
+    def purge_stale(self) -> int:
+        """Delete persisted labels produced by a different model configuration."""
+        table = sentiment_cache_table
+        with self.engine.begin() as conn:
+            removed = conn.execute(
+                delete(table).where(table.c.model_identity != self.model_identity)
+            ).rowcount or 0
+        if removed:
+            logger.info("Dropped %d sentiment cache entries from previous models", removed)
+        return removed
+
+    def _remember(self, key: str, sentiment: str) -> None:
+        with self._lock:
+            self._memory[key] = sentiment
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        with self._lock:
+            sentiment = self._memory.get(key)
+            if sentiment is not None:
+                self._memory.move_to_end(key)
+            return sentiment
+
+    def _db_get(self, key: str) -> Optional[str]:
+        table = sentiment_cache_table
+        try:
+            with self.engine.connect() as conn:
+                return conn.execute(select(table.c.sentiment).where(table.c.key == key)).scalar()
+        except Exception as exc:
+            logger.warning("Sentiment cache read failed: %s", exc)
+            return None
+
+    def _db_set(self, key: str, sentiment: str) -> None:
+        table = sentiment_cache_table
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(delete(table).where(table.c.key == key))
+                conn.execute(
+                    table.insert().values(
+                        key=key,
+                        model_identity=self.model_identity,
+                        sentiment=sentiment,
+                        created_at=time.time(),
+                    )
+                )
+        except Exception as exc:
+            logger.warning("Sentiment cache write failed: %s", exc)
+
+    def get(self, text: str) -> Optional[str]:
+        if not normalize_snippet(text):
+            return None
+        key = sentiment_cache_key(text, self.model_identity)
+        sentiment = self._memory_get(key)
+        if sentiment is not None or self.engine is None:
+            return sentiment
+        sentiment = self._db_get(key)
+        if sentiment is not None:
+            self._remember(key, sentiment)
+        return sentiment
+
+    def set(self, text: str, sentiment: str) -> None:
+        if not normalize_snippet(text) or not sentiment:
+            return
+        key = sentiment_cache_key(text, self.model_identity)
+        self._remember(key, sentiment)
+        if self.engine is not None:
+            self._db_set(key, sentiment)
+
+    async def aget(self, text: str) -> Optional[str]:
+        if not normalize_snippet(text):
+            return None
+        sentiment = self._memory_get(sentiment_cache_key(text, self.model_identity))
+        if sentiment is not None or self.engine is None:
+            return sentiment
+        return await asyncio.to_thread(self.get, text)
+
+    async def aset(self, text: str, sentiment: str) -> None:
+        if self.engine is None:
+            self.set(text, sentiment)
+            return
+        await asyncio.to_thread(self.set, text, sentiment)
+
+
+_cache_instance: Optional[SentimentCache] = None
+_engine_instance: Optional[Engine] = None
+_engine_url: Optional[str] = None
+_cache_lock = threading.Lock()
+
+
+def _get_engine() -> Optional[Engine]:
+    global _engine_instance, _engine_url
+    url = settings.sentiment_cache_url.strip()
+    if not url or url == "memory://":
+        return None
+    if _engine_instance is None or _engine_url != url:
+        _engine_instance = create_cache_engine(url)
+        _engine_url = url
+    return _engine_instance
+
+
+def get_sentiment_cache() -> Optional[SentimentCache]:
+    """Return the cache for the current model configuration, or None when disabled."""
+    global _cache_instance
+    if not settings.sentiment_cache_enabled:
+        return None
+    identity = sentiment_model_identity()
+    with _cache_lock:
+        if _cache_instance is None or _cache_instance.model_identity != identity:
+            _cache_instance = SentimentCache(
+                identity,
+                engine=_get_engine(),
+                memory_entries=settings.sentiment_cache_memory_entries,
+            )
+        return _cache_instance
+
+
+def reset_sentiment_cache(cache: Optional[SentimentCache] = None) -> None:
+    global _cache_instance
+    with _cache_lock:
+        _cache_instance = cache
@@ -1,8 +1,13 @@
+import asyncio
 import logging
+import time
 from contextlib import asynccontextmanager
+from typing import Callable, Optional
 
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from config import settings
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -10,6 +15,7 @@ logger = logging.getLogger(__name__)
 _model = None
 _tokenizer = None
 _pipeline = None
+_batcher: Optional["MicroBatcher"] = None
 
 
 class SentimentRequest(BaseModel):
@@ -21,6 +27,14 @@ class SentimentResponse(BaseModel):
     confidence: float
 
 
+class SentimentBatchRequest(BaseModel):
+    texts: list[str] = Field(default_factory=list)
+
+
+class SentimentBatchResponse(BaseModel):
+    results: list[SentimentResponse]
+
+
 def _load_model():
     global _model, _tokenizer, _pipeline
     import torch
@@ -47,10 +61,128 @@ def _load_model():
     logger.info("Erlangshen sentiment model loaded successfully")
 
 
+def _to_sentiment(label: str) -> str:
+    label = label.lower()
+    if label in ["positive", "pos"]:
+        return "positive"
+    if label in ["negative", "neg"]:
+        return "negative"
+    return "neutral"
+
+
+def classify_texts(texts: list[str]) -> list[SentimentResponse]:
+    """Run the pipeline over many texts in padding-friendly batches.
+
+    Texts are sorted by length before batching so each padded batch holds
+    similarly sized inputs; results are returned in the original order.
+    """
+    results = [SentimentResponse(sentiment="neutral", confidence=0.0) for _ in texts]
+    pending = [i for i, text in enumerate(texts) if text and text.strip()]
+    if not pending:
+        return results
+    pending.sort(key=lambda i: len(texts[i]))
+    outputs = _pipeline([texts[i] for i in pending], batch_size=settings.sentiment_batch_size)
+    for index, output in zip(pending, outputs):
+        if isinstance(output, list):
+            output = output[0] if output else None
+        if output:
+            results[index] = SentimentResponse(
+                sentiment=_to_sentiment(output["label"]),
+                confidence=output["score"],
+            )
+    return results
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-text requests into one forward pass.
+
+    The first queued request opens a window of ``max_wait`` seconds; everything
+    that arrives in it (up to ``max_batch_size``) is classified together in a
+    worker thread so the event loop keeps accepting requests meanwhile.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[list[str]], list],
+        max_batch_size: int,
+        max_wait: float,
+    ) -> None:
+        self.process = process
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            self._worker = loop.create_task(self._run())
+        return self._queue
+
+    async def submit(self, text: str):
+        queue = self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((text, future))
+        return await future
+
+    async def _collect(self) -> list[tuple[str, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            texts = [text for text, _ in batch]
+            try:
+                results = await asyncio.to_thread(self.process, texts)
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def close(self) -> None:
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+
+def _get_batcher() -> MicroBatcher:
+    global _batcher
+    if _batcher is None:
+        _batcher = MicroBatcher(
+            classify_texts,
+            max_batch_size=settings.sentiment_batch_size,
+            max_wait=settings.sentiment_batch_max_wait_ms / 1000.0,
+        )
+    return _batcher
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     _load_model()
     yield
+    if _batcher is not None:
+        await _batcher.close()
     logger.info("Sentiment service shutting down")
 
 
@@ -79,23 +211,22 @@ async def classify_sentiment(request: SentimentRequest):
         return SentimentResponse(sentiment="neutral", confidence=0.0)
 
     try:
-        results = _pipeline(text)
-        if results and len(results) > 0:
-            label = results[0]["label"].lower()
-            confidence = results[0]["score"]
+        return await _get_batcher().submit(text)
+    except Exception as e:
+        logger.error(f"Sentiment analysis failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-            if label in ["positive", "pos"]:
-                sentiment = "positive"
-            elif label in ["negative", "neg"]:
-                sentiment = "negative"
-            else:
-                sentiment = "neutral"
 
-            return SentimentResponse(sentiment=sentiment, confidence=confidence)
+@app.post("/sentiment/batch", response_model=SentimentBatchResponse)
+async def classify_sentiment_batch(request: SentimentBatchRequest):
+    if _pipeline is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
 
-        return SentimentResponse(sentiment="neutral", confidence=0.0)
+    try:
+        results = await asyncio.to_thread(classify_texts, request.texts)
+        return SentimentBatchResponse(results=results)
     except Exception as e:
-        logger.error(f"Sentiment analysis failed: {e}")
+        logger.error(f"Batch sentiment analysis failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
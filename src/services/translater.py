@@ -1,9 +1,10 @@
-import asyncio
 import json
 import re
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Awaitable, Callable
 
 from prompts import load_prompt
+from services.event_loop_bridge import run_sync
+from services.translation_memory import get_translation_memory
 
 if TYPE_CHECKING:
     from services.ollama import OllamaService
@@ -127,27 +128,59 @@ class TranslaterService:
         vertical_description: str | None,
         override_examples: list[dict] | None = None,
     ) -> dict[tuple[str, str], str]:
+        remembered = await self._remembered_entities(items, vertical_name)
+        pending = [i for i in items if (i["type"], i["name"]) not in remembered]
+        if not pending:
+            return remembered
         examples_json = _examples_json(override_examples)
         results = await _translate_entity_batch(
             self.ollama,
-            items,
+            pending,
             vertical_name,
             vertical_description,
             examples_json=examples_json,
             retry=False,
         )
-        missing = [i for i in items if (i["type"], i["name"]) not in results]
-        if not missing:
-            return results
-        retry_results = await _translate_entity_batch(
-            self.ollama,
-            missing,
-            vertical_name,
-            vertical_description,
-            examples_json=examples_json,
-            retry=True,
-        )
-        return {**results, **retry_results}
+        missing = [i for i in pending if (i["type"], i["name"]) not in results]
+        if missing:
+            retry_results = await _translate_entity_batch(
+                self.ollama,
+                missing,
+                vertical_name,
+                vertical_description,
+                examples_json=examples_json,
+                retry=True,
+            )
+            results = {**results, **retry_results}
+        await self._remember_entities(results, vertical_name)
+        return {**remembered, **results}
+
+    async def _remembered_entities(
+        self, items: list[dict], vertical_name: str
+    ) -> dict[tuple[str, str], str]:
+        memory = get_translation_memory()
+        if memory is None:
+            return {}
+        found: dict[tuple[str, str], str] = {}
+        for entity_type in sorted({i["type"] for i in items}):
+            names = [i["name"] for i in items if i["type"] == entity_type]
+            hits = await memory.alookup_many(
+                names, "Chinese", "English", kind=f"entity_{entity_type}", context=vertical_name
+            )
+            found.update({(entity_type, name): english for name, english in hits.items()})
+        return found
+
+    async def _remember_entities(
+        self, results: dict[tuple[str, str], str], vertical_name: str
+    ) -> None:
+        memory = get_translation_memory()
+        if memory is None or not results:
+            return
+        for entity_type in sorted({t for t, _ in results}):
+            pairs = {name: english for (t, name), english in results.items() if t == entity_type}
+            await memory.astore_many(
+                pairs, "Chinese", "English", kind=f"entity_{entity_type}", context=vertical_name
+            )
 
     def translate_entities_to_english_batch_sync(
         self,
@@ -156,7 +189,7 @@ class TranslaterService:
         vertical_description: str | None,
         override_examples: list[dict] | None = None,
     ) -> dict[tuple[str, str], str]:
-        return asyncio.run(
+        return run_sync(
             self.translate_entities_to_english_batch(
                 items,
                 vertical_name,
@@ -168,22 +201,53 @@ class TranslaterService:
     async def translate_entity(self, name: str) -> str:
         if has_latin_letters(name):
             return name
-        prompt = _build_entity_prompt(name)
-        system_prompt = _entity_system_prompt()
-        return await _translate_with_guardrails(
-            self.ollama, name, prompt, system_prompt, is_entity=True
+        return await self._remembered_call(
+            name,
+            "Chinese",
+            "English",
+            "entity",
+            lambda: _translate_with_guardrails(
+                self.ollama, name, _build_entity_prompt(name), _entity_system_prompt(), is_entity=True
+            ),
         )
 
     def translate_entity_sync(self, name: str) -> str:
-        return asyncio.run(self.translate_entity(name))
+        return run_sync(self.translate_entity(name))
 
     async def translate_text(self, text: str, source_lang: str, target_lang: str) -> str:
-        prompt = _build_text_prompt(text, source_lang, target_lang)
-        system_prompt = _text_system_prompt(source_lang, target_lang)
-        return await _translate_with_guardrails(self.ollama, text, prompt, system_prompt)
+        return await self._remembered_call(
+            text,
+            source_lang,
+            target_lang,
+            "text",
+            lambda: _translate_with_guardrails(
+                self.ollama,
+                text,
+                _build_text_prompt(text, source_lang, target_lang),
+                _text_system_prompt(source_lang, target_lang),
+            ),
+        )
+
+    async def _remembered_call(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        kind: str,
+        translate: Callable[[], Awaitable[str]],
+    ) -> str:
+        memory = get_translation_memory()
+        if memory is None or not text or not text.strip():
+            return await translate()
+        remembered = await memory.alookup_many([text], source_lang, target_lang, kind=kind)
+        if text in remembered:
+            return remembered[text]
+        translated = await translate()
+        await memory.astore_many({text: translated}, source_lang, target_lang, kind=kind)
+        return translated
 
     def translate_text_sync(self, text: str, source_lang: str, target_lang: str) -> str:
-        return asyncio.run(self.translate_text(text, source_lang, target_lang))
+        return run_sync(self.translate_text(text, source_lang, target_lang))
 
     async def translate_batch(
         self,
@@ -210,19 +274,38 @@ class TranslaterService:
         if not need_translation:
             return results
 
-        to_translate = [texts[i] for i in need_translation]
+        memory = get_translation_memory()
+        if memory is not None:
+            remembered = await memory.alookup_many(
+                [texts[i] for i in need_translation], source_lang, target_lang
+            )
+            for i in need_translation:
+                if texts[i] in remembered:
+                    results[i] = remembered[texts[i]]
+                    if cache is not None:
+                        cache[texts[i]] = remembered[texts[i]]
+            need_translation = [i for i in need_translation if texts[i] not in remembered]
+            if not need_translation:
+                return results
+
+        to_translate = list(dict.fromkeys(texts[i] for i in need_translation))
         if len(to_translate) == 1:
             translated = [await self.translate_text(to_translate[0], source_lang, target_lang)]
         else:
             translated = await _translate_batch_internal(
                 self.ollama, to_translate, source_lang, target_lang, max_batch_size
             )
+        by_source = dict(zip(to_translate, translated))
 
-        for idx, trans in zip(need_translation, translated):
+        for idx in need_translation:
+            trans = by_source.get(texts[idx], texts[idx])
             results[idx] = trans
             if cache is not None:
                 cache[texts[idx]] = trans
 
+        if memory is not None and len(to_translate) > 1:
+            await memory.astore_many(by_source, source_lang, target_lang)
+
         return results
 
     def translate_batch_sync(
@@ -233,7 +316,7 @@ class TranslaterService:
         max_batch_size: int = 20,
         cache: dict[str, str] | None = None,
     ) -> list[str]:
-        return asyncio.run(self.translate_batch(texts, source_lang, target_lang, max_batch_size, cache))
+        return run_sync(self.translate_batch(texts, source_lang, target_lang, max_batch_size, cache))
 
 
 def _build_entity_prompt(name: str) -> str:
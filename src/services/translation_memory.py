@@ -0,0 +1,328 @@
+"""Persistent translation memory in the knowledge DB.
+
+Translations are keyed by a hash of (kind, context, source text) plus the
+source/target language and the translation model, so a new model or prompt
+version starts from an empty memory instead of reusing stale output.
+
+Lookups only read (through the read session). Hit counts and last-used
+times are collected in memory and written back in batches, so snippet
+translation does not take the knowledge DB write lock on every lookup.
+Per-run hit/miss counts are added to the run's Redis progress hash when a
+run-scoped task ends, so the finalize report covers every worker.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from config import settings
+from models.knowledge_domain import KnowledgeTranslationMemory
+from services.knowledge_session import knowledge_session
+from services.run_state import get_run_state_store
+
+logger = logging.getLogger(__name__)
+
+# Bump when the translation prompts change in a way that alters output.
+TRANSLATION_PROMPT_VERSION = "v1"
+_LOOKUP_CHUNK = 500
+_TOUCH_BATCH = 200
+RUN_STATS_GROUP = "translation_memory"
+
+_current_run_id: ContextVar[Optional[int]] = ContextVar("translation_memory_run_id", default=None)
+
+
+def translation_model_identity() -> str:
+    return f"{settings.ollama_model_translation}:{TRANSLATION_PROMPT_VERSION}"
+
+
+def source_hash(text: str, kind: str = "text", context: str = "") -> str:
+    payload = f"{kind}\x00{context}\x00{text}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _lang(value: str) -> str:
+    return (value or "").strip().lower()
+
+
+def _chunks(items: list, size: int) -> Iterable[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+@dataclass
+class TranslationMemoryStats:
+    hits: int = 0
+    misses: int = 0
+    stored: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stored": self.stored,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class TranslationMemory:
+    """Bulk lookup/store of translations for one model identity."""
+
+    def __init__(self, model: Optional[str] = None):
+        self.model = model or translation_model_identity()
+        self.stats = TranslationMemoryStats()
+        self._run_stats: dict[int, TranslationMemoryStats] = {}
+        self._pending_hits: Counter[int] = Counter()
+        self._lock = threading.Lock()
+
+    def lookup_many(
+        self,
+        texts: list[str],
+        source_lang: str,
+        target_lang: str,
+        kind: str = "text",
+        context: str = "",
+    ) -> dict[str, str]:
+        """Return {source text: translation} for every remembered text."""
+        unique = list(dict.fromkeys(t for t in texts if t and t.strip()))
+        if not unique:
+            return {}
+        by_hash = {source_hash(t, kind, context): t for t in unique}
+        found: dict[str, str] = {}
+        hit_ids: list[int] = []
+        try:
+            with knowledge_session() as db:
+                for hashes in _chunks(list(by_hash), _LOOKUP_CHUNK):
+                    rows = (
+                        db.query(
+                            KnowledgeTranslationMemory.id,
+                            KnowledgeTranslationMemory.source_hash,
+                            KnowledgeTranslationMemory.translated_text,
+                        )
+                        .filter(
+                            KnowledgeTranslationMemory.source_hash.in_(hashes),
+                            KnowledgeTranslationMemory.source_lang == _lang(source_lang),
+                            KnowledgeTranslationMemory.target_lang == _lang(target_lang),
+                            KnowledgeTranslationMemory.model == self.model,
+                        )
+                        .all()
+                    )
+                    for row_id, row_hash, translated_text in rows:
+                        found[by_hash[row_hash]] = translated_text
+                        hit_ids.append(row_id)
+        except Exception as exc:
+            logger.warning("Translation memory lookup failed: %s", exc)
+            found, hit_ids = {}, []
+        self._count(hits=len(found), misses=len(unique) - len(found))
+        self._record_hits(hit_ids)
+        return found
+
+    def _record_hits(self, row_ids: list[int]) -> None:
+        if not row_ids:
+            return
+        with self._lock:
+            self._pending_hits.update(row_ids)
+            full = len(self._pending_hits) >= _TOUCH_BATCH
+        if full:
+            self.flush_hits()
+
+    def flush_hits(self) -> int:
+        """Write pending hit counts and last-used times; return the rows touched."""
+        with self._lock:
+            pending, self._pending_hits = self._pending_hits, Counter()
+        if not pending:
+            return 0
+        by_count: dict[int, list[int]] = {}
+        for row_id, count in pending.items():
+            by_count.setdefault(count, []).append(row_id)
+        now = datetime.now(timezone.utc)
+        try:
+            with knowledge_session(write=True) as db:
+                for count, row_ids in by_count.items():
+                    for ids in _chunks(row_ids, _LOOKUP_CHUNK):
+                        db.execute(
+                            update(KnowledgeTranslationMemory)
+                            .where(KnowledgeTranslationMemory.id.in_(ids))
+                            .values(
+                                hit_count=KnowledgeTranslationMemory.hit_count + count,
+                                last_used_at=now,
+                            )
+                        )
+        except Exception as exc:
+            logger.warning("Translation memory hit update failed: %s", exc)
+            return 0
+        return len(pending)
+
+    def store_many(
+        self,
+        translations: dict[str, str],
+        source_lang: str,
+        target_lang: str,
+        kind: str = "text",
+        context: str = "",
+    ) -> int:
+        """Remember translations; entries that echo the source are skipped."""
+        pairs = {
+            src: dst.strip()
+            for src, dst in translations.items()
+            if src and src.strip() and dst and dst.strip() and dst.strip() != src.strip()
+        }
+        if not pairs:
+            return 0
+        by_hash = {source_hash(src, kind, context): src for src in pairs}
+        try:
+            with knowledge_session(write=True) as db:
+                existing: set[str] = set()
+                for hashes in _chunks(list(by_hash), _LOOKUP_CHUNK):
+                    existing.update(
+                        h for (h,) in db.query(KnowledgeTranslationMemory.source_hash).filter(
+                            KnowledgeTranslationMemory.source_hash.in_(hashes),
+                            KnowledgeTranslationMemory.source_lang == _lang(source_lang),
+                            KnowledgeTranslationMemory.target_lang == _lang(target_lang),
+                            KnowledgeTranslationMemory.model == self.model,
+                        )
+                    )
+                new_rows = [
+                    KnowledgeTranslationMemory(
+                        source_hash=h,
+                        source_lang=_lang(source_lang),
+                        target_lang=_lang(target_lang),
+                        model=self.model,
+                        kind=kind,
+                        source_text=src,
+                        translated_text=pairs[src],
+                        hit_count=0,
+                    )
+                    for h, src in by_hash.items()
+                    if h not in existing
+                ]
+                db.add_all(new_rows)
+        except IntegrityError:
+            logger.debug("Translation memory entries were stored concurrently; skipping")
+            return 0
+        except Exception as exc:
+            logger.warning("Translation memory store failed: %s", exc)
+            return 0
+        self._count(stored=len(new_rows))
+        return len(new_rows)
+
+    async def alookup_many(self, texts: list[str], source_lang: str, target_lang: str, kind: str = "text", context: str = "") -> dict[str, str]:
+        return await asyncio.to_thread(self.lookup_many, texts, source_lang, target_lang, kind, context)
+
+    async def astore_many(self, translations: dict[str, str], source_lang: str, target_lang: str, kind: str = "text", context: str = "") -> int:
+        return await asyncio.to_thread(self.store_many, translations, source_lang, target_lang, kind, context)
+
+    def _count(self, hits: int = 0, misses: int = 0, stored: int = 0) -> None:
+        run_id = _current_run_id.get()
+        with self._lock:
+            targets = [self.stats]
+            if run_id is not None:
+                targets.append(self._run_stats.setdefault(run_id, TranslationMemoryStats()))
+            for stats in targets:
+                stats.hits += hits
+                stats.misses += misses
+                stats.stored += stored
+
+    def flush_run_stats(self, run_id: Optional[int]) -> None:
+        """Add the counts recorded under ``run_id`` in this process to the shared run stats."""
+        with self._lock:
+            stats = self._run_stats.pop(run_id, None)
+        if run_id is None or stats is None:
+            return
+        try:
+            get_run_state_store().add_stats(
+                run_id,
+                RUN_STATS_GROUP,
+                {"hits": stats.hits, "misses": stats.misses, "stored": stats.stored},
+            )
+        except Exception as exc:
+            logger.warning("Failed to persist translation memory stats for run %s: %s", run_id, exc)
+
+    def run_stats(self, run_id: int) -> TranslationMemoryStats:
+        """Counts of ``run_id`` across all workers (plus any not yet flushed here)."""
+        try:
+            shared = get_run_state_store().stats(run_id, RUN_STATS_GROUP)
+        except Exception as exc:
+            logger.warning("Failed to read translation memory stats for run %s: %s", run_id, exc)
+            shared = {}
+        stats = TranslationMemoryStats(**shared)
+        with self._lock:
+            pending = self._run_stats.get(run_id)
+            if pending is not None:
+                stats.hits += pending.hits
+                stats.misses += pending.misses
+                stats.stored += pending.stored
+        return stats
+
+    def report(self) -> dict:
+        """Cumulative counts for this process."""
+        with self._lock:
+            return {"model": self.model, **self.stats.as_dict()}
+
+
+_memory_instance: Optional[TranslationMemory] = None
+_memory_lock = threading.Lock()
+
+
+def get_translation_memory() -> Optional[TranslationMemory]:
+    """Return the process-wide memory, or None when disabled."""
+    global _memory_instance
+    if not settings.translation_memory_enabled:
+        return None
+    identity = translation_model_identity()
+    with _memory_lock:
+        if _memory_instance is None or _memory_instance.model != identity:
+            _memory_instance = TranslationMemory(identity)
+        return _memory_instance
+
+
+def reset_translation_memory(memory: Optional[TranslationMemory] = None) -> None:
+    global _memory_instance
+    with _memory_lock:
+        _memory_instance = memory
+
+
+@contextmanager
+def translation_memory_run_scope(run_id: Optional[int]) -> Iterator[None]:
+    """Attribute translation memory hits/misses inside the block to ``run_id``."""
+    token = _current_run_id.set(run_id)
+    try:
+        yield
+    finally:
+        _current_run_id.reset(token)
+        memory = get_translation_memory()
+        if memory is not None:
+            memory.flush_hits()
+            memory.flush_run_stats(run_id)
+
+
+def translation_memory_report(run_id: int) -> Optional[dict]:
+    """Report ``run_id``'s counts from every worker next to this process's totals."""
+    memory = get_translation_memory()
+    if memory is None:
+        return None
+    run = memory.run_stats(run_id).as_dict()
+    logger.info(
+        "[translation-memory] run=%d hits=%d misses=%d stored=%d hit_rate=%.1f%%",
+        run_id, run["hits"], run["misses"], run["stored"], run["hit_rate"] * 100,
+    )
+    process = memory.report()
+    return {
+        "model": process.pop("model"),
+        "run": run,
+        "process": process,
+    }
@@ -45,12 +45,26 @@ def _build_prompt_coverage(run_details: dict, brand_id: int) -> pd.DataFrame:
     return df.reset_index(drop=True)
 
 
+def _fetch_prompt_mentions(run_id: int) -> dict | None:
+    params: dict = {"limit": 500, "include_answer_text": "false"}
+    run_details = fetch_json(f"/api/v1/tracking/runs/{run_id}/details", params=params)
+    page = run_details
+    while page and page.get("next_cursor") is not None:
+        page = fetch_json(
+            f"/api/v1/tracking/runs/{run_id}/details",
+            params={**params, "cursor": page["next_cursor"]},
+        )
+        if page:
+            run_details["answers"].extend(page.get("answers") or [])
+    return run_details
+
+
 def render_prompt_gaps(run_id: int, brand_id: int | None) -> None:
     if not brand_id:
         st.info("Select a brand to see prompt coverage.")
         return
 
-    run_details = fetch_json(f"/api/v1/tracking/runs/{run_id}/details")
+    run_details = _fetch_prompt_mentions(run_id)
     if not run_details:
         st.info("Run details not available.")
         return
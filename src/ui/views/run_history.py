@@ -25,8 +25,22 @@ def _fetch_runs(vertical_id: int | None = None, model_name: str | None = None) -
     return fetch_json("/api/v1/tracking/runs", params=params) or []
 
 
-def _fetch_run_details(run_id: int) -> dict | None:
-    return fetch_json(f"/api/v1/tracking/runs/{run_id}/details")
+ANSWER_PAGE_SIZE = 20
+
+
+def _fetch_run_details(run_id: int, cursor: int | None = None) -> dict | None:
+    params: dict = {"limit": ANSWER_PAGE_SIZE, "include_answer_text": "false"}
+    if cursor is not None:
+        params["cursor"] = cursor
+    return fetch_json(f"/api/v1/tracking/runs/{run_id}/details", params=params)
+
+
+def _fetch_answer(run_id: int, answer_id: int) -> dict | None:
+    return fetch_json(f"/api/v1/tracking/runs/{run_id}/answers/{answer_id}")
+
+
+def _cursor_stack(run_id: int) -> list:
+    return st.session_state.setdefault(f"history_cursors_{run_id}", [None])
 
 
 def _fetch_run_export(run_id: int) -> list[dict] | None:
@@ -66,7 +80,7 @@ def _render_runs_table(runs: list[dict]) -> None:
     st.dataframe(display_df, use_container_width=True, hide_index=True)
 
 
-def _render_answer_details(answer: dict, index: int) -> None:
+def _render_answer_details(run_id: int, answer: dict) -> None:
     st.markdown("#### Prompt")
     col1, col2 = st.columns(2)
     with col1:
@@ -78,35 +92,64 @@ def _render_answer_details(answer: dict, index: int) -> None:
 
     st.markdown("---")
     st.markdown("#### LLM Answer")
+    _render_answer_text(run_id, answer["id"])
+
+    st.markdown("---")
+    st.markdown("#### Brand Mentions Detected")
+    mentioned_brands = [m for m in answer.get("mentions") or [] if m.get("mentioned")]
+    if not mentioned_brands:
+        st.info("No brands were mentioned in this answer.")
+        return
+
+    for mention in mentioned_brands:
+        _render_mention(mention)
+
+
+def _render_answer_text(run_id: int, answer_id: int) -> None:
+    state_key = f"history_answer_{answer_id}"
+    if state_key not in st.session_state:
+        if not st.button("Load answer text", key=f"load_{state_key}"):
+            return
+        st.session_state[state_key] = _fetch_answer(run_id, answer_id)
+    full_answer = st.session_state[state_key]
+    if not full_answer:
+        st.warning("Answer text not available.")
+        return
+
     col1, col2 = st.columns(2)
     with col1:
         st.markdown("**Chinese Answer:**")
         st.text_area(
             "Chinese",
-            answer["raw_answer_zh"],
+            full_answer.get("raw_answer_zh") or "",
             height=150,
-            key=f"history_answer_zh_{index}",
+            key=f"history_answer_zh_{answer_id}",
             label_visibility="collapsed",
         )
     with col2:
         st.markdown("**English Translation:**")
         st.text_area(
             "English",
-            answer.get("raw_answer_en") or "_Translation not available_",
+            full_answer.get("raw_answer_en") or "_Translation not available_",
             height=150,
-            key=f"history_answer_en_{index}",
+            key=f"history_answer_en_{answer_id}",
             label_visibility="collapsed",
         )
 
-    st.markdown("---")
-    st.markdown("#### Brand Mentions Detected")
-    mentioned_brands = [m for m in answer.get("mentions") or [] if m.get("mentioned")]
-    if not mentioned_brands:
-        st.info("No brands were mentioned in this answer.")
-        return
 
-    for mention in mentioned_brands:
-        _render_mention(mention)
+def _render_answer_pager(run_id: int, next_cursor: int | None) -> None:
+    cursors = _cursor_stack(run_id)
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if len(cursors) > 1 and st.button("Previous", key=f"history_prev_{run_id}"):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        st.caption(f"Page {len(cursors)}")
+    with col3:
+        if next_cursor is not None and st.button("Next", key=f"history_next_{run_id}"):
+            cursors.append(next_cursor)
+            st.rerun()
 
 
 def _render_mention(mention: dict) -> None:
@@ -142,7 +185,7 @@ def _render_run_detail(run_details: dict, vertical_name: str, vertical_id: int)
     with col2:
         st.metric("Status", run_details["status"])
     with col3:
-        st.metric("Prompts Answered", len(run_details.get("answers") or []))
+        st.metric("Prompts Answered", run_details.get("total_answers", 0))
 
     tab_prompts, tab_export = st.tabs(["Prompts & Answers", "Export"])
 
@@ -151,9 +194,11 @@ def _render_run_detail(run_details: dict, vertical_name: str, vertical_id: int)
         if not answers:
             st.info("No answers available for this run yet. The job may still be processing.")
         else:
-            for i, answer in enumerate(answers, 1):
+            offset = (len(_cursor_stack(run_details["id"])) - 1) * ANSWER_PAGE_SIZE
+            for i, answer in enumerate(answers, offset + 1):
                 with st.expander(f"Prompt & Answer {i}", expanded=(i == 1)):
-                    _render_answer_details(answer, i)
+                    _render_answer_details(run_details["id"], answer)
+            _render_answer_pager(run_details["id"], run_details.get("next_cursor"))
 
     with tab_export:
         run_id = run_details["id"]
@@ -222,7 +267,9 @@ def show() -> None:
         selected_run_id = run_options[selected_run_label]
 
         with st.spinner("Loading run details..."):
-            run_details = _fetch_run_details(selected_run_id)
+            run_details = _fetch_run_details(
+                selected_run_id, _cursor_stack(selected_run_id)[-1]
+            )
         if not run_details:
             st.error("Failed to load run details.")
             return
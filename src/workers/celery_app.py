@@ -1,4 +1,4 @@
-import asyncio
+import logging
 
 from celery import Celery
 from celery.signals import worker_shutdown
@@ -7,6 +7,8 @@ from kombu import Queue
 from config import settings
 from models.sqlite_config import is_sqlite_url
 
+logger = logging.getLogger(__name__)
+
 celery_app = Celery(
     "dragonlens",
     broker=settings.celery_broker_url,
@@ -48,6 +50,16 @@ celery_config = {
     },
 }
 
+if settings.fair_scheduling_enabled:
+    from services.run_scheduler import PRIORITY_LEVELS
+
+    # Redis emulates priorities with one list per step; 0 is consumed first.
+    celery_config["broker_transport_options"] = {
+        "queue_order_strategy": "priority",
+        "priority_steps": list(range(PRIORITY_LEVELS)),
+        "sep": ":",
+    }
+
 sqlite_concurrency = _celery_sqlite_concurrency(settings.database_url)
 if sqlite_concurrency is not None:
     celery_config["worker_concurrency"] = sqlite_concurrency
@@ -58,11 +70,26 @@ celery_app.conf.beat_schedule = {
 }
 
 
-@worker_shutdown.connect
-def _cleanup_ollama_client(**kwargs: object) -> None:
+async def _close_loop_bound_clients() -> None:
+    from services.llm_client_pool import LLMClientPool
     from services.ollama import OllamaService
+    from services.sentiment_analysis import get_async_sentiment_client
+
+    await OllamaService.close_client()
+    await LLMClientPool.aclose_current_loop()
+    await get_async_sentiment_client().aclose()
+
+
+@worker_shutdown.connect
+def _cleanup_async_clients(**kwargs: object) -> None:
+    from services.event_loop_bridge import get_event_loop_bridge, shutdown_event_loop_bridge
+    from services.llm_client_pool import LLMClientPool
 
-    try:
-        asyncio.get_event_loop().run_until_complete(OllamaService.close_client())
-    except RuntimeError:
-        pass
+    bridge = get_event_loop_bridge()
+    if bridge.is_running():
+        try:
+            bridge.run(_close_loop_bound_clients(), timeout=10)
+        except Exception as exc:
+            logger.warning("Failed to close async clients on shutdown: %s", exc)
+    LLMClientPool.close_all()
+    shutdown_event_loop_bridge()
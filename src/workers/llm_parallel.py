@@ -2,6 +2,8 @@ import asyncio
 from dataclasses import dataclass
 from typing import Awaitable, Callable
 
+from services.adaptive_concurrency import AdaptiveLimiter
+
 QueryFn = Callable[[str], Awaitable[tuple[str, int, int, float]]]
 
 
@@ -21,12 +23,8 @@ class LLMResult:
     error: str | None = None
 
 
-def _semaphore(concurrency: int) -> asyncio.Semaphore:
-    return asyncio.Semaphore(max(1, concurrency))
-
-
-async def _query_one(req: LLMRequest, query_fn: QueryFn, semaphore: asyncio.Semaphore):
-    async with semaphore:
+async def _query_one(req: LLMRequest, query_fn: QueryFn, limiter: AdaptiveLimiter):
+    async with limiter.acquire():
         return await query_fn(req.prompt_text_zh)
 
 
@@ -40,9 +38,10 @@ def _to_result(req: LLMRequest, raw: object) -> LLMResult:
 async def fetch_llm_answers_parallel(
     requests: list[LLMRequest],
     query_fn: QueryFn,
-    concurrency: int,
+    concurrency: int = 1,
+    limiter: AdaptiveLimiter | None = None,
 ) -> list[LLMResult]:
-    semaphore = _semaphore(concurrency)
-    coros = [_query_one(r, query_fn, semaphore) for r in requests]
+    limiter = limiter or AdaptiveLimiter.fixed("parallel_fetch", concurrency)
+    coros = [_query_one(r, query_fn, limiter) for r in requests]
     results = await asyncio.gather(*coros, return_exceptions=True)
     return [_to_result(r, results[i]) for i, r in enumerate(requests)]
@@ -4,34 +4,24 @@ import asyncio
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from sqlalchemy.orm import Session
 
-from models import Brand, BrandMention, ExtractionDebug, LLMAnswer, Product, ProductMention, Prompt, Run, Vertical
+from config import settings
+from models import Brand, LLMAnswer, Product, Prompt, Run, Vertical
 from models.db_retry import commit_with_retry, flush_with_retry
 from models.domain import LLMRoute, Sentiment
+from services.adaptive_concurrency import get_limiter, get_ollama_limiter, log_limiter_snapshots
+from services.llm_streaming import new_stream_collector, stream_metrics
+from services.mention_writer import MentionWriter
 from services.pricing import calculate_cost
+from workers.stages import InOrder, Stage, log_stage_timings, run_stages
 
-logger = logging.getLogger(__name__)
-
-REMOTE_LLM_SEMAPHORE: Optional[asyncio.Semaphore] = None
-OLLAMA_SEMAPHORE: Optional[asyncio.Semaphore] = None
-
-
-def _get_remote_semaphore() -> asyncio.Semaphore:
-    global REMOTE_LLM_SEMAPHORE
-    if REMOTE_LLM_SEMAPHORE is None:
-        REMOTE_LLM_SEMAPHORE = asyncio.Semaphore(3)
-    return REMOTE_LLM_SEMAPHORE
-
-
-def _get_ollama_semaphore() -> asyncio.Semaphore:
-    global OLLAMA_SEMAPHORE
-    if OLLAMA_SEMAPHORE is None:
-        OLLAMA_SEMAPHORE = asyncio.Semaphore(5)
-    return OLLAMA_SEMAPHORE
+if TYPE_CHECKING:
+    from services.extraction.pipeline import ExtractionPipeline
 
+logger = logging.getLogger(__name__)
 
 @dataclass
 class PromptContext:
@@ -48,6 +38,8 @@ class LLMQueryResult:
     tokens_in: int = 0
     tokens_out: int = 0
     latency: float = 0.0
+    time_to_first_token: Optional[float] = None
+    tokens_per_second: Optional[float] = None
     cost_estimate: float = 0.0
     is_reused: bool = False
     reused_route: Optional[LLMRoute] = None
@@ -85,21 +77,6 @@ class ExtractionResult:
     error: Optional[str] = None
 
 
-def prepare_prompts(prompts: list[Prompt], translator) -> list[PromptContext]:
-    contexts = []
-    for prompt in prompts:
-        prompt_text_zh = prompt.text_zh
-        prompt_text_en = prompt.text_en
-        if not prompt_text_zh and prompt_text_en:
-            logger.info(f"Translating English prompt {prompt.id} to Chinese...")
-            prompt_text_zh = translator.translate_text_sync(prompt_text_en, "English", "Chinese")
-        if not prompt_text_zh:
-            logger.warning(f"Prompt {prompt.id} has no text, skipping")
-            continue
-        contexts.append(PromptContext(prompt, prompt_text_zh, prompt_text_en))
-    return contexts
-
-
 async def _fetch_single_llm_answer(
     context: PromptContext,
     resolution,
@@ -108,9 +85,8 @@ async def _fetch_single_llm_answer(
     run: Run,
     provider: str,
     model_name: str,
+    reusable: Optional[LLMAnswer] = None,
 ) -> LLMQueryResult:
-    from services.answer_reuse import find_reusable_answer
-
     prompt = context.prompt
     existing = db.query(LLMAnswer).filter(
         LLMAnswer.run_id == run.id,
@@ -131,12 +107,6 @@ async def _fetch_single_llm_answer(
             existing_answer=existing,
         )
 
-    reusable = find_reusable_answer(
-        db, run,
-        prompt_text_zh=context.prompt_text_zh,
-        prompt_text_en=context.prompt_text_en,
-    )
-
     if reusable:
         logger.info(f"Reusing answer from previous run for prompt {prompt.id}")
         return LLMQueryResult(
@@ -152,10 +122,12 @@ async def _fetch_single_llm_answer(
         )
 
     try:
-        async with _get_remote_semaphore():
+        limiter = get_limiter(provider, model_name, local=resolution.route == LLMRoute.LOCAL)
+        stream = new_stream_collector()
+        async with limiter.acquire():
             logger.info(f"Querying {provider}/{model_name} for prompt {prompt.id}...")
             answer_zh, tokens_in, tokens_out, latency = await llm_router.query_with_resolution(
-                resolution, context.prompt_text_zh
+                resolution, context.prompt_text_zh, stream=stream
             )
             logger.info(f"Received answer for prompt {prompt.id}: {answer_zh[:80]}...")
 
@@ -166,6 +138,7 @@ async def _fetch_single_llm_answer(
             tokens_in=tokens_in,
             tokens_out=tokens_out,
             latency=latency,
+            **stream_metrics(stream),
             cost_estimate=cost,
             is_reused=False,
         )
@@ -174,34 +147,16 @@ async def _fetch_single_llm_answer(
         return LLMQueryResult(context=context, answer_zh="", error=str(e))
 
 
-async def fetch_all_llm_answers(
-    contexts: list[PromptContext],
-    resolution,
-    llm_router,
-    db: Session,
-    run: Run,
-    provider: str,
-    model_name: str,
-) -> list[LLMQueryResult]:
-    logger.info(f"Fetching {len(contexts)} LLM answers in parallel...")
-
-    tasks = [
-        _fetch_single_llm_answer(ctx, resolution, llm_router, db, run, provider, model_name)
-        for ctx in contexts
-    ]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-    processed = []
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            logger.error(f"Exception for prompt {contexts[i].prompt.id}: {result}")
-            processed.append(LLMQueryResult(context=contexts[i], answer_zh="", error=str(result)))
-        else:
-            processed.append(result)
+def _reusable_answers(db: Session, run: Run, contexts: list[PromptContext]) -> dict[int, LLMAnswer]:
+    """Resolve reusable answers for all prompts of the run in one lookup."""
+    from services.answer_reuse import find_reusable_answers
 
-    success_count = sum(1 for r in processed if not r.error and r.answer_zh)
-    logger.info(f"Fetched {success_count}/{len(contexts)} answers successfully")
-    return processed
+    if not run.reuse_answers or not contexts:
+        return {}
+    answers = find_reusable_answers(
+        db, run, [(ctx.prompt_text_zh, ctx.prompt_text_en) for ctx in contexts]
+    )
+    return {ctx.prompt.id: answer for ctx, answer in zip(contexts, answers) if answer}
 
 
 async def _translate_single_answer(result: LLMQueryResult, translator) -> LLMQueryResult:
@@ -209,122 +164,15 @@ async def _translate_single_answer(result: LLMQueryResult, translator) -> LLMQue
         return result
 
     try:
-        async with _get_ollama_semaphore():
-            loop = asyncio.get_event_loop()
-            answer_en = await loop.run_in_executor(
-                None,
-                translator.translate_text_sync,
-                result.answer_zh,
-                "Chinese",
-                "English"
+        async with get_ollama_limiter().acquire():
+            result.answer_en = await translator.translate_text(
+                result.answer_zh, "Chinese", "English"
             )
-            result.answer_en = answer_en
     except Exception as e:
         logger.error(f"Error translating answer for prompt {result.context.prompt.id}: {e}")
     return result
 
 
-async def translate_all_answers(results: list[LLMQueryResult], translator) -> list[LLMQueryResult]:
-    to_translate = [r for r in results if not r.error and r.answer_zh and not r.answer_en]
-    logger.info(f"Translating {len(to_translate)} answers in parallel...")
-
-    tasks = [_translate_single_answer(r, translator) for r in to_translate]
-    await asyncio.gather(*tasks)
-
-    return results
-
-
-async def _extract_single_result(
-    result: LLMQueryResult,
-    vertical_id: int,
-    user_brands: list[Brand],
-    db: Session,
-    ollama_service,
-    translator,
-    run_id: int,
-    provider: str,
-    model_name: str,
-    resolution,
-) -> ExtractionResult:
-    import json
-    from services.brand_discovery import discover_brands_and_products
-    from services.product_discovery import discover_and_store_products
-
-    if result.error or not result.answer_zh:
-        return ExtractionResult(query_result=result, error=result.error or "No answer")
-
-    try:
-        answer_zh = result.answer_zh
-        prompt = result.context.prompt
-
-        if result.existing_answer:
-            llm_answer = result.existing_answer
-            db.query(BrandMention).filter(BrandMention.llm_answer_id == llm_answer.id).delete()
-            db.query(ProductMention).filter(ProductMention.llm_answer_id == llm_answer.id).delete()
-        else:
-            answer_route = resolution.route
-            if result.reused_route:
-                answer_route = result.reused_route
-            llm_answer = LLMAnswer(
-                run_id=run_id,
-                prompt_id=prompt.id,
-                provider=provider,
-                model_name=model_name,
-                route=answer_route,
-                raw_answer_zh=result.answer_zh,
-                raw_answer_en=result.answer_en,
-                tokens_in=result.tokens_in,
-                tokens_out=result.tokens_out,
-                latency=result.latency,
-                cost_estimate=result.cost_estimate,
-            )
-            db.add(llm_answer)
-            flush_with_retry(db)
-
-        all_brands, extraction_result = discover_brands_and_products(
-            answer_zh, vertical_id, user_brands, db
-        )
-
-        debug_info = None
-        if extraction_result.debug_info:
-            debug_info = {
-                "raw_brands": extraction_result.debug_info.raw_brands,
-                "raw_products": extraction_result.debug_info.raw_products,
-                "rejected_at_light_filter": extraction_result.debug_info.rejected_at_light_filter,
-                "final_brands": extraction_result.debug_info.final_brands,
-                "final_products": extraction_result.debug_info.final_products,
-            }
-
-        discovered_products = discover_and_store_products(
-            db,
-            vertical_id,
-            answer_zh,
-            all_brands,
-            extraction_relationships=extraction_result.product_brand_relationships,
-        )
-
-        product_mentions = await _extract_product_mentions(
-            llm_answer, discovered_products, answer_zh, translator, all_brands, ollama_service
-        )
-
-        brand_mentions = await _extract_brand_mentions(
-            answer_zh, all_brands, ollama_service, translator
-        )
-
-        return ExtractionResult(
-            query_result=result,
-            llm_answer=llm_answer,
-            discovered_brands=all_brands,
-            discovered_products=discovered_products,
-            brand_mentions=brand_mentions,
-            product_mentions=product_mentions,
-            debug_info=debug_info,
-        )
-    except Exception as e:
-        logger.error(f"Error extracting entities for prompt {result.context.prompt.id}: {e}", exc_info=True)
-        return ExtractionResult(query_result=result, error=str(e))
-
-
 async def _extract_product_mentions(
     llm_answer: LLMAnswer,
     products: list[Product],
@@ -341,33 +189,23 @@ async def _extract_product_mentions(
     brand_names = [b.display_name for b in brands]
     brand_aliases = [_brand_aliases(b) for b in brands]
 
-    async with _get_ollama_semaphore():
+    async with get_ollama_limiter().acquire():
         mentions = await ollama_service.extract_products(
             answer_zh, product_names, product_aliases, brand_names, brand_aliases
         )
 
-    results = []
-    for mention_data in mentions:
-        if not mention_data["mentioned"] or mention_data["rank"] is None:
-            continue
-        product = products[mention_data["product_index"]]
-
-        sentiment_str = "neutral"
-        if mention_data["snippets"]:
-            async with _get_ollama_semaphore():
-                sentiment_str = await ollama_service.classify_sentiment(mention_data["snippets"][0])
-
-        sentiment = _map_sentiment(sentiment_str)
-        en_snippets = _translate_snippets_sync(mention_data["snippets"], translator)
-
-        results.append(ProductMentionData(
-            product=product,
+    kept = [m for m in mentions if m["mentioned"] and m["rank"] is not None]
+    sentiments, translations = await _classify_and_translate(kept, ollama_service, translator)
+    return [
+        ProductMentionData(
+            product=products[mention_data["product_index"]],
             rank=mention_data["rank"],
-            sentiment=sentiment,
+            sentiment=_map_sentiment(first_snippet_sentiment(mention_data, sentiments)),
             zh_snippets=mention_data["snippets"],
-            en_snippets=en_snippets,
-        ))
-    return results
+            en_snippets=[translations.get(s, s) for s in mention_data["snippets"]],
+        )
+        for mention_data in kept
+    ]
 
 
 async def _extract_brand_mentions(
@@ -382,31 +220,21 @@ async def _extract_brand_mentions(
     brand_names = [b.display_name for b in all_brands]
     brand_aliases = [_brand_aliases(b) for b in all_brands]
 
-    async with _get_ollama_semaphore():
+    async with get_ollama_limiter().acquire():
         mentions = await ollama_service.extract_brands(answer_zh, brand_names, brand_aliases)
 
-    results = []
-    for mention_data in mentions:
-        if not mention_data["mentioned"]:
-            continue
-        brand = all_brands[mention_data["brand_index"]]
-
-        sentiment_str = "neutral"
-        if mention_data["snippets"]:
-            async with _get_ollama_semaphore():
-                sentiment_str = await ollama_service.classify_sentiment(mention_data["snippets"][0])
-
-        sentiment = _map_sentiment(sentiment_str)
-        en_snippets = _translate_snippets_sync(mention_data["snippets"], translator)
-
-        results.append(MentionData(
-            brand=brand,
+    kept = [m for m in mentions if m["mentioned"]]
+    sentiments, translations = await _classify_and_translate(kept, ollama_service, translator)
+    return [
+        MentionData(
+            brand=all_brands[mention_data["brand_index"]],
             rank=mention_data["rank"],
-            sentiment=sentiment,
+            sentiment=_map_sentiment(first_snippet_sentiment(mention_data, sentiments)),
             zh_snippets=mention_data["snippets"],
-            en_snippets=en_snippets,
-        ))
-    return results
+            en_snippets=[translations.get(s, s) for s in mention_data["snippets"]],
+        )
+        for mention_data in kept
+    ]
 
 
 def _brand_aliases(brand: Brand) -> list[str]:
@@ -429,8 +257,33 @@ def _map_sentiment(sentiment_str: str) -> Sentiment:
     return Sentiment.NEUTRAL
 
 
-def _translate_snippets_sync(snippets: list[str], translator) -> list[str]:
-    return [translator.translate_text_sync(s, "Chinese", "English") for s in snippets]
+def first_snippet_sentiment(mention_data: dict, sentiments: dict[str, str]) -> str:
+    """Sentiment label classified for the mention's first snippet ("neutral" without one)."""
+    snippets = mention_data.get("snippets")
+    return sentiments.get(snippets[0], "neutral") if snippets else "neutral"
+
+
+async def _classify_and_translate(
+    mentions: list[dict], ollama_service, translator
+) -> tuple[dict[str, str], dict[str, str]]:
+    """Batch-classify first snippets and batch-translate all snippets of the mentions."""
+    first_snippets = list(dict.fromkeys(m["snippets"][0] for m in mentions if m["snippets"]))
+    all_snippets = list(dict.fromkeys(s for m in mentions for s in m["snippets"]))
+
+    async def classify() -> list[str]:
+        if not first_snippets:
+            return []
+        async with get_ollama_limiter().acquire():
+            return await ollama_service.classify_sentiment_batch(first_snippets)
+
+    async def translate() -> list[str]:
+        if not all_snippets:
+            return []
+        async with get_ollama_limiter().acquire():
+            return await translator.translate_batch(all_snippets, "Chinese", "English")
+
+    labels, translated = await asyncio.gather(classify(), translate())
+    return dict(zip(first_snippets, labels)), dict(zip(all_snippets, translated))
 
 
 def _ensure_llm_answer_record(
@@ -444,11 +297,8 @@ def _ensure_llm_answer_record(
 ) -> LLMAnswer:
     prompt = result.context.prompt
     if result.existing_answer:
-        llm_answer = result.existing_answer
-        db.query(BrandMention).filter(BrandMention.llm_answer_id == llm_answer.id).delete()
-        db.query(ProductMention).filter(ProductMention.llm_answer_id == llm_answer.id).delete()
-        db.query(ExtractionDebug).filter(ExtractionDebug.llm_answer_id == llm_answer.id).delete()
-        return llm_answer
+        # Its previous mentions are replaced in bulk by ``batch_save_mentions``.
+        return result.existing_answer
 
     answer_route = resolution.route
     if result.reused_route:
@@ -464,6 +314,8 @@ def _ensure_llm_answer_record(
         tokens_in=result.tokens_in,
         tokens_out=result.tokens_out,
         latency=result.latency,
+        time_to_first_token=result.time_to_first_token,
+        tokens_per_second=result.tokens_per_second,
         cost_estimate=result.cost_estimate,
     )
     db.add(llm_answer)
@@ -471,166 +323,219 @@ def _ensure_llm_answer_record(
     return llm_answer
 
 
-async def extract_all_entities(
-    results: list[LLMQueryResult],
-    vertical_id: int,
-    user_brands: list[Brand],
-    db: Session,
-    ollama_service,
-    translator,
-    run_id: int,
-    provider: str,
-    model_name: str,
-    resolution,
-) -> list[ExtractionResult]:
-    from services.brand_discovery import discover_brands_and_products_from_result
-    from services.extraction.pipeline import ExtractionPipeline
-    from services.brand_recognition.models import ExtractionResult as BrandExtractionResult
-    from services.product_discovery import discover_and_store_products
+@dataclass
+class _ExtractionScope:
+    pipeline: "ExtractionPipeline"
+    vertical_id: int
+    vertical_name: str
+    vertical_description: str
 
-    valid_results = [r for r in results if not r.error and r.answer_zh]
-    logger.info(f"Extracting entities from {len(valid_results)} answers...")
-    if not valid_results:
-        return []
+
+def _open_extraction_scope(db: Session, vertical_id: int, run_id: int) -> _ExtractionScope:
+    from services.extraction.pipeline import ExtractionPipeline
 
     vertical = db.query(Vertical).filter(Vertical.id == vertical_id).first()
     vertical_name = vertical.name if vertical else "generic"
     vertical_description = vertical.description if vertical and vertical.description else ""
-
     pipeline = ExtractionPipeline(
         vertical=vertical_name,
         vertical_description=vertical_description,
         db=db,
         run_id=run_id,
     )
+    return _ExtractionScope(pipeline, vertical_id, vertical_name, vertical_description)
 
-    prepared: list[tuple[LLMQueryResult, LLMAnswer]] = []
-    extraction_results: list[ExtractionResult] = []
-    try:
-        for result in valid_results:
-            llm_answer = _ensure_llm_answer_record(
-                db,
-                result,
-                run_id=run_id,
-                provider=provider,
-                model_name=model_name,
-                resolution=resolution,
-            )
-            prepared.append((result, llm_answer))
 
-        for result, _ in prepared:
-            await pipeline.process_response(
-                result.answer_zh,
-                response_id=str(result.context.prompt.id),
-                user_brands=user_brands,
-            )
+async def _submit_for_extraction(
+    scope: _ExtractionScope,
+    result: LLMQueryResult,
+    user_brands: list[Brand],
+    db: Session,
+    run_id: int,
+    provider: str,
+    model_name: str,
+    resolution,
+) -> tuple[LLMQueryResult, LLMAnswer]:
+    llm_answer = _ensure_llm_answer_record(
+        db,
+        result,
+        run_id=run_id,
+        provider=provider,
+        model_name=model_name,
+        resolution=resolution,
+    )
+    await scope.pipeline.process_response(
+        result.answer_zh,
+        response_id=str(result.context.prompt.id),
+        user_brands=user_brands,
+    )
+    return result, llm_answer
 
-        batch_result = await pipeline.finalize()
 
-        for result, llm_answer in prepared:
-            answer_zh = result.answer_zh
-            response_id = str(result.context.prompt.id)
-            extraction_result = batch_result.response_results.get(
-                response_id,
-                BrandExtractionResult(brands={}, products={}),
-            )
-            all_brands, extraction_result = discover_brands_and_products_from_result(
-                answer_zh,
-                vertical_id,
-                user_brands,
-                db,
-                extraction_result,
-                vertical_name=vertical_name,
-                vertical_description=vertical_description,
-            )
+@dataclass
+class _DiscoveredAnswer:
+    result: LLMQueryResult
+    llm_answer: LLMAnswer
+    brands: list[Brand]
+    products: list[Product]
+    debug_info: Optional[dict]
 
-            debug_info = None
-            if extraction_result.debug_info:
-                debug_info = {
-                    "raw_brands": extraction_result.debug_info.raw_brands,
-                    "raw_products": extraction_result.debug_info.raw_products,
-                    "rejected_at_light_filter": extraction_result.debug_info.rejected_at_light_filter,
-                    "final_brands": extraction_result.debug_info.final_brands,
-                    "final_products": extraction_result.debug_info.final_products,
-                }
-
-            discovered_products = discover_and_store_products(
-                db,
-                vertical_id,
-                answer_zh,
-                all_brands,
-                extraction_relationships=extraction_result.product_brand_relationships,
-            )
 
-            product_mentions = await _extract_product_mentions(
-                llm_answer, discovered_products, answer_zh, translator, all_brands, ollama_service
-            )
-            brand_mentions = await _extract_brand_mentions(
-                answer_zh, all_brands, ollama_service, translator
-            )
+def _discover_entities(
+    scope: _ExtractionScope,
+    result: LLMQueryResult,
+    llm_answer: LLMAnswer,
+    batch_result,
+    user_brands: list[Brand],
+    db: Session,
+) -> _DiscoveredAnswer:
+    from services.brand_discovery import discover_brands_and_products_from_result
+    from services.brand_recognition.models import ExtractionResult as BrandExtractionResult
+    from services.product_discovery import discover_and_store_products
 
-            extraction_results.append(
-                ExtractionResult(
-                    query_result=result,
-                    llm_answer=llm_answer,
-                    discovered_brands=all_brands,
-                    discovered_products=discovered_products,
-                    brand_mentions=brand_mentions,
-                    product_mentions=product_mentions,
-                    debug_info=debug_info,
-                )
-            )
-    finally:
-        pipeline.close()
+    answer_zh = result.answer_zh
+    extraction_result = batch_result.response_results.get(
+        str(result.context.prompt.id),
+        BrandExtractionResult(brands={}, products={}),
+    )
+    all_brands, extraction_result = discover_brands_and_products_from_result(
+        answer_zh,
+        scope.vertical_id,
+        user_brands,
+        db,
+        extraction_result,
+        vertical_name=scope.vertical_name,
+        vertical_description=scope.vertical_description,
+    )
 
-    success_count = sum(1 for r in extraction_results if not r.error)
-    logger.info(f"Extracted entities from {success_count}/{len(valid_results)} answers")
-    return extraction_results
+    debug_info = None
+    if extraction_result.debug_info:
+        debug_info = {
+            "raw_brands": extraction_result.debug_info.raw_brands,
+            "raw_products": extraction_result.debug_info.raw_products,
+            "rejected_at_light_filter": extraction_result.debug_info.rejected_at_light_filter,
+            "final_brands": extraction_result.debug_info.final_brands,
+            "final_products": extraction_result.debug_info.final_products,
+        }
+
+    discovered_products = discover_and_store_products(
+        db,
+        scope.vertical_id,
+        answer_zh,
+        all_brands,
+        extraction_relationships=extraction_result.product_brand_relationships,
+    )
+    return _DiscoveredAnswer(result, llm_answer, all_brands, discovered_products, debug_info)
 
 
-def batch_save_mentions(db: Session, extraction_results: list[ExtractionResult]) -> None:
-    import json
+async def _extract_answer_mentions(
+    discovered: _DiscoveredAnswer,
+    ollama_service,
+    translator,
+    semaphore: asyncio.Semaphore,
+) -> ExtractionResult:
+    answer_zh = discovered.result.answer_zh
+    async with semaphore:
+        product_mentions, brand_mentions = await asyncio.gather(
+            _extract_product_mentions(
+                discovered.llm_answer,
+                discovered.products,
+                answer_zh,
+                translator,
+                discovered.brands,
+                ollama_service,
+            ),
+            _extract_brand_mentions(answer_zh, discovered.brands, ollama_service, translator),
+        )
+    return ExtractionResult(
+        query_result=discovered.result,
+        llm_answer=discovered.llm_answer,
+        discovered_brands=discovered.brands,
+        discovered_products=discovered.products,
+        brand_mentions=brand_mentions,
+        product_mentions=product_mentions,
+        debug_info=discovered.debug_info,
+    )
+
 
+async def _extract_mentions(
+    scope: _ExtractionScope,
+    prepared: list[tuple[LLMQueryResult, LLMAnswer]],
+    batch_result,
+    user_brands: list[Brand],
+    db: Session,
+    ollama_service,
+    translator,
+) -> list[ExtractionResult]:
+    """Discover entities per answer, then extract mentions concurrently.
+
+    Discovery reads and writes the shared ``Session``, so it runs serially
+    in prompt order; later answers see the brands/products stored for
+    earlier ones exactly as in a sequential run. Mention extraction only
+    talks to Ollama and runs for up to ``pipeline_extraction_concurrency``
+    answers at once, with results returned in prompt order.
+    """
+    discovered = [
+        _discover_entities(scope, result, llm_answer, batch_result, user_brands, db)
+        for result, llm_answer in prepared
+    ]
+    semaphore = asyncio.Semaphore(max(1, settings.pipeline_extraction_concurrency))
+    return list(
+        await asyncio.gather(
+            *(_extract_answer_mentions(d, ollama_service, translator, semaphore) for d in discovered)
+        )
+    )
+
+
+def batch_save_mentions(db: Session, extraction_results: list[ExtractionResult]) -> None:
+    """Replace the mentions of every answer in the batch with bulk statements."""
+    answer_ids = [ext.llm_answer.id for ext in extraction_results if ext.llm_answer]
+    writer = MentionWriter()
     for ext in extraction_results:
         if ext.error or not ext.llm_answer:
             continue
+        answer_id = ext.llm_answer.id
 
         if ext.debug_info:
-            debug_record = ExtractionDebug(
-                llm_answer_id=ext.llm_answer.id,
-                raw_brands=json.dumps(ext.debug_info.get("raw_brands", []), ensure_ascii=False),
-                raw_products=json.dumps(ext.debug_info.get("raw_products", []), ensure_ascii=False),
-                rejected_at_light_filter=json.dumps(ext.debug_info.get("rejected_at_light_filter", []), ensure_ascii=False),
-                final_brands=json.dumps(ext.debug_info.get("final_brands", []), ensure_ascii=False),
-                final_products=json.dumps(ext.debug_info.get("final_products", []), ensure_ascii=False),
-                extraction_method="qwen",
+            writer.add_debug(
+                answer_id,
+                raw_brands=ext.debug_info.get("raw_brands"),
+                raw_products=ext.debug_info.get("raw_products"),
+                rejected_at_light_filter=ext.debug_info.get("rejected_at_light_filter"),
+                final_brands=ext.debug_info.get("final_brands"),
+                final_products=ext.debug_info.get("final_products"),
             )
-            db.add(debug_record)
 
         for mention in ext.brand_mentions:
-            db_mention = BrandMention(
-                llm_answer_id=ext.llm_answer.id,
-                brand_id=mention.brand.id,
-                mentioned=True,
-                rank=mention.rank,
-                sentiment=mention.sentiment,
-                evidence_snippets={"zh": mention.zh_snippets, "en": mention.en_snippets},
+            writer.add_brand(
+                answer_id, mention.brand.id, mention.rank, mention.sentiment,
+                mention.zh_snippets, mention.en_snippets,
             )
-            db.add(db_mention)
 
         for mention in ext.product_mentions:
-            db_mention = ProductMention(
-                llm_answer_id=ext.llm_answer.id,
-                product_id=mention.product.id,
-                mentioned=True,
-                rank=mention.rank,
-                sentiment=mention.sentiment,
-                evidence_snippets={"zh": mention.zh_snippets, "en": mention.en_snippets},
+            writer.add_product(
+                answer_id, mention.product.id, mention.rank, mention.sentiment,
+                mention.zh_snippets, mention.en_snippets,
             )
-            db.add(db_mention)
 
+    written = writer.write(db, replace_answer_ids=answer_ids)
     commit_with_retry(db)
-    logger.info(f"Saved mentions for {len(extraction_results)} answers")
+    logger.info(f"Saved {written} mention rows for {len(extraction_results)} answers")
+
+
+async def _prepare_prompts_async(prompts: list[Prompt], translator) -> list[PromptContext]:
+    contexts = []
+    for prompt in prompts:
+        prompt_text_zh = prompt.text_zh
+        prompt_text_en = prompt.text_en
+        if not prompt_text_zh and prompt_text_en:
+            logger.info(f"Translating English prompt {prompt.id} to Chinese...")
+            prompt_text_zh = await translator.translate_text(prompt_text_en, "English", "Chinese")
+        if not prompt_text_zh:
+            logger.warning(f"Prompt {prompt.id} has no text, skipping")
+            continue
+        contexts.append(PromptContext(prompt, prompt_text_zh, prompt_text_en))
+    return contexts
 
 
 async def run_parallel_pipeline(
@@ -645,23 +550,66 @@ async def run_parallel_pipeline(
     provider: str,
     model_name: str,
 ) -> list[ExtractionResult]:
+    """Stream prompts through fetch -> translate -> extract stages.
+
+    Translation and per-answer extraction of one answer overlap with
+    fetching the next; run-level consolidation (``ExtractionPipeline.finalize``)
+    and mention extraction still happen once every answer has been submitted.
+    """
     logger.info(f"Starting parallel pipeline for {len(prompts)} prompts...")
 
-    contexts = prepare_prompts(prompts, translator)
+    contexts = await _prepare_prompts_async(prompts, translator)
     if not contexts:
         logger.warning("No valid prompts to process")
         return []
 
-    llm_results = await fetch_all_llm_answers(
-        contexts, resolution, llm_router, db, run, provider, model_name
-    )
+    order = {id(ctx): index for index, ctx in enumerate(contexts)}
+    reusable = _reusable_answers(db, run, contexts)
+    scope = _open_extraction_scope(db, run.vertical_id, run.id)
 
-    llm_results = await translate_all_answers(llm_results, translator)
+    async def fetch(ctx: PromptContext) -> LLMQueryResult:
+        try:
+            return await _fetch_single_llm_answer(
+                ctx, resolution, llm_router, db, run, provider, model_name,
+                reusable.get(ctx.prompt.id),
+            )
+        except Exception as e:
+            logger.error(f"Exception for prompt {ctx.prompt.id}: {e}")
+            return LLMQueryResult(context=ctx, answer_zh="", error=str(e))
+
+    async def translate(result: LLMQueryResult) -> LLMQueryResult:
+        return await _translate_single_answer(result, translator)
+
+    async def submit(result: LLMQueryResult) -> Optional[tuple[LLMQueryResult, LLMAnswer]]:
+        if result.error or not result.answer_zh:
+            return None
+        return await _submit_for_extraction(
+            scope, result, brands, db, run.id, provider, model_name, resolution
+        )
 
-    extraction_results = await extract_all_entities(
-        llm_results, run.vertical_id, brands, db, ollama_service, translator,
-        run.id, provider, model_name, resolution
-    )
+    # process_response updates the matcher shared by all answers, so they
+    # must reach it in prompt order whatever order the fetches finish in.
+    submit_in_order = InOrder(submit, lambda result: order[id(result.context)])
+    queue_size = settings.pipeline_stage_queue_size
+    stages = [
+        Stage("fetch", fetch, workers=len(contexts), queue_size=queue_size),
+        Stage("translate", translate, workers=settings.pipeline_translate_workers, queue_size=queue_size),
+        Stage("extract", submit_in_order, workers=1, queue_size=queue_size),
+    ]
+    try:
+        await run_stages(contexts, stages)
+        prepared = submit_in_order.outputs
+        if prepared:
+            batch_result = await scope.pipeline.finalize()
+            extraction_results = await _extract_mentions(
+                scope, prepared, batch_result, brands, db, ollama_service, translator
+            )
+        else:
+            extraction_results = []
+    finally:
+        scope.pipeline.close()
+    log_stage_timings(stages, label=f"pipeline run={run.id}")
+    log_limiter_snapshots()
 
     batch_save_mentions(db, extraction_results)
 
@@ -0,0 +1,175 @@
+"""Bounded producer/consumer stages for streaming work through a run.
+
+Each stage owns an ``asyncio.Queue`` with a fixed capacity and a number of
+worker coroutines. Items flow to the next stage as soon as they are ready,
+so stage N+1 works on item i while stage N is still on item i+1, and a
+slow downstream stage blocks upstream producers once its queue is full.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+@dataclass
+class StageTiming:
+    name: str
+    items: int = 0
+    busy_seconds: float = 0.0
+    max_queue_depth: int = 0
+    first_started: Optional[float] = None
+    last_finished: Optional[float] = None
+
+    @property
+    def wall_seconds(self) -> float:
+        if self.first_started is None or self.last_finished is None:
+            return 0.0
+        return self.last_finished - self.first_started
+
+    def record(self, started: float, finished: float) -> None:
+        self.items += 1
+        self.busy_seconds += finished - started
+        if self.first_started is None or started < self.first_started:
+            self.first_started = started
+        if self.last_finished is None or finished > self.last_finished:
+            self.last_finished = finished
+
+    def as_dict(self) -> dict:
+        return {
+            "stage": self.name,
+            "items": self.items,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "wall_seconds": round(self.wall_seconds, 3),
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+@dataclass
+class Stage:
+    """One step of a streaming pipeline.
+
+    ``handler`` maps an input item to an output item; returning ``None``
+    drops the item. ``workers`` bounds how many items the stage handles at
+    once and ``queue_size`` bounds how many wait in front of it.
+    """
+
+    name: str
+    handler: Callable[[Any], Awaitable[Any]]
+    workers: int = 1
+    queue_size: int = 8
+    timing: StageTiming = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.workers = max(1, self.workers)
+        self.queue_size = max(1, self.queue_size)
+        self.timing = StageTiming(self.name)
+
+
+async def _put(stage: Stage, queue: asyncio.Queue, item: Any) -> None:
+    await queue.put(item)
+    stage.timing.max_queue_depth = max(stage.timing.max_queue_depth, queue.qsize())
+
+
+async def run_stages(
+    items: Iterable[Any],
+    stages: list[Stage],
+    clock: Callable[[], float] = time.monotonic,
+) -> list[Any]:
+    """Stream ``items`` through ``stages`` and return the final outputs.
+
+    Outputs are returned in completion order. Handler errors cancel the
+    whole pipeline and propagate to the caller.
+    """
+    if not stages:
+        return list(items)
+    queues = [asyncio.Queue(maxsize=stage.queue_size) for stage in stages]
+    outputs: list[Any] = []
+
+    async def feed() -> None:
+        for item in items:
+            await _put(stages[0], queues[0], item)
+        for _ in range(stages[0].workers):
+            await queues[0].put(_STOP)
+
+    async def work(index: int) -> None:
+        stage, inbox = stages[index], queues[index]
+        while True:
+            item = await inbox.get()
+            if item is _STOP:
+                return
+            started = clock()
+            result = await stage.handler(item)
+            stage.timing.record(started, clock())
+            if result is None:
+                continue
+            if index + 1 < len(stages):
+                await _put(stages[index + 1], queues[index + 1], result)
+            else:
+                outputs.append(result)
+
+    async def run_stage(index: int) -> None:
+        await asyncio.gather(*(work(index) for _ in range(stages[index].workers)))
+        if index + 1 < len(stages):
+            for _ in range(stages[index + 1].workers):
+                await queues[index + 1].put(_STOP)
+
+    tasks = [asyncio.ensure_future(feed())]
+    tasks.extend(asyncio.ensure_future(run_stage(i)) for i in range(len(stages)))
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return outputs
+
+
+class InOrder:
+    """Stage handler that passes items to ``handler`` in sequence order.
+
+    Items that arrive early are buffered until every item before them has
+    been handled, so a stage fed by out-of-order upstream work still sees
+    its inputs in order. ``position`` maps an item to its 0-based sequence
+    number; every number must eventually arrive. Use it with ``workers=1``.
+    Non-``None`` handler results are collected in ``outputs`` in order and
+    the stage itself emits nothing.
+    """
+
+    def __init__(self, handler: Callable[[Any], Awaitable[Any]], position: Callable[[Any], int]):
+        self.handler = handler
+        self.position = position
+        self.outputs: list[Any] = []
+        self._pending: dict[int, Any] = {}
+        self._next = 0
+
+    async def __call__(self, item: Any) -> None:
+        self._pending[self.position(item)] = item
+        while self._next in self._pending:
+            ready = self._pending.pop(self._next)
+            self._next += 1
+            result = await self.handler(ready)
+            if result is not None:
+                self.outputs.append(result)
+        return None
+
+
+def log_stage_timings(stages: list[Stage], label: str = "pipeline") -> list[dict]:
+    timings = [stage.timing.as_dict() for stage in stages]
+    for timing in timings:
+        logger.info(
+            "[%s] stage=%s items=%d busy=%.2fs wall=%.2fs max_queue=%d",
+            label,
+            timing["stage"],
+            timing["items"],
+            timing["busy_seconds"],
+            timing["wall_seconds"],
+            timing["max_queue_depth"],
+        )
+    return timings
@@ -1,20 +1,20 @@
 import asyncio
+import functools
+import inspect
 import logging
 from dataclasses import dataclass
 from datetime import datetime
 from typing import List
 
 from celery import Task, chord, group
+from celery.exceptions import Retry
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-import json
-
 from config import settings
 from models import (
     Brand,
     BrandMention,
-    ExtractionDebug,
     LLMAnswer,
     Product,
     ProductMention,
@@ -25,7 +25,7 @@ from models import (
 from models.database import SessionLocal
 from models.domain import LLMRoute, RunStatus, Sentiment
 from models.db_retry import commit_with_retry, flush_with_retry
-from services.answer_reuse import find_reusable_answer
+from services.answer_reuse import find_reusable_answer, find_reusable_answers
 from services.brand_discovery import (
     discover_brands_and_products,
     discover_brands_and_products_from_result,
@@ -33,6 +33,7 @@ from services.brand_discovery import (
 from services.brand_recognition import extract_entities
 from services.brand_recognition.models import ExtractionResult as BrandExtractionResult
 from services.entity_consolidation import consolidate_run
+from services.event_loop_bridge import run_sync
 from services.extraction.consultant import ExtractionConsultant
 from services.extraction.models import BatchExtractionResult
 from services.extraction.pipeline import ExtractionPipeline, persist_extraction_knowledge
@@ -41,6 +42,8 @@ from services.brand_recognition.consolidation_service import (
     run_enhanced_consolidation,
 )
 from services.knowledge_verticals import get_or_create_vertical
+from services.latest_metrics import refresh_latest_metrics_safely
+from services.mention_writer import MentionWriter, delete_extraction_debug, delete_mentions
 from models.knowledge_database import KnowledgeWriteSessionLocal
 from services.brand_recognition.product_brand_mapping import (
     map_products_to_brands_for_run,
@@ -57,49 +60,70 @@ from services.translater import (
 from services.metrics_service import calculate_and_save_metrics
 from services.product_metrics_service import calculate_and_save_run_product_metrics
 from services.pricing import calculate_cost
+from services.adaptive_concurrency import get_limiter, log_limiter_snapshots
+from services.llm_cache import get_llm_cache, llm_cache_run_scope
+from services.llm_singleflight import Flight, get_llm_singleflight, singleflight_key
+from services.llm_streaming import new_stream_collector, stream_metrics
 from services.remote_llms import LLMRouter
+from services.run_checkpoints import FinalizeCheckpoints, clear_finalize_checkpoints
+from services.run_scheduler import get_run_scheduler
+from services.run_state import get_run_state_store, results_key as run_results_key
+from services.translation_memory import translation_memory_report, translation_memory_run_scope
 from workers.celery_app import celery_app
 from workers.llm_parallel import LLMRequest, LLMResult, fetch_llm_answers_parallel
+from workers.pipeline import first_snippet_sentiment
 
 logger = logging.getLogger(__name__)
 
-_persistent_event_loop = None
 
+def _run_async(coro):
+    return run_sync(coro)
 
-def _get_or_create_event_loop():
-    global _persistent_event_loop
-    if _persistent_event_loop is None or _persistent_event_loop.is_closed():
-        _persistent_event_loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(_persistent_event_loop)
-    return _persistent_event_loop
 
+def _store_batch_results(key: str, results: list[dict]) -> None:
+    get_run_state_store().store_results(key, results)
 
-def _run_async(coro):
-    loop = _get_or_create_event_loop()
-    return loop.run_until_complete(coro)
 
+def _load_all_results(key: str) -> list[dict]:
+    return get_run_state_store().load_results(key)
 
-def _get_redis():
-    import redis
-    return redis.from_url(settings.redis_url)
 
+def _clear_batch_results(key: str) -> None:
+    get_run_state_store().clear_results(key)
+
+
+def _count_progress(task_fn):
+    """Count the task's answer/extraction payload towards its run's progress."""
+
+    @functools.wraps(task_fn)
+    def wrapper(*args, **kwargs):
+        payload = task_fn(*args, **kwargs)
+        run_id = payload.get("run_id") if isinstance(payload, dict) else None
+        if run_id is None:
+            return payload
+        if payload.get("stage") == "answer":
+            if payload.get("ok"):
+                get_run_state_store().increment(run_id, answered=1)
+        elif payload.get("ok"):
+            get_run_state_store().increment(run_id, extracted=1)
+        else:
+            get_run_state_store().increment(run_id, failed=1)
+        return payload
 
-def _store_batch_results(key: str, results: list[dict]) -> None:
-    r = _get_redis()
-    for result in results:
-        r.rpush(key, json.dumps(result))
-    r.expire(key, 86400)
+    return wrapper
 
 
-def _load_all_results(key: str) -> list[dict]:
-    r = _get_redis()
-    raw = r.lrange(key, 0, -1)
-    return [json.loads(item) for item in raw]
+def _run_scoped(task_fn):
+    """Attribute LLM cache and translation memory counts inside a task to its run_id argument."""
+    signature = inspect.signature(task_fn)
 
+    @functools.wraps(task_fn)
+    def wrapper(*args, **kwargs):
+        run_id = signature.bind_partial(*args, **kwargs).arguments.get("run_id")
+        with llm_cache_run_scope(run_id), translation_memory_run_scope(run_id):
+            return task_fn(*args, **kwargs)
 
-def _clear_batch_results(key: str) -> None:
-    r = _get_redis()
-    r.delete(key)
+    return wrapper
 
 
 @dataclass(frozen=True)
@@ -128,31 +152,46 @@ def _prompt_text_zh(prompt: Prompt, translator: TranslaterService) -> str | None
     return translator.translate_text_sync(prompt.text_en, "English", "Chinese")
 
 
+def _existing_answers(db: Session, run_id: int, prompt_ids: list[int]) -> dict[int, LLMAnswer]:
+    if not prompt_ids:
+        return {}
+    answers = (
+        db.query(LLMAnswer)
+        .filter(LLMAnswer.run_id == run_id, LLMAnswer.prompt_id.in_(prompt_ids))
+        .all()
+    )
+    return {answer.prompt_id: answer for answer in answers}
+
+
 def _prompt_work_items(
     db: Session,
     run: Run,
     prompts: list[Prompt],
     translator: TranslaterService,
 ) -> tuple[list[_PromptWorkItem], list[LLMRequest]]:
-    items: list[_PromptWorkItem] = []
-    requests: list[LLMRequest] = []
+    texts: list[tuple[Prompt, str]] = []
     for prompt in prompts:
         prompt_text_zh = _prompt_text_zh(prompt, translator)
         if not prompt_text_zh:
             logger.warning(f"Prompt {prompt.id} has no text, skipping")
             continue
-        existing = (
-            db.query(LLMAnswer)
-            .filter(LLMAnswer.run_id == run.id, LLMAnswer.prompt_id == prompt.id)
-            .first()
-        )
-        reusable = (
-            None
-            if existing
-            else find_reusable_answer(
-                db, run, prompt_text_zh=prompt_text_zh, prompt_text_en=prompt.text_en
-            )
+        texts.append((prompt, prompt_text_zh))
+
+    existing_by_prompt = _existing_answers(db, run.id, [prompt.id for prompt, _ in texts])
+    missing = [(p, zh) for p, zh in texts if p.id not in existing_by_prompt]
+    reusable_by_prompt = {
+        prompt.id: answer
+        for (prompt, _), answer in zip(
+            missing,
+            find_reusable_answers(db, run, [(zh, p.text_en) for p, zh in missing]),
         )
+    }
+
+    items: list[_PromptWorkItem] = []
+    requests: list[LLMRequest] = []
+    for prompt, prompt_text_zh in texts:
+        existing = existing_by_prompt.get(prompt.id)
+        reusable = reusable_by_prompt.get(prompt.id)
         items.append(
             _PromptWorkItem(prompt, prompt_text_zh, prompt.text_en, existing, reusable)
         )
@@ -251,6 +290,70 @@ def _llm_queue(route: LLMRoute) -> str:
     return "local_llm" if route == LLMRoute.LOCAL else "remote_llm"
 
 
+def _register_for_scheduling(run: Run) -> None:
+    scheduler = get_run_scheduler()
+    if scheduler is None:
+        return
+    try:
+        scheduler.register_run(run.id, run.priority or 1)
+    except Exception as exc:
+        logger.warning("Fair scheduling unavailable for run %s: %s", run.id, exc)
+
+
+def _unregister_from_scheduling(run_id: int) -> None:
+    scheduler = get_run_scheduler()
+    if scheduler is None:
+        return
+    try:
+        scheduler.finish_run(run_id)
+    except Exception as exc:
+        logger.warning("Failed to remove run %s from scheduling: %s", run_id, exc)
+
+
+def _dispatch_options(run_id: int) -> dict:
+    scheduler = get_run_scheduler()
+    if scheduler is None:
+        return {}
+    try:
+        return {"priority": scheduler.next_priority(run_id)}
+    except Exception as exc:
+        logger.warning("Fair scheduling unavailable for run %s: %s", run_id, exc)
+        return {}
+
+
+def _prompt_chain(
+    run_id: int, prompt_id: int, llm_queue: str, force_reextract: bool, kb_fence: int = 0
+):
+    """ensure_llm_answer | ensure_extraction for one prompt, at the run's fair-share priority.
+
+    A non-zero ``kb_fence`` makes the extraction wait until that many
+    consolidation passes have been written to the knowledge DB.
+    """
+    options = _dispatch_options(run_id)
+    extraction_kwargs = {"kb_fence": kb_fence} if kb_fence else {}
+    return (
+        ensure_llm_answer.s(run_id, prompt_id).set(queue=llm_queue, **options)
+        | ensure_extraction.s(run_id, force_reextract, **extraction_kwargs).set(
+            queue="ollama_extract", **options
+        )
+    )
+
+
+def _kb_fence_pending(run_id: int, kb_fence: int) -> bool:
+    if not kb_fence:
+        return False
+    try:
+        return get_run_state_store().kb_version(run_id) < kb_fence
+    except Exception as exc:
+        logger.warning("KB fence check failed for run %s, not waiting: %s", run_id, exc)
+        return False
+
+
+def _fence_max_retries() -> int:
+    poll = max(settings.consolidation_fence_poll_seconds, 0.1)
+    return max(1, int(settings.consolidation_fence_max_wait_seconds / poll))
+
+
 @celery_app.task(base=DatabaseTask, bind=True)
 def start_run(
     self: DatabaseTask,
@@ -282,15 +385,15 @@ def start_run(
     batch_size = settings.extraction_consolidation_batch_size
     batches = [prompt_ids[i:i + batch_size] for i in range(0, len(prompt_ids), batch_size)]
 
-    results_key = f"dragonlens:run:{run_id}:batch_results"
-    _clear_batch_results(results_key)
+    clear_finalize_checkpoints(self.db, run_id)
+    results_key = run_results_key(run_id)
+    get_run_state_store().begin_run(run_id, len(prompt_ids))
+    _register_for_scheduling(run)
 
     first_batch = batches[0]
     remaining = batches[1:]
     header = [
-        ensure_llm_answer.s(run_id, pid).set(queue=llm_queue)
-        | ensure_extraction.s(run_id, force_reextract).set(queue="ollama_extract")
-        for pid in first_batch
+        _prompt_chain(run_id, pid, llm_queue, force_reextract) for pid in first_batch
     ]
     callback = intermediate_consolidation.s(
         run_id, 0, results_key, remaining,
@@ -301,7 +404,10 @@ def start_run(
 
 
 @celery_app.task(base=DatabaseTask, bind=True)
+@_count_progress
+@_run_scoped
 def ensure_llm_answer(self: DatabaseTask, run_id: int, prompt_id: int) -> dict:
+    flight: Flight | None = None
     try:
         run = self.db.query(Run).filter(Run.id == run_id).first()
         prompt = (
@@ -331,10 +437,29 @@ def ensure_llm_answer(self: DatabaseTask, run_id: int, prompt_id: int) -> dict:
         if reusable:
             return _copy_reused_answer(self.db, run_id, prompt_id, run, reusable)
 
-        llm_router = LLMRouter(self.db)
+        flight = _join_answer_flight(run, prompt_text_zh)
+        if flight is not None and flight.pending:
+            flight = None
+            if self.request.retries < _flight_max_retries():
+                raise self.retry(
+                    countdown=settings.llm_singleflight_poll_seconds,
+                    max_retries=_flight_max_retries(),
+                )
+            logger.warning(
+                "LLM singleflight for run %s prompt %s still pending; querying directly",
+                run_id, prompt_id,
+            )
+        if flight is not None and flight.result is not None:
+            shared = _shared_answer(self.db, flight)
+            flight = None
+            if shared is not None:
+                return _copy_reused_answer(self.db, run_id, prompt_id, run, shared)
+
+        llm_router = LLMRouter(self.db, run_id=run_id)
         resolution = llm_router.resolve(run.provider, run.model_name)
+        stream = new_stream_collector()
         answer_zh, tokens_in, tokens_out, latency = _run_async(
-            llm_router.query_with_resolution(resolution, prompt_text_zh)
+            llm_router.query_with_resolution(resolution, prompt_text_zh, stream=stream)
         )
         answer_en = (
             translator.translate_text_sync(answer_zh, "Chinese", "English")
@@ -355,14 +480,19 @@ def ensure_llm_answer(self: DatabaseTask, run_id: int, prompt_id: int) -> dict:
             tokens_in=tokens_in,
             tokens_out=tokens_out,
             latency=latency,
+            **stream_metrics(stream),
             cost_estimate=cost_estimate,
         )
         self.db.add(llm_answer)
         flush_with_retry(self.db)
         commit_with_retry(self.db)
+        _finish_answer_flight(flight, llm_answer.id)
         return _answer_payload(run_id, prompt_id, llm_answer.id, True, False)
+    except Retry:
+        raise
     except IntegrityError:
         self.db.rollback()
+        _finish_answer_flight(flight)
         existing = _existing_answer(self.db, run_id, prompt_id)
         if existing:
             return _answer_payload(run_id, prompt_id, existing.id, True, True)
@@ -370,6 +500,7 @@ def ensure_llm_answer(self: DatabaseTask, run_id: int, prompt_id: int) -> dict:
             run_id, prompt_id, None, False, False, "IntegrityError on llm_answer insert"
         )
     except Exception as exc:
+        _finish_answer_flight(flight)
         logger.error(
             f"ensure_llm_answer failed for run={run_id} prompt={prompt_id}: {exc}",
             exc_info=True,
@@ -377,6 +508,59 @@ def ensure_llm_answer(self: DatabaseTask, run_id: int, prompt_id: int) -> dict:
         return _answer_payload(run_id, prompt_id, None, False, False, str(exc))
 
 
+def _join_answer_flight(run: Run, prompt_text_zh: str) -> Flight | None:
+    """Coalesce identical in-flight prompts of runs that allow answer reuse."""
+    if not run.reuse_answers:
+        return None
+    singleflight = get_llm_singleflight()
+    if singleflight is None:
+        return None
+    key = singleflight_key(
+        run.provider, run.model_name, run.web_search_enabled, prompt_text_zh
+    )
+    try:
+        return singleflight.join(key)
+    except Exception as exc:
+        logger.warning("LLM singleflight unavailable for run %s: %s", run.id, exc)
+        return None
+
+
+def _flight_max_retries() -> int:
+    poll = max(settings.llm_singleflight_poll_seconds, 0.1)
+    return max(1, int(settings.llm_singleflight_wait_seconds / poll))
+
+
+def _shared_answer(db: Session, flight: Flight) -> LLMAnswer | None:
+    """The leader's answer, unless it is gone or its run has failed since."""
+    answer = (
+        db.query(LLMAnswer)
+        .join(Run, Run.id == LLMAnswer.run_id)
+        .filter(LLMAnswer.id == int(flight.result), Run.status != RunStatus.FAILED)
+        .first()
+    )
+    if answer is None:
+        try:
+            get_llm_singleflight().forget(flight.key)
+        except Exception as exc:
+            logger.warning("Failed to drop stale singleflight result %s: %s", flight.key, exc)
+    return answer
+
+
+def _finish_answer_flight(flight: Flight | None, answer_id: int | None = None) -> None:
+    if flight is None or not flight.leader:
+        return
+    singleflight = get_llm_singleflight()
+    if singleflight is None:
+        return
+    try:
+        if answer_id is None:
+            singleflight.abandon(flight)
+        else:
+            singleflight.publish(flight, answer_id)
+    except Exception as exc:
+        logger.warning("Failed to finish singleflight %s: %s", flight.key, exc)
+
+
 def _copy_reused_answer(
     db: Session, run_id: int, prompt_id: int, run: Run, reusable: LLMAnswer
 ) -> dict:
@@ -392,6 +576,8 @@ def _copy_reused_answer(
             tokens_in=reusable.tokens_in,
             tokens_out=reusable.tokens_out,
             latency=reusable.latency,
+            time_to_first_token=reusable.time_to_first_token,
+            tokens_per_second=reusable.tokens_per_second,
             cost_estimate=reusable.cost_estimate,
         )
         db.add(llm_answer)
@@ -409,14 +595,30 @@ def _copy_reused_answer(
 
 
 @celery_app.task(base=DatabaseTask, bind=True)
+@_count_progress
+@_run_scoped
 def ensure_extraction(
-    self: DatabaseTask, payload: dict, run_id: int, force_reextract: bool = False
+    self: DatabaseTask,
+    payload: dict,
+    run_id: int,
+    force_reextract: bool = False,
+    kb_fence: int = 0,
 ) -> dict:
     if not payload.get("ok") or not payload.get("llm_answer_id"):
         return _extraction_payload(
             payload, False, "extraction_skipped", payload.get("error")
         )
 
+    if _kb_fence_pending(run_id, kb_fence):
+        if self.request.retries < _fence_max_retries():
+            raise self.retry(
+                countdown=settings.consolidation_fence_poll_seconds,
+                max_retries=_fence_max_retries(),
+            )
+        logger.warning(
+            "[BATCH] KB fence %d for run %d not reached; extracting anyway", kb_fence, run_id
+        )
+
     prompt_id = int(payload["prompt_id"])
     llm_answer_id = int(payload["llm_answer_id"])
     try:
@@ -430,13 +632,9 @@ def ensure_extraction(
         if not force_reextract and _has_mentions(self.db, llm_answer_id):
             return _extraction_payload(payload, True, "extraction_skipped", None)
 
-        self.db.query(BrandMention).filter(
-            BrandMention.llm_answer_id == llm_answer_id
-        ).delete()
-        self.db.query(ProductMention).filter(
-            ProductMention.llm_answer_id == llm_answer_id
-        ).delete()
+        delete_mentions(self.db, [llm_answer_id])
         flush_with_retry(self.db)
+        writer = MentionWriter()
 
         brands = self.db.query(Brand).filter(Brand.vertical_id == run.vertical_id).all()
         translator = TranslaterService()
@@ -454,30 +652,8 @@ def ensure_extraction(
 
         if extraction_result.debug_info:
             logger.info(f"[TASK] ensure_extraction: storing extraction debug info")
-            self.db.query(ExtractionDebug).filter(
-                ExtractionDebug.llm_answer_id == llm_answer_id
-            ).delete()
-            debug_record = ExtractionDebug(
-                llm_answer_id=llm_answer_id,
-                raw_brands=json.dumps(
-                    extraction_result.debug_info.raw_brands, ensure_ascii=False
-                ),
-                raw_products=json.dumps(
-                    extraction_result.debug_info.raw_products, ensure_ascii=False
-                ),
-                rejected_at_light_filter=json.dumps(
-                    extraction_result.debug_info.rejected_at_light_filter,
-                    ensure_ascii=False,
-                ),
-                final_brands=json.dumps(
-                    extraction_result.debug_info.final_brands, ensure_ascii=False
-                ),
-                final_products=json.dumps(
-                    extraction_result.debug_info.final_products, ensure_ascii=False
-                ),
-                extraction_method="qwen",
-            )
-            self.db.add(debug_record)
+            delete_extraction_debug(self.db, [llm_answer_id])
+            _add_debug_row(writer, llm_answer_id, extraction_result.debug_info)
             logger.info(f"[TASK] ensure_extraction: debug record added")
 
         logger.info(f"[TASK] ensure_extraction: calling discover_and_store_products")
@@ -506,54 +682,35 @@ def ensure_extraction(
         brand_aliases = [
             b.aliases.get("zh", []) + b.aliases.get("en", []) for b in all_brands
         ]
-        brand_mentions = _run_async(
-            ollama_service.extract_brands(answer_zh, brand_names, brand_aliases)
-        )
-
         product_names, product_aliases = _products_to_variants(discovered_products)
         brand_names_for_products, brand_aliases_for_products = _brands_to_variants(
             all_brands
         )
-        product_mentions = _run_async(
-            ollama_service.extract_products(
-                answer_zh,
-                product_names,
-                product_aliases,
-                brand_names_for_products,
-                brand_aliases_for_products,
+        brand_mentions, product_mentions = _run_async(
+            _gather(
+                ollama_service.extract_brands(answer_zh, brand_names, brand_aliases),
+                ollama_service.extract_products(
+                    answer_zh,
+                    product_names,
+                    product_aliases,
+                    brand_names_for_products,
+                    brand_aliases_for_products,
+                ),
             )
         )
 
-        all_snippets, snippet_map = _collect_all_snippets(
-            brand_mentions, product_mentions
-        )
-        if settings.batch_translation_enabled and all_snippets:
-            translated = translator.translate_batch_sync(
-                all_snippets, "Chinese", "English"
+        sentiments, translated, snippet_map = _run_async(
+            _classify_and_translate_snippets(
+                ollama_service, translator, brand_mentions, product_mentions
             )
-        else:
-            translated = [
-                translator.translate_text_sync(s, "Chinese", "English")
-                for s in all_snippets
-            ]
+        )
 
         for mention_data in brand_mentions:
             if not mention_data["mentioned"]:
                 continue
             brand = all_brands[mention_data["brand_index"]]
-            sentiment_str = "neutral"
-            if mention_data["snippets"]:
-                sentiment_str = _run_async(
-                    ollama_service.classify_sentiment(mention_data["snippets"][0])
-                )
-            sentiment = (
-                Sentiment.POSITIVE
-                if sentiment_str == "positive"
-                else (
-                    Sentiment.NEGATIVE
-                    if sentiment_str == "negative"
-                    else Sentiment.NEUTRAL
-                )
+            sentiment = _map_sentiment(
+                first_snippet_sentiment(mention_data, sentiments)
             )
             en_snippets = _get_translated_snippets(
                 "brand",
@@ -562,30 +719,22 @@ def ensure_extraction(
                 snippet_map,
                 translated,
             )
-            self.db.add(
-                BrandMention(
-                    llm_answer_id=llm_answer_id,
-                    brand_id=brand.id,
-                    mentioned=True,
-                    rank=mention_data["rank"],
-                    sentiment=sentiment,
-                    evidence_snippets={
-                        "zh": mention_data["snippets"],
-                        "en": en_snippets,
-                    },
-                )
+            writer.add_brand(
+                llm_answer_id,
+                brand.id,
+                mention_data["rank"],
+                sentiment,
+                mention_data["snippets"],
+                en_snippets,
             )
 
         for mention_data in product_mentions:
             if not mention_data["mentioned"] or mention_data["rank"] is None:
                 continue
             product = discovered_products[mention_data["product_index"]]
-            sentiment_str = "neutral"
-            if mention_data["snippets"]:
-                sentiment_str = _run_async(
-                    ollama_service.classify_sentiment(mention_data["snippets"][0])
-                )
-            sentiment = _map_sentiment(sentiment_str)
+            sentiment = _map_sentiment(
+                first_snippet_sentiment(mention_data, sentiments)
+            )
             en_snippets = _get_translated_snippets(
                 "product",
                 mention_data["product_index"],
@@ -593,20 +742,15 @@ def ensure_extraction(
                 snippet_map,
                 translated,
             )
-            self.db.add(
-                ProductMention(
-                    llm_answer_id=llm_answer_id,
-                    product_id=product.id,
-                    mentioned=True,
-                    rank=mention_data["rank"],
-                    sentiment=sentiment,
-                    evidence_snippets={
-                        "zh": mention_data["snippets"],
-                        "en": en_snippets,
-                    },
-                )
+            writer.add_product(
+                llm_answer_id,
+                product.id,
+                mention_data["rank"],
+                sentiment,
+                mention_data["snippets"],
+                en_snippets,
             )
-        flush_with_retry(self.db)
+        writer.write(self.db)
 
         commit_with_retry(self.db)
         return _extraction_payload(payload, True, "extraction", None)
@@ -618,6 +762,17 @@ def ensure_extraction(
         return _extraction_payload(payload, False, "extraction", str(exc))
 
 
+def _add_debug_row(writer: MentionWriter, llm_answer_id: int, debug_info) -> None:
+    writer.add_debug(
+        llm_answer_id,
+        raw_brands=debug_info.raw_brands,
+        raw_products=debug_info.raw_products,
+        rejected_at_light_filter=debug_info.rejected_at_light_filter,
+        final_brands=debug_info.final_brands,
+        final_products=debug_info.final_products,
+    )
+
+
 def _has_mentions(db: Session, llm_answer_id: int) -> bool:
     if (
         db.query(BrandMention.id)
@@ -634,6 +789,7 @@ def _has_mentions(db: Session, llm_answer_id: int) -> bool:
 
 
 @celery_app.task(base=DatabaseTask, bind=True)
+@_run_scoped
 def intermediate_consolidation(
     self: DatabaseTask,
     results: list[dict],
@@ -649,34 +805,43 @@ def intermediate_consolidation(
 
     Persists normalized entities to the knowledge DB so subsequent batches
     benefit from a richer KB.  Then launches the next batch chord or
-    finalize_run if no batches remain.
+    finalize_run if no batches remain.  With consolidation overlap enabled
+    the next chord is launched before the consultant runs; its extractions
+    wait for the run's KB version to reach ``batch_index + 1``.
     """
     logger.info(
         "[BATCH] intermediate_consolidation batch=%d run=%d, %d results, %d batches remaining",
         batch_index, run_id, len(results), len(remaining_batches),
     )
     _store_batch_results(results_key, results)
+    get_run_state_store().increment(run_id, batches_completed=1)
+
+    overlap = settings.consolidation_overlap_enabled and bool(remaining_batches)
+    if overlap:
+        # Fetch the next batch's answers now; its extractions wait on the fence.
+        _dispatch_next_batch(
+            run_id, batch_index, results_key, remaining_batches,
+            force_reextract, skip_entity_consolidation, llm_queue,
+            kb_fence=batch_index + 1,
+        )
 
     try:
         _run_batch_consultant(self.db, run_id)
     except Exception as exc:
         logger.error("[BATCH] Consultant failed for batch %d run %d: %s", batch_index, run_id, exc, exc_info=True)
 
-    if remaining_batches:
-        next_batch = remaining_batches[0]
-        rest = remaining_batches[1:]
-        header = []
-        for prompt_id in next_batch:
-            header.append(
-                ensure_llm_answer.s(run_id, prompt_id).set(queue=llm_queue)
-                | ensure_extraction.s(run_id, force_reextract).set(queue="ollama_extract")
-            )
-        callback = intermediate_consolidation.s(
-            run_id, batch_index + 1, results_key, rest,
+    if settings.consolidation_overlap_enabled:
+        try:
+            get_run_state_store().bump_kb_version(run_id)
+        except Exception as exc:
+            logger.warning("[BATCH] Failed to advance KB fence for run %d: %s", run_id, exc)
+
+    if remaining_batches and not overlap:
+        _dispatch_next_batch(
+            run_id, batch_index, results_key, remaining_batches,
             force_reextract, skip_entity_consolidation, llm_queue,
-        ).set(queue="ollama_extract")
-        chord(group(header))(callback)
-    else:
+        )
+    elif not remaining_batches:
         finalize_run.delay(
             run_id, force_reextract, skip_entity_consolidation, results_key,
         )
@@ -684,6 +849,29 @@ def intermediate_consolidation(
     return {"batch_index": batch_index, "ok": True, "run_id": run_id}
 
 
+def _dispatch_next_batch(
+    run_id: int,
+    batch_index: int,
+    results_key: str,
+    remaining_batches: list[list[int]],
+    force_reextract: bool,
+    skip_entity_consolidation: bool,
+    llm_queue: str,
+    kb_fence: int = 0,
+) -> None:
+    next_batch = remaining_batches[0]
+    rest = remaining_batches[1:]
+    header = [
+        _prompt_chain(run_id, prompt_id, llm_queue, force_reextract, kb_fence=kb_fence)
+        for prompt_id in next_batch
+    ]
+    callback = intermediate_consolidation.s(
+        run_id, batch_index + 1, results_key, rest,
+        force_reextract, skip_entity_consolidation, llm_queue,
+    ).set(queue="ollama_extract")
+    chord(group(header))(callback)
+
+
 def _run_batch_consultant(db: Session, run_id: int) -> None:
     """Run ExtractionConsultant over all entities extracted so far for a run."""
     consolidation_input = gather_consolidation_input(db, run_id)
@@ -765,6 +953,7 @@ def _gather_item_pairs_for_run(db: Session, run_id: int) -> list[tuple[str | Non
 
 
 @celery_app.task(base=DatabaseTask, bind=True)
+@_run_scoped
 def finalize_run(
     self: DatabaseTask,
     run_id: int,
@@ -776,47 +965,63 @@ def finalize_run(
     if not run:
         raise ValueError(f"Run {run_id} not found")
 
-    if results_key:
-        results = _load_all_results(results_key)
-        _clear_batch_results(results_key)
-    else:
-        results = []
+    checkpoints = FinalizeCheckpoints(self.db, run_id)
+    if not checkpoints.completed("results"):
+        results = _load_all_results(results_key) if results_key else []
+        _unregister_from_scheduling(run_id)
+        failed_ids = _failed_prompt_ids(results)
+        if _should_fail_run(results):
+            if results_key:
+                _clear_batch_results(results_key)
+            run.status = RunStatus.FAILED
+            run.error_message = (
+                f"Run failed: failed_prompts={len(failed_ids)} prompt_ids={failed_ids}"
+            )
+            run.completed_at = datetime.utcnow()
+            commit_with_retry(self.db)
+            return {
+                "run_id": run_id,
+                "status": "failed",
+                "failed_count": len(failed_ids),
+                "failed_prompt_ids": failed_ids,
+            }
+        checkpoints.run(
+            "results",
+            lambda: {
+                "failed_prompt_ids": failed_ids,
+                "skip_entity_consolidation": skip_entity_consolidation,
+            },
+        )
+        if results_key:
+            _clear_batch_results(results_key)
 
-    failed_ids = _failed_prompt_ids(results)
-    if _should_fail_run(results):
+    options = checkpoints.output("results") or {}
+    failed_ids = options.get("failed_prompt_ids", [])
+    skip_entity_consolidation = options.get(
+        "skip_entity_consolidation", skip_entity_consolidation
+    )
+
+    try:
+        _run_finalize_stages(self.db, run, checkpoints, skip_entity_consolidation)
+    except Exception as exc:
+        stage = checkpoints.current_stage
+        self.db.rollback()
+        if self.request.retries < settings.finalize_max_retries:
+            logger.warning(
+                "[FINALIZE] run=%d stage=%s failed, retrying from checkpoint: %s",
+                run_id, stage, exc,
+            )
+            raise self.retry(
+                exc=exc,
+                countdown=settings.finalize_retry_countdown_seconds,
+                max_retries=settings.finalize_max_retries,
+            )
+        logger.error("[FINALIZE] run=%d stage=%s failed: %s", run_id, stage, exc, exc_info=True)
         run.status = RunStatus.FAILED
-        run.error_message = (
-            f"Run failed: failed_prompts={len(failed_ids)} prompt_ids={failed_ids}"
-        )
+        run.error_message = f"Finalize failed at stage {stage}: {exc}"
         run.completed_at = datetime.utcnow()
         commit_with_retry(self.db)
-        return {
-            "run_id": run_id,
-            "status": "failed",
-            "failed_count": len(failed_ids),
-            "failed_prompt_ids": failed_ids,
-        }
-
-    _backfill_entity_english_names(self.db, run)
-
-    enhanced_result = _run_async(run_enhanced_consolidation(self.db, run_id))
-    _run_async(apply_vertical_gate_to_run(self.db, run_id))
-    if not skip_entity_consolidation:
-        consolidate_run(
-            self.db, run_id, normalized_brands=enhanced_result.normalized_brands
-        )
-    _run_async(map_products_to_brands_for_run(self.db, run_id))
-    calculate_and_save_metrics(self.db, run_id)
-    calculate_and_save_run_product_metrics(self.db, run_id)
-    _run_comparison_if_enabled(self.db, run_id)
-
-    if settings.vertical_auto_match_enabled:
-        try:
-            from services.vertical_auto_match import ensure_vertical_grouping_for_run
-
-            _run_async(ensure_vertical_grouping_for_run(self.db, run_id))
-        except Exception as exc:
-            logger.warning("Vertical auto-match skipped for run %s: %s", run_id, exc)
+        raise
 
     run.status = RunStatus.COMPLETED
     run.completed_at = datetime.utcnow()
@@ -828,9 +1033,84 @@ def finalize_run(
         "status": "completed",
         "failed_count": len(failed_ids),
         "failed_prompt_ids": failed_ids,
+        "stage_durations": checkpoints.durations(),
+        "llm_cache": _log_llm_cache_stats(run_id),
+        "translation_memory": translation_memory_report(run_id),
     }
 
 
+def _run_finalize_stages(
+    db: Session,
+    run: Run,
+    checkpoints: FinalizeCheckpoints,
+    skip_entity_consolidation: bool,
+) -> None:
+    run_id = run.id
+
+    def enhanced_consolidation() -> dict:
+        result = _run_async(run_enhanced_consolidation(db, run_id))
+        return {"normalized_brands": result.normalized_brands}
+
+    def entity_consolidation() -> None:
+        if skip_entity_consolidation:
+            return None
+        normalized = checkpoints.output("enhanced_consolidation") or {}
+        consolidate_run(
+            db, run_id, normalized_brands=normalized.get("normalized_brands") or {}
+        )
+        return None
+
+    def vertical_gate() -> dict:
+        return {"gated_brands": _run_async(apply_vertical_gate_to_run(db, run_id))}
+
+    def product_brand_mapping() -> dict:
+        mapping = _run_async(map_products_to_brands_for_run(db, run_id))
+        return {"mapped_products": len(mapping or {})}
+
+    checkpoints.run("english_backfill", lambda: _backfill_entity_english_names(db, run))
+    checkpoints.run("enhanced_consolidation", enhanced_consolidation)
+    checkpoints.run("vertical_gate", vertical_gate)
+    checkpoints.run("entity_consolidation", entity_consolidation)
+    checkpoints.run("product_brand_mapping", product_brand_mapping)
+    checkpoints.run("run_metrics", lambda: calculate_and_save_metrics(db, run_id))
+    checkpoints.run("product_metrics", lambda: calculate_and_save_run_product_metrics(db, run_id))
+    checkpoints.run("comparison", lambda: _run_comparison_if_enabled(db, run_id))
+    checkpoints.run("vertical_auto_match", lambda: _run_vertical_auto_match(db, run_id))
+    checkpoints.run(
+        "latest_metrics",
+        lambda: refresh_latest_metrics_safely(db, run.vertical_id, [run.model_name]),
+    )
+
+
+@celery_app.task(base=DatabaseTask, bind=True)
+def refresh_vertical_latest_metrics(self: DatabaseTask, vertical_id: int) -> dict | None:
+    """Rebuild every latest-metrics scope of a vertical after canonical mappings changed."""
+    return refresh_latest_metrics_safely(self.db, vertical_id)
+
+
+def _run_vertical_auto_match(db: Session, run_id: int) -> None:
+    if not settings.vertical_auto_match_enabled:
+        return
+    try:
+        from services.vertical_auto_match import ensure_vertical_grouping_for_run
+
+        _run_async(ensure_vertical_grouping_for_run(db, run_id))
+    except Exception as exc:
+        logger.warning("Vertical auto-match skipped for run %s: %s", run_id, exc)
+
+
+def _log_llm_cache_stats(run_id: int) -> dict | None:
+    cache = get_llm_cache()
+    if cache is None:
+        return None
+    stats = cache.run_stats(run_id)
+    logger.info(
+        "[LLM_CACHE] run=%d hits=%d misses=%d bypassed=%d hit_rate=%.1f%%",
+        run_id, stats.hits, stats.misses, stats.bypassed, stats.hit_rate * 100,
+    )
+    return stats.as_dict()
+
+
 def _run_comparison_if_enabled(db: Session, run_id: int) -> None:
     from models import ComparisonRunStatus, RunComparisonConfig
     from services.comparison_prompts.metrics_update import (
@@ -985,6 +1265,7 @@ def _apply_entity_english_mapping(
 
 
 @celery_app.task(base=DatabaseTask, bind=True)
+@_run_scoped
 def run_vertical_analysis(
     self: DatabaseTask, vertical_id: int, provider: str, model_name: str, run_id: int
 ):
@@ -1011,7 +1292,7 @@ def run_vertical_analysis(
         if not brands:
             raise ValueError(f"No brands found for vertical {vertical_id}")
 
-        llm_router = LLMRouter(self.db)
+        llm_router = LLMRouter(self.db, run_id=run_id)
         resolution = llm_router.resolve(provider, model_name)
         run.route = resolution.route
         commit_with_retry(self.db)
@@ -1032,9 +1313,13 @@ def run_vertical_analysis(
         llm_results_by_prompt_id: dict[int, LLMResult] = {}
         if llm_requests:
             if concurrency > 1 and len(llm_requests) > 1:
+                limiter = get_limiter(
+                    provider, model_name, local=resolution.route == LLMRoute.LOCAL
+                )
                 llm_results = _run_async(
-                    fetch_llm_answers_parallel(llm_requests, _query_fn, concurrency)
+                    fetch_llm_answers_parallel(llm_requests, _query_fn, limiter=limiter)
                 )
+                log_limiter_snapshots()
                 _raise_on_llm_errors(llm_results)
                 llm_results_by_prompt_id = {r.prompt_id: r for r in llm_results}
             else:
@@ -1051,6 +1336,8 @@ def run_vertical_analysis(
                     )
 
         prepared_answers: list[tuple[_PromptWorkItem, LLMAnswer, str]] = []
+        writer = MentionWriter()
+        replaced_answer_ids: list[int] = []
 
         for item in work_items:
             prompt = item.prompt
@@ -1067,13 +1354,6 @@ def run_vertical_analysis(
             if item.existing_answer:
                 llm_answer = item.existing_answer
                 answer_zh = llm_answer.raw_answer_zh
-                self.db.query(BrandMention).filter(
-                    BrandMention.llm_answer_id == llm_answer.id
-                ).delete()
-                self.db.query(ProductMention).filter(
-                    ProductMention.llm_answer_id == llm_answer.id
-                ).delete()
-                flush_with_retry(self.db)
             elif item.reusable_answer:
                 reusable = item.reusable_answer
                 answer_zh = reusable.raw_answer_zh
@@ -1160,30 +1440,7 @@ def run_vertical_analysis(
             )
 
             if extraction_result.debug_info:
-                self.db.query(ExtractionDebug).filter(
-                    ExtractionDebug.llm_answer_id == llm_answer.id
-                ).delete()
-                debug_record = ExtractionDebug(
-                    llm_answer_id=llm_answer.id,
-                    raw_brands=json.dumps(
-                        extraction_result.debug_info.raw_brands, ensure_ascii=False
-                    ),
-                    raw_products=json.dumps(
-                        extraction_result.debug_info.raw_products, ensure_ascii=False
-                    ),
-                    rejected_at_light_filter=json.dumps(
-                        extraction_result.debug_info.rejected_at_light_filter,
-                        ensure_ascii=False,
-                    ),
-                    final_brands=json.dumps(
-                        extraction_result.debug_info.final_brands, ensure_ascii=False
-                    ),
-                    final_products=json.dumps(
-                        extraction_result.debug_info.final_products, ensure_ascii=False
-                    ),
-                    extraction_method="qwen",
-                )
-                self.db.add(debug_record)
+                _add_debug_row(writer, llm_answer.id, extraction_result.debug_info)
 
             logger.info("Discovering products in response...")
             discovered_products = discover_and_store_products(
@@ -1219,41 +1476,18 @@ def run_vertical_analysis(
                 )
             )
 
-            all_snippets, snippet_map = _collect_all_snippets(
-                brand_mentions_data, product_mentions_data
-            )
-            if settings.batch_translation_enabled and all_snippets:
-                logger.info(f"Batch translating {len(all_snippets)} snippets...")
-                translated = translator.translate_batch_sync(
-                    all_snippets, "Chinese", "English"
+            sentiments, translated, snippet_map = _run_async(
+                _classify_and_translate_snippets(
+                    ollama_service, translator, brand_mentions_data, product_mentions_data
                 )
-            else:
-                translated = [
-                    translator.translate_text_sync(s, "Chinese", "English")
-                    for s in all_snippets
-                ]
+            )
 
             for mention_data in brand_mentions_data:
                 if not mention_data["mentioned"]:
                     continue
                 brand = all_brands[mention_data["brand_index"]]
-                sentiment_str = "neutral"
-                if mention_data["snippets"]:
-                    snippet = mention_data["snippets"][0]
-                    sentiment_str = _run_async(
-                        ollama_service.classify_sentiment(snippet)
-                    )
-                    logger.info(
-                        f"Brand {brand.display_name} sentiment: {sentiment_str}"
-                    )
-                sentiment = (
-                    Sentiment.POSITIVE
-                    if sentiment_str == "positive"
-                    else (
-                        Sentiment.NEGATIVE
-                        if sentiment_str == "negative"
-                        else Sentiment.NEUTRAL
-                    )
+                sentiment = _map_sentiment(
+                    first_snippet_sentiment(mention_data, sentiments)
                 )
                 en_snippets = _get_translated_snippets(
                     "brand",
@@ -1262,29 +1496,22 @@ def run_vertical_analysis(
                     snippet_map,
                     translated,
                 )
-                mention = BrandMention(
-                    llm_answer_id=llm_answer.id,
-                    brand_id=brand.id,
-                    mentioned=True,
-                    rank=mention_data["rank"],
-                    sentiment=sentiment,
-                    evidence_snippets={
-                        "zh": mention_data["snippets"],
-                        "en": en_snippets,
-                    },
+                writer.add_brand(
+                    llm_answer.id,
+                    brand.id,
+                    mention_data["rank"],
+                    sentiment,
+                    mention_data["snippets"],
+                    en_snippets,
                 )
-                self.db.add(mention)
 
             for mention_data in product_mentions_data:
                 if not mention_data["mentioned"] or mention_data["rank"] is None:
                     continue
                 product = discovered_products[mention_data["product_index"]]
-                sentiment_str = "neutral"
-                if mention_data["snippets"]:
-                    sentiment_str = _run_async(
-                        ollama_service.classify_sentiment(mention_data["snippets"][0])
-                    )
-                sentiment = _map_sentiment(sentiment_str)
+                sentiment = _map_sentiment(
+                    first_snippet_sentiment(mention_data, sentiments)
+                )
                 en_snippets = _get_translated_snippets(
                     "product",
                     mention_data["product_index"],
@@ -1292,22 +1519,19 @@ def run_vertical_analysis(
                     snippet_map,
                     translated,
                 )
-                self.db.add(
-                    ProductMention(
-                        llm_answer_id=llm_answer.id,
-                        product_id=product.id,
-                        mentioned=True,
-                        rank=mention_data["rank"],
-                        sentiment=sentiment,
-                        evidence_snippets={
-                            "zh": mention_data["snippets"],
-                            "en": en_snippets,
-                        },
-                    )
+                writer.add_product(
+                    llm_answer.id,
+                    product.id,
+                    mention_data["rank"],
+                    sentiment,
+                    mention_data["snippets"],
+                    en_snippets,
                 )
-            flush_with_retry(self.db)
+            if item.existing_answer:
+                replaced_answer_ids.append(llm_answer.id)
 
-            commit_with_retry(self.db)
+        writer.write(self.db, replace_answer_ids=replaced_answer_ids)
+        commit_with_retry(self.db)
 
         logger.info(f"Running enhanced consolidation for run {run_id}...")
         enhanced_result = _run_async(run_enhanced_consolidation(self.db, run_id))
@@ -1578,6 +1802,51 @@ def _collect_all_snippets(
     return all_snippets, snippet_map
 
 
+async def _gather(*aws):
+    return await asyncio.gather(*aws)
+
+
+def _sentiment_snippets(
+    brand_mentions: list[dict],
+    product_mentions: list[dict],
+) -> list[str]:
+    """First snippet of every kept mention, deduplicated in order."""
+    snippets = [
+        m["snippets"][0] for m in brand_mentions if m.get("mentioned") and m.get("snippets")
+    ]
+    snippets += [
+        m["snippets"][0]
+        for m in product_mentions
+        if m.get("mentioned") and m.get("rank") is not None and m.get("snippets")
+    ]
+    return list(dict.fromkeys(snippets))
+
+
+async def _classify_and_translate_snippets(
+    ollama_service,
+    translator: TranslaterService,
+    brand_mentions: list[dict],
+    product_mentions: list[dict],
+) -> tuple[dict[str, str], list[str], dict[tuple[str, int, int], int]]:
+    """Classify and translate all snippets of one answer in two batch calls.
+
+    Returns ({snippet: sentiment}, translations aligned with the collected
+    snippets, snippet_map from ``_collect_all_snippets``).
+    """
+    all_snippets, snippet_map = _collect_all_snippets(brand_mentions, product_mentions)
+    sentiment_inputs = _sentiment_snippets(brand_mentions, product_mentions)
+    if settings.batch_translation_enabled and all_snippets:
+        translation = translator.translate_batch(all_snippets, "Chinese", "English")
+    else:
+        translation = _gather(
+            *(translator.translate_text(s, "Chinese", "English") for s in all_snippets)
+        )
+    labels, translated = await asyncio.gather(
+        ollama_service.classify_sentiment_batch(sentiment_inputs), translation
+    )
+    return dict(zip(sentiment_inputs, labels)), list(translated), snippet_map
+
+
 def _get_translated_snippets(
     entity_type: str,
     entity_idx: int,
@@ -40,6 +40,10 @@ _set_env_default("KNOWLEDGE_DATABASE_URL", "sqlite:///:memory:")
 os.environ["FEEDBACK_SANITY_CHECKS_ENABLED"] = "false"
 os.environ["FEEDBACK_TRIGGER_RERUN_ENABLED"] = "false"
 os.environ["VERTICAL_AUTO_MATCH_ENABLED"] = "false"
+os.environ["LLM_CACHE_ENABLED"] = "false"
+os.environ["SENTIMENT_CACHE_ENABLED"] = "false"
+os.environ["TRANSLATION_MEMORY_ENABLED"] = "false"
+os.environ["LLM_SINGLEFLIGHT_ENABLED"] = "false"
 _set_env_default("ENCRYPTION_SECRET_KEY", "test-secret-key")
 
 
@@ -79,9 +83,9 @@ def _routers():
 
 
 def _models():
-    from models import Base, get_db
+    from models import Base, get_db, get_read_db
 
-    return Base, get_db
+    return Base, get_db, get_read_db
 
 
 def _knowledge_models():
@@ -99,7 +103,7 @@ def _knowledge_models():
 
 @pytest.fixture(scope="function")
 def db_engine():
-    Base, _ = _models()
+    Base, _, _ = _models()
     engine = create_engine(
         "sqlite:///:memory:",
         connect_args={"check_same_thread": False},
@@ -172,7 +176,7 @@ def test_app():
 
 @pytest.fixture(scope="function")
 def client(db_session: Session, knowledge_db_session: Session, test_app: FastAPI):
-    _, get_db = _models()
+    _, get_db, get_read_db = _models()
     _, get_knowledge_db, get_knowledge_db_write, _ = _knowledge_models()
 
     def override_get_db():
@@ -194,6 +198,7 @@ def client(db_session: Session, knowledge_db_session: Session, test_app: FastAPI
             pass
 
     test_app.dependency_overrides[get_db] = override_get_db
+    test_app.dependency_overrides[get_read_db] = override_get_db
     test_app.dependency_overrides[get_knowledge_db] = override_get_knowledge_db
     test_app.dependency_overrides[get_knowledge_db_write] = (
         override_get_knowledge_db_write
@@ -0,0 +1,226 @@
+import asyncio
+
+import httpx
+import pytest
+from openai import RateLimitError
+
+from config import settings
+from services.adaptive_concurrency import (
+    AdaptiveLimiter,
+    get_limiter,
+    get_ollama_limiter,
+    is_overload_error,
+    limiter_snapshots,
+    reset_limiters,
+)
+from services.ollama import OllamaOverloadedError
+from workers.llm_parallel import LLMRequest, fetch_llm_answers_parallel
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    reset_limiters()
+    yield
+    reset_limiters()
+
+
+def _rate_limit_error() -> RateLimitError:
+    request = httpx.Request("POST", "https://api.example.com/v1/chat/completions")
+    response = httpx.Response(429, request=request)
+    return RateLimitError("rate limited", response=response, body=None)
+
+
+def _ollama_overloaded() -> OllamaOverloadedError:
+    request = httpx.Request("POST", "http://localhost:11434/api/chat")
+    response = httpx.Response(503, request=request)
+    return OllamaOverloadedError("busy", request=request, response=response)
+
+
+class _FakeProvider:
+    """Fake LLM that returns 429 whenever more than `capacity` calls overlap."""
+
+    def __init__(self, capacity: int, delay: float = 0.005):
+        self.capacity = capacity
+        self.delay = delay
+        self.active = 0
+        self.max_seen = 0
+        self.rejected = 0
+
+    async def __call__(self, prompt_zh: str):
+        self.active += 1
+        self.max_seen = max(self.max_seen, self.active)
+        try:
+            if self.active > self.capacity:
+                self.rejected += 1
+                raise _rate_limit_error()
+            await asyncio.sleep(self.delay)
+            return prompt_zh, 1, 1, self.delay
+        finally:
+            self.active -= 1
+
+
+def test_classifies_overload_errors():
+    assert is_overload_error(_rate_limit_error())
+    assert is_overload_error(_ollama_overloaded())
+    assert is_overload_error(httpx.ReadTimeout("slow"))
+    assert not is_overload_error(ValueError("bad prompt"))
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_additively_while_healthy():
+    limiter = AdaptiveLimiter("test", initial_limit=2, max_limit=5)
+
+    for _ in range(2 + 3 + 4):
+        async with limiter.acquire():
+            pass
+
+    assert limiter.limit == 5
+
+
+@pytest.mark.asyncio
+async def test_limit_halves_on_rate_limit():
+    limiter = AdaptiveLimiter("test", initial_limit=8, max_limit=8)
+
+    with pytest.raises(RateLimitError):
+        async with limiter.acquire():
+            raise _rate_limit_error()
+
+    assert limiter.limit == 4
+    assert limiter.overloads == 1
+
+
+@pytest.mark.asyncio
+async def test_ordinary_errors_do_not_back_off():
+    limiter = AdaptiveLimiter("test", initial_limit=4, max_limit=4)
+
+    with pytest.raises(ValueError):
+        async with limiter.acquire():
+            raise ValueError("bad")
+
+    assert limiter.limit == 4
+    assert limiter.errors == 1
+
+
+@pytest.mark.asyncio
+async def test_limit_never_drops_below_minimum():
+    limiter = AdaptiveLimiter("test", initial_limit=2, min_limit=1, max_limit=4)
+
+    for _ in range(5):
+        limiter._last_backoff = 0.0
+        limiter.record_failure(_ollama_overloaded())
+
+    assert limiter.limit == 1
+
+
+@pytest.mark.asyncio
+async def test_fixed_limiter_never_changes():
+    limiter = AdaptiveLimiter.fixed("fixed", 3)
+
+    for _ in range(20):
+        async with limiter.acquire():
+            pass
+    limiter.record_failure(_rate_limit_error())
+
+    assert limiter.limit == 3
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_released_in_order_and_respect_limit():
+    limiter = AdaptiveLimiter.fixed("fixed", 2)
+    active = 0
+    max_active = 0
+    order: list[int] = []
+
+    async def worker(i: int):
+        nonlocal active, max_active
+        async with limiter.acquire():
+            active += 1
+            max_active = max(max_active, active)
+            order.append(i)
+            await asyncio.sleep(0.001)
+            active -= 1
+
+    await asyncio.gather(*(worker(i) for i in range(8)))
+
+    assert max_active == 2
+    assert order == list(range(8))
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_slot():
+    limiter = AdaptiveLimiter.fixed("fixed", 1)
+    release = asyncio.Event()
+
+    async def holder():
+        async with limiter.acquire():
+            await release.wait()
+
+    async def waiter():
+        async with limiter.acquire():
+            pass
+
+    holding = asyncio.create_task(holder())
+    await asyncio.sleep(0)
+    waiting = asyncio.create_task(waiter())
+    await asyncio.sleep(0)
+    waiting.cancel()
+    release.set()
+    await holding
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+
+    assert limiter.in_flight == 0
+    async with limiter.acquire():
+        assert limiter.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_converges_below_fake_provider_capacity():
+    provider = _FakeProvider(capacity=3)
+    limiter = AdaptiveLimiter("fake/model", initial_limit=8, max_limit=8)
+    requests = [LLMRequest(prompt_id=i, prompt_text_zh=f"p{i}") for i in range(60)]
+
+    results = await fetch_llm_answers_parallel(requests, provider, limiter=limiter)
+
+    assert provider.rejected > 0
+    assert limiter.limit <= 4
+    assert limiter.overloads == provider.rejected
+    late = await fetch_llm_answers_parallel(requests, provider, limiter=limiter)
+    assert sum(1 for r in late if r.error) < sum(1 for r in results if r.error)
+
+
+def test_registry_keys_by_provider_and_model(monkeypatch):
+    monkeypatch.setattr(settings, "remote_llm_concurrency", 3)
+    monkeypatch.setattr(settings, "remote_llm_max_concurrency", 10)
+
+    a = get_limiter("DeepSeek", "deepseek-chat")
+    b = get_limiter("deepseek", "deepseek-chat")
+    c = get_limiter("deepseek", "deepseek-reasoner")
+
+    assert a is b
+    assert a is not c
+    assert a.limit == 3 and a.max_limit == 10
+
+
+def test_registry_uses_fixed_limits_when_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "adaptive_concurrency_enabled", False)
+    monkeypatch.setattr(settings, "ollama_concurrency", 5)
+
+    limiter = get_ollama_limiter()
+
+    assert limiter.min_limit == limiter.max_limit == 5
+
+
+def test_snapshots_expose_limits_and_latency():
+    limiter = get_limiter("kimi", "kimi-k2.5")
+    limiter.record_success(1.0)
+    limiter.record_success(3.0)
+
+    snaps = {s["name"]: s for s in limiter_snapshots()}
+
+    snap = snaps["kimi/kimi-k2.5"]
+    assert snap["limit"] == limiter.limit
+    assert snap["successes"] == 2
+    assert snap["p95_latency"] == 3.0
+    assert snap["ewma_latency"] == pytest.approx(1.4)
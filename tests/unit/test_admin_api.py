@@ -12,6 +12,7 @@ from models import (
     Base,
     Brand,
     DailyMetrics,
+    LatestEntityMetrics,
     LLMAnswer,
     Prompt,
     PromptLanguage,
@@ -31,6 +32,7 @@ from models.knowledge_domain import (
 )
 from models.sqlite_config import apply_sqlite_pragmas
 from services.demo_publish import apply_demo_publish_request, build_demo_publish_request
+from services.latest_metrics import refresh_latest_metrics
 
 
 def test_public_demo_blocks_non_admin_mutations(
@@ -256,6 +258,27 @@ def test_demo_publish_replaces_existing_snapshot_with_fk_checks() -> None:
         assert names == ["Toyota"]
 
 
+def test_demo_publish_replaces_vertical_with_materialized_metrics() -> None:
+    with _fk_enforced_session() as session:
+        vertical = _seed_demo_vertical(session)
+        refresh_latest_metrics(session, vertical.id)
+        assert (
+            session.query(LatestEntityMetrics)
+            .filter(LatestEntityMetrics.vertical_id == vertical.id)
+            .count()
+            > 0
+        )
+        payload = build_demo_publish_request(session, vertical.id, "publish-1")
+
+        vertical_id, run_count, _, _ = apply_demo_publish_request(session, payload)
+        session.commit()
+
+        assert vertical_id > 0
+        assert run_count == 1
+        assert session.query(Vertical).filter(Vertical.name == "Cars").count() == 1
+        assert session.query(LatestEntityMetrics).count() == 0
+
+
 def _seed_demo_vertical(db_session: Session) -> Vertical:
     vertical = Vertical(name="Cars", description="Vehicles")
     db_session.add(vertical)
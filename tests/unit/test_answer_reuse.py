@@ -0,0 +1,96 @@
+"""Unit tests for batched, hash-indexed answer reuse."""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models import LLMAnswer, Prompt, Run, RunStatus, Vertical
+from models.domain import PromptLanguage, prompt_text_hash
+from services.answer_reuse import find_reusable_answers
+
+
+def _completed_run(db: Session, vertical: Vertical, texts: list[tuple], completed_at: datetime) -> Run:
+    run = Run(
+        vertical_id=vertical.id,
+        provider="deepseek",
+        model_name="deepseek-chat",
+        status=RunStatus.COMPLETED,
+        completed_at=completed_at,
+    )
+    db.add(run)
+    db.flush()
+    for text_zh, text_en in texts:
+        prompt = Prompt(
+            vertical_id=vertical.id, run_id=run.id, text_zh=text_zh, text_en=text_en,
+            language_original=PromptLanguage.ZH,
+        )
+        db.add(prompt)
+        db.flush()
+        db.add(LLMAnswer(
+            run_id=run.id, prompt_id=prompt.id, provider="deepseek", model_name="deepseek-chat",
+            raw_answer_zh=f"run{run.id}:{text_zh or text_en}",
+        ))
+    db.commit()
+    return run
+
+
+def _new_run(db: Session, vertical: Vertical) -> Run:
+    run = Run(
+        vertical_id=vertical.id, provider="deepseek", model_name="deepseek-chat",
+        status=RunStatus.PENDING, reuse_answers=True,
+    )
+    db.add(run)
+    db.commit()
+    return run
+
+
+def test_prompt_hash_is_whitespace_normalized_and_kept_in_sync(db_session: Session):
+    vertical = Vertical(name="SUV")
+    db_session.add(vertical)
+    db_session.flush()
+    prompt = Prompt(vertical_id=vertical.id, text_en=" Recommend  10 SUVs\n")
+    db_session.add(prompt)
+    db_session.commit()
+
+    assert prompt.text_en_hash == prompt_text_hash("Recommend 10 SUVs")
+    assert prompt.text_zh_hash is None
+    assert prompt_text_hash("   ") is None
+
+    prompt.text_zh = "推荐10款SUV"
+    db_session.commit()
+    assert prompt.text_zh_hash == prompt_text_hash("推荐10款SUV")
+
+
+def test_batch_lookup_is_aligned_prefers_latest_run_and_uses_one_query(db_session: Session, db_engine):
+    vertical = Vertical(name="SUV")
+    db_session.add(vertical)
+    db_session.commit()
+    now = datetime.utcnow()
+    old = _completed_run(db_session, vertical, [("推荐10款SUV", None), ("最省油的SUV", None)], now - timedelta(days=2))
+    new = _completed_run(db_session, vertical, [("推荐10款SUV", "Recommend 10 SUVs")], now)
+    run = _new_run(db_session, vertical)
+    db_session.refresh(run)
+
+    statements: list[str] = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db_engine, "before_cursor_execute", listener)
+    try:
+        answers = find_reusable_answers(
+            db_session,
+            run,
+            [("推荐10款SUV", None), ("没有这个问题", None), (None, "Recommend 10 SUVs"), ("最省油的SUV ", None)],
+        )
+    finally:
+        event.remove(db_engine, "before_cursor_execute", listener)
+
+    assert [a.raw_answer_zh if a else None for a in answers] == [
+        f"run{new.id}:推荐10款SUV",
+        None,
+        f"run{new.id}:推荐10款SUV",
+        f"run{old.id}:最省油的SUV",
+    ]
+    assert len(statements) == 1
+
+    run.reuse_answers = False
+    assert find_reusable_answers(db_session, run, [("推荐10款SUV", None)]) == [None]
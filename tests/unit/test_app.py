@@ -20,3 +20,13 @@ def test_health(client: TestClient):
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
+
+
+def test_database_health_reports_pool_stats(client: TestClient):
+    response = client.get("/health/db")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"main", "knowledge"}
+    assert set(data["main"]) == {"write", "read"}
+    assert "pool" in data["knowledge"]["read"]
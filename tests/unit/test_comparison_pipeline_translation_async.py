@@ -1,9 +1,9 @@
-import asyncio
 from dataclasses import dataclass
 
 import pytest
 
 from models import ComparisonPrompt, ComparisonPromptSource, ComparisonPromptType, Run, RunStatus, Vertical
+from services.adaptive_concurrency import AdaptiveLimiter
 from services.comparison_prompts.run_pipeline import _fetch_one
 
 
@@ -38,6 +38,6 @@ async def test_fetch_one_defers_answer_translation(db_session):
     db_session.add(prompt)
     db_session.commit()
     db_session.refresh(prompt)
-    sem = asyncio.Semaphore(1)
-    answer = await _fetch_one(db_session, run, prompt, _Router(), _Resolution(), sem)
+    limiter = AdaptiveLimiter.fixed("test", 1)
+    answer = await _fetch_one(db_session, run, prompt, _Router(), _Resolution(), limiter)
     assert answer and answer.raw_answer_en is None
@@ -0,0 +1,56 @@
+"""Unit tests for read/write engine construction."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from config import Settings
+from models.engines import _connect_args, create_db_engine, pool_stats
+
+
+def test_read_urls_default_to_write_urls(monkeypatch):
+    monkeypatch.delenv("DATABASE_READ_URL", raising=False)
+    monkeypatch.delenv("KNOWLEDGE_DATABASE_READ_URL", raising=False)
+    monkeypatch.setenv("DATABASE_URL", "postgresql+psycopg://u:p@db/app")
+    monkeypatch.setenv("KNOWLEDGE_DATABASE_URL", "")
+
+    configured = Settings(_env_file=None)
+
+    assert configured.resolved_database_read_url == "postgresql+psycopg://u:p@db/app"
+    assert configured.resolved_knowledge_database_read_url == "postgresql+psycopg://u:p@db/app"
+
+
+def test_read_engine_on_second_sqlite_file_rejects_writes(tmp_path):
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    write_engine = create_db_engine(url)
+    read_engine = create_db_engine(url, read_only=True)
+    with write_engine.begin() as connection:
+        connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+        connection.execute(text("INSERT INTO items (id) VALUES (1)"))
+
+    with read_engine.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM items")).scalar() == 1
+        with pytest.raises(OperationalError):
+            connection.execute(text("INSERT INTO items (id) VALUES (2)"))
+
+    write_engine.dispose()
+    read_engine.dispose()
+
+
+def test_postgres_read_engine_sets_timeout_and_read_only():
+    args = _connect_args("postgresql+psycopg://u:p@db/app", 5000, True)
+
+    assert args == {"options": "-c statement_timeout=5000 -c default_transaction_read_only=on"}
+    assert _connect_args("postgresql+psycopg://u:p@db/app", None, False) == {}
+
+
+def test_pool_stats_reports_checked_out_connections(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'app.db'}")
+
+    with engine.connect():
+        stats = pool_stats(engine)
+
+    assert stats["pool"] == "QueuePool"
+    assert stats["checked_out"] == 1
+    assert pool_stats(engine)["checked_out"] == 0
+    engine.dispose()
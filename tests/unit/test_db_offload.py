@@ -0,0 +1,88 @@
+"""Unit tests for offloading synchronous database work from the event loop."""
+
+import asyncio
+import inspect
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import db_offload
+from api.db_offload import offload_db, reset_db_executor, run_db
+from api.routers.metrics import get_latest_metrics
+from config import settings
+
+
+@pytest.fixture(autouse=True)
+def _fresh_executor():
+    reset_db_executor()
+    yield
+    reset_db_executor()
+
+
+def test_offloaded_endpoint_keeps_signature_and_is_awaitable():
+    parameters = inspect.signature(get_latest_metrics).parameters
+    assert list(parameters)[:2] == ["vertical_id", "model_name"]
+    assert asyncio.iscoroutinefunction(get_latest_metrics)
+
+
+def test_slow_work_does_not_block_the_event_loop(monkeypatch):
+    monkeypatch.setattr(settings, "db_offload_enabled", True)
+    main_thread = threading.get_ident()
+
+    @offload_db
+    def slow_query(delay: float) -> int:
+        time.sleep(delay)
+        return threading.get_ident()
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        worker_thread = await slow_query(0.2)
+        task.cancel()
+        return worker_thread, ticks
+
+    worker_thread, ticks = asyncio.run(scenario())
+    assert worker_thread != main_thread
+    assert ticks >= 5
+
+
+def test_pool_is_bounded_and_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "db_threadpool_workers", 2)
+    monkeypatch.setattr(settings, "db_offload_enabled", True)
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+
+    async def burst():
+        await asyncio.gather(*(run_db(work) for _ in range(6)))
+
+    asyncio.run(burst())
+    assert peak == 2
+
+    monkeypatch.setattr(settings, "db_offload_enabled", False)
+    assert asyncio.run(run_db(threading.get_ident)) == threading.get_ident()
+    assert db_offload._executor is not None
+
+
+def test_offloaded_endpoint_serves_requests(client: TestClient):
+    response = client.get("/api/v1/verticals")
+
+    assert response.status_code == 200
+    assert response.json() == []
@@ -0,0 +1,73 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+
+import pytest
+
+from services.event_loop_bridge import EventLoopBridge, get_event_loop_bridge, run_sync
+
+
+@pytest.fixture()
+def bridge():
+    instance = EventLoopBridge(name="test-bridge")
+    yield instance
+    instance.stop()
+
+
+def test_run_reuses_one_background_loop(bridge):
+    async def current():
+        return asyncio.get_running_loop(), threading.current_thread()
+
+    first_loop, first_thread = bridge.run(current())
+    second_loop, second_thread = bridge.run(current())
+
+    assert first_loop is second_loop
+    assert first_thread is second_thread is not threading.current_thread()
+
+
+def test_submit_is_thread_safe_and_propagates_errors(bridge):
+    async def double(value):
+        await asyncio.sleep(0)
+        return value * 2
+
+    async def boom():
+        raise ValueError("bad")
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda v: bridge.run(double(v)), range(8)))
+
+    assert results == [v * 2 for v in range(8)]
+    with pytest.raises(ValueError, match="bad"):
+        bridge.run(boom())
+
+
+def test_submit_copies_caller_context(bridge):
+    var: contextvars.ContextVar[str] = contextvars.ContextVar("bridge_test", default="unset")
+
+    async def read():
+        return var.get()
+
+    token = var.set("caller")
+    try:
+        assert bridge.run(read()) == "caller"
+    finally:
+        var.reset(token)
+
+
+def test_run_from_loop_thread_raises(bridge):
+    async def nested():
+        inner = asyncio.sleep(0)
+        with pytest.raises(RuntimeError, match="own thread"):
+            bridge.run(inner)
+        return True
+
+    assert bridge.run(nested())
+
+
+def test_module_helpers_share_the_worker_bridge():
+    async def current():
+        return asyncio.get_running_loop()
+
+    assert run_sync(current()) is run_sync(current())
+    assert get_event_loop_bridge().loop is run_sync(current())
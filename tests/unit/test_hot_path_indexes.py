@@ -0,0 +1,34 @@
+"""Unit tests for the hot-path index bootstrap."""
+
+from sqlalchemy import create_engine, inspect, text
+
+from models import Base
+from models.indexes import HOT_PATH_INDEXES, ensure_hot_path_indexes, missing_hot_path_indexes
+
+
+def test_indexes_are_created_once():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+
+    with engine.begin() as connection:
+        created = ensure_hot_path_indexes(connection)
+        again = ensure_hot_path_indexes(connection)
+
+    assert created == [spec.name for spec in HOT_PATH_INDEXES]
+    assert again == []
+    names = {index["name"] for index in inspect(engine).get_indexes("runs")}
+    assert {"ix_runs_vertical_status_model_time", "ix_runs_vertical_model_time"} <= names
+
+
+def test_index_covered_by_existing_prefix_is_skipped():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+
+    with engine.begin() as connection:
+        connection.execute(
+            text("CREATE UNIQUE INDEX uq_brands_vertical_display ON brands (vertical_id, display_name)")
+        )
+        missing = {spec.name for spec in missing_hot_path_indexes(connection)}
+
+    assert "ix_brands_vertical_id" not in missing
+    assert "ix_products_vertical_id" in missing
@@ -0,0 +1,118 @@
+"""Unit tests for the materialized latest metrics."""
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from models import Brand, BrandMention, LatestEntityMetrics, LLMAnswer, Prompt, Run, Vertical
+from models.domain import EntityType, PromptLanguage, RunStatus, Sentiment
+from services.dashboard_metrics import compute_latest_brand_metrics
+from services.latest_metrics import (
+    check_latest_metrics,
+    invalidate_latest_metrics,
+    refresh_latest_metrics,
+    schedule_latest_metrics_refresh,
+)
+from workers import tasks
+
+
+def _seed(db: Session) -> Vertical:
+    vertical = Vertical(name="SUVs")
+    db.add(vertical)
+    db.flush()
+    brands = [
+        Brand(vertical_id=vertical.id, display_name=name, original_name=name, aliases={})
+        for name in ("Toyota", "Honda", "Mazda")
+    ]
+    db.add_all(brands)
+    prompts = [
+        Prompt(vertical_id=vertical.id, text_zh=f"问题{i}", language_original=PromptLanguage.ZH)
+        for i in range(3)
+    ]
+    db.add_all(prompts)
+    db.flush()
+    for model_name, ranks in (("qwen", (1, 2, None)), ("deepseek", (2, 1, 3))):
+        run = Run(vertical_id=vertical.id, model_name=model_name, status=RunStatus.COMPLETED)
+        db.add(run)
+        db.flush()
+        for prompt in prompts:
+            answer = LLMAnswer(run_id=run.id, prompt_id=prompt.id, model_name=model_name, raw_answer_zh="答")
+            db.add(answer)
+            db.flush()
+            for brand, rank in zip(brands, ranks):
+                db.add(
+                    BrandMention(
+                        llm_answer_id=answer.id,
+                        brand_id=brand.id,
+                        mentioned=rank is not None,
+                        rank=rank,
+                        sentiment=Sentiment.POSITIVE if rank == 1 else Sentiment.NEUTRAL,
+                        evidence_snippets={},
+                    )
+                )
+    db.flush()
+    return vertical
+
+
+def test_endpoint_serves_materialized_rows_matching_live_metrics(client: TestClient, db_session: Session):
+    vertical = _seed(db_session)
+    live = {
+        model: compute_latest_brand_metrics(db_session, vertical.id, model).model_dump(mode="json")
+        for model in ("all", "qwen", "deepseek")
+    }
+
+    summary = refresh_latest_metrics(db_session, vertical.id)
+
+    assert summary["scopes"] == ["all", "deepseek", "qwen"]
+    for model, expected in live.items():
+        response = client.get("/api/v1/metrics/latest", params={"vertical_id": vertical.id, "model_name": model})
+        assert response.status_code == 200
+        assert response.json() == expected
+    assert check_latest_metrics(db_session, vertical.id) == []
+
+
+def test_check_reports_drift_and_refresh_repairs_it(db_session: Session):
+    vertical = _seed(db_session)
+    refresh_latest_metrics(db_session, vertical.id)
+    row = (
+        db_session.query(LatestEntityMetrics)
+        .filter(
+            LatestEntityMetrics.vertical_id == vertical.id,
+            LatestEntityMetrics.model_name == "qwen",
+            LatestEntityMetrics.entity_type == EntityType.BRAND,
+            LatestEntityMetrics.entity_key == "Toyota",
+        )
+        .one()
+    )
+    row.share_of_voice = 0.0
+    db_session.flush()
+
+    diffs = check_latest_metrics(db_session, vertical.id)
+
+    assert [(d.model_name, d.entity_key, d.field) for d in diffs] == [("qwen", "Toyota", "share_of_voice")]
+    refresh_latest_metrics(db_session, vertical.id, ["qwen"])
+    assert check_latest_metrics(db_session, vertical.id) == []
+
+
+def test_invalidated_scopes_fall_back_to_live_computation(client: TestClient, db_session: Session):
+    vertical = _seed(db_session)
+    refresh_latest_metrics(db_session, vertical.id)
+    invalidate_latest_metrics(db_session, [vertical.id])
+    db_session.flush()
+
+    response = client.get("/api/v1/metrics/latest", params={"vertical_id": vertical.id})
+
+    assert db_session.query(LatestEntityMetrics).count() == 0
+    assert response.status_code == 200
+    assert [brand["brand_name"] for brand in response.json()["brands"]] == ["Honda", "Mazda", "Toyota"]
+
+
+def test_scheduled_refresh_drops_rows_and_queues_rebuild(monkeypatch, db_session: Session):
+    vertical = _seed(db_session)
+    refresh_latest_metrics(db_session, vertical.id)
+    queued = []
+    monkeypatch.setattr(tasks.refresh_vertical_latest_metrics, "delay", queued.append)
+
+    schedule_latest_metrics_refresh(db_session, [vertical.id, vertical.id])
+
+    assert db_session.query(LatestEntityMetrics).count() == 0
+    assert queued == [vertical.id]
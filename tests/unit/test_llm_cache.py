@@ -0,0 +1,208 @@
+"""Unit tests for the content-addressed LLM response cache."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from config import settings
+from services import llm_cache
+from services.llm_cache import (
+    CacheStats,
+    LLMResponseCache,
+    MemoryCacheBackend,
+    SQLCacheBackend,
+    cache_key,
+    cached_llm_call,
+    get_llm_cache,
+    llm_cache_run_scope,
+    reset_llm_cache,
+)
+from services.ollama import OllamaService
+
+
+@pytest.fixture()
+def memory_cache(monkeypatch):
+    monkeypatch.setattr(settings, "llm_cache_enabled", True)
+    cache = LLMResponseCache(MemoryCacheBackend(ttl_seconds=60, max_entries=10))
+    reset_llm_cache(cache)
+    yield cache
+    reset_llm_cache()
+
+
+class _Counter:
+    def __init__(self, value: str = "answer"):
+        self.value = value
+        self.calls = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        return self.value
+
+
+def test_cache_key_is_stable_and_field_sensitive():
+    base = cache_key("ollama/qwen", "sys", "prompt", 0.0, "json")
+    assert base == cache_key("ollama/qwen", "sys", "prompt", 0.0, "json")
+    assert len(base) == 64
+    variants = [
+        cache_key("ollama/other", "sys", "prompt", 0.0, "json"),
+        cache_key("ollama/qwen", "other", "prompt", 0.0, "json"),
+        cache_key("ollama/qwen", "sys", "other", 0.0, "json"),
+        cache_key("ollama/qwen", "sys", "prompt", 0.1, "json"),
+        cache_key("ollama/qwen", "sys", "prompt", 0.0, None),
+    ]
+    assert base not in variants
+    assert len(set(variants)) == len(variants)
+
+
+def test_disabled_cache_always_fetches(monkeypatch):
+    monkeypatch.setattr(settings, "llm_cache_enabled", False)
+    reset_llm_cache()
+    fetch = _Counter()
+    assert get_llm_cache() is None
+    asyncio.run(cached_llm_call("m", "p", fetch, temperature=0.0))
+    asyncio.run(cached_llm_call("m", "p", fetch, temperature=0.0))
+    assert fetch.calls == 2
+
+
+def test_deterministic_call_is_served_from_cache(memory_cache):
+    fetch = _Counter("cached answer")
+
+    async def run():
+        first = await cached_llm_call("m", "p", fetch, system_prompt="s", temperature=0.0)
+        second = await cached_llm_call("m", "p", fetch, system_prompt="s", temperature=0.0)
+        return first, second
+
+    assert asyncio.run(run()) == ("cached answer", "cached answer")
+    assert fetch.calls == 1
+
+
+def test_nonzero_temperature_bypasses_cache(memory_cache):
+    fetch = _Counter()
+    asyncio.run(cached_llm_call("m", "p", fetch, temperature=0.7))
+    asyncio.run(cached_llm_call("m", "p", fetch, temperature=0.7))
+    assert fetch.calls == 2
+    assert len(memory_cache.backend) == 0
+
+
+def test_nondeterministic_flag_caches_sampled_calls(memory_cache):
+    memory_cache.allow_nondeterministic = True
+    fetch = _Counter()
+    asyncio.run(cached_llm_call("m", "p", fetch, temperature=0.7))
+    asyncio.run(cached_llm_call("m", "p", fetch, temperature=0.7))
+    assert fetch.calls == 1
+
+
+def test_empty_response_is_not_cached(memory_cache):
+    fetch = _Counter("")
+    asyncio.run(cached_llm_call("m", "p", fetch, temperature=0.0))
+    asyncio.run(cached_llm_call("m", "p", fetch, temperature=0.0))
+    assert fetch.calls == 2
+
+
+def test_memory_backend_expires_and_evicts_lru(monkeypatch):
+    backend = MemoryCacheBackend(ttl_seconds=10, max_entries=2)
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    backend.set("a", "m", "A")
+    backend.set("b", "m", "B")
+    assert backend.get("a") == "A"
+    backend.set("c", "m", "C")
+    assert backend.get("b") is None
+    assert backend.get("a") == "A"
+    now[0] += 11
+    assert backend.get("a") is None
+
+
+def test_sql_backend_round_trip_ttl_and_lru(monkeypatch, tmp_path):
+    backend = SQLCacheBackend(f"sqlite:///{tmp_path / 'cache.db'}", ttl_seconds=10, max_entries=2)
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    backend.set("a", "m", "A")
+    now[0] += 1
+    backend.set("b", "m", "B")
+    now[0] += 1
+    assert backend.get("a") == "A"
+    now[0] += 1
+    backend.set("c", "m", "C")
+    assert backend.evict() == 1
+    assert backend.get("b") is None
+    assert backend.get("a") == "A"
+    now[0] += 20
+    assert backend.get("c") is None
+
+
+def test_sql_backend_accumulates_run_stats():
+    backend = SQLCacheBackend("sqlite:///:memory:", ttl_seconds=0, max_entries=10)
+    backend.add_run_stats(7, CacheStats(hits=2, misses=1))
+    backend.add_run_stats(7, CacheStats(hits=1, bypassed=3))
+    stats = backend.run_stats(7)
+    assert (stats.hits, stats.misses, stats.bypassed) == (3, 1, 3)
+    assert backend.run_stats(8).as_dict()["hit_rate"] == 0.0
+
+
+def test_run_scope_attributes_and_flushes_stats(memory_cache):
+    fetch = _Counter()
+
+    async def run():
+        await cached_llm_call("m", "p", fetch, temperature=0.0)
+        await cached_llm_call("m", "p", fetch, temperature=0.0)
+        await cached_llm_call("m", "p", fetch, temperature=0.9)
+
+    with llm_cache_run_scope(42):
+        asyncio.run(run())
+    stats = memory_cache.backend.run_stats(42)
+    assert (stats.hits, stats.misses, stats.bypassed) == (1, 1, 1)
+    assert stats.hit_rate == 0.5
+    assert memory_cache.run_stats(43).hits == 0
+
+
+def test_backend_failure_falls_back_to_fetch(memory_cache, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(memory_cache.backend, "get", broken)
+    monkeypatch.setattr(memory_cache.backend, "set", broken)
+    fetch = _Counter("live")
+    assert asyncio.run(cached_llm_call("m", "p", fetch, temperature=0.0)) == "live"
+    assert fetch.calls == 1
+
+
+class _CountingTransport(httpx.AsyncBaseTransport):
+    def __init__(self):
+        self.calls = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        return httpx.Response(200, json={"message": {"content": "ok"}}, request=request)
+
+
+def test_ollama_deterministic_calls_hit_cache(memory_cache, monkeypatch):
+    transport = _CountingTransport()
+
+    async def run():
+        client = httpx.AsyncClient(transport=transport)
+        monkeypatch.setattr(OllamaService, "_get_client", classmethod(lambda cls: client))
+        service = OllamaService()
+        results = [
+            await service._call_ollama("qwen", "translate", system_prompt="s", temperature=0.0),
+            await service._call_ollama("qwen", "translate", system_prompt="s", temperature=0.0),
+            await service._call_ollama("qwen", "translate", system_prompt="s", temperature=0.7),
+        ]
+        await client.aclose()
+        return results
+
+    assert asyncio.run(run()) == ["ok", "ok", "ok"]
+    assert transport.calls == 2
+
+
+def test_sql_backend_evicts_periodically(monkeypatch):
+    backend = SQLCacheBackend("sqlite:///:memory:", ttl_seconds=0, max_entries=3)
+    monkeypatch.setattr(SQLCacheBackend, "EVICTION_INTERVAL", 5)
+    base = time.time()
+    for i in range(5):
+        monkeypatch.setattr(llm_cache.time, "time", lambda i=i: base + i)
+        backend.set(f"k{i}", "m", str(i))
+    assert backend.get("k0") is None
+    assert backend.get("k4") == "4"
@@ -0,0 +1,119 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from config import settings
+from services.llm_client_pool import LLMClientPool
+from services.remote_llms import DeepSeekService, OpenRouterService
+
+
+@pytest.fixture(autouse=True)
+def reset_pool():
+    LLMClientPool.close_all()
+    yield
+    LLMClientPool.close_all()
+
+
+def _mock_response(content: str = "回答"):
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content=content))]
+    response.usage = MagicMock(prompt_tokens=1, completion_tokens=2)
+    return response
+
+
+@pytest.mark.asyncio
+async def test_same_provider_and_key_share_one_client():
+    first = LLMClientPool.get_http_client("deepseek", "https://api.example.com/v1", "key-a")
+    second = LLMClientPool.get_http_client("deepseek", "https://api.example.com/v1/", "key-a")
+
+    assert first is second
+    assert LLMClientPool.size() == 1
+
+
+@pytest.mark.asyncio
+async def test_different_keys_and_providers_get_separate_clients():
+    a = LLMClientPool.get_http_client("deepseek", "https://api.example.com/v1", "key-a")
+    b = LLMClientPool.get_http_client("deepseek", "https://api.example.com/v1", "key-b")
+    c = LLMClientPool.get_http_client("kimi", "https://api.example.com/v1", "key-a")
+
+    assert len({id(a), id(b), id(c)}) == 3
+
+
+def test_clients_are_scoped_to_event_loop():
+    async def fetch():
+        return LLMClientPool.get_http_client("openrouter", "https://openrouter.ai/api/v1", "k")
+
+    loop_a = asyncio.new_event_loop()
+    loop_b = asyncio.new_event_loop()
+    try:
+        client_a = loop_a.run_until_complete(fetch())
+        client_b = loop_b.run_until_complete(fetch())
+        assert client_a is not client_b
+        assert loop_a.run_until_complete(fetch()) is client_a
+
+        LLMClientPool.close_all()
+        assert client_a.is_closed
+        assert client_b.is_closed
+        assert LLMClientPool.size() == 0
+    finally:
+        loop_a.close()
+        loop_b.close()
+
+
+def test_entries_for_closed_loops_are_pruned():
+    async def fetch():
+        return LLMClientPool.get_http_client("openrouter", "https://openrouter.ai/api/v1", "k")
+
+    old_loop = asyncio.new_event_loop()
+    old_loop.run_until_complete(fetch())
+    old_loop.close()
+
+    fresh_loop = asyncio.new_event_loop()
+    try:
+        fresh_loop.run_until_complete(fetch())
+        assert LLMClientPool.size() == 1
+    finally:
+        fresh_loop.run_until_complete(LLMClientPool.aclose_current_loop())
+        fresh_loop.close()
+
+
+def test_pool_limits_follow_settings(monkeypatch):
+    monkeypatch.setattr(settings, "llm_http_max_connections", 7)
+    monkeypatch.setattr(settings, "llm_http_max_keepalive_connections", 3)
+
+    with patch("services.llm_client_pool.httpx.AsyncClient") as mock_client_class:
+        mock_client_class.return_value = MagicMock(is_closed=False)
+        LLMClientPool.get_http_client("deepseek", "https://api.example.com/v1", "k")
+
+    limits = mock_client_class.call_args.kwargs["limits"]
+    assert limits.max_connections == 7
+    assert limits.max_keepalive_connections == 3
+    assert mock_client_class.call_args.kwargs["http2"] is False
+
+
+@pytest.mark.asyncio
+async def test_repeated_queries_reuse_sdk_client():
+    with patch("services.base_llm.AsyncOpenAI") as mock_client_class:
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(return_value=_mock_response())
+        mock_client_class.return_value = mock_client
+
+        await DeepSeekService(api_key="k").query("一")
+        await DeepSeekService(api_key="k").query("二")
+
+    mock_client_class.assert_called_once()
+    assert mock_client.chat.completions.create.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_openrouter_and_vendor_do_not_share_sdk_client(monkeypatch):
+    with patch("services.base_llm.AsyncOpenAI") as mock_client_class:
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(return_value=_mock_response())
+        mock_client_class.return_value = mock_client
+
+        await DeepSeekService(api_key="k").query("一")
+        await OpenRouterService(api_key="k").query("二", model_name="openrouter/auto")
+
+    assert mock_client_class.call_count == 2
@@ -109,10 +109,8 @@ class TestKimiService:
         mock_response = MagicMock()
         mock_response.choices = [MagicMock(message=MagicMock(content="测试回答"))]
         mock_response.usage = MagicMock(prompt_tokens=10, completion_tokens=20)
-        mock_http_client = MagicMock()
-        mock_http_client.aclose = AsyncMock()
 
-        with patch("services.remote_llms.httpx.AsyncClient", return_value=mock_http_client), patch("services.remote_llms.AsyncOpenAI") as mock_client_class:
+        with patch("services.base_llm.AsyncOpenAI") as mock_client_class:
             mock_client = MagicMock()
             mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
             mock_client_class.return_value = mock_client
@@ -137,10 +135,8 @@ class TestKimiService:
         mock_response = MagicMock()
         mock_response.choices = [MagicMock(message=MagicMock(content="测试回答"))]
         mock_response.usage = MagicMock(prompt_tokens=10, completion_tokens=20)
-        mock_http_client = MagicMock()
-        mock_http_client.aclose = AsyncMock()
 
-        with patch("services.remote_llms.httpx.AsyncClient", return_value=mock_http_client), patch("services.remote_llms.AsyncOpenAI") as mock_client_class:
+        with patch("services.base_llm.AsyncOpenAI") as mock_client_class:
             mock_client = MagicMock()
             mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
             mock_client_class.return_value = mock_client
@@ -166,10 +162,8 @@ class TestKimiService:
         mock_response = MagicMock()
         mock_response.choices = [MagicMock(message=MagicMock(content="测试回答"))]
         mock_response.usage = MagicMock(prompt_tokens=10, completion_tokens=20)
-        mock_http_client = MagicMock()
-        mock_http_client.aclose = AsyncMock()
 
-        with patch("services.remote_llms.httpx.AsyncClient", return_value=mock_http_client), patch("services.remote_llms.AsyncOpenAI") as mock_client_class, patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        with patch("services.base_llm.AsyncOpenAI") as mock_client_class, patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
             mock_client = MagicMock()
             mock_client.chat.completions.create = AsyncMock(
                 side_effect=[timeout_error, mock_response]
@@ -186,6 +180,7 @@ class TestKimiService:
             assert tokens_out == 20
             assert latency >= 0
             assert mock_client.chat.completions.create.await_count == 2
+            mock_client_class.assert_called_once()
             mock_sleep.assert_awaited_once_with(settings.kimi_retry_base_delay_seconds)
 
     @pytest.mark.asyncio
@@ -199,10 +194,8 @@ class TestKimiService:
             )
         ]
         mock_response.usage = MagicMock(prompt_tokens=10, completion_tokens=20)
-        mock_http_client = MagicMock()
-        mock_http_client.aclose = AsyncMock()
 
-        with patch("services.remote_llms.httpx.AsyncClient", return_value=mock_http_client), patch("services.remote_llms.AsyncOpenAI") as mock_client_class:
+        with patch("services.base_llm.AsyncOpenAI") as mock_client_class:
             mock_client = MagicMock()
             mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
             mock_client_class.return_value = mock_client
@@ -217,10 +210,8 @@ class TestKimiService:
         mock_response = MagicMock()
         mock_response.choices = [MagicMock(message=MagicMock(content="测试回答"))]
         mock_response.usage = MagicMock(prompt_tokens=10, completion_tokens=20)
-        mock_http_client = MagicMock()
-        mock_http_client.aclose = AsyncMock()
 
-        with patch("services.remote_llms.httpx.AsyncClient", return_value=mock_http_client), patch("services.remote_llms.AsyncOpenAI") as mock_client_class:
+        with patch("services.base_llm.AsyncOpenAI") as mock_client_class:
             mock_client = MagicMock()
             mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
             mock_client_class.return_value = mock_client
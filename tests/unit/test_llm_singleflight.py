@@ -0,0 +1,86 @@
+"""Unit tests for cross-worker LLM prompt coalescing."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from services.llm_singleflight import Singleflight, reset_llm_singleflight, singleflight_key
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def singleflight():
+    return Singleflight(fakeredis.FakeRedis(), lock_ttl_seconds=60)
+
+
+KEY = singleflight_key("deepseek", "deepseek-chat", False, "最好的SUV是什么？")
+
+
+def test_key_covers_provider_model_web_search_and_prompt():
+    assert KEY == singleflight_key("deepseek", "deepseek-chat", False, "最好的SUV是什么？")
+    assert KEY != singleflight_key("deepseek", "deepseek-chat", True, "最好的SUV是什么？")
+    assert KEY != singleflight_key("qwen", "deepseek-chat", False, "最好的SUV是什么？")
+    assert KEY != singleflight_key("deepseek", "deepseek-chat", False, "最好的轿车是什么？")
+
+
+def test_first_caller_leads_and_followers_reuse_published_result(singleflight):
+    leader = singleflight.join(KEY)
+    assert leader.leader
+
+    singleflight.publish(leader, 42)
+    follower = singleflight.join(KEY)
+
+    assert not follower.leader
+    assert follower.result == "42"
+
+
+def test_follower_sees_pending_flight_until_leader_finishes(singleflight):
+    leader = singleflight.join(KEY)
+
+    waiter = singleflight.join(KEY)
+    assert waiter.pending and not waiter.leader
+
+    singleflight.abandon(leader)
+    successor = singleflight.join(KEY)
+    assert successor.leader and successor.token != leader.token
+
+
+def test_published_result_expires_with_the_lock(singleflight):
+    leader = singleflight.join(KEY)
+    singleflight.redis.pexpire(f"{KEY}:lock", 1500)
+
+    singleflight.publish(leader, 42)
+
+    assert singleflight.redis.get(f"{KEY}:lock") is None
+    assert 0 < singleflight.redis.pttl(f"{KEY}:result") <= 1500
+
+
+def test_release_only_deletes_own_lock(singleflight):
+    stale = singleflight.join(KEY)
+    singleflight.redis.set(f"{KEY}:lock", "someone-else")
+
+    singleflight.abandon(stale)
+
+    assert singleflight.redis.get(f"{KEY}:lock") == b"someone-else"
+
+
+def test_join_answer_flight_requires_answer_reuse(singleflight, monkeypatch):
+    from workers import tasks
+
+    monkeypatch.setattr(tasks.settings, "llm_singleflight_enabled", True)
+    reset_llm_singleflight(singleflight)
+    try:
+        run = SimpleNamespace(
+            id=1, provider="deepseek", model_name="deepseek-chat", web_search_enabled=False,
+            reuse_answers=False,
+        )
+        assert tasks._join_answer_flight(run, "最好的SUV是什么？") is None
+
+        run.reuse_answers = True
+        flight = tasks._join_answer_flight(run, "最好的SUV是什么？")
+        assert flight.leader and flight.key == KEY
+        tasks._finish_answer_flight(flight, 7)
+        assert tasks._join_answer_flight(run, "最好的SUV是什么？").result == "7"
+    finally:
+        reset_llm_singleflight()
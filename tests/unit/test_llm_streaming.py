@@ -0,0 +1,174 @@
+"""Unit tests for streamed LLM answers and time-to-first-token capture."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from config import settings
+from models.domain import LLMRoute
+from services.llm_streaming import StreamCollector, new_stream_collector, stream_metrics
+from services.ollama import OllamaService
+from services.remote_llms import DeepSeekService, KimiService, LLMResolution, LLMRouter
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _chunk(content=None, reasoning=None, usage=None):
+    choices = []
+    if content is not None or reasoning is not None:
+        delta = SimpleNamespace(content=content, reasoning_content=reasoning)
+        choices.append(SimpleNamespace(delta=delta))
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class _AsyncChunks:
+    def __init__(self, chunks):
+        self._chunks = list(chunks)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._chunks:
+            raise StopAsyncIteration
+        return self._chunks.pop(0)
+
+
+def test_collector_records_ttft_and_tokens_per_second():
+    clock = _FakeClock()
+    seen: list[str] = []
+    stream = StreamCollector(on_text=seen.append, clock=clock)
+
+    stream.start()
+    clock.now += 0.5
+    stream.feed("思考", reasoning=True)
+    clock.now += 0.5
+    stream.feed("你好")
+    clock.now += 2.0
+    stream.feed("世界")
+    stream.finish(tokens_out=40)
+
+    assert stream.text == "你好世界"
+    assert seen == ["你好", "世界"]
+    assert stream.time_to_first_token == pytest.approx(0.5)
+    assert stream.tokens_per_second == pytest.approx(40 / 2.5)
+    assert stream.latency == pytest.approx(3.0)
+
+
+def test_collector_survives_failing_hook():
+    def broken(_delta):
+        raise ValueError("boom")
+
+    stream = StreamCollector(on_text=broken)
+    stream.start()
+    stream.feed("a")
+    assert stream.text == "a"
+
+
+def test_new_stream_collector_follows_setting(monkeypatch):
+    monkeypatch.setattr(settings, "llm_streaming_enabled", False)
+    assert new_stream_collector() is None
+    assert stream_metrics(None) == {"time_to_first_token": None, "tokens_per_second": None}
+    monkeypatch.setattr(settings, "llm_streaming_enabled", True)
+    assert isinstance(new_stream_collector(), StreamCollector)
+
+
+@pytest.mark.asyncio
+async def test_openai_compatible_stream_uses_reported_usage():
+    chunks = [
+        _chunk("1. 品牌A\n"),
+        _chunk("2. 品牌B"),
+        _chunk(usage=SimpleNamespace(prompt_tokens=12, completion_tokens=34)),
+    ]
+    with patch("services.base_llm.AsyncOpenAI") as mock_client_class:
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(return_value=_AsyncChunks(chunks))
+        mock_client_class.return_value = mock_client
+
+        stream = StreamCollector()
+        service = DeepSeekService(api_key="stream-key")
+        answer, tokens_in, tokens_out, latency = await service.query("测试", stream=stream)
+
+    assert answer == "1. 品牌A\n2. 品牌B"
+    assert (tokens_in, tokens_out) == (12, 34)
+    assert latency == stream.latency
+    assert stream.time_to_first_token is not None
+    kwargs = mock_client.chat.completions.create.call_args.kwargs
+    assert kwargs["stream"] is True
+    assert kwargs["stream_options"] == {"include_usage": True}
+
+
+@pytest.mark.asyncio
+async def test_kimi_stream_reads_choice_usage_and_rejects_reasoning_only(monkeypatch):
+    monkeypatch.setattr(settings, "kimi_retry_attempts", 1)
+    final = SimpleNamespace(
+        delta=SimpleNamespace(content=None, reasoning_content="分析中"),
+        usage={"prompt_tokens": 5, "completion_tokens": 9},
+    )
+    chunks = [SimpleNamespace(choices=[final], usage=None)]
+    with patch("services.base_llm.AsyncOpenAI") as mock_client_class:
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(return_value=_AsyncChunks(chunks))
+        mock_client_class.return_value = mock_client
+
+        service = KimiService(api_key="kimi-stream-key")
+        with pytest.raises(RuntimeError, match="reasoning_content without final content"):
+            await service.query("测试", model_name="kimi-k2.5", stream=StreamCollector())
+
+    kwargs = mock_client.chat.completions.create.call_args.kwargs
+    assert kwargs["stream"] is True
+    assert "stream_options" not in kwargs
+
+
+class _NDJSONTransport(httpx.AsyncBaseTransport):
+    def __init__(self, lines: list[dict]):
+        self.body = "\n".join(json.dumps(line, ensure_ascii=False) for line in lines).encode()
+        self.payloads: list[dict] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.payloads.append(json.loads(request.content))
+        return httpx.Response(200, content=self.body, request=request)
+
+
+@pytest.mark.asyncio
+async def test_ollama_query_main_model_streams(monkeypatch):
+    transport = _NDJSONTransport([
+        {"message": {"content": "第一"}, "done": False},
+        {"message": {"content": "第二"}, "done": False},
+        {"message": {"content": ""}, "done": True, "prompt_eval_count": 7, "eval_count": 11},
+    ])
+    client = httpx.AsyncClient(transport=transport)
+    monkeypatch.setattr(OllamaService, "_get_client", classmethod(lambda cls: client))
+
+    stream = StreamCollector()
+    answer, tokens_in, tokens_out, _ = await OllamaService().query_main_model("问题", "qwen", stream=stream)
+    await client.aclose()
+
+    assert answer == "第一第二"
+    assert (tokens_in, tokens_out) == (7, 11)
+    assert transport.payloads[0]["stream"] is True
+    assert stream.time_to_first_token is not None
+
+
+@pytest.mark.asyncio
+async def test_router_passes_stream_to_service():
+    service = MagicMock()
+    service.query = AsyncMock(return_value=("答案", 1, 2, 0.1))
+    router = LLMRouter()
+    stream = StreamCollector()
+
+    await router.query_with_resolution(LLMResolution(service, "m", LLMRoute.VENDOR), "问题", stream=stream)
+    await router.query_with_resolution(LLMResolution(service, "m", LLMRoute.VENDOR), "问题")
+
+    assert service.query.await_args_list[0].kwargs == {"stream": stream}
+    assert service.query.await_args_list[1].kwargs == {}
+
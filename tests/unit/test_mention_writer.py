@@ -0,0 +1,138 @@
+"""Unit tests for bulk mention persistence."""
+
+import json
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from models import Brand, BrandMention, ExtractionDebug, LLMAnswer, Product, ProductMention, Prompt, Run, Vertical
+from models.db_retry import execute_with_retry
+from models.domain import PromptLanguage, RunStatus, Sentiment
+from services.mention_writer import MentionWriter, delete_mentions
+
+
+def _answers(db: Session, count: int) -> tuple[list[LLMAnswer], Brand, Product]:
+    vertical = Vertical(name="SUV")
+    db.add(vertical)
+    db.flush()
+    brand = Brand(vertical_id=vertical.id, display_name="BYD", original_name="BYD", aliases={})
+    db.add(brand)
+    db.flush()
+    product = Product(vertical_id=vertical.id, brand_id=brand.id, display_name="宋PLUS", original_name="宋PLUS")
+    run = Run(vertical_id=vertical.id, provider="deepseek", model_name="deepseek-chat", status=RunStatus.IN_PROGRESS)
+    db.add_all([product, run])
+    db.flush()
+    answers = []
+    for index in range(count):
+        prompt = Prompt(vertical_id=vertical.id, run_id=run.id, text_zh=f"问题{index}", language_original=PromptLanguage.ZH)
+        db.add(prompt)
+        db.flush()
+        answer = LLMAnswer(
+            run_id=run.id, prompt_id=prompt.id, provider="deepseek", model_name="deepseek-chat",
+            raw_answer_zh="回答",
+        )
+        db.add(answer)
+        answers.append(answer)
+    db.commit()
+    return answers, brand, product
+
+
+def _count_statements(db_engine, prefix: str) -> list[str]:
+    statements = []
+
+    @event.listens_for(db_engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(prefix):
+            statements.append(statement)
+
+    return statements
+
+
+def test_write_inserts_each_table_in_one_statement(db_session: Session, db_engine):
+    answers, brand, product = _answers(db_session, 3)
+    writer = MentionWriter()
+    for rank, answer in enumerate(answers, start=1):
+        writer.add_brand(answer.id, brand.id, rank, Sentiment.POSITIVE, ["比亚迪很好"], ["BYD is good"])
+        writer.add_product(answer.id, product.id, rank, Sentiment.NEUTRAL, ["宋PLUS"], ["Song PLUS"])
+    writer.add_debug(answers[0].id, raw_brands=["比亚迪"], final_brands=["BYD"])
+
+    inserts = _count_statements(db_engine, "INSERT")
+    assert writer.write(db_session) == 7
+    db_session.commit()
+
+    assert len(inserts) == 3
+    assert len(writer) == 0
+    mentions = db_session.query(BrandMention).order_by(BrandMention.rank).all()
+    assert [m.llm_answer_id for m in mentions] == [a.id for a in answers]
+    assert mentions[0].sentiment == Sentiment.POSITIVE
+    assert mentions[0].evidence_snippets == {"zh": ["比亚迪很好"], "en": ["BYD is good"]}
+    assert mentions[0].created_at is not None
+    assert db_session.query(ProductMention).count() == 3
+    debug = db_session.query(ExtractionDebug).one()
+    assert json.loads(debug.raw_brands) == ["比亚迪"]
+    assert json.loads(debug.raw_products) == []
+
+
+def test_delete_mentions_uses_one_statement_per_table(db_session: Session, db_engine):
+    answers, brand, product = _answers(db_session, 4)
+    writer = MentionWriter()
+    for answer in answers:
+        writer.add_brand(answer.id, brand.id, 1, Sentiment.NEUTRAL, [], [])
+        writer.add_product(answer.id, product.id, 1, Sentiment.NEUTRAL, [], [])
+        writer.add_debug(answer.id)
+    writer.write(db_session)
+    db_session.commit()
+
+    deletes = _count_statements(db_engine, "DELETE")
+    delete_mentions(db_session, [a.id for a in answers[:3]], include_debug=True)
+    db_session.commit()
+
+    assert len(deletes) == 3
+    assert db_session.query(BrandMention.llm_answer_id).all() == [(answers[3].id,)]
+    assert db_session.query(ProductMention).count() == 1
+    assert db_session.query(ExtractionDebug).count() == 1
+
+    delete_mentions(db_session, [])
+    assert len(deletes) == 3
+
+
+def test_write_replaces_previous_rows_of_given_answers(db_session: Session):
+    answers, brand, product = _answers(db_session, 2)
+    writer = MentionWriter()
+    for answer in answers:
+        writer.add_brand(answer.id, brand.id, 1, Sentiment.NEUTRAL, ["旧"], ["old"])
+        writer.add_debug(answer.id)
+    writer.write(db_session)
+    db_session.commit()
+
+    writer.add_brand(answers[0].id, brand.id, 2, Sentiment.POSITIVE, ["新"], ["new"])
+    writer.write(db_session, replace_answer_ids=[answers[0].id])
+    db_session.commit()
+
+    rows = db_session.query(BrandMention.llm_answer_id, BrandMention.rank).order_by(BrandMention.llm_answer_id).all()
+    assert rows == [(answers[0].id, 2), (answers[1].id, 1)]
+    assert db_session.query(ExtractionDebug.llm_answer_id).all() == [(answers[1].id,)]
+
+
+def test_execute_with_retry_retries_sqlite_lock(monkeypatch):
+    calls = []
+
+    class _Session:
+        def execute(self, statement, params=None):
+            calls.append(statement)
+            if calls.count(statement) < 3:
+                raise OperationalError("INSERT", {}, Exception("database is locked"))
+            return "ok"
+
+        def rollback(self):
+            calls.append("rollback")
+
+    monkeypatch.setattr("models.db_retry.time.sleep", lambda _: None)
+    assert execute_with_retry(_Session(), "stmt") == "ok"
+    assert calls == ["stmt", "stmt", "stmt"]
+
+    calls.clear()
+    with pytest.raises(OperationalError):
+        execute_with_retry(_Session(), "stmt", retries=2)
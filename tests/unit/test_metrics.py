@@ -1,6 +1,6 @@
 import pytest
 
-from metrics.metrics import AnswerMetrics, visibility_metrics
+from metrics.metrics import AnswerMetrics, visibility_metrics, visibility_metrics_by_brand
 
 
 def test_visibility_metrics_with_ranked_mentions():
@@ -36,3 +36,21 @@ def test_metrics_zero_when_brand_absent():
     assert metrics["top_spot_share"] == 0.0
     assert metrics["sentiment_index"] == 0.0
     assert metrics["dragon_lens_visibility"] == 0.0
+
+
+def test_visibility_metrics_by_brand_matches_per_brand_computation():
+    prompt_ids = [1, 2, 3, 4]
+    mentions = [
+        AnswerMetrics(prompt_id=1, brand="Alpha", rank=1, sentiment="positive"),
+        AnswerMetrics(prompt_id=1, brand="Beta", rank=2, sentiment="positive"),
+        AnswerMetrics(prompt_id=2, brand="Alpha", rank=3, sentiment="negative"),
+        AnswerMetrics(prompt_id=3, brand="Beta", rank=1, sentiment="neutral"),
+        AnswerMetrics(prompt_id=4, brand="Gamma", rank=None, sentiment="positive"),
+    ]
+    brands = ["Alpha", "Beta", "Delta", "Gamma"]
+
+    grouped = visibility_metrics_by_brand(prompt_ids, mentions, brands)
+
+    for brand in brands:
+        competitors = [other for other in brands if other != brand]
+        assert grouped[brand] == visibility_metrics(prompt_ids, mentions, brand, competitors)
@@ -5,9 +5,9 @@ def test_ollama_service_init_does_not_load_sentiment(monkeypatch):
     from services import ollama as ollama_module
 
     def _boom():
-        raise AssertionError("get_sentiment_service should not be called during init")
+        raise AssertionError("get_async_sentiment_client should not be called during init")
 
-    monkeypatch.setattr(ollama_module, "get_sentiment_service", _boom)
+    monkeypatch.setattr(ollama_module, "get_async_sentiment_client", _boom)
 
     ollama_module.OllamaService()
 
@@ -20,7 +20,7 @@ async def test_classify_sentiment_lazy_loads_once(monkeypatch):
         def __init__(self):
             self.calls = 0
 
-        def classify_sentiment(self, text: str) -> str:
+        async def classify_sentiment(self, text: str, raise_errors: bool = False) -> str:
             self.calls += 1
             return "positive"
 
@@ -32,7 +32,7 @@ async def test_classify_sentiment_lazy_loads_once(monkeypatch):
         return dummy
 
     monkeypatch.setattr(ollama_module.settings, "use_erlangshen_sentiment", True)
-    monkeypatch.setattr(ollama_module, "get_sentiment_service", _loader)
+    monkeypatch.setattr(ollama_module, "get_async_sentiment_client", _loader)
 
     service = ollama_module.OllamaService()
 
@@ -50,10 +50,10 @@ async def test_classify_sentiment_does_not_load_when_disabled(monkeypatch):
         return "neutral"
 
     def _boom():
-        raise AssertionError("get_sentiment_service should not be called when disabled")
+        raise AssertionError("get_async_sentiment_client should not be called when disabled")
 
     monkeypatch.setattr(ollama_module.settings, "use_erlangshen_sentiment", False)
-    monkeypatch.setattr(ollama_module, "get_sentiment_service", _boom)
+    monkeypatch.setattr(ollama_module, "get_async_sentiment_client", _boom)
 
     service = ollama_module.OllamaService()
     monkeypatch.setattr(service, "_classify_sentiment_with_qwen", _fake_qwen)
@@ -0,0 +1,187 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from workers import pipeline
+from workers.stages import InOrder, Stage, run_stages
+
+
+@pytest.mark.asyncio
+async def test_downstream_stage_starts_before_upstream_finishes():
+    events: list[str] = []
+
+    async def fetch(item):
+        await asyncio.sleep(0.01 * item)
+        events.append(f"fetch:{item}")
+        return item
+
+    async def translate(item):
+        events.append(f"translate:{item}")
+        return item * 10
+
+    stages = [Stage("fetch", fetch, workers=3), Stage("translate", translate)]
+    outputs = await run_stages([1, 2, 3], stages)
+
+    assert sorted(outputs) == [10, 20, 30]
+    assert events.index("translate:1") < events.index("fetch:3")
+    assert [s.timing.items for s in stages] == [3, 3]
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_applies_backpressure():
+    release = asyncio.Event()
+    produced: list[int] = []
+
+    async def produce(item):
+        produced.append(item)
+        return item
+
+    async def slow_consume(item):
+        await release.wait()
+        return item
+
+    stages = [
+        Stage("produce", produce, workers=1, queue_size=1),
+        Stage("consume", slow_consume, workers=1, queue_size=2),
+    ]
+    task = asyncio.ensure_future(run_stages(range(10), stages))
+    await asyncio.sleep(0.05)
+    # One item in the consumer, two queued, one blocked in put.
+    assert len(produced) <= 4
+    release.set()
+    assert sorted(await task) == list(range(10))
+    assert stages[1].timing.max_queue_depth <= 2
+
+
+@pytest.mark.asyncio
+async def test_none_drops_item_and_errors_cancel_pipeline():
+    async def keep_even(item):
+        return item if item % 2 == 0 else None
+
+    async def identity(item):
+        return item
+
+    assert sorted(await run_stages(range(6), [Stage("filter", keep_even), Stage("id", identity)])) == [0, 2, 4]
+
+    async def boom(item):
+        if item == 3:
+            raise ValueError("stage failed")
+        return item
+
+    with pytest.raises(ValueError, match="stage failed"):
+        await run_stages(range(20), [Stage("boom", boom, queue_size=1), Stage("id", identity, queue_size=1)])
+
+
+@pytest.mark.asyncio
+async def test_in_order_handler_buffers_early_items():
+    handled: list[int] = []
+
+    async def fetch(item):
+        await asyncio.sleep(0.01 * (4 - item))
+        return item
+
+    async def handle(item):
+        handled.append(item)
+        return item * 10 if item != 2 else None
+
+    ordered = InOrder(handle, lambda item: item)
+    outputs = await run_stages(range(5), [Stage("fetch", fetch, workers=5), Stage("ordered", ordered)])
+
+    assert outputs == []
+    assert handled == [0, 1, 2, 3, 4]
+    assert ordered.outputs == [0, 10, 30, 40]
+
+
+@pytest.mark.asyncio
+async def test_run_parallel_pipeline_streams_and_finalizes_once(monkeypatch):
+    prompts = [SimpleNamespace(id=i, text_zh=f"问题{i}", text_en=None) for i in range(4)]
+    finalize_calls: list[int] = []
+    submitted: list[int] = []
+    saved: list = []
+
+    class FakeExtractionPipeline:
+        async def finalize(self):
+            finalize_calls.append(1)
+            return "batch"
+
+        def close(self):
+            pass
+
+    scope = pipeline._ExtractionScope(FakeExtractionPipeline(), 1, "cars", "")
+
+    async def fake_fetch(ctx, *args):
+        await asyncio.sleep(0.01 * (4 - ctx.prompt.id))
+        if ctx.prompt.id == 2:
+            return pipeline.LLMQueryResult(context=ctx, answer_zh="", error="boom")
+        return pipeline.LLMQueryResult(context=ctx, answer_zh=f"回答{ctx.prompt.id}")
+
+    async def fake_translate(result, translator):
+        result.answer_en = f"answer {result.context.prompt.id}"
+        return result
+
+    async def fake_submit(scope_arg, result, *args):
+        assert not finalize_calls
+        submitted.append(result.context.prompt.id)
+        return result, SimpleNamespace(id=result.context.prompt.id)
+
+    async def fake_mentions(scope_arg, prepared, batch_result, *args):
+        assert batch_result == "batch"
+        return [pipeline.ExtractionResult(query_result=r, llm_answer=a) for r, a in prepared]
+
+    monkeypatch.setattr(pipeline, "_open_extraction_scope", lambda *args: scope)
+    monkeypatch.setattr(pipeline, "_fetch_single_llm_answer", fake_fetch)
+    monkeypatch.setattr(pipeline, "_translate_single_answer", fake_translate)
+    monkeypatch.setattr(pipeline, "_submit_for_extraction", fake_submit)
+    monkeypatch.setattr(pipeline, "_extract_mentions", fake_mentions)
+    monkeypatch.setattr(pipeline, "batch_save_mentions", lambda db, results: saved.extend(results))
+
+    run = SimpleNamespace(id=7, vertical_id=1, reuse_answers=False)
+    results = await pipeline.run_parallel_pipeline(
+        None, run, prompts, [], None, None, None, None, "deepseek", "deepseek-chat"
+    )
+
+    assert submitted == [0, 1, 3]
+    assert [r.query_result.context.prompt.id for r in results] == [0, 1, 3]
+    assert [r.query_result.answer_en for r in results] == ["answer 0", "answer 1", "answer 3"]
+    assert finalize_calls == [1]
+    assert saved == results
+
+
+@pytest.mark.asyncio
+async def test_mention_extraction_overlaps_answers_and_keeps_prompt_order(monkeypatch):
+    monkeypatch.setattr(pipeline.settings, "pipeline_extraction_concurrency", 2)
+    discovery_order: list[int] = []
+    in_flight = 0
+    peak = 0
+
+    def fake_discover(scope, result, llm_answer, batch_result, user_brands, db):
+        discovery_order.append(result.context.prompt.id)
+        return pipeline._DiscoveredAnswer(result, llm_answer, [], [], None)
+
+    async def fake_products(llm_answer, products, answer_zh, translator, brands, ollama):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01 * (5 - llm_answer.id))
+        in_flight -= 1
+        return [f"product-{llm_answer.id}"]
+
+    async def fake_brands(answer_zh, brands, ollama, translator):
+        return [answer_zh]
+
+    monkeypatch.setattr(pipeline, "_discover_entities", fake_discover)
+    monkeypatch.setattr(pipeline, "_extract_product_mentions", fake_products)
+    monkeypatch.setattr(pipeline, "_extract_brand_mentions", fake_brands)
+
+    prepared = []
+    for i in range(5):
+        ctx = pipeline.PromptContext(SimpleNamespace(id=i), f"问题{i}", None)
+        prepared.append((pipeline.LLMQueryResult(context=ctx, answer_zh=f"回答{i}"), SimpleNamespace(id=i)))
+
+    results = await pipeline._extract_mentions(None, prepared, None, [], None, None, None)
+
+    assert discovery_order == [0, 1, 2, 3, 4]
+    assert [r.product_mentions for r in results] == [[f"product-{i}"] for i in range(5)]
+    assert [r.brand_mentions for r in results] == [[f"回答{i}"] for i in range(5)]
+    assert peak == 2
@@ -0,0 +1,199 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from config import settings
+from models.domain import LLMProvider, LLMRoute
+from services import rate_limit
+from services.rate_limit import (
+    ProviderRateLimiter,
+    RateBudget,
+    RateBudgetTimeout,
+    RedisTokenBucket,
+    bucket_name,
+    estimate_tokens,
+)
+from services.remote_llms import DeepSeekService, LLMResolution, LLMRouter
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+class _Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+def _bucket(server, clock) -> RedisTokenBucket:
+    return RedisTokenBucket(fakeredis.FakeRedis(server=server), clock=clock)
+
+
+def test_requests_per_minute_budget_is_enforced(server, clock):
+    bucket = _bucket(server, clock)
+    budget = RateBudget(requests_per_minute=3)
+
+    waits = [bucket.try_acquire("deepseek:k", budget, 1, "1") for _ in range(4)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(20.0)
+
+
+def test_budget_refills_over_time(server, clock):
+    bucket = _bucket(server, clock)
+    budget = RateBudget(requests_per_minute=60)
+    for _ in range(60):
+        assert bucket.try_acquire("kimi:k", budget, 1, "1") == 0.0
+    assert bucket.try_acquire("kimi:k", budget, 1, "1") > 0
+
+    clock.advance(1.0)
+
+    assert bucket.try_acquire("kimi:k", budget, 1, "1") == 0.0
+
+
+def test_budget_is_shared_between_workers(server, clock):
+    worker_a = _bucket(server, clock)
+    worker_b = _bucket(server, clock)
+    budget = RateBudget(requests_per_minute=2)
+
+    assert worker_a.try_acquire("openrouter:k", budget, 1, "1") == 0.0
+    assert worker_b.try_acquire("openrouter:k", budget, 1, "2") == 0.0
+    assert worker_a.try_acquire("openrouter:k", budget, 1, "1") > 0
+    assert worker_b.try_acquire("openrouter:k", budget, 1, "2") > 0
+
+
+def test_tokens_per_minute_budget_and_refund(server, clock):
+    bucket = _bucket(server, clock)
+    budget = RateBudget(tokens_per_minute=1000)
+
+    assert bucket.try_acquire("deepseek:k", budget, 800, "1") == 0.0
+    assert bucket.try_acquire("deepseek:k", budget, 800, "1") > 0
+
+    bucket.refund("deepseek:k", budget, 700)
+
+    assert bucket.try_acquire("deepseek:k", budget, 800, "1") == 0.0
+
+
+def test_buckets_are_isolated_per_key(server, clock):
+    bucket = _bucket(server, clock)
+    budget = RateBudget(requests_per_minute=1)
+
+    assert bucket.try_acquire(bucket_name(LLMProvider.DEEPSEEK, "a"), budget, 1, "1") == 0.0
+    assert bucket.try_acquire(bucket_name(LLMProvider.DEEPSEEK, "b"), budget, 1, "1") == 0.0
+    assert bucket.try_acquire(bucket_name(LLMProvider.DEEPSEEK, "a"), budget, 1, "1") > 0
+
+
+def test_run_over_fair_share_yields_to_waiting_run(server, clock):
+    bucket = _bucket(server, clock)
+    budget = RateBudget(requests_per_minute=4)
+    assert bucket.try_acquire("kimi:k", budget, 1, "big") == 0.0
+    assert bucket.try_acquire("kimi:k", budget, 1, "big") == 0.0
+    assert bucket.try_acquire("kimi:k", budget, 1, "big") == 0.0
+    assert bucket.try_acquire("kimi:k", budget, 1, "big") == 0.0
+    assert bucket.try_acquire("kimi:k", budget, 1, "small") > 0
+
+    clock.advance(15.0)
+
+    assert bucket.try_acquire("kimi:k", budget, 1, "big") > 0
+    assert bucket.try_acquire("kimi:k", budget, 1, "small") == 0.0
+
+
+def test_single_run_may_use_whole_budget(server, clock):
+    bucket = _bucket(server, clock)
+    budget = RateBudget(requests_per_minute=4)
+
+    assert all(bucket.try_acquire("kimi:k", budget, 1, "only") == 0.0 for _ in range(4))
+
+
+def test_estimate_tokens_uses_output_cap(monkeypatch):
+    monkeypatch.setattr(settings, "llm_rate_limit_default_output_tokens", 500)
+
+    assert estimate_tokens("一二三四", None) == 502
+    assert estimate_tokens("一二三四", 100) == 102
+
+
+@pytest.mark.asyncio
+async def test_limiter_times_out_when_budget_never_frees(server, clock, monkeypatch):
+    monkeypatch.setattr(settings, "deepseek_requests_per_minute", 1)
+    limiter = ProviderRateLimiter(_bucket(server, clock), max_wait=1.0)
+
+    assert await limiter.acquire(LLMProvider.DEEPSEEK, "k", 10, run_id=1) is not None
+    with pytest.raises(RateBudgetTimeout):
+        await limiter.acquire(LLMProvider.DEEPSEEK, "k", 10, run_id=1)
+
+
+@pytest.mark.asyncio
+async def test_limiter_skips_unconfigured_providers(server, clock, monkeypatch):
+    monkeypatch.setattr(settings, "kimi_requests_per_minute", None)
+    monkeypatch.setattr(settings, "kimi_tokens_per_minute", None)
+    limiter = ProviderRateLimiter(_bucket(server, clock))
+
+    assert await limiter.acquire(LLMProvider.KIMI, "k", 10) is None
+
+
+@pytest.mark.asyncio
+async def test_limiter_fails_open_when_redis_is_down(monkeypatch):
+    monkeypatch.setattr(settings, "deepseek_requests_per_minute", 10)
+    broken = MagicMock()
+    broken.try_acquire.side_effect = ConnectionError("redis down")
+
+    assert await ProviderRateLimiter(broken).acquire(LLMProvider.DEEPSEEK, "k", 10) is None
+
+
+@pytest.mark.asyncio
+async def test_router_acquires_budget_before_sending(server, clock, monkeypatch):
+    monkeypatch.setattr(settings, "deepseek_requests_per_minute", 10)
+    monkeypatch.setattr(settings, "deepseek_tokens_per_minute", 100_000)
+    bucket = _bucket(server, clock)
+    limiter = ProviderRateLimiter(bucket)
+    monkeypatch.setattr(rate_limit, "_rate_limiter", limiter)
+    monkeypatch.setattr(settings, "llm_rate_limit_enabled", True)
+    service = DeepSeekService(api_key="k")
+    service.query = AsyncMock(return_value=("答案", 10, 20, 0.1))
+    router = LLMRouter(run_id=42)
+
+    result = await router.query_with_resolution(
+        LLMResolution(service, "deepseek-chat", LLMRoute.VENDOR), "问题"
+    )
+
+    assert result == ("答案", 10, 20, 0.1)
+    state = fakeredis.FakeRedis(server=server).hgetall(
+        f"dragonlens:ratelimit:{bucket_name(LLMProvider.DEEPSEEK, 'k')}:state"
+    )
+    assert float(state[b"requests"]) == pytest.approx(9.0)
+    assert float(state[b"tokens"]) == pytest.approx(100_000 - 30)
+
+
+@pytest.mark.asyncio
+async def test_router_settles_budget_when_query_fails(monkeypatch):
+    limiter = MagicMock()
+    limiter.acquire = AsyncMock(return_value="permit")
+    limiter.settle = AsyncMock()
+    monkeypatch.setattr(rate_limit, "_rate_limiter", limiter)
+    monkeypatch.setattr(settings, "llm_rate_limit_enabled", True)
+    service = DeepSeekService(api_key="k")
+    service.query = AsyncMock(side_effect=RuntimeError("boom"))
+    service._get_api_key = MagicMock(side_effect=AssertionError("key already resolved"))
+    estimated = estimate_tokens("问题")
+
+    with pytest.raises(RuntimeError):
+        await LLMRouter(run_id=42).query_with_resolution(
+            LLMResolution(service, "deepseek-chat", LLMRoute.VENDOR, "k"), "问题"
+        )
+
+    limiter.acquire.assert_awaited_once_with(LLMProvider.DEEPSEEK, "k", estimated, 42)
+    limiter.settle.assert_awaited_once_with(LLMProvider.DEEPSEEK, "permit", estimated)
@@ -0,0 +1,108 @@
+"""Unit tests for checkpointed finalize stages."""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from models import Run, RunFinalizeStage, RunStatus, Vertical
+from services.brand_recognition.consolidation_service import EnhancedConsolidationResult
+from services.run_checkpoints import (
+    FINALIZE_STAGES,
+    FinalizeCheckpoints,
+    can_resume_finalize,
+    clear_finalize_checkpoints,
+    first_incomplete_stage,
+)
+from workers import tasks
+
+
+def _run(db_session: Session) -> Run:
+    vertical = Vertical(name="Checkpoint Cars")
+    db_session.add(vertical)
+    db_session.flush()
+    run = Run(vertical_id=vertical.id, model_name="qwen", status=RunStatus.IN_PROGRESS)
+    db_session.add(run)
+    db_session.commit()
+    return run
+
+
+def test_completed_stage_is_skipped_and_output_reused(db_session: Session):
+    run = _run(db_session)
+    ticks = iter([0.0, 2.5])
+    checkpoints = FinalizeCheckpoints(db_session, run.id, clock=lambda: next(ticks))
+    calls = []
+
+    first = checkpoints.run("results", lambda: calls.append(1) or {"failed_prompt_ids": [4]})
+    again = FinalizeCheckpoints(db_session, run.id).run("results", lambda: calls.append(2))
+
+    assert calls == [1]
+    assert first == again == {"failed_prompt_ids": [4]}
+    assert checkpoints.durations() == {"results": 2.5}
+    assert can_resume_finalize(db_session, run.id)
+    assert first_incomplete_stage(db_session, run.id) == "english_backfill"
+    with pytest.raises(ValueError):
+        checkpoints.run("unknown", lambda: None)
+
+
+def test_finalize_stages_resume_after_failure(db_session: Session, monkeypatch):
+    run = _run(db_session)
+    calls: list[str] = []
+    fail = {"product_brand_mapping": True}
+
+    async def enhanced(db, run_id):
+        calls.append("enhanced")
+        return EnhancedConsolidationResult({}, {}, {"vw": "Volkswagen"}, None)
+
+    async def gate(db, run_id):
+        calls.append("gate")
+        return 0
+
+    async def mapping(db, run_id):
+        calls.append("mapping")
+        if fail.pop("product_brand_mapping", False):
+            raise RuntimeError("ollama timeout")
+        return {"golf": "vw"}
+
+    consolidated = []
+    monkeypatch.setattr(tasks, "_backfill_entity_english_names", lambda db, r: calls.append("backfill"))
+    monkeypatch.setattr(tasks, "run_enhanced_consolidation", enhanced)
+    monkeypatch.setattr(tasks, "apply_vertical_gate_to_run", gate)
+    monkeypatch.setattr(
+        tasks, "consolidate_run", lambda db, run_id, normalized_brands: consolidated.append(normalized_brands)
+    )
+    monkeypatch.setattr(tasks, "map_products_to_brands_for_run", mapping)
+    monkeypatch.setattr(tasks, "calculate_and_save_metrics", lambda db, run_id: calls.append("metrics"))
+    monkeypatch.setattr(tasks, "calculate_and_save_run_product_metrics", lambda db, run_id: None)
+    monkeypatch.setattr(tasks, "_run_comparison_if_enabled", lambda db, run_id: None)
+    monkeypatch.setattr(tasks, "refresh_latest_metrics_safely", lambda db, vertical_id, models: None)
+    monkeypatch.setattr(tasks.settings, "vertical_auto_match_enabled", False)
+
+    FinalizeCheckpoints(db_session, run.id).run("results", lambda: {})
+    with pytest.raises(RuntimeError):
+        tasks._run_finalize_stages(db_session, run, FinalizeCheckpoints(db_session, run.id), False)
+    assert first_incomplete_stage(db_session, run.id) == "product_brand_mapping"
+
+    tasks._run_finalize_stages(db_session, run, FinalizeCheckpoints(db_session, run.id), False)
+
+    assert calls == ["backfill", "enhanced", "gate", "mapping", "mapping", "metrics"]
+    assert consolidated == [{"vw": "Volkswagen"}]
+    assert first_incomplete_stage(db_session, run.id) is None
+    assert not can_resume_finalize(db_session, run.id)
+    stored = db_session.query(RunFinalizeStage).filter(RunFinalizeStage.run_id == run.id).count()
+    assert stored == len(FINALIZE_STAGES)
+
+    clear_finalize_checkpoints(db_session, run.id)
+    assert first_incomplete_stage(db_session, run.id) == "results"
+
+
+def test_stages_endpoint_lists_durations_in_order(client: TestClient, db_session: Session):
+    run = _run(db_session)
+    checkpoints = FinalizeCheckpoints(db_session, run.id)
+    checkpoints.run("english_backfill", lambda: None)
+    checkpoints.run("results", lambda: {})
+
+    response = client.get(f"/api/v1/tracking/runs/{run.id}/stages")
+
+    assert response.status_code == 200
+    assert [row["stage"] for row in response.json()] == ["results", "english_backfill"]
+    assert client.get("/api/v1/tracking/runs/999999/stages").status_code == 404
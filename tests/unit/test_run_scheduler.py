@@ -0,0 +1,107 @@
+"""Unit tests for fair-share run scheduling."""
+
+import pytest
+
+from services.run_scheduler import FairShareScheduler, priority_level, reset_run_scheduler
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+class _Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture
+def scheduler(clock):
+    instance = FairShareScheduler(fakeredis.FakeRedis(), quantum=5, idle_seconds=600, clock=clock)
+    reset_run_scheduler(instance)
+    yield instance
+    reset_run_scheduler()
+
+
+def test_priority_level_is_lead_in_quanta_capped():
+    assert priority_level(0, 0, quantum=5) == 0
+    assert priority_level(4.9, 0, quantum=5) == 0
+    assert priority_level(12, 2, quantum=5) == 2
+    assert priority_level(500, 0, quantum=5) == 9
+    assert priority_level(1, 3, quantum=5) == 0
+
+
+def test_late_small_run_overtakes_large_run(scheduler):
+    scheduler.register_run(1)
+    big = [scheduler.next_priority(1) for _ in range(30)]
+    assert big == [0] * 30
+
+    scheduler.register_run(2)
+    small = [scheduler.next_priority(2) for _ in range(5)]
+
+    assert small == [0] * 5
+    assert scheduler.next_priority(1) == 5
+
+
+def test_new_run_joins_at_most_levels_quanta_behind_leader(scheduler):
+    scheduler.register_run(1)
+    for _ in range(100):
+        scheduler.next_priority(1)
+    scheduler.register_run(2)
+
+    shares = {share.run_id: share.virtual_time for share in scheduler.shares()}
+    assert shares[2] == pytest.approx(100 - 5 * 9)
+    assert scheduler.next_priority(1) == 9
+
+
+def test_equal_runs_stay_interleaved(scheduler):
+    scheduler.register_run(1)
+    scheduler.register_run(2)
+    priorities = [scheduler.next_priority(run_id) for _ in range(6) for run_id in (1, 2)]
+    assert priorities == [0] * 12
+
+
+def test_weight_scales_share(scheduler):
+    scheduler.register_run(1, weight=1)
+    scheduler.register_run(2, weight=2)
+    for _ in range(10):
+        scheduler.next_priority(1)
+        scheduler.next_priority(2)
+    shares = {share.run_id: share for share in scheduler.shares()}
+    assert shares[1].virtual_time == pytest.approx(10)
+    assert shares[2].virtual_time == pytest.approx(5)
+    assert shares[2].weight == 2
+
+
+def test_finished_and_idle_runs_leave_the_active_set(scheduler, clock):
+    scheduler.register_run(1)
+    scheduler.register_run(2)
+    scheduler.finish_run(1)
+    assert [s.run_id for s in scheduler.shares()] == [2]
+
+    clock.now += 601
+    scheduler.register_run(3)
+    assert [s.run_id for s in scheduler.shares()] == [3]
+
+
+def test_prompt_chain_carries_priority(scheduler, monkeypatch):
+    from workers import tasks
+
+    scheduler.register_run(5)
+    for _ in range(10):
+        scheduler.next_priority(5)
+    scheduler.register_run(6)
+    scheduler.next_priority(6)
+
+    chain = tasks._prompt_chain(5, 11, "remote_llm", False)
+    first, second = chain.tasks
+
+    assert first.options["priority"] == 1
+    assert second.options["priority"] == 1
+    assert first.options["queue"] == "remote_llm"
+    assert tasks._prompt_chain(6, 12, "remote_llm", False).tasks[0].options["priority"] == 0
@@ -0,0 +1,130 @@
+"""Unit tests for the Redis run-state store."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services.run_state import (
+    RunStateStore,
+    progress_key,
+    reset_run_state_store,
+    results_key,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+class _CountingRedis(fakeredis.FakeRedis):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pipelines = 0
+
+    def pipeline(self, *args, **kwargs):
+        self.pipelines += 1
+        return super().pipeline(*args, **kwargs)
+
+
+@pytest.fixture
+def store():
+    instance = RunStateStore(_CountingRedis(), clock=lambda: 1000.0)
+    reset_run_state_store(instance)
+    yield instance
+    reset_run_state_store()
+
+
+def test_results_are_pushed_in_one_pipeline_and_round_trip(store):
+    key = results_key(7)
+    results = [{"prompt_id": i, "ok": i != 2} for i in range(5)]
+
+    store.store_results(key, results)
+    store.store_results(key, [])
+
+    assert store.redis.pipelines == 1
+    assert store.load_results(key) == results
+    assert 0 < store.redis.ttl(key) <= store.ttl_seconds
+    store.clear_results(key)
+    assert store.load_results(key) == []
+
+
+def test_begin_run_resets_previous_state(store):
+    store.store_results(results_key(7), [{"prompt_id": 1}])
+    store.increment(7, answered=3, failed=1)
+
+    store.begin_run(7, total_prompts=10)
+
+    assert store.load_results(results_key(7)) == []
+    progress = store.progress(7)
+    assert (progress.total, progress.answered, progress.failed) == (10, 0, 0)
+    assert progress.started_at == 1000.0
+
+
+def test_counters_are_atomic_increments(store):
+    store.begin_run(3, total_prompts=4)
+    for _ in range(3):
+        store.increment(3, answered=1)
+    store.increment(3, extracted=2, failed=1, batches_completed=1)
+
+    progress = store.progress(3)
+    assert progress.as_dict() | {"started_at": None, "updated_at": None} == {
+        "run_id": 3,
+        "total": 4,
+        "answered": 3,
+        "extracted": 2,
+        "failed": 1,
+        "batches_completed": 1,
+        "started_at": None,
+        "updated_at": None,
+    }
+    assert progress.done == 3
+    assert store.progress(99) is None
+    with pytest.raises(ValueError):
+        store.increment(3, unknown=1)
+
+
+def test_increment_swallows_redis_errors():
+    class _Broken:
+        def pipeline(self):
+            raise ConnectionError("redis down")
+
+    RunStateStore(_Broken()).increment(1, answered=1)
+
+
+def test_progress_endpoint_reads_redis_only(client: TestClient, store):
+    store.begin_run(42, total_prompts=5)
+    store.increment(42, answered=2, extracted=1)
+
+    response = client.get("/api/v1/tracking/runs/42/progress")
+    missing = client.get("/api/v1/tracking/runs/43/progress")
+
+    assert response.status_code == 200
+    assert response.json()["answered"] == 2
+    assert response.json()["extracted"] == 1
+    assert missing.status_code == 404
+    assert store.redis.hget(progress_key(42), "total") == b"5"
+
+
+def test_kb_version_fence(store, monkeypatch):
+    from workers import tasks
+
+    store.begin_run(8, total_prompts=10)
+    assert store.kb_version(8) == 0
+    assert tasks._kb_fence_pending(8, 1)
+    assert not tasks._kb_fence_pending(8, 0)
+
+    assert store.bump_kb_version(8) == 1
+    assert not tasks._kb_fence_pending(8, 1)
+    assert tasks._kb_fence_pending(8, 2)
+    assert store.progress(8).total == 10
+
+    chain = tasks._prompt_chain(8, 3, "remote_llm", False, kb_fence=2)
+    assert chain.tasks[1].kwargs == {"kb_fence": 2}
+    assert tasks._prompt_chain(8, 3, "remote_llm", False).tasks[1].kwargs == {}
+
+
+def test_grouped_stats_accumulate_in_progress_hash(store):
+    store.add_stats(3, "translation_memory", {"hits": 2, "misses": 0})
+    store.add_stats(3, "translation_memory", {"hits": 1, "misses": 4})
+    store.add_stats(3, "other", {"hits": 9})
+
+    assert store.stats(3, "translation_memory") == {"hits": 3, "misses": 4}
+    assert store.stats(4, "translation_memory") == {}
+    assert store.redis.ttl(progress_key(3)) > 0
@@ -1,4 +1,5 @@
 import asyncio
+import json
 
 import httpx
 import pytest
@@ -333,3 +334,101 @@ def test_list_snippet_truncated_for_long_table_rows():
     assert benz_mention["mentioned"] is True
     snippet = benz_mention["snippets"][0]
     assert len(snippet) <= 52
+
+
+def _patch_async_transport(monkeypatch, handler):
+    real_async_client = httpx.AsyncClient
+
+    def _factory(**kwargs):
+        return real_async_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(sentiment_module.httpx, "AsyncClient", _factory)
+
+
+def test_async_sentiment_client_bounds_concurrency(monkeypatch):
+    from services.sentiment_analysis import AsyncSentimentClient
+
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"sentiment": "positive", "confidence": 0.9})
+
+    _patch_async_transport(monkeypatch, handler)
+
+    async def run():
+        client = AsyncSentimentClient(base_url="http://sentiment", max_concurrency=2)
+        results = await asyncio.gather(*(client.classify_sentiment(f"文本{i}") for i in range(6)))
+        await client.aclose()
+        return results
+
+    assert asyncio.run(run()) == ["positive"] * 6
+    assert peak == 2
+
+
+def test_async_sentiment_client_handles_connection_error(monkeypatch):
+    from services.sentiment_analysis import AsyncSentimentClient
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    _patch_async_transport(monkeypatch, handler)
+
+    async def run():
+        client = AsyncSentimentClient(base_url="http://sentiment")
+        single = await client.classify_sentiment("测试文本")
+        batch = await client.classify_batch(["甲", "", "乙"])
+        healthy = await client.health_check()
+        await client.aclose()
+        return single, batch, healthy
+
+    assert asyncio.run(run()) == ("neutral", ["neutral", "neutral", "neutral"], False)
+
+
+def test_async_sentiment_client_classify_batch(monkeypatch):
+    from services.sentiment_analysis import AsyncSentimentClient
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        texts = json.loads(request.content)["texts"]
+        return httpx.Response(200, json={"results": [{"sentiment": "negative"} for _ in texts]})
+
+    _patch_async_transport(monkeypatch, handler)
+
+    async def run():
+        client = AsyncSentimentClient(base_url="http://sentiment")
+        results = await client.classify_batch(["差", " ", "糟"])
+        await client.aclose()
+        return results
+
+    assert asyncio.run(run()) == ["negative", "neutral", "negative"]
+
+
+def test_async_sentiment_client_keeps_one_client_per_loop(monkeypatch):
+    from services.sentiment_analysis import AsyncSentimentClient
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"sentiment": "positive", "confidence": 0.9})
+
+    _patch_async_transport(monkeypatch, handler)
+    client = AsyncSentimentClient(base_url="http://sentiment")
+    first, second = asyncio.new_event_loop(), asyncio.new_event_loop()
+    try:
+        assert first.run_until_complete(client.classify_sentiment("甲")) == "positive"
+        first_http = client._clients[first].http_client
+        assert second.run_until_complete(client.classify_sentiment("乙")) == "positive"
+
+        assert not first_http.is_closed
+        assert first.run_until_complete(client.classify_sentiment("丙")) == "positive"
+        assert client._clients[first].http_client is first_http
+
+        first.run_until_complete(client.aclose())
+        assert first_http.is_closed and first not in client._clients
+    finally:
+        second.run_until_complete(client.aclose())
+        first.close()
+        second.close()
@@ -0,0 +1,115 @@
+"""Unit tests for the snippet sentiment memo."""
+
+import pytest
+
+from config import settings
+from services.llm_cache import create_cache_engine
+from services.ollama import OllamaService
+from services.sentiment_cache import (
+    SentimentCache,
+    get_sentiment_cache,
+    reset_sentiment_cache,
+    sentiment_cache_key,
+    sentiment_model_identity,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache():
+    reset_sentiment_cache()
+    yield
+    reset_sentiment_cache()
+
+
+def test_key_normalizes_whitespace_and_width():
+    identity = "erlangshen:x"
+    assert sentiment_cache_key(" 比亚迪宋PLUS  是一款好车 ", identity) == sentiment_cache_key(
+        "比亚迪宋ＰＬＵＳ 是一款好车", identity
+    )
+    assert sentiment_cache_key("好车", identity) != sentiment_cache_key("好车", "qwen:y")
+
+
+def test_identity_tracks_model_and_fallback(monkeypatch):
+    monkeypatch.setattr(settings, "use_erlangshen_sentiment", True)
+    primary = sentiment_model_identity()
+    monkeypatch.setattr(settings, "ollama_model_sentiment", "qwen3:8b")
+    assert sentiment_model_identity() != primary
+    monkeypatch.setattr(settings, "use_erlangshen_sentiment", False)
+    assert sentiment_model_identity().startswith("qwen:qwen3:8b")
+
+
+def test_memory_tier_is_lru():
+    cache = SentimentCache("m", memory_entries=2)
+    cache.set("甲", "positive")
+    cache.set("乙", "negative")
+    assert cache.get("甲") == "positive"
+    cache.set("丙", "neutral")
+    assert cache.get("乙") is None
+    assert cache.get("甲") == "positive"
+    assert cache.get("   ") is None
+
+
+def test_persistent_tier_survives_new_instance_and_purges_other_models(tmp_path):
+    engine = create_cache_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    SentimentCache("model-a", engine=engine).set("好车", "positive")
+
+    assert SentimentCache("model-a", engine=engine).get("好车") == "positive"
+
+    other = SentimentCache("model-b", engine=engine)
+    assert other.get("好车") is None
+    assert SentimentCache("model-a", engine=engine).get("好车") is None
+
+
+def test_get_sentiment_cache_rebuilds_when_model_changes(monkeypatch):
+    monkeypatch.setattr(settings, "sentiment_cache_enabled", True)
+    monkeypatch.setattr(settings, "sentiment_cache_url", "memory://")
+    first = get_sentiment_cache()
+    first.set("好车", "positive")
+    assert get_sentiment_cache() is first
+
+    monkeypatch.setattr(settings, "erlangshen_sentiment_model", "other/model")
+    second = get_sentiment_cache()
+    assert second is not first
+    assert second.get("好车") is None
+
+
+@pytest.mark.asyncio
+async def test_classify_sentiment_memoizes_model_results(monkeypatch):
+    monkeypatch.setattr(settings, "sentiment_cache_enabled", True)
+    monkeypatch.setattr(settings, "sentiment_cache_url", "memory://")
+    monkeypatch.setattr(settings, "use_erlangshen_sentiment", False)
+    calls: list[str] = []
+
+    async def _fake_qwen(text: str) -> str:
+        calls.append(text)
+        return "positive"
+
+    service = OllamaService()
+    monkeypatch.setattr(service, "_classify_sentiment_with_qwen", _fake_qwen)
+
+    assert await service.classify_sentiment("比亚迪宋PLUS是一款好车") == "positive"
+    assert await service.classify_sentiment(" 比亚迪宋PLUS是一款好车") == "positive"
+    assert calls == ["比亚迪宋PLUS是一款好车"]
+
+
+@pytest.mark.asyncio
+async def test_service_outage_defaults_are_not_cached(monkeypatch):
+    import httpx
+
+    monkeypatch.setattr(settings, "sentiment_cache_enabled", True)
+    monkeypatch.setattr(settings, "sentiment_cache_url", "memory://")
+    monkeypatch.setattr(settings, "use_erlangshen_sentiment", True)
+
+    class _DownClient:
+        calls = 0
+
+        async def classify_sentiment(self, text: str, raise_errors: bool = False) -> str:
+            _DownClient.calls += 1
+            raise httpx.ConnectError("refused")
+
+    service = OllamaService()
+    service._sentiment_service = _DownClient()
+
+    assert await service.classify_sentiment("好车") == "neutral"
+    assert await service.classify_sentiment("好车") == "neutral"
+    assert _DownClient.calls == 2
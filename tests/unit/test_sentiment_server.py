@@ -0,0 +1,113 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import services.sentiment_server as server
+from config import settings
+from services.sentiment_analysis import SentimentClient
+
+
+class _FakePipeline:
+    def __init__(self):
+        self.calls: list[tuple[list[str], int]] = []
+
+    def __call__(self, texts, batch_size=None):
+        self.calls.append((list(texts), batch_size))
+        return [
+            {"label": "Positive" if "好" in text else "Negative", "score": 0.9}
+            for text in texts
+        ]
+
+
+@pytest.fixture()
+def fake_pipeline(monkeypatch):
+    pipeline = _FakePipeline()
+    monkeypatch.setattr(server, "_pipeline", pipeline)
+    monkeypatch.setattr(server, "_batcher", None)
+    return pipeline
+
+
+def test_classify_texts_sorts_by_length_and_keeps_order(fake_pipeline, monkeypatch):
+    monkeypatch.setattr(settings, "sentiment_batch_size", 16)
+    texts = ["这辆车非常好开", "", "差", "很好"]
+
+    results = server.classify_texts(texts)
+
+    assert [r.sentiment for r in results] == ["positive", "neutral", "negative", "positive"]
+    assert results[1].confidence == 0.0
+    sent, batch_size = fake_pipeline.calls[0]
+    assert sent == ["差", "很好", "这辆车非常好开"]
+    assert batch_size == 16
+
+
+def test_micro_batcher_coalesces_concurrent_requests():
+    batches: list[list[str]] = []
+
+    def process(texts):
+        batches.append(list(texts))
+        return [text.upper() for text in texts]
+
+    async def run():
+        batcher = server.MicroBatcher(process, max_batch_size=8, max_wait=0.05)
+        results = await asyncio.gather(*(batcher.submit(t) for t in ["a", "b", "c"]))
+        await batcher.close()
+        return results
+
+    assert asyncio.run(run()) == ["A", "B", "C"]
+    assert batches == [["a", "b", "c"]]
+
+
+def test_micro_batcher_respects_max_batch_size_and_propagates_errors():
+    def process(texts):
+        if "bad" in texts:
+            raise RuntimeError("model crashed")
+        return texts
+
+    async def run():
+        batcher = server.MicroBatcher(process, max_batch_size=2, max_wait=0.05)
+        ok = await asyncio.gather(*(batcher.submit(t) for t in ["a", "b", "c"]))
+        with pytest.raises(RuntimeError, match="model crashed"):
+            await batcher.submit("bad")
+        await batcher.close()
+        return ok
+
+    assert asyncio.run(run()) == ["a", "b", "c"]
+
+
+def test_single_and_batch_endpoints(fake_pipeline):
+    client = TestClient(server.app)
+
+    single = client.post("/sentiment", json={"text": "很好"})
+    batch = client.post("/sentiment/batch", json={"texts": ["很好", "", "糟糕"]})
+
+    assert single.json() == {"sentiment": "positive", "confidence": 0.9}
+    assert [r["sentiment"] for r in batch.json()["results"]] == ["positive", "neutral", "negative"]
+
+
+def test_client_classify_batch_chunks_requests(monkeypatch):
+    monkeypatch.setattr(settings, "sentiment_client_batch_size", 2)
+    requests: list[list[str]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        texts = json.loads(request.content)["texts"]
+        requests.append(texts)
+        return httpx.Response(200, json={"results": [{"sentiment": "positive", "confidence": 1.0} for _ in texts]})
+
+    client = SentimentClient(base_url="http://sentiment")
+    client._http_client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    assert client.classify_batch(["a", " ", "b", "c"]) == ["positive", "neutral", "positive", "positive"]
+    assert requests == [["a", "b"], ["c"]]
+
+
+def test_client_classify_batch_falls_back_to_neutral():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("refused", request=request)
+
+    client = SentimentClient(base_url="http://sentiment")
+    client._http_client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    assert client.classify_batch(["a", "b"]) == ["neutral", "neutral"]
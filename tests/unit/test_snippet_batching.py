@@ -0,0 +1,99 @@
+"""Per-answer batched sentiment and snippet translation."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from config import settings
+from services.ollama import OllamaService
+from services.sentiment_cache import reset_sentiment_cache
+from workers.tasks import _classify_and_translate_snippets
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache():
+    reset_sentiment_cache()
+    yield
+    reset_sentiment_cache()
+
+
+class _BatchClient:
+    def __init__(self, fail: bool = False):
+        self.calls: list[list[str]] = []
+        self.fail = fail
+
+    async def classify_batch(self, texts, raise_errors=False):
+        self.calls.append(list(texts))
+        if self.fail:
+            raise httpx.ConnectError("refused")
+        return ["positive" if "好" in t else "negative" for t in texts]
+
+
+@pytest.mark.asyncio
+async def test_classify_sentiment_batch_dedupes_and_keeps_order(monkeypatch):
+    monkeypatch.setattr(settings, "use_erlangshen_sentiment", True)
+    client = _BatchClient()
+    service = OllamaService()
+    service._sentiment_service = client
+
+    labels = await service.classify_sentiment_batch(["好车", "差", "好车", ""])
+
+    assert labels == ["positive", "negative", "positive", "neutral"]
+    assert client.calls == [["好车", "差"]]
+
+
+@pytest.mark.asyncio
+async def test_classify_sentiment_batch_uses_cache_and_skips_outage_defaults(monkeypatch):
+    monkeypatch.setattr(settings, "use_erlangshen_sentiment", True)
+    monkeypatch.setattr(settings, "sentiment_cache_enabled", True)
+    monkeypatch.setattr(settings, "sentiment_cache_url", "memory://")
+    service = OllamaService()
+
+    service._sentiment_service = _BatchClient(fail=True)
+    assert await service.classify_sentiment_batch(["好车"]) == ["neutral"]
+
+    client = _BatchClient()
+    service._sentiment_service = client
+    assert await service.classify_sentiment_batch(["好车"]) == ["positive"]
+    assert await service.classify_sentiment_batch(["好车", "差"]) == ["positive", "negative"]
+    assert client.calls == [["好车"], ["差"]]
+
+
+def test_answer_snippets_cost_one_sentiment_and_one_translation_call(monkeypatch):
+    monkeypatch.setattr(settings, "batch_translation_enabled", True)
+
+    class _Ollama:
+        def __init__(self):
+            self.calls: list[list[str]] = []
+
+        async def classify_sentiment_batch(self, texts):
+            self.calls.append(list(texts))
+            return ["positive"] * len(texts)
+
+    class _Translator:
+        def __init__(self):
+            self.calls: list[list[str]] = []
+
+        async def translate_batch(self, texts, source_lang, target_lang):
+            self.calls.append(list(texts))
+            return [f"en:{t}" for t in texts]
+
+    brand_mentions = [
+        {"mentioned": True, "brand_index": 0, "rank": 1, "snippets": ["甲很好", "共享"]},
+        {"mentioned": True, "brand_index": 1, "rank": 2, "snippets": ["共享"]},
+        {"mentioned": False, "brand_index": 2, "rank": None, "snippets": ["忽略"]},
+    ]
+    product_mentions = [
+        {"mentioned": True, "product_index": 0, "rank": 1, "snippets": ["甲很好"]},
+    ]
+    ollama, translator = _Ollama(), _Translator()
+
+    sentiments, translated, snippet_map = asyncio.run(
+        _classify_and_translate_snippets(ollama, translator, brand_mentions, product_mentions)
+    )
+
+    assert ollama.calls == [["甲很好", "共享"]]
+    assert translator.calls == [["甲很好", "共享"]]
+    assert sentiments == {"甲很好": "positive", "共享": "positive"}
+    assert translated[snippet_map[("brand", 1, 0)]] == "en:共享"
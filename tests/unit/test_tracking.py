@@ -247,6 +247,90 @@ def test_get_run_details_nonexistent(client: TestClient):
     assert "not found" in response.json()["detail"]
 
 
+def _run_with_answers(client: TestClient, db_session, count: int) -> int:
+    from models import Brand, BrandMention, LLMAnswer, Prompt
+    from models.domain import Sentiment
+
+    job = client.post(
+        "/api/v1/tracking/jobs",
+        json={
+            "vertical_name": "SUV Cars",
+            "brands": [{"display_name": "VW"}, {"display_name": "Toyota"}],
+            "prompts": [{"text_en": f"Best SUV {i}?", "language_original": "en"} for i in range(count)],
+            "provider": "qwen",
+            "model_name": "qwen",
+        },
+    ).json()
+    brands = db_session.query(Brand).filter(Brand.vertical_id == job["vertical_id"]).all()
+    prompts = db_session.query(Prompt).filter(Prompt.run_id == job["run_id"]).order_by(Prompt.id).all()
+    for prompt in prompts:
+        answer = LLMAnswer(
+            run_id=job["run_id"], prompt_id=prompt.id, model_name="qwen",
+            raw_answer_zh=f"回答{prompt.id}", raw_answer_en=f"Answer {prompt.id}",
+        )
+        db_session.add(answer)
+        db_session.flush()
+        for rank, brand in enumerate(brands, start=1):
+            db_session.add(BrandMention(
+                llm_answer_id=answer.id, brand_id=brand.id, mentioned=True, rank=rank,
+                sentiment=Sentiment.NEUTRAL, evidence_snippets={"zh": [], "en": []},
+            ))
+    db_session.commit()
+    return job["run_id"]
+
+
+def test_get_run_details_paginates_with_cursor(client: TestClient, db_session):
+    run_id = _run_with_answers(client, db_session, 5)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, "include_answer_text": "false"}
+        if cursor is not None:
+            params["cursor"] = cursor
+        data = client.get(f"/api/v1/tracking/runs/{run_id}/details", params=params).json()
+        assert data["total_answers"] == 5
+        assert all(a["raw_answer_zh"] is None for a in data["answers"])
+        assert all(len(a["mentions"]) == 2 for a in data["answers"])
+        seen.extend(a["id"] for a in data["answers"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == sorted(seen) and len(seen) == 5
+
+    answer = client.get(f"/api/v1/tracking/runs/{run_id}/answers/{seen[0]}").json()
+    assert answer["raw_answer_zh"].startswith("回答")
+    assert answer["raw_answer_en"].startswith("Answer")
+    assert answer["prompt_text_en"].startswith("Best SUV")
+    assert {m["brand_name"] for m in answer["mentions"]} == {"VW", "Toyota"}
+    assert client.get(f"/api/v1/tracking/runs/{run_id}/answers/999999").status_code == 404
+
+
+def test_get_run_details_query_count_is_independent_of_answers(client: TestClient, db_session, db_engine):
+    from sqlalchemy import event
+
+    run_id = _run_with_answers(client, db_session, 12)
+    statements = []
+
+    @event.listens_for(db_engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    data = client.get(f"/api/v1/tracking/runs/{run_id}/details").json()
+    event.remove(db_engine, "before_cursor_execute", _record)
+
+    assert len(data["answers"]) == 12
+    assert data["next_cursor"] is None
+    assert all(len(a["mentions"]) == 2 for a in data["answers"])
+    assert len(statements) <= 7
+
+    slim = client.get(
+        f"/api/v1/tracking/runs/{run_id}/details",
+        params={"include_mentions": "false", "include_answer_text": "false"},
+    ).json()
+    assert all(a["mentions"] == [] and a["raw_answer_en"] is None for a in slim["answers"])
+
+
 def test_delete_tracking_jobs_multiple_filters_returns_error(client: TestClient):
     response = client.delete(
         "/api/v1/tracking/jobs?status=pending&vertical_name=SUV Cars"
@@ -0,0 +1,146 @@
+"""Unit tests for the persistent translation memory."""
+
+import asyncio
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy.orm import Session
+
+import services.translation_memory as tm
+from config import settings
+from models.knowledge_domain import KnowledgeTranslationMemory
+from services.translater import TranslaterService
+
+
+class FakeOllama:
+    def __init__(self, response: str):
+        self.response = response
+        self.prompts: list[str] = []
+        self.translation_model = "test-model"
+
+    async def _call_ollama(self, model, prompt, system_prompt=None, temperature=0.7, format=None):
+        self.prompts.append(prompt)
+        return self.response
+
+
+@pytest.fixture()
+def memory(monkeypatch, knowledge_db_engine):
+    @contextmanager
+    def _session(existing=None, write=False):
+        db = Session(bind=knowledge_db_engine)
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    monkeypatch.setattr(tm, "knowledge_session", _session)
+    monkeypatch.setattr(settings, "translation_memory_enabled", True)
+    tm.reset_translation_memory()
+    yield tm.get_translation_memory()
+    tm.reset_translation_memory()
+
+
+def test_disabled_memory_is_none(monkeypatch):
+    monkeypatch.setattr(settings, "translation_memory_enabled", False)
+    assert tm.get_translation_memory() is None
+
+
+def test_store_and_bulk_lookup(memory, knowledge_db_engine):
+    stored = memory.store_many(
+        {"你好": "Hello", "世界": "World", "同样": "同样"}, "Chinese", "English"
+    )
+    assert stored == 2
+    assert memory.store_many({"你好": "Hi"}, "Chinese", "English") == 0
+
+    found = memory.lookup_many(["你好", "世界", "新词", "你好"], "chinese", "ENGLISH")
+    assert found == {"你好": "Hello", "世界": "World"}
+    assert memory.report()["hits"] == 2
+    assert memory.report()["misses"] == 1
+
+    with Session(bind=knowledge_db_engine) as db:
+        row = db.query(KnowledgeTranslationMemory).filter_by(source_text="你好").one()
+        assert row.hit_count == 0
+        assert row.last_used_at is None
+
+    memory.lookup_many(["你好"], "Chinese", "English")
+    assert memory.flush_hits() == 2
+    with Session(bind=knowledge_db_engine) as db:
+        row = db.query(KnowledgeTranslationMemory).filter_by(source_text="你好").one()
+        assert row.hit_count == 2
+        assert row.last_used_at is not None
+    assert memory.flush_hits() == 0
+
+
+def test_report_reads_run_counts_from_shared_store(memory):
+    fakeredis = pytest.importorskip("fakeredis")
+    from services.run_state import RunStateStore, reset_run_state_store
+
+    reset_run_state_store(RunStateStore(fakeredis.FakeRedis()))
+    try:
+        memory.store_many({"你好": "Hello"}, "Chinese", "English")
+        memory.lookup_many(["你好"], "Chinese", "English")
+        with tm.translation_memory_run_scope(7):
+            memory.lookup_many(["你好", "新词"], "Chinese", "English")
+        # Counts flushed by another worker's task of the same run.
+        tm.get_run_state_store().add_stats(7, tm.RUN_STATS_GROUP, {"hits": 3})
+
+        report = tm.translation_memory_report(7)
+
+        assert report["run"] == {"hits": 4, "misses": 1, "stored": 0, "hit_rate": 0.8}
+        assert report["process"]["hits"] == 2
+        assert tm.translation_memory_report(8)["run"]["hits"] == 0
+    finally:
+        reset_run_state_store()
+
+
+def test_entries_are_isolated_by_model_kind_and_context(memory):
+    memory.store_many({"比亚迪": "BYD"}, "Chinese", "English", kind="entity_brand", context="EV")
+
+    assert memory.lookup_many(["比亚迪"], "Chinese", "English") == {}
+    assert memory.lookup_many(["比亚迪"], "Chinese", "English", kind="entity_brand", context="Phones") == {}
+    other = tm.TranslationMemory(model="other-model:v1")
+    assert other.lookup_many(["比亚迪"], "Chinese", "English", kind="entity_brand", context="EV") == {}
+    assert memory.lookup_many(["比亚迪"], "Chinese", "English", kind="entity_brand", context="EV") == {
+        "比亚迪": "BYD"
+    }
+
+
+def test_translate_batch_skips_ollama_for_remembered_texts(memory):
+    fake = FakeOllama('["Hello", "World"]')
+    translator = TranslaterService(fake)
+
+    first = asyncio.run(translator.translate_batch(["你好", "世界"], "Chinese", "English"))
+    second = asyncio.run(translator.translate_batch(["你好", "世界"], "Chinese", "English"))
+
+    assert first == second == ["Hello", "World"]
+    assert len(fake.prompts) == 1
+
+
+def test_translate_text_remembers_single_results(memory):
+    fake = FakeOllama("Hello")
+    translator = TranslaterService(fake)
+
+    assert asyncio.run(translator.translate_text("你好", "Chinese", "English")) == "Hello"
+    assert asyncio.run(translator.translate_text("你好", "Chinese", "English")) == "Hello"
+    assert len(fake.prompts) == 1
+
+
+@pytest.mark.asyncio
+async def test_entity_batch_only_sends_unremembered_names(memory):
+    memory.store_many({"比亚迪": "BYD"}, "Chinese", "English", kind="entity_brand", context="cars")
+    fake = FakeOllama('[{"type":"brand","name":"吉利","english":"Geely"}]')
+    translator = TranslaterService(fake)
+    items = [{"type": "brand", "name": "比亚迪"}, {"type": "brand", "name": "吉利"}]
+
+    mapping = await translator.translate_entities_to_english_batch(items, "cars", "car brands")
+
+    assert mapping == {("brand", "比亚迪"): "BYD", ("brand", "吉利"): "Geely"}
+    assert len(fake.prompts) == 1
+    assert "比亚迪" not in fake.prompts[0]
+    assert await memory.alookup_many(
+        ["吉利"], "Chinese", "English", kind="entity_brand", context="cars"
+    ) == {"吉利": "Geely"}